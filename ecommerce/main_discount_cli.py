@@ -1,30 +1,535 @@
 """Script principal para testar o sistema de descontos via CLI."""
 
+import argparse
 import asyncio
+import json
+import multiprocessing
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from decimal import Decimal
 
 # Adicionar o diretório raiz ao PYTHONPATH para permitir imports relativos
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 )
 
+from ecommerce.modules.cart.application.use_cases.cart_event_log import (  # noqa: E501
+    EVENT_LOG_FORMATS,
+)
 from ecommerce.modules.cart.application.use_cases.create_fixed_discount import (  # noqa: E501
     CreateFixedDiscountUseCase,
 )
+from ecommerce.modules.cart.application.use_cases.export_discounts import (  # noqa: E501
+    EXPORT_FORMATS,
+    ExportDiscountsUseCase,
+)
+from ecommerce.modules.cart.application.use_cases.import_discounts import (  # noqa: E501
+    ImportDiscountsUseCase,
+)
+from ecommerce.modules.cart.application.use_cases.replay_cart_events import (  # noqa: E501
+    ReplayCartEventsUseCase,
+)
+from ecommerce.modules.cart.application.use_cases.simulate_discount_load import (  # noqa: E501
+    LoadProfile,
+    SimulateDiscountLoadUseCase,
+    TrafficMix,
+)
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
 from ecommerce.modules.cart.domain.services.discount_service import (  # noqa: E501
     DiscountService,
 )
+from ecommerce.modules.cart.domain.services.discount_snapshot import (  # noqa: E501
+    DiscountCatalogSnapshot,
+)
+from ecommerce.modules.cart.domain.services.guarded_discount_service import (  # noqa: E501
+    DEFAULT_STORE_ERRORS,
+    GuardedDiscountService,
+)
 from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
     InMemoryDiscountRepository,
 )
 from ecommerce.modules.cart.interfaces.cli.discount_cli import DiscountCLI
+from ecommerce.modules.cart.interfaces.cli.discount_export_cli import (  # noqa: E501
+    DiscountExportCLI,
+)
+from ecommerce.modules.cart.interfaces.cli.discount_import_cli import (  # noqa: E501
+    SUPPORTED_FORMATS,
+    DiscountImportCLI,
+    detect_format,
+    iter_csv_rows,
+    iter_jsonl_rows,
+)
+from ecommerce.modules.cart.interfaces.cli.discount_load_cli import (  # noqa: E501
+    DiscountLoadCLI,
+)
+from ecommerce.modules.cart.interfaces.cli.discount_replay_cli import (  # noqa: E501
+    DiscountReplayCLI,
+)
+from ecommerce.modules.cart.interfaces.cli.profiling import (
+    PROFILE_MODES,
+    profile_session,
+)
+from ecommerce.modules.cart.interfaces.http.discount_http_load import (  # noqa: E501
+    HTTPLoadProfile,
+    run_http_load_process,
+)
+from ecommerce.modules.cart.interfaces.http.discount_http_server import (  # noqa: E501
+    DiscountHTTPServer,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Monta o parser de argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(description='Sistema de descontos')
+    parser.add_argument(
+        '--profile',
+        choices=PROFILE_MODES,
+        help='Perfila o comando: cprofile registra todas as chamadas; '
+        'sampling amostra a pilha com custo menor',
+    )
+    parser.add_argument(
+        '--profile-output',
+        default='discount_profile',
+        help='Prefixo dos arquivos .pstats, .collapsed e .summary.txt',
+    )
+    parser.add_argument(
+        '--profile-interval',
+        type=float,
+        default=0.005,
+        help='Intervalo entre amostras do modo sampling, em segundos',
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    import_parser = subparsers.add_parser(
+        'import', help='Importa descontos de um arquivo CSV ou JSONL'
+    )
+    import_parser.add_argument('path', help='Arquivo a ser importado')
+    import_parser.add_argument(
+        '--format',
+        dest='file_format',
+        choices=SUPPORTED_FORMATS,
+        help='Formato do arquivo (padrão: deduzido da extensão)',
+    )
+    import_parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1000,
+        help='Quantidade de descontos persistidos por lote',
+    )
+    import_parser.add_argument(
+        '--reject-file',
+        help='Arquivo JSONL que recebe as linhas recusadas',
+    )
+    import_parser.add_argument(
+        '--backend',
+        choices=('memory', 'sqlite'),
+        default='memory',
+        help='Repositório que recebe os descontos; com memory o arquivo '
+        'é apenas validado e nada é gravado (padrão: memory)',
+    )
+    import_parser.add_argument(
+        '--database',
+        default='discounts.db',
+        help='Arquivo SQLite do backend sqlite, criado se não existir',
+    )
+    import_parser.add_argument(
+        '--shards',
+        type=int,
+        default=1,
+        help='Quantidade de arquivos SQLite entre os quais o backend '
+        'sqlite distribui os descontos',
+    )
+
+    export_parser = subparsers.add_parser(
+        'export', help='Exporta o catálogo de descontos'
+    )
+    export_parser.add_argument('path', help='Arquivo de saída')
+    export_parser.add_argument(
+        '--format',
+        dest='file_format',
+        choices=EXPORT_FORMATS,
+        default='jsonl',
+        help='Formato de saída (padrão: jsonl)',
+    )
+    export_parser.add_argument(
+        '--gzip',
+        action='store_true',
+        help='Comprime a saída com gzip',
+    )
+    export_parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Quantidade de descontos lidos e gravados por lote',
+    )
+    export_parser.add_argument(
+        '--backend',
+        choices=('memory', 'sqlite'),
+        default='memory',
+        help='Repositório lido na exportação; com memory o catálogo '
+        'exportado é vazio (padrão: memory)',
+    )
+    export_parser.add_argument(
+        '--database',
+        default='discounts.db',
+        help='Arquivo SQLite do backend sqlite',
+    )
+    export_parser.add_argument(
+        '--shards',
+        type=int,
+        default=1,
+        help='Quantidade de arquivos SQLite entre os quais o backend '
+        'sqlite distribui os descontos',
+    )
+
+    simulate_parser = subparsers.add_parser(
+        'simulate',
+        help='Simula checkouts concorrentes validando e resgatando cupons',
+    )
+    simulate_parser.add_argument(
+        '--backend',
+        choices=('memory', 'sqlite'),
+        default='memory',
+        help='Repositório usado na simulação (padrão: memory)',
+    )
+    simulate_parser.add_argument(
+        '--database',
+        default='discount_load.db',
+        help='Arquivo SQLite do backend sqlite, recriado vazio a cada '
+        'execução',
+    )
+    simulate_parser.add_argument(
+        '--overwrite',
+        action='store_true',
+        help='Permite apagar os arquivos de --database que já existirem',
+    )
+    simulate_parser.add_argument(
+        '--shards',
+        type=int,
+        default=1,
+        help='Quantidade de arquivos SQLite entre os quais o backend '
+        'sqlite distribui os descontos',
+    )
+    simulate_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=2000,
+        help='Quantidade de tarefas simultâneas',
+    )
+    simulate_parser.add_argument(
+        '--requests',
+        type=int,
+        default=20_000,
+        help='Total de requisições',
+    )
+    simulate_parser.add_argument(
+        '--mix',
+        default='0.6,0.15,0.15,0.1',
+        help='Pesos de cupons válidos, inexistentes, disputados e '
+        'expirando, separados por vírgula',
+    )
+    simulate_parser.add_argument(
+        '--hot-limit',
+        type=int,
+        default=100,
+        help='Limite de uso do cupom disputado',
+    )
+    simulate_parser.add_argument(
+        '--seed', type=int, default=0, help='Semente da combinação'
+    )
+    simulate_parser.add_argument(
+        '--output', help='Arquivo JSON que recebe o relatório'
+    )
+
+    serve_parser = subparsers.add_parser(
+        'serve', help='Atende validações e resgates de cupons via HTTP'
+    )
+    serve_parser.add_argument(
+        '--host', default='127.0.0.1', help='Endereço de escuta'
+    )
+    serve_parser.add_argument(
+        '--port', type=int, default=8080, help='Porta de escuta'
+    )
+    serve_parser.add_argument(
+        '--backend',
+        choices=('memory', 'sqlite'),
+        default='memory',
+        help='Repositório usado pelo servidor (padrão: memory)',
+    )
+    serve_parser.add_argument(
+        '--database',
+        default='discount_http.db',
+        help='Arquivo SQLite do backend sqlite, recriado vazio a cada '
+        'execução',
+    )
+    serve_parser.add_argument(
+        '--overwrite',
+        action='store_true',
+        help='Permite apagar os arquivos de --database que já existirem',
+    )
+    serve_parser.add_argument(
+        '--shards',
+        type=int,
+        default=1,
+        help='Quantidade de arquivos SQLite entre os quais o backend '
+        'sqlite distribui os descontos',
+    )
+    serve_parser.add_argument(
+        '--coupons',
+        type=int,
+        default=1000,
+        help='Quantidade de cupons de exemplo cadastrados na partida',
+    )
+    serve_parser.add_argument(
+        '--load-test',
+        action='store_true',
+        help='Executa o teste de carga embutido e encerra o servidor',
+    )
+    serve_parser.add_argument(
+        '--connections',
+        type=int,
+        default=32,
+        help='Conexões persistentes do teste de carga',
+    )
+    serve_parser.add_argument(
+        '--requests',
+        type=int,
+        default=50_000,
+        help='Total de requisições do teste de carga',
+    )
+    serve_parser.add_argument(
+        '--pipeline',
+        type=int,
+        default=16,
+        help='Requisições enviadas em pipeline por lote',
+    )
+    serve_parser.add_argument(
+        '--output', help='Arquivo JSON que recebe o relatório do teste'
+    )
+    serve_parser.add_argument(
+        '--validation-timeout',
+        type=float,
+        help='Prazo, em segundos, de cada leitura de validação; acima '
+        'dele, a validação usa a cópia em memória do catálogo '
+        '(padrão: sem prazo)',
+    )
+
+    replay_parser = subparsers.add_parser(
+        'replay',
+        help='Reprecifica um log de eventos de carrinho com catálogos '
+        'alternativos de descontos',
+    )
+    replay_parser.add_argument('path', help='Log de eventos')
+    replay_parser.add_argument(
+        '--format',
+        dest='file_format',
+        choices=EVENT_LOG_FORMATS,
+        help='Formato do log (padrão: deduzido da extensão)',
+    )
+    replay_parser.add_argument(
+        '--catalog',
+        action='append',
+        default=[],
+        metavar='NOME=ARQUIVO',
+        help='Cenário com os descontos de um arquivo CSV ou JSONL de '
+        'importação; pode ser repetido. O cenário baseline, sem '
+        'descontos, é sempre incluído',
+    )
+    replay_parser.add_argument(
+        '--processes',
+        type=int,
+        default=1,
+        help='Processos, cada um com uma partição dos carrinhos',
+    )
+    replay_parser.add_argument(
+        '--max-open-carts',
+        type=int,
+        default=1_000_000,
+        help='Quantidade máxima de carrinhos abertos em memória',
+    )
+    replay_parser.add_argument(
+        '--output', help='Arquivo JSON que recebe o relatório'
+    )
+
+    return parser
+
+
+async def load_catalog(path: str) -> list[Discount]:
+    """Lê os descontos de um arquivo de importação para a memória."""
+    repository = InMemoryDiscountRepository()
+    import_use_case = ImportDiscountsUseCase(
+        CreateFixedDiscountUseCase(DiscountService(repository))
+    )
+    read_rows = (
+        iter_csv_rows if detect_format(path) == 'csv' else iter_jsonl_rows
+    )
+    with open(path, encoding='utf-8', newline='') as file:
+        report = await import_use_case.execute(read_rows(file))
+    if report.rejected:
+        print(f'{path}: {report.rejected} linhas recusadas')
+    return await repository.list()
+
+
+async def seed_http_coupons(
+    discount_service: DiscountService, count: int
+) -> list[Discount]:
+    """Cadastra cupons percentuais de exemplo para o servidor HTTP."""
+    valid_from = datetime.now() - timedelta(days=1)
+    return await discount_service.save_discounts(
+        [
+            Discount(
+                type=DiscountType.PERCENTAGE,
+                value=Decimal(10),
+                code=f'HTTP-{index}',
+                description='Cupom de exemplo',
+                valid_from=valid_from,
+            )
+            for index in range(count)
+        ]
+    )
+
+
+async def serve(args: argparse.Namespace, discount_service: DiscountService):
+    """Inicia o servidor HTTP e, se pedido, executa o teste de carga."""
+    discounts = await seed_http_coupons(discount_service, args.coupons)
+    if isinstance(discount_service, GuardedDiscountService):
+        await discount_service.refresh_snapshot()
+    server = DiscountHTTPServer(discount_service, args.host, args.port)
+    await server.start()
+    print(f'Servidor HTTP em http://{server.host}:{server.port}')
+
+    if not args.load_test:
+        await server.serve_forever()
+        return
+
+    # O cliente roda em outro processo, deixando o loop do servidor com
+    # um núcleo só para si
+    profile = HTTPLoadProfile(
+        connections=args.connections,
+        requests=args.requests,
+        pipeline_depth=args.pipeline,
+    )
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(
+        1, mp_context=multiprocessing.get_context('spawn')
+    ) as executor:
+        report = await loop.run_in_executor(
+            executor,
+            run_http_load_process,
+            server.host,
+            server.port,
+            [discount.code for discount in discounts],
+            [str(discount.id) for discount in discounts],
+            profile,
+        )
+    await server.close()
+
+    report.update(server.metrics())
+    document = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(document + '\n')
+    print(document)
+
 
+def sqlite_files(path: str, shards: int = 1) -> list[str]:
+    """Lista os arquivos SQLite de um backend com `shards` fragmentos."""
+    if shards <= 1:
+        return [path]
+    root, extension = os.path.splitext(path)
+    return [f'{root}-{index}{extension}' for index in range(shards)]
 
-async def main():
+
+async def build_fresh_sqlite_repository(args: argparse.Namespace):
+    """Cria o backend sqlite de `simulate` e `serve` sobre arquivos vazios.
+
+    Raises:
+        SystemExit: Se algum dos arquivos já existir e `--overwrite` não
+            tiver sido informado
+
+    """
+    existing = [
+        path
+        for path in sqlite_files(args.database, args.shards)
+        if os.path.exists(path)
+    ]
+    if existing and not args.overwrite:
+        raise SystemExit(
+            f'{existing[0]} já existe; use --overwrite para apagá-lo'
+        )
+    return await build_sqlite_repository(
+        args.database, args.shards, reset=True
+    )
+
+
+async def build_sqlite_repository(
+    path: str, shards: int = 1, reset: bool = False
+):
+    """Cria um repositório SQL sobre arquivos SQLite.
+
+    As tabelas que ainda não existem são criadas; com `reset`, os
+    arquivos existentes são apagados antes. Com mais de um fragmento,
+    cada um usa o arquivo `<nome>-<n><ext>` e os descontos são
+    distribuídos por um `ShardedDiscountRepository`.
+    """
+    if shards > 1:
+        from ecommerce.modules.cart.infrastructure.db.repositories.sharded_discount_repository import (  # noqa: E501
+            ShardedDiscountRepository,
+        )
+
+        return ShardedDiscountRepository(
+            {
+                f'shard-{index}': await build_sqlite_repository(
+                    shard_path, reset=reset
+                )
+                for index, shard_path in enumerate(sqlite_files(path, shards))
+            }
+        )
+
+    from sqlalchemy.ext.asyncio import (
+        async_sessionmaker,
+        create_async_engine,
+    )
+
+    from ecommerce.modules.cart.infrastructure.db.models.base import Base
+    from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+        SQLDiscountRepository,
+    )
+    from ecommerce.modules.cart.infrastructure.db.session_router import (
+        SessionRouter,
+    )
+
+    if reset and os.path.exists(path):
+        os.remove(path)
+
+    engine = create_async_engine(f'sqlite+aiosqlite:///{path}')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    router = SessionRouter(async_sessionmaker(engine, expire_on_commit=False))
+    return SQLDiscountRepository(router=router)
+
+
+async def main(argv: list[str] | None = None):
     """Função principal que configura e inicia o programa."""
+    args = build_parser().parse_args(argv)
+
+    with profile_session(
+        args.profile, args.profile_output, args.profile_interval
+    ):
+        await run(args)
+
+
+async def run(args: argparse.Namespace):
+    """Executa o comando escolhido na linha de comando."""
     # Criar o repositório (usando implementação em memória para este exemplo)
     discount_repository = InMemoryDiscountRepository()
+    if args.command in ('import', 'export') and args.backend == 'sqlite':
+        discount_repository = await build_sqlite_repository(
+            args.database, args.shards
+        )
 
     # Criar o serviço de desconto
     discount_service = DiscountService(discount_repository)
@@ -34,6 +539,86 @@ async def main():
         discount_service
     )
 
+    if args.command == 'import':
+        import_cli = DiscountImportCLI(
+            ImportDiscountsUseCase(
+                create_fixed_discount_use_case, batch_size=args.batch_size
+            )
+        )
+        await import_cli.run(
+            args.path,
+            file_format=args.file_format,
+            reject_path=args.reject_file,
+        )
+        return
+
+    if args.command == 'simulate':
+        if args.backend == 'sqlite':
+            discount_repository = await build_fresh_sqlite_repository(args)
+
+        weights = [float(weight) for weight in args.mix.split(',')]
+        profile = LoadProfile(
+            concurrency=args.concurrency,
+            requests=args.requests,
+            mix=TrafficMix(*weights),
+            hot_coupon_limit=args.hot_limit,
+            seed=args.seed,
+        )
+        load_cli = DiscountLoadCLI(
+            SimulateDiscountLoadUseCase(DiscountService(discount_repository))
+        )
+        await load_cli.run(profile, output_path=args.output)
+        return
+
+    if args.command == 'serve':
+        store_errors = DEFAULT_STORE_ERRORS
+        if args.backend == 'sqlite':
+            from sqlalchemy.exc import SQLAlchemyError
+
+            discount_repository = await build_fresh_sqlite_repository(args)
+            store_errors = (*store_errors, SQLAlchemyError)
+        if args.validation_timeout:
+            discount_service = GuardedDiscountService(
+                discount_repository,
+                DiscountCatalogSnapshot(),
+                timeout=args.validation_timeout,
+                store_errors=store_errors,
+            )
+        else:
+            discount_service = DiscountService(discount_repository)
+        await serve(args, discount_service)
+        return
+
+    if args.command == 'replay':
+        catalogs = {'baseline': []}
+        for catalog in args.catalog:
+            name, _, path = catalog.partition('=')
+            catalogs[name] = await load_catalog(path)
+        replay_cli = DiscountReplayCLI(
+            ReplayCartEventsUseCase(
+                catalogs, max_open_carts=args.max_open_carts
+            )
+        )
+        replay_cli.run(
+            args.path,
+            file_format=args.file_format,
+            processes=args.processes,
+            output_path=args.output,
+        )
+        return
+
+    if args.command == 'export':
+        export_cli = DiscountExportCLI(
+            ExportDiscountsUseCase(discount_service)
+        )
+        await export_cli.run(
+            args.path,
+            file_format=args.file_format,
+            compress=args.gzip,
+            chunk_size=args.chunk_size,
+        )
+        return
+
     # Criar a interface de linha de comando
     discount_cli = DiscountCLI(create_fixed_discount_use_case)
 
@@ -0,0 +1,221 @@
+"""Logs de eventos de carrinho em JSONL ou em registros binários.
+
+Os logs são lidos como fluxos: apenas um bloco do arquivo fica em memória
+por vez, qualquer que seja o seu tamanho. O formato binário usa registros
+de tamanho fixo, decodificados em blocos com `struct.iter_unpack`, e
+permite descartar eventos de outras partições antes de montá-los.
+"""
+
+import json
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+from ...domain.value_objects.money import from_minor_units, to_minor_units
+
+ADD_ITEM = 'add_item'
+SET_QUANTITY = 'set_quantity'
+APPLY_COUPON = 'apply_coupon'
+CHECKOUT = 'checkout'
+
+EVENT_KINDS = (ADD_ITEM, SET_QUANTITY, APPLY_COUPON, CHECKOUT)
+EVENT_LOG_FORMATS = ('jsonl', 'binary')
+
+BINARY_MAGIC = b'CEVT\x01'
+# tipo, carrinho, instante, produto, quantidade, preço, código
+_RECORD = struct.Struct('<B16sq16siq32s')
+_RECORDS_PER_CHUNK = 8192
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_NO_PRODUCT = bytes(16)
+_KIND_INDEX = {kind: index for index, kind in enumerate(EVENT_KINDS)}
+
+
+@dataclass(slots=True)
+class CartEvent:
+    """Uma ação registrada sobre um carrinho."""
+
+    kind: str
+    cart_id: UUID
+    timestamp: datetime
+    product_id: UUID | None = None
+    quantity: int = 0
+    price: Decimal = Decimal(0)
+    code: str | None = None
+
+
+def shard_of(cart_id: UUID, shards: int) -> int:
+    """Partição de um carrinho, estável entre processos e formatos."""
+    return cart_id.int % shards
+
+
+def detect_format(path: str) -> str:
+    """Deduz o formato do log pela extensão do arquivo."""
+    if path.endswith('.jsonl'):
+        return 'jsonl'
+    return 'binary'
+
+
+def write_events(
+    path: str, events: Iterable[CartEvent], file_format: str | None = None
+) -> int:
+    """Grave eventos em um log.
+
+    Args:
+        path: Arquivo de saída
+        events: Eventos em ordem cronológica
+        file_format: 'jsonl' ou 'binary' (padrão: deduzido da extensão)
+
+    Returns:
+        Quantidade de eventos gravados
+
+    Raises:
+        ValueError: Se o formato for desconhecido ou um código de cupom
+            não couber no registro binário
+
+    """
+    file_format = file_format or detect_format(path)
+    if file_format not in EVENT_LOG_FORMATS:
+        raise ValueError(f'Formato de log desconhecido: {file_format}')
+
+    written = 0
+    if file_format == 'jsonl':
+        with open(path, 'w', encoding='utf-8') as output:
+            for event in events:
+                output.write(_encode_json(event) + '\n')
+                written += 1
+        return written
+
+    with open(path, 'wb') as output:
+        output.write(BINARY_MAGIC)
+        chunk = []
+        for event in events:
+            chunk.append(_encode_record(event))
+            if len(chunk) >= _RECORDS_PER_CHUNK:
+                output.write(b''.join(chunk))
+                written += len(chunk)
+                chunk.clear()
+        output.write(b''.join(chunk))
+        written += len(chunk)
+    return written
+
+
+def read_events(
+    path: str,
+    file_format: str | None = None,
+    shard: int = 0,
+    shards: int = 1,
+) -> Iterator[CartEvent]:
+    """Percorra os eventos de um log, opcionalmente de uma só partição.
+
+    Args:
+        path: Arquivo do log
+        file_format: 'jsonl' ou 'binary' (padrão: deduzido da extensão)
+        shard: Partição lida, entre 0 e `shards - 1`
+        shards: Quantidade de partições
+
+    Yields:
+        Eventos dos carrinhos da partição, na ordem do arquivo
+
+    Raises:
+        ValueError: Se o formato for desconhecido ou o arquivo inválido
+
+    """
+    file_format = file_format or detect_format(path)
+    if file_format == 'jsonl':
+        return _read_jsonl(path, shard, shards)
+    if file_format == 'binary':
+        return _read_binary(path, shard, shards)
+    raise ValueError(f'Formato de log desconhecido: {file_format}')
+
+
+def _encode_json(event: CartEvent) -> str:
+    record = {
+        'kind': event.kind,
+        'cart_id': str(event.cart_id),
+        'timestamp': event.timestamp.isoformat(),
+    }
+    if event.product_id is not None:
+        record['product_id'] = str(event.product_id)
+    if event.kind in (ADD_ITEM, SET_QUANTITY):
+        record['quantity'] = event.quantity
+    if event.kind == ADD_ITEM:
+        record['price'] = str(event.price)
+    if event.code is not None:
+        record['code'] = event.code
+    return json.dumps(record, separators=(',', ':'))
+
+
+def _encode_record(event: CartEvent) -> bytes:
+    code = (event.code or '').encode()
+    if len(code) > 32:
+        raise ValueError(f'Código de cupom muito longo: {event.code}')
+    return _RECORD.pack(
+        _KIND_INDEX[event.kind],
+        event.cart_id.bytes,
+        (event.timestamp - _EPOCH) // _MICROSECOND,
+        event.product_id.bytes if event.product_id else _NO_PRODUCT,
+        event.quantity,
+        to_minor_units(event.price),
+        code,
+    )
+
+
+def _read_jsonl(path: str, shard: int, shards: int) -> Iterator[CartEvent]:
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            cart_id = UUID(record['cart_id'])
+            if shards > 1 and cart_id.int % shards != shard:
+                continue
+            product_id = record.get('product_id')
+            yield CartEvent(
+                kind=record['kind'],
+                cart_id=cart_id,
+                timestamp=datetime.fromisoformat(record['timestamp']),
+                product_id=UUID(product_id) if product_id else None,
+                quantity=record.get('quantity', 0),
+                price=Decimal(record.get('price', 0)),
+                code=record.get('code'),
+            )
+
+
+def _read_binary(path: str, shard: int, shards: int) -> Iterator[CartEvent]:
+    chunk_size = _RECORD.size * _RECORDS_PER_CHUNK
+    from_bytes = int.from_bytes
+    with open(path, 'rb') as source:
+        if source.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError('Arquivo não é um log binário de eventos')
+        remaining = os.fstat(source.fileno()).st_size - len(BINARY_MAGIC)
+        if remaining % _RECORD.size:
+            raise ValueError('Log binário truncado')
+
+        while chunk := source.read(chunk_size):
+            for (
+                kind,
+                cart,
+                micros,
+                product,
+                quantity,
+                price,
+                code,
+            ) in _RECORD.iter_unpack(chunk):
+                if shards > 1 and from_bytes(cart) % shards != shard:
+                    continue
+                code = code.rstrip(b'\0')
+                yield CartEvent(
+                    EVENT_KINDS[kind],
+                    UUID(bytes=cart),
+                    _EPOCH + timedelta(microseconds=micros),
+                    None if product == _NO_PRODUCT else UUID(bytes=product),
+                    quantity,
+                    from_minor_units(price),
+                    code.decode() if code else None,
+                )
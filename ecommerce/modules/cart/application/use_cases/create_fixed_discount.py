@@ -1,6 +1,7 @@
 """Caso de uso para criação de desconto de valor fixo."""
 
 from datetime import datetime
+from decimal import Decimal
 
 from ...domain.entities.discount import Discount
 from ...domain.services.discount_service import DiscountService
@@ -47,16 +48,9 @@ class CreateFixedDiscountUseCase:
             ValueError: Se os parâmetros forem inválidos
 
         """
-        # Validação de parâmetros
-        if amount <= 0:
-            raise ValueError('Valor do desconto deve ser maior que zero')
-
-        if not code:
-            raise ValueError('Código do cupom é obrigatório')
-
-        # Converter valores para objetos de domínio
-        discount_amount = Money(amount, currency)
-        min_order = Money(minimum_order_value, currency)
+        discount_amount, min_order = self._to_money(
+            amount, code, currency, minimum_order_value
+        )
 
         # Delegar a criação ao serviço de domínio
         return await self.discount_service.create_fixed_amount_discount(
@@ -67,3 +61,64 @@ class CreateFixedDiscountUseCase:
             valid_until=valid_until,
             max_usage_count=max_usage_count,
         )
+
+    def build(
+        self,
+        amount: Decimal,
+        code: str,
+        description: str,
+        currency: str = 'BRL',
+        minimum_order_value: Decimal = Decimal(0),
+        valid_until: datetime | None = None,
+        max_usage_count: int | None = None,
+    ) -> Discount:
+        """Valida os parâmetros e monta o desconto sem persisti-lo.
+
+        Aplica exatamente as mesmas regras de `execute`, permitindo que
+        importações em lote validem cada linha e persistam em blocos.
+
+        Args:
+            amount: Valor do desconto
+            code: Código do cupom
+            description: Descrição do desconto
+            currency: Moeda (padrão BRL)
+            minimum_order_value: Valor mínimo de pedido para aplicar o desconto
+            valid_until: Data de expiração do desconto
+            max_usage_count: Número máximo de usos
+
+        Returns:
+            O desconto montado, ainda não persistido
+
+        Raises:
+            ValueError: Se os parâmetros forem inválidos
+
+        """
+        discount_amount, min_order = self._to_money(
+            amount, code, currency, minimum_order_value
+        )
+
+        return self.discount_service.build_fixed_amount_discount(
+            amount=discount_amount,
+            code=code,
+            description=description,
+            minimum_order_value=min_order,
+            valid_until=valid_until,
+            max_usage_count=max_usage_count,
+        )
+
+    def _to_money(
+        self,
+        amount: Decimal | float,
+        code: str,
+        currency: str,
+        minimum_order_value: Decimal | float,
+    ) -> tuple[Money, Money]:
+        # Validação de parâmetros
+        if amount <= 0:
+            raise ValueError('Valor do desconto deve ser maior que zero')
+
+        if not code:
+            raise ValueError('Código do cupom é obrigatório')
+
+        # Converter valores para objetos de domínio
+        return Money(amount, currency), Money(minimum_order_value, currency)
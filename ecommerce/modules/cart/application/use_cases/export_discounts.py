@@ -0,0 +1,242 @@
+"""Caso de uso para exportação do catálogo de descontos."""
+
+import csv
+import gzip
+import io
+import json
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, BinaryIO
+
+from ...domain.entities.discount import Discount
+from ...domain.services.discount_service import DiscountService
+from ...domain.value_objects.money import Money
+
+EXPORT_FIELDS = (
+    'id',
+    'code',
+    'type',
+    'value',
+    'description',
+    'currency',
+    'minimum_order_value',
+    'maximum_discount_amount',
+    'valid_from',
+    'valid_until',
+    'max_usage_count',
+    'current_usage_count',
+)
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'columnar')
+
+COLUMNAR_FORMAT_NAME = 'discounts-columnar'
+COLUMNAR_FORMAT_VERSION = 1
+
+
+def discount_to_record(discount: Discount) -> dict[str, Any]:
+    """Converta um desconto em um registro plano para exportação.
+
+    Valores monetários são exportados como texto para preservar as casas
+    decimais exatas.
+
+    Args:
+        discount: Desconto a ser exportado
+
+    Returns:
+        Dicionário com os campos de `EXPORT_FIELDS`
+
+    """
+    value = discount.value
+    if isinstance(value, Money):
+        value = value.amount
+
+    return {
+        'id': str(discount.id),
+        'code': discount.code,
+        'type': discount.type.name,
+        'value': str(value),
+        'description': discount.description,
+        'currency': discount.minimum_order_value.currency,
+        'minimum_order_value': str(discount.minimum_order_value.amount),
+        'maximum_discount_amount': str(
+            discount.maximum_discount_amount.amount
+        ),
+        'valid_from': discount.valid_from.isoformat(),
+        'valid_until': (
+            discount.valid_until.isoformat() if discount.valid_until else None
+        ),
+        'max_usage_count': discount.max_usage_count,
+        'current_usage_count': discount.current_usage_count,
+    }
+
+
+def _encode_csv(records: list[dict[str, Any]], first: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(
+        buffer, fieldnames=EXPORT_FIELDS, lineterminator='\n'
+    )
+    if first:
+        writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue()
+
+
+def _encode_jsonl(records: list[dict[str, Any]], first: bool) -> str:
+    return ''.join(
+        json.dumps(record, ensure_ascii=False) + '\n' for record in records
+    )
+
+
+def _encode_columnar(records: list[dict[str, Any]], first: bool) -> str:
+    """Codifica um lote como um grupo de linhas orientado a colunas.
+
+    O arquivo é uma sequência de linhas JSON: um cabeçalho com a lista de
+    colunas seguido de um grupo por lote, em que cada coluna é uma lista
+    de valores. Isso evita repetir os nomes dos campos a cada registro.
+    """
+    header = ''
+    if first:
+        header = (
+            json.dumps(
+                {
+                    'format': COLUMNAR_FORMAT_NAME,
+                    'version': COLUMNAR_FORMAT_VERSION,
+                    'fields': EXPORT_FIELDS,
+                }
+            )
+            + '\n'
+        )
+
+    group = {
+        'rows': len(records),
+        'columns': [
+            [record[field] for record in records] for field in EXPORT_FIELDS
+        ],
+    }
+    return header + json.dumps(group, ensure_ascii=False) + '\n'
+
+
+_ENCODERS: dict[str, Callable[[list[dict[str, Any]], bool], str]] = {
+    'csv': _encode_csv,
+    'jsonl': _encode_jsonl,
+    'columnar': _encode_columnar,
+}
+
+
+@dataclass
+class ExportReport:
+    """Resumo de uma exportação."""
+
+    rows: int = 0
+    chunks: int = 0
+    bytes_written: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Vazão da exportação em linhas por segundo."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.rows / self.elapsed_seconds
+
+
+class _CountingWriter(io.RawIOBase):
+    """Repassa escritas a outro arquivo contando os bytes gravados."""
+
+    def __init__(self, target: BinaryIO):
+        self.target = target
+        self.count = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.target.write(data)
+        self.count += len(data)
+        return len(data)
+
+
+class ExportDiscountsUseCase:
+    """Caso de uso para exportar todos os descontos com seus contadores.
+
+    Os descontos são lidos do repositório em lotes e cada lote é
+    codificado e gravado imediatamente, com compressão gzip incremental
+    opcional, mantendo o uso de memória constante.
+    """
+
+    def __init__(self, discount_service: DiscountService):
+        """Inicializa o caso de uso com o serviço de desconto.
+
+        Args:
+            discount_service: Serviço que gerencia operações com descontos
+
+        """
+        self.discount_service = discount_service
+
+    async def execute(
+        self,
+        output: BinaryIO,
+        file_format: str = 'jsonl',
+        compress: bool = False,
+        chunk_size: int = 1000,
+        on_progress: Callable[[ExportReport], None] | None = None,
+    ) -> ExportReport:
+        """Exporta o catálogo para o arquivo binário informado.
+
+        Args:
+            output: Arquivo de destino aberto em modo binário
+            file_format: Um dos formatos de `EXPORT_FORMATS`
+            compress: Se True, grava a saída comprimida com gzip
+            chunk_size: Quantidade de descontos por lote
+            on_progress: Chamado após a gravação de cada lote
+
+        Returns:
+            Resumo da exportação
+
+        Raises:
+            ValueError: Se o formato ou o tamanho do lote forem inválidos
+
+        """
+        if file_format not in _ENCODERS:
+            raise ValueError(
+                f'Formato não suportado: {file_format}. '
+                f'Use um de: {", ".join(EXPORT_FORMATS)}'
+            )
+        if chunk_size <= 0:
+            raise ValueError('Tamanho do lote deve ser maior que zero')
+
+        encode = _ENCODERS[file_format]
+        report = ExportReport()
+        started_at = time.perf_counter()
+
+        counter = _CountingWriter(output)
+        sink: BinaryIO = (
+            gzip.GzipFile(fileobj=counter, mode='wb', mtime=0)
+            if compress
+            else counter
+        )
+
+        try:
+            async for batch in self.discount_service.stream_discounts(
+                chunk_size
+            ):
+                records = [discount_to_record(item) for item in batch]
+                sink.write(encode(records, report.chunks == 0).encode())
+                report.rows += len(records)
+                report.chunks += 1
+                report.elapsed_seconds = time.perf_counter() - started_at
+                if on_progress:
+                    on_progress(report)
+
+            if report.chunks == 0 and file_format != 'jsonl':
+                # Catálogo vazio: ainda assim grava o cabeçalho
+                sink.write(encode([], True).encode())
+        finally:
+            if compress:
+                sink.close()
+
+        output.flush()
+        report.bytes_written = counter.count
+        report.elapsed_seconds = time.perf_counter() - started_at
+        return report
@@ -0,0 +1,211 @@
+"""Caso de uso para importação em lote de descontos de valor fixo."""
+
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any
+
+from ...domain.entities.discount import Discount
+from .create_fixed_discount import CreateFixedDiscountUseCase
+
+
+@dataclass(frozen=True)
+class RejectedRow:
+    """Linha recusada durante a importação."""
+
+    line_number: int
+    row: Any
+    error: str
+
+
+@dataclass
+class ImportReport:
+    """Resumo de uma importação em lote."""
+
+    accepted: int = 0
+    rejected: int = 0
+    batches: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def processed(self) -> int:
+        """Total de linhas lidas até o momento."""
+        return self.accepted + self.rejected
+
+    @property
+    def rows_per_second(self) -> float:
+        """Vazão da importação em linhas por segundo."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+
+class ImportDiscountsUseCase:
+    """Caso de uso para importar descontos de valor fixo em lote.
+
+    As linhas são consumidas de forma incremental e persistidas em blocos
+    de tamanho fixo, de modo que o uso de memória depende apenas do
+    tamanho do lote, e não do tamanho do arquivo de origem.
+    """
+
+    def __init__(
+        self,
+        create_fixed_discount_use_case: CreateFixedDiscountUseCase,
+        batch_size: int = 1000,
+    ):
+        """Inicializa o caso de uso.
+
+        Args:
+            create_fixed_discount_use_case: Caso de uso cujas regras de
+                validação são aplicadas a cada linha
+            batch_size: Quantidade de descontos persistidos por lote
+
+        """
+        if batch_size <= 0:
+            raise ValueError('Tamanho do lote deve ser maior que zero')
+
+        self.create_fixed_discount_use_case = create_fixed_discount_use_case
+        self.batch_size = batch_size
+
+    async def execute(
+        self,
+        rows: Iterable[tuple[int, Any]],
+        on_reject: Callable[[RejectedRow], None] | None = None,
+        on_progress: Callable[[ImportReport], None] | None = None,
+    ) -> ImportReport:
+        """Importa os descontos descritos pelas linhas informadas.
+
+        Args:
+            rows: Pares (número da linha, registro) lidos do arquivo
+            on_reject: Chamado para cada linha recusada
+            on_progress: Chamado após a persistência de cada lote
+
+        Returns:
+            Resumo da importação
+
+        """
+        report = ImportReport()
+        batch: list[tuple[int, Any, Discount]] = []
+        started_at = time.perf_counter()
+
+        def reject(line_number: int, row: Any, error: str) -> None:
+            report.rejected += 1
+            if on_reject:
+                on_reject(RejectedRow(line_number, row, error))
+
+        for line_number, row in rows:
+            try:
+                discount = self.create_fixed_discount_use_case.build(
+                    **self._parse_row(row)
+                )
+            except ValueError as e:
+                reject(line_number, row, str(e))
+                continue
+
+            batch.append((line_number, row, discount))
+
+            if len(batch) >= self.batch_size:
+                await self._flush(batch, report, reject)
+                report.elapsed_seconds = time.perf_counter() - started_at
+                if on_progress:
+                    on_progress(report)
+
+        if batch:
+            await self._flush(batch, report, reject)
+
+        report.elapsed_seconds = time.perf_counter() - started_at
+        return report
+
+    async def _flush(
+        self,
+        batch: list[tuple[int, Any, Discount]],
+        report: ImportReport,
+        reject: Callable[[int, Any, str], None],
+    ) -> None:
+        """Persista o lote atual e o esvazie.
+
+        Se o lote falhar como um todo, cada desconto é salvo
+        individualmente para isolar as linhas problemáticas.
+        """
+        service = self.create_fixed_discount_use_case.discount_service
+        report.batches += 1
+
+        try:
+            await service.save_discounts([item[2] for item in batch])
+            report.accepted += len(batch)
+        except Exception:
+            for line_number, row, discount in batch:
+                try:
+                    await service.save_discounts([discount])
+                    report.accepted += 1
+                except Exception as e:
+                    reject(line_number, row, f'Erro ao persistir: {e}')
+
+        batch.clear()
+
+    def _parse_row(self, row: Any) -> dict[str, Any]:
+        """Converta um registro bruto nos argumentos do caso de uso.
+
+        Raises:
+            ValueError: Se algum campo estiver ausente ou malformado
+
+        """
+        if not isinstance(row, dict):
+            raise ValueError('Linha malformada')
+
+        def text(name: str) -> str:
+            value = row.get(name)
+            return '' if value is None else str(value).strip()
+
+        def decimal(name: str, default: str | None = None) -> Decimal:
+            value = text(name) or default
+            if value is None:
+                raise ValueError(f'Campo obrigatório ausente: {name}')
+            try:
+                result = Decimal(value)
+            except InvalidOperation:
+                raise ValueError(
+                    f'Valor inválido para {name}: {value}'
+                ) from None
+            if not result.is_finite():
+                raise ValueError(f'Valor inválido para {name}: {value}')
+            return result
+
+        minimum_order_value = decimal('minimum_order_value', '0')
+        if minimum_order_value < 0:
+            raise ValueError('Valor mínimo não pode ser negativo')
+
+        valid_until = None
+        if text('valid_until'):
+            try:
+                valid_until = datetime.fromisoformat(text('valid_until'))
+            except ValueError:
+                raise ValueError(
+                    f'Data inválida para valid_until: {text("valid_until")}'
+                ) from None
+
+        max_usage_count = None
+        if text('max_usage_count'):
+            try:
+                max_usage_count = int(text('max_usage_count'))
+            except ValueError:
+                raise ValueError(
+                    f'Limite de uso inválido: {text("max_usage_count")}'
+                ) from None
+            if max_usage_count <= 0:
+                raise ValueError('Limite de uso deve ser maior que zero')
+
+        amount = decimal('amount')
+
+        return {
+            'amount': amount,
+            'code': text('code'),
+            'description': text('description')
+            or f'Desconto de R$ {amount:.2f}',
+            'currency': text('currency') or 'BRL',
+            'minimum_order_value': minimum_order_value,
+            'valid_until': valid_until,
+            'max_usage_count': max_usage_count,
+        }
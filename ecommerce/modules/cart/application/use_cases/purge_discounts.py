@@ -0,0 +1,177 @@
+"""Caso de uso para a limpeza de descontos expirados e esgotados."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol
+
+
+class PurgeableDiscountRepository(Protocol):
+    """Repositório de descontos capaz de remover descontos inativos."""
+
+    async def purge(
+        self,
+        expired_before: datetime,
+        exhausted_before: datetime,
+        limit: int,
+        archive: bool = False,
+    ) -> int:
+        """Remove um lote de descontos expirados ou esgotados."""
+        ...
+
+
+@dataclass
+class PurgeReport:
+    """Progresso de uma execução da limpeza."""
+
+    purged: int = 0
+    chunks: int = 0
+    chunk_size: int = 0
+    last_chunk_seconds: float = 0.0
+    max_chunk_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+    archived: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        """Vazão da limpeza em descontos por segundo."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.purged / self.elapsed_seconds
+
+
+class PurgeDiscountsUseCase:
+    """Caso de uso para remover descontos inativos em pequenos lotes.
+
+    Cada lote é uma operação curta no repositório, seguida de uma pausa
+    que devolve o controle ao tráfego de resgates. O tamanho do lote se
+    adapta para que cada um termine dentro de `chunk_time_budget`: é
+    reduzido à metade quando o lote demora demais e volta a crescer,
+    até `chunk_size`, quando sobra folga.
+
+    Os períodos de carência mantêm por algum tempo descontos recém
+    expirados ou esgotados, para que resgates em andamento não os
+    encontrem removidos.
+    """
+
+    def __init__(
+        self,
+        discount_repository: PurgeableDiscountRepository,
+        expired_grace: timedelta = timedelta(days=7),
+        exhausted_grace: timedelta = timedelta(days=1),
+        chunk_size: int = 500,
+        chunk_time_budget: float = 0.1,
+        pause_seconds: float = 0.01,
+        archive: bool = False,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Inicializa o caso de uso.
+
+        Args:
+            discount_repository: Repositório com suporte a `purge`
+            expired_grace: Tempo mínimo desde o fim da validade
+            exhausted_grace: Tempo mínimo desde a última gravação de um
+                desconto esgotado
+            chunk_size: Quantidade máxima de descontos por lote
+            chunk_time_budget: Duração máxima desejada de cada lote
+            pause_seconds: Pausa entre lotes
+            archive: Se True, arquiva os descontos removidos
+            clock: Relógio usado para medir os lotes
+
+        """
+        if chunk_size <= 0:
+            raise ValueError('Tamanho do lote deve ser maior que zero')
+
+        self.discount_repository = discount_repository
+        self.expired_grace = expired_grace
+        self.exhausted_grace = exhausted_grace
+        self.chunk_size = chunk_size
+        self.chunk_time_budget = chunk_time_budget
+        self.pause_seconds = pause_seconds
+        self.archive = archive
+        self.clock = clock
+
+    async def execute(
+        self,
+        now: datetime | None = None,
+        on_progress: Callable[[PurgeReport], None] | None = None,
+        max_chunks: int | None = None,
+    ) -> PurgeReport:
+        """Remove os descontos inativos até não restar nenhum.
+
+        Args:
+            now: Instante de referência para as carências (padrão: agora)
+            on_progress: Chamado após cada lote com o progresso atual
+            max_chunks: Limite de lotes nesta execução
+
+        Returns:
+            Resumo da limpeza
+
+        """
+        now = now or datetime.now()
+        expired_before = now - self.expired_grace
+        exhausted_before = now - self.exhausted_grace
+
+        report = PurgeReport(chunk_size=self.chunk_size, archived=self.archive)
+        started_at = self.clock()
+
+        while max_chunks is None or report.chunks < max_chunks:
+            chunk_started_at = self.clock()
+            purged = await self.discount_repository.purge(
+                expired_before,
+                exhausted_before,
+                limit=report.chunk_size,
+                archive=self.archive,
+            )
+            elapsed = self.clock() - chunk_started_at
+
+            report.chunks += 1
+            report.purged += purged
+            report.last_chunk_seconds = elapsed
+            report.max_chunk_seconds = max(report.max_chunk_seconds, elapsed)
+            report.elapsed_seconds = self.clock() - started_at
+            if on_progress:
+                on_progress(report)
+
+            if purged < report.chunk_size:
+                break
+
+            report.chunk_size = self._next_chunk_size(
+                report.chunk_size, elapsed
+            )
+            await asyncio.sleep(self.pause_seconds)
+
+        report.elapsed_seconds = self.clock() - started_at
+        return report
+
+    async def run_periodically(
+        self,
+        stop: asyncio.Event,
+        interval_seconds: float = 300,
+        on_report: Callable[[PurgeReport], None] | None = None,
+    ) -> None:
+        """Executa a limpeza em segundo plano até `stop` ser sinalizado.
+
+        Args:
+            stop: Evento que encerra a execução
+            interval_seconds: Intervalo entre execuções
+            on_report: Chamado com o resumo de cada execução
+
+        """
+        while not stop.is_set():
+            report = await self.execute()
+            if on_report:
+                on_report(report)
+            try:
+                await asyncio.wait_for(stop.wait(), interval_seconds)
+            except TimeoutError:
+                pass
+
+    def _next_chunk_size(self, current: int, elapsed: float) -> int:
+        if elapsed > self.chunk_time_budget:
+            return max(1, current // 2)
+        if elapsed < self.chunk_time_budget / 2:
+            return min(self.chunk_size, current * 2)
+        return current
@@ -0,0 +1,88 @@
+"""Caso de uso para resgatar um desconto e emitir um cupom de retorno."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from ...domain.entities.discount import Discount
+from ...domain.repositories.unit_of_work import UnitOfWork
+from ...domain.services.discount_service import DiscountService
+from ...domain.value_objects.money import Money
+
+
+@dataclass(frozen=True)
+class Redemption:
+    """Resultado de um resgate."""
+
+    total: Money
+    reward: Discount | None = None
+
+
+class RedeemDiscountUseCase:
+    """Caso de uso para resgatar um desconto em uma única transação.
+
+    O resgate e, se configurado, a criação de um cupom de retorno para a
+    próxima compra são gravados juntos pela unidade de trabalho: ambos
+    são confirmados ou nenhum deles é.
+    """
+
+    def __init__(
+        self,
+        unit_of_work: Callable[[], UnitOfWork],
+        reward_percentage: float | None = None,
+        reward_validity: timedelta = timedelta(days=30),
+    ):
+        """Inicializa o caso de uso.
+
+        Args:
+            unit_of_work: Fábrica de unidades de trabalho, uma por execução
+            reward_percentage: Percentual do cupom de retorno (padrão: não
+                emite cupom)
+            reward_validity: Validade do cupom de retorno
+
+        """
+        self.unit_of_work = unit_of_work
+        self.reward_percentage = reward_percentage
+        self.reward_validity = reward_validity
+
+    async def execute(
+        self,
+        cart_total: Money,
+        discount_id: UUID,
+        reward_code: str | None = None,
+    ) -> Redemption:
+        """Resgata o desconto e emite o cupom de retorno.
+
+        Args:
+            cart_total: Valor total do carrinho
+            discount_id: ID do desconto resgatado
+            reward_code: Código do cupom de retorno; obrigatório para
+                emiti-lo quando `reward_percentage` está configurado
+
+        Returns:
+            Valor com desconto e o cupom de retorno, se emitido
+
+        Raises:
+            ValueError: Se o desconto não existir ou não puder ser usado
+
+        """
+        async with self.unit_of_work() as uow:
+            service = DiscountService(uow.discounts)
+            total = await service.apply_discount_to_cart(
+                cart_total, discount_id
+            )
+
+            reward = None
+            if self.reward_percentage and reward_code:
+                reward = await service.create_percentage_discount(
+                    self.reward_percentage,
+                    reward_code,
+                    'Cupom de retorno',
+                    valid_until=datetime.now() + self.reward_validity,
+                    max_usage_count=1,
+                )
+
+            await uow.commit()
+
+        return Redemption(total, reward)
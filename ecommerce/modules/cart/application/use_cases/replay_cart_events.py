@@ -0,0 +1,405 @@
+"""Caso de uso para reprecificar carrinhos a partir de um log de eventos."""
+
+import copy
+import multiprocessing
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from ...domain.entities.cart import Cart
+from ...domain.entities.cart_item import CartItem
+from ...domain.entities.discount import Discount
+from ...domain.services.cart_pricing_service import CartPricingService
+from ...domain.services.discount_eligibility_index import (
+    DiscountEligibilityIndex,
+)
+from .cart_event_log import (
+    ADD_ITEM,
+    APPLY_COUPON,
+    CHECKOUT,
+    SET_QUANTITY,
+    CartEvent,
+    read_events,
+)
+
+
+@dataclass
+class ScenarioResult:
+    """Resultado acumulado de um catálogo de descontos."""
+
+    revenue: Decimal = Decimal(0)
+    discount_total: Decimal = Decimal(0)
+    discounted_orders: int = 0
+    coupons_applied: int = 0
+    coupons_rejected: int = 0
+    promotions_applied: int = 0
+
+    def merge(self, other: 'ScenarioResult') -> None:
+        """Acumula o resultado de outra partição."""
+        self.revenue += other.revenue
+        self.discount_total += other.discount_total
+        self.discounted_orders += other.discounted_orders
+        self.coupons_applied += other.coupons_applied
+        self.coupons_rejected += other.coupons_rejected
+        self.promotions_applied += other.promotions_applied
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta o resultado para um dicionário serializável em JSON."""
+        return {
+            'revenue': str(self.revenue),
+            'discount_total': str(self.discount_total),
+            'discounted_orders': self.discounted_orders,
+            'coupons_applied': self.coupons_applied,
+            'coupons_rejected': self.coupons_rejected,
+            'promotions_applied': self.promotions_applied,
+        }
+
+
+@dataclass
+class ReplayReport:
+    """Resultado de uma reprodução de eventos."""
+
+    events: int = 0
+    checkouts: int = 0
+    gross_revenue: Decimal = Decimal(0)
+    orphan_checkouts: int = 0
+    evicted_carts: int = 0
+    abandoned_carts: int = 0
+    elapsed_seconds: float = 0.0
+    scenarios: dict[str, ScenarioResult] = field(default_factory=dict)
+
+    @property
+    def events_per_second(self) -> float:
+        """Vazão da reprodução."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.events / self.elapsed_seconds
+
+    def merge(self, other: 'ReplayReport') -> None:
+        """Acumula o relatório de outra partição, exceto o tempo."""
+        self.events += other.events
+        self.checkouts += other.checkouts
+        self.gross_revenue += other.gross_revenue
+        self.orphan_checkouts += other.orphan_checkouts
+        self.evicted_carts += other.evicted_carts
+        self.abandoned_carts += other.abandoned_carts
+        for name, result in other.scenarios.items():
+            self.scenarios.setdefault(name, ScenarioResult()).merge(result)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta o relatório para um dicionário serializável em JSON."""
+        return {
+            'events': self.events,
+            'checkouts': self.checkouts,
+            'gross_revenue': str(self.gross_revenue),
+            'orphan_checkouts': self.orphan_checkouts,
+            'evicted_carts': self.evicted_carts,
+            'abandoned_carts': self.abandoned_carts,
+            'elapsed_seconds': self.elapsed_seconds,
+            'events_per_second': self.events_per_second,
+            'scenarios': {
+                name: result.to_dict()
+                for name, result in self.scenarios.items()
+            },
+        }
+
+
+class _OpenCart:
+    """Estado mínimo de um carrinho ainda não finalizado."""
+
+    __slots__ = ('created_at', 'items', 'codes')
+
+    def __init__(self, created_at: datetime):
+        self.created_at = created_at
+        # produto -> [quantidade, preço unitário]
+        self.items: dict[UUID, list] = {}
+        self.codes: list[str] = []
+
+
+class _Scenario:
+    """Descontos de um catálogo, separados pela forma de aplicação."""
+
+    __slots__ = (
+        'coupons',
+        'automatic',
+        'promotions',
+        'discounts',
+        'pricing_service',
+        'result',
+    )
+
+    def __init__(self, discounts: list[Discount], currency: str):
+        discounts = copy.deepcopy(discounts)
+        # Descontos com código valem quando o cupom é aplicado; os sem
+        # código valem para todo carrinho, por linha se forem direcionados
+        self.coupons = {d.code: d for d in discounts if d.code}
+        self.automatic = [
+            d for d in discounts if not d.code and not d.is_targeted
+        ]
+        self.promotions = DiscountEligibilityIndex(
+            d for d in discounts if not d.code and d.is_targeted
+        )
+        self.discounts = {d.id: d for d in discounts}
+        self.pricing_service = CartPricingService(
+            currency, promotions=self.promotions
+        )
+        self.result = ScenarioResult()
+
+
+class ReplayCartEventsUseCase:
+    """Caso de uso para comparar catálogos de descontos sobre eventos reais.
+
+    Os eventos são consumidos em fluxo e apenas os carrinhos abertos ficam
+    em memória, limitados a `max_open_carts`: ao passar do limite, o
+    carrinho sem atividade há mais tempo é descartado e contado em
+    `evicted_carts`, e um checkout posterior dele conta como órfão. Cada
+    checkout monta um `Cart` com os cupons aplicados e o precifica com o
+    `CartPricingService` no instante do evento, uma vez por catálogo.
+
+    Descontos sem código são promoções automáticas do catálogo: os
+    direcionados entram no `DiscountEligibilityIndex` do cenário e os
+    demais são aplicados a todo carrinho, antes dos cupons. Os eventos
+    não registram a categoria dos produtos, de modo que apenas os alvos
+    por produto são considerados.
+
+    Os limites de uso dos descontos são contados a partir de zero em cada
+    catálogo. Na reprodução particionada, cada processo conta os usos das
+    suas partições: um desconto com limite pode ser aplicado até o limite
+    em cada partição.
+    """
+
+    def __init__(
+        self,
+        catalogs: dict[str, list[Discount]],
+        currency: str = 'BRL',
+        max_open_carts: int = 1_000_000,
+    ):
+        """Inicializa o caso de uso.
+
+        Args:
+            catalogs: Descontos de cada cenário, pelo nome do cenário
+            currency: Moeda dos preços registrados nos eventos
+            max_open_carts: Quantidade máxima de carrinhos em memória
+
+        """
+        if max_open_carts <= 0:
+            raise ValueError('Limite de carrinhos deve ser maior que zero')
+
+        self.catalogs = catalogs
+        self.currency = currency
+        self.max_open_carts = max_open_carts
+
+    def execute(self, events: Iterable[CartEvent]) -> ReplayReport:
+        """Reproduz os eventos e acumula o resultado de cada catálogo.
+
+        Args:
+            events: Eventos em ordem cronológica
+
+        Returns:
+            Relatório da reprodução
+
+        """
+        started_at = time.perf_counter()
+        scenarios = {
+            name: _Scenario(discounts, self.currency)
+            for name, discounts in self.catalogs.items()
+        }
+        report = ReplayReport(
+            scenarios={
+                name: scenario.result for name, scenario in scenarios.items()
+            }
+        )
+        open_carts: OrderedDict[UUID, _OpenCart] = OrderedDict()
+        max_open_carts = self.max_open_carts
+
+        for event in events:
+            report.events += 1
+            kind = event.kind
+
+            if kind == CHECKOUT:
+                cart = open_carts.pop(event.cart_id, None)
+                if cart is None:
+                    report.orphan_checkouts += 1
+                else:
+                    self._checkout(event, cart, scenarios, report)
+                continue
+
+            cart = open_carts.get(event.cart_id)
+            if cart is None:
+                cart = open_carts[event.cart_id] = _OpenCart(event.timestamp)
+                if len(open_carts) > max_open_carts:
+                    open_carts.popitem(last=False)
+                    report.evicted_carts += 1
+            else:
+                open_carts.move_to_end(event.cart_id)
+
+            if kind == ADD_ITEM:
+                line = cart.items.get(event.product_id)
+                if line is None:
+                    cart.items[event.product_id] = [
+                        event.quantity,
+                        event.price,
+                    ]
+                else:
+                    line[0] += event.quantity
+            elif kind == SET_QUANTITY:
+                line = cart.items.get(event.product_id)
+                if event.quantity <= 0:
+                    cart.items.pop(event.product_id, None)
+                elif line is not None:
+                    line[0] = event.quantity
+            elif kind == APPLY_COUPON:
+                if event.code not in cart.codes:
+                    cart.codes.append(event.code)
+
+        report.abandoned_carts = len(open_carts)
+        report.elapsed_seconds = time.perf_counter() - started_at
+        return report
+
+    def execute_file(
+        self,
+        path: str,
+        file_format: str | None = None,
+        processes: int = 1,
+    ) -> ReplayReport:
+        """Reproduz um log de eventos, particionado por carrinho.
+
+        Com mais de um processo, cada um lê o arquivo inteiro, mas monta
+        apenas os eventos dos carrinhos da sua partição; os relatórios são
+        somados ao final.
+
+        Args:
+            path: Arquivo do log
+            file_format: 'jsonl' ou 'binary' (padrão: deduzido da extensão)
+            processes: Quantidade de processos
+
+        Returns:
+            Relatório da reprodução
+
+        """
+        if processes <= 1:
+            return self.execute(read_events(path, file_format))
+
+        started_at = time.perf_counter()
+        with ProcessPoolExecutor(
+            processes, mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            futures = [
+                executor.submit(
+                    replay_shard,
+                    self.catalogs,
+                    self.currency,
+                    self.max_open_carts,
+                    path,
+                    file_format,
+                    shard,
+                    processes,
+                )
+                for shard in range(processes)
+            ]
+            report = ReplayReport()
+            for future in futures:
+                report.merge(future.result())
+
+        report.elapsed_seconds = time.perf_counter() - started_at
+        return report
+
+    def _checkout(
+        self,
+        event: CartEvent,
+        open_cart: _OpenCart,
+        scenarios: dict[str, _Scenario],
+        report: ReplayReport,
+    ) -> None:
+        """Precifica o carrinho finalizado em cada catálogo.
+
+        Catálogos sem promoções e sem nenhum dos cupons aplicados ao
+        carrinho não alteram o subtotal; apenas os demais passam pelo
+        `CartPricingService`.
+        """
+        subtotal = sum(
+            (price * quantity for quantity, price in open_cart.items.values()),
+            Decimal(0),
+        )
+        report.checkouts += 1
+        report.gross_revenue += subtotal
+
+        cart = None
+        codes = open_cart.codes
+        for scenario in scenarios.values():
+            result = scenario.result
+            coupons = [
+                scenario.coupons[code]
+                for code in codes
+                if code in scenario.coupons
+            ]
+            if (
+                not coupons
+                and not scenario.automatic
+                and not scenario.promotions
+            ):
+                result.revenue += subtotal
+                result.coupons_rejected += len(codes)
+                continue
+
+            if cart is None:
+                cart = self._build_cart(event, open_cart)
+            cart.discounts = [*scenario.automatic, *coupons]
+            pricing = scenario.pricing_service.compute(cart, event.timestamp)
+
+            applied = pricing.applied_discount_ids
+            for discount_id in applied:
+                scenario.discounts[discount_id].use()
+            coupons_applied = sum(
+                1 for discount in coupons if discount.id in applied
+            )
+
+            result.revenue += pricing.total.amount
+            result.discount_total += pricing.discount_total.amount
+            result.coupons_applied += coupons_applied
+            result.coupons_rejected += len(codes) - coupons_applied
+            result.promotions_applied += len(applied) - coupons_applied
+            if applied:
+                result.discounted_orders += 1
+
+    @staticmethod
+    def _build_cart(event: CartEvent, open_cart: _OpenCart) -> Cart:
+        """Monta a entidade do carrinho finalizado, ainda sem descontos."""
+        now = event.timestamp
+        return Cart(
+            id=event.cart_id,
+            items=[
+                CartItem(
+                    cart_id=event.cart_id,
+                    product_id=product_id,
+                    quantity=quantity,
+                    id=product_id,
+                    price=price,
+                    added_at=open_cart.created_at,
+                    updated_at=now,
+                )
+                for product_id, (quantity, price) in open_cart.items.items()
+            ],
+            created_at=open_cart.created_at,
+            updated_at=now,
+        )
+
+
+def replay_shard(
+    catalogs: dict[str, list[Discount]],
+    currency: str,
+    max_open_carts: int,
+    path: str,
+    file_format: str | None,
+    shard: int,
+    shards: int,
+) -> ReplayReport:
+    """Reproduz uma partição do log; executado em um processo separado."""
+    use_case = ReplayCartEventsUseCase(catalogs, currency, max_open_carts)
+    return use_case.execute(read_events(path, file_format, shard, shards))
@@ -0,0 +1,284 @@
+"""Caso de uso para simular carga concorrente de validação e resgate."""
+
+import asyncio
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from ...domain.entities.discount import Discount, DiscountType
+from ...domain.services.discount_service import DiscountService
+from ...domain.value_objects.money import Money
+
+VALID = 'valid'
+UNKNOWN = 'unknown'
+HOT = 'hot'
+EXPIRING = 'expiring'
+
+PERCENTILES = (50, 95, 99, 99.9)
+
+
+@dataclass(frozen=True)
+class TrafficMix:
+    """Pesos relativos de cada tipo de requisição."""
+
+    valid: float = 0.6
+    unknown: float = 0.15
+    hot: float = 0.15
+    expiring: float = 0.1
+
+    def choices(self) -> tuple[list[str], list[float]]:
+        """Retorna os tipos de requisição e seus pesos."""
+        return (
+            [VALID, UNKNOWN, HOT, EXPIRING],
+            [self.valid, self.unknown, self.hot, self.expiring],
+        )
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """Configuração de uma simulação de carga."""
+
+    concurrency: int = 2000
+    requests: int = 20_000
+    mix: TrafficMix = field(default_factory=TrafficMix)
+    valid_coupons: int = 1000
+    hot_coupon_limit: int = 100
+    expiring_coupons: int = 100
+    expiring_after_seconds: float = 0.5
+    order_value: Decimal = Decimal('200')
+    seed: int = 0
+
+
+@dataclass
+class LoadReport:
+    """Resultado de uma simulação de carga."""
+
+    requests: int = 0
+    elapsed_seconds: float = 0.0
+    throughput: float = 0.0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    outcomes: dict[str, int] = field(default_factory=dict)
+    requests_by_kind: dict[str, int] = field(default_factory=dict)
+    errors: dict[str, int] = field(default_factory=dict)
+    over_redemptions: int = 0
+    lost_usage_updates: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta o relatório para um dicionário serializável em JSON."""
+        return asdict(self)
+
+
+def percentile(sorted_values: list[float], rank: float) -> float:
+    """Calcula um percentil pelo método do posto mais próximo.
+
+    Args:
+        sorted_values: Valores em ordem crescente
+        rank: Percentil desejado, entre 0 e 100
+
+    Returns:
+        Valor do percentil ou 0 se não houver valores
+
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, -(-len(sorted_values) * rank // 100) - 1)
+    return sorted_values[min(int(index), len(sorted_values) - 1)]
+
+
+class SimulateDiscountLoadUseCase:
+    """Caso de uso para medir o `DiscountService` sob carga concorrente.
+
+    Cada requisição valida um código de cupom e, se ele for aceito,
+    resgata o desconto, como em um checkout. As requisições são
+    distribuídas entre milhares de tarefas asyncio simultâneas, segundo a
+    combinação de tráfego do perfil: cupons válidos, códigos
+    inexistentes, um único cupom disputado com limite de uso e cupons que
+    expiram durante a simulação.
+    """
+
+    def __init__(self, discount_service: DiscountService):
+        """Inicializa o caso de uso.
+
+        Args:
+            discount_service: Serviço de descontos sob teste
+
+        """
+        self.discount_service = discount_service
+
+    async def execute(self, profile: LoadProfile) -> LoadReport:
+        """Cadastra os cupons do perfil e executa a simulação.
+
+        Args:
+            profile: Configuração da simulação
+
+        Returns:
+            Relatório com vazão, latências, erros e violações
+
+        """
+        if profile.concurrency <= 0 or profile.requests <= 0:
+            raise ValueError('Concorrência e requisições devem ser positivas')
+
+        catalog = await self._seed(profile)
+        limited = {
+            discount.id: discount.max_usage_count
+            for discounts in catalog.values()
+            for discount in discounts
+            if discount.max_usage_count
+        }
+
+        rng = random.Random(profile.seed)
+        kinds, weights = profile.mix.choices()
+        plan = rng.choices(kinds, weights, k=profile.requests)
+        codes = [
+            self._code_for(kind, catalog, rng, index)
+            for index, kind in enumerate(plan)
+        ]
+
+        order_value = Money(profile.order_value)
+        latencies: list[float] = []
+        outcomes: Counter[str] = Counter()
+        errors: Counter[str] = Counter()
+        redemptions: Counter[UUID] = Counter()
+        cursor = iter(range(profile.requests))
+
+        async def worker() -> None:
+            for index in cursor:
+                started_at = time.perf_counter()
+                try:
+                    outcome = await self._checkout(
+                        codes[index], order_value, redemptions
+                    )
+                except Exception as error:
+                    outcome = 'error'
+                    errors[type(error).__name__] += 1
+                latencies.append(time.perf_counter() - started_at)
+                outcomes[outcome] += 1
+
+        started_at = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(profile.concurrency)))
+        elapsed = time.perf_counter() - started_at
+
+        over_redemptions, lost_updates = await self._check_redemptions(
+            limited, redemptions
+        )
+
+        latencies.sort()
+        return LoadReport(
+            requests=profile.requests,
+            elapsed_seconds=elapsed,
+            throughput=profile.requests / elapsed if elapsed > 0 else 0.0,
+            latency_ms={
+                f'p{rank:g}'.replace('.', ''): percentile(latencies, rank)
+                * 1000
+                for rank in PERCENTILES
+            },
+            outcomes=dict(outcomes),
+            requests_by_kind=dict(Counter(plan)),
+            errors=dict(errors),
+            over_redemptions=over_redemptions,
+            lost_usage_updates=lost_updates,
+        )
+
+    async def _seed(self, profile: LoadProfile) -> dict[str, list[Discount]]:
+        """Cadastra os cupons usados pela simulação."""
+        now = datetime.now()
+        catalog = {
+            VALID: [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(10),
+                    code=f'LOAD-VALID-{index}',
+                    valid_from=now - timedelta(days=1),
+                )
+                for index in range(profile.valid_coupons)
+            ],
+            HOT: [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(50),
+                    code='LOAD-HOT',
+                    valid_from=now - timedelta(days=1),
+                    max_usage_count=profile.hot_coupon_limit,
+                )
+            ],
+            EXPIRING: [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(20),
+                    code=f'LOAD-EXPIRING-{index}',
+                    valid_from=now - timedelta(days=1),
+                    valid_until=now
+                    + timedelta(seconds=profile.expiring_after_seconds),
+                )
+                for index in range(profile.expiring_coupons)
+            ],
+        }
+
+        for discounts in catalog.values():
+            await self.discount_service.save_discounts(discounts)
+        return catalog
+
+    def _code_for(
+        self,
+        kind: str,
+        catalog: dict[str, list[Discount]],
+        rng: random.Random,
+        index: int,
+    ) -> str:
+        if kind == UNKNOWN:
+            return f'LOAD-UNKNOWN-{index}'
+        return rng.choice(catalog[kind]).code
+
+    async def _checkout(
+        self,
+        code: str,
+        order_value: Money,
+        redemptions: Counter[UUID],
+    ) -> str:
+        """Valida o cupom e, se aceito, resgata o desconto."""
+        discount = await self.discount_service.validate_coupon_code(
+            code, order_value
+        )
+        if discount is None:
+            return 'rejected'
+
+        try:
+            await self.discount_service.apply_discount_to_cart(
+                order_value, discount.id
+            )
+        except ValueError:
+            # O cupom deixou de ser válido entre a validação e o resgate
+            return 'rejected_on_redeem'
+
+        redemptions[discount.id] += 1
+        return 'redeemed'
+
+    async def _check_redemptions(
+        self,
+        limited: dict[UUID, int],
+        redemptions: Counter[UUID],
+    ) -> tuple[int, int]:
+        """Compara os resgates concedidos com os limites e com o estoque.
+
+        Returns:
+            Resgates concedidos acima do limite de uso e resgates que não
+            aparecem no contador de uso persistido
+
+        """
+        over_redemptions = 0
+        for discount_id, limit in limited.items():
+            over_redemptions += max(0, redemptions[discount_id] - limit)
+
+        lost_updates = 0
+        for discount_id, granted in redemptions.items():
+            stored = await self.discount_service.discount_repository.get_by_id(
+                discount_id
+            )
+            lost_updates += max(0, granted - stored.current_usage_count)
+
+        return over_redemptions, lost_updates
@@ -1,5 +1,6 @@
 """Entities for the cart module."""
 
 from .cart import Cart, CartItem, Discount
+from .discount import DiscountType
 
-__all__ = ['Cart', 'CartItem', 'Discount']
+__all__ = ['Cart', 'CartItem', 'Discount', 'DiscountType']
@@ -16,3 +16,4 @@ class CartItem:
     price: float = 0.0
     added_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
+    category_id: UUID | None = None
@@ -1,11 +1,22 @@
 """Entities for the cart module."""
 
+import threading
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum, auto
+from typing import TYPE_CHECKING
 from uuid import UUID, uuid4
 
-from ecommerce.modules.cart.domain.value_objects import Money
+from ecommerce.modules.cart.domain.value_objects import Money, RateSnapshot
+
+if TYPE_CHECKING:
+    from ..services.currency_conversion_service import (
+        CurrencyConversionService,
+    )
+
+# Travas compartilhadas pelos contadores de uso, escolhidas pelo ID do
+# desconto; uma trava por instância impediria copiar e comparar descontos
+_USAGE_LOCKS = tuple(threading.Lock() for _ in range(64))
 
 
 class DiscountType(Enum):
@@ -16,7 +27,7 @@ class DiscountType(Enum):
     COUPON = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Discount:
     """Entity for the discount."""
 
@@ -25,24 +36,58 @@ class Discount:
     id: UUID = field(default_factory=uuid4)
     code: str | None = None
     description: str = ''
-    minimum_order_value: Money = field(default_factory=lambda: Money(0))
-    maximum_discount_amount: Money = field(default_factory=lambda: Money(0))
+    minimum_order_value: Money = field(default_factory=Money.zero)
+    maximum_discount_amount: Money = field(default_factory=Money.zero)
     valid_from: datetime = field(default_factory=datetime.now)
     valid_until: datetime | None = None
     max_usage_count: int | None = None
     current_usage_count: int = 0
+    # Sem produtos nem categorias, o desconto vale para o pedido inteiro
+    product_ids: frozenset[UUID] = frozenset()
+    category_ids: frozenset[UUID] = frozenset()
+    _converted_minimums: dict[str, tuple[RateSnapshot, Money, Money]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def is_targeted(self) -> bool:
+        """Indica se o desconto vale apenas para produtos ou categorias."""
+        return bool(self.product_ids or self.category_ids)
+
+    def targets(self, product_id: UUID, category_id: UUID | None) -> bool:
+        """Verifica se o desconto direcionado vale para um item.
+
+        Args:
+            product_id: Produto do item
+            category_id: Categoria do produto, se conhecida
+
+        Returns:
+            True se o produto ou a sua categoria forem alvos do desconto
 
-    def is_valid(self, order_value: Money) -> bool:
+        """
+        return product_id in self.product_ids or (
+            category_id is not None and category_id in self.category_ids
+        )
+
+    def is_valid(
+        self,
+        order_value: Money,
+        converter: 'CurrencyConversionService | None' = None,
+        now: datetime | None = None,
+    ) -> bool:
         """Verifica se o desconto é válido para o pedido atual.
 
         Args:
             order_value: Valor do pedido a ser verificado
+            converter: Serviço de câmbio usado quando o pedido está em
+                moeda diferente do valor mínimo do desconto
+            now: Instante da verificação (padrão: agora)
 
         Returns:
             True se o desconto for válido, False caso contrário
 
         """
-        now = datetime.now()
+        now = now or datetime.now()
 
         # Verificar validade temporal
         if now < self.valid_from:
@@ -59,17 +104,107 @@ class Discount:
             return False
 
         # Verificar valor mínimo do pedido
-        if order_value < self.minimum_order_value:
+        minimum_order_value = self.minimum_order_value
+        if converter and order_value.currency != minimum_order_value.currency:
+            minimum_order_value = self.minimum_order_value_in(
+                order_value.currency, converter
+            )
+
+        if order_value < minimum_order_value:
             return False
 
         return True
 
-    def apply_to(self, order_value: Money) -> Money:
+    def minimum_order_value_in(
+        self, currency: str, converter: 'CurrencyConversionService'
+    ) -> Money:
+        """Retorna o valor mínimo do pedido convertido para outra moeda.
+
+        O resultado fica guardado no próprio desconto por moeda, junto
+        com a tabela de câmbio e o valor mínimo usados na conversão; ele
+        só é reaproveitado enquanto a tabela vigente do serviço for a
+        mesma e o valor mínimo não tiver sido alterado.
+
+        Args:
+            currency: Moeda de destino
+            converter: Serviço de câmbio
+
+        Returns:
+            Valor mínimo na moeda informada
+
+        """
+        snapshot = converter.snapshot()
+        minimum = self.minimum_order_value
+        entry = self._converted_minimums.get(currency)
+        if entry is not None and entry[0] is snapshot and entry[1] == minimum:
+            return entry[2]
+
+        converted = converter.convert(minimum, currency, snapshot.version)
+        self._converted_minimums[currency] = (snapshot, minimum, converted)
+        return converted
+
+    def apply_to(
+        self,
+        order_value: Money,
+        converter: 'CurrencyConversionService | None' = None,
+    ) -> Money:
         """Apply the discount to the order value."""
-        result = order_value
+        if not self.is_valid(order_value, converter):
+            return order_value
+
+        result = self.discounted_value(order_value, converter)
 
-        if not self.is_valid(order_value):
-            return result
+        if self.max_usage_count:
+            self.use()
+
+        return result
+
+    def calculate(
+        self,
+        order_value: Money,
+        converter: 'CurrencyConversionService | None' = None,
+        now: datetime | None = None,
+    ) -> Money:
+        """Calcula o valor com desconto sem registrar o uso.
+
+        Usado para precificação e simulações, em que o desconto é apenas
+        avaliado e não efetivamente resgatado.
+
+        Args:
+            order_value: Valor do pedido
+            converter: Serviço de câmbio para pedidos em outra moeda
+            now: Instante da avaliação (padrão: agora)
+
+        Returns:
+            Valor do pedido com o desconto, ou o próprio valor do pedido
+            se o desconto não for válido
+
+        """
+        if not self.is_valid(order_value, converter, now):
+            return order_value
+
+        return self.discounted_value(order_value, converter)
+
+    def discounted_value(
+        self,
+        order_value: Money,
+        converter: 'CurrencyConversionService | None' = None,
+    ) -> Money:
+        """Calcula o valor com desconto sem verificar a validade.
+
+        Útil quando a elegibilidade já foi verificada sobre outro valor,
+        como o subtotal do carrinho, e o desconto é aplicado sobre o
+        total parcial resultante de descontos anteriores.
+
+        Args:
+            order_value: Valor sobre o qual o desconto é aplicado
+            converter: Serviço de câmbio para pedidos em outra moeda
+
+        Returns:
+            Valor com o desconto aplicado
+
+        """
+        result = order_value
 
         if self.type == DiscountType.PERCENTAGE:
             # Calcular desconto percentual
@@ -84,24 +219,56 @@ class Discount:
                     order_value.amount - self.maximum_discount_amount.amount
                 )
 
-            result = Money(discount_value)
+            result = Money(discount_value, order_value.currency)
 
         elif self.type == DiscountType.FIXED_AMOUNT:
             # Retornar valor fixo, limitado ao valor do pedido
-            fixed_amount = min(self.value.amount, order_value.amount)
+            value = self._value_in(order_value.currency, converter)
+            fixed_amount = min(value.amount, order_value.amount)
             discount_value = order_value.amount - fixed_amount
-            result = Money(discount_value)
+            result = Money(discount_value, order_value.currency)
 
         elif self.type == DiscountType.COUPON:
             # Lógica para cupons especiais pode ser mais complexa
             # Por simplicidade, tratamos como um desconto fixo
-            result = Money(min(self.value.amount, order_value.amount))
-
-        if self.max_usage_count:
-            self.use()
+            value = self._value_in(order_value.currency, converter)
+            result = Money(
+                min(value.amount, order_value.amount), order_value.currency
+            )
 
         return result
 
+    def _value_in(
+        self, currency: str, converter: 'CurrencyConversionService | None'
+    ) -> Money:
+        """Retorna o valor fixo do desconto na moeda do pedido."""
+        if converter and self.value.currency != currency:
+            return converter.convert(self.value, currency)
+        return self.value
+
     def use(self) -> None:
         """Registra o uso do desconto, incrementando o contador de uso."""
-        self.current_usage_count += 1
+        with self._usage_lock():
+            self.current_usage_count += 1
+
+    def try_use(self) -> bool:
+        """Registra o uso apenas se o limite de uso não foi atingido.
+
+        A verificação e o incremento são atômicos entre threads que
+        compartilham esta instância.
+
+        Returns:
+            True se o uso foi registrado, False se o desconto está esgotado
+
+        """
+        with self._usage_lock():
+            if (
+                self.max_usage_count
+                and self.current_usage_count >= self.max_usage_count
+            ):
+                return False
+            self.current_usage_count += 1
+            return True
+
+    def _usage_lock(self) -> threading.Lock:
+        return _USAGE_LOCKS[hash(self.id) % len(_USAGE_LOCKS)]
@@ -0,0 +1,26 @@
+"""Interface do repositório de carrinhos."""
+
+from typing import Protocol
+from uuid import UUID
+
+from ..entities.cart import Cart
+
+
+class CartRepository(Protocol):
+    """Repository for the cart entity."""
+
+    async def get_by_id(self, cart_id: UUID) -> Cart | None:
+        """Retorna um carrinho, com seus itens, pelo seu ID."""
+        ...
+
+    async def get_by_session_id(self, session_id: str) -> Cart | None:
+        """Retorna o carrinho associado a uma sessão anônima."""
+        ...
+
+    async def save(self, cart: Cart) -> Cart:
+        """Salva um carrinho, gravando apenas os itens alterados."""
+        ...
+
+    async def delete(self, cart_id: UUID) -> None:
+        """Exclui um carrinho e seus itens pelo ID do carrinho."""
+        ...
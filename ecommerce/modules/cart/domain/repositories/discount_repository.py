@@ -1,9 +1,14 @@
 """Interface do repositório de descontos."""
 
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime
 from typing import Protocol
 from uuid import UUID
 
 from ..entities.discount import Discount
+from ..value_objects.money import Money
 
 
 class DiscountRepository(Protocol):
@@ -21,10 +26,36 @@ class DiscountRepository(Protocol):
         """Salva um desconto."""
         ...
 
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Salva um lote de descontos de uma só vez."""
+        ...
+
     async def delete(self, discount_id: UUID) -> None:
         """Exclui um desconto pelo seu ID."""
         ...
 
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Exclui um lote de descontos de uma só vez."""
+        ...
+
     async def list(self) -> list[Discount]:
         """Lista todos os descontos."""
         ...
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos pelo início do código, sem distinção de caixa."""
+        ...
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos, opcionalmente até um valor mínimo."""
+        ...
+
+    def stream(self, batch_size: int = 1000) -> AsyncIterator[list[Discount]]:
+        """Percorre todos os descontos em lotes, sem materializá-los."""
+        ...
@@ -0,0 +1,39 @@
+"""Interface da unidade de trabalho."""
+
+from __future__ import annotations
+
+from types import TracebackType
+from typing import Protocol
+
+from .discount_repository import DiscountRepository
+
+
+class UnitOfWork(Protocol):
+    """Agrupa as gravações de um caso de uso em uma única transação.
+
+    As gravações feitas por `discounts` ficam pendentes até `commit`;
+    sair do bloco `async with` sem confirmar descarta todas elas.
+    """
+
+    discounts: DiscountRepository
+
+    async def __aenter__(self) -> UnitOfWork:
+        """Inicia a unidade de trabalho."""
+        ...
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Encerra a unidade, descartando o que não foi confirmado."""
+        ...
+
+    async def commit(self) -> None:
+        """Grava as alterações pendentes de uma só vez e as confirma."""
+        ...
+
+    async def rollback(self) -> None:
+        """Descarta as alterações pendentes."""
+        ...
@@ -0,0 +1,196 @@
+"""Services for pricing carts."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from ..entities.cart import Cart
+from ..entities.cart_item import CartItem
+from ..entities.discount import Discount, DiscountType
+from ..value_objects import Money
+from .discount_eligibility_index import DiscountEligibilityIndex
+from .pricing_cache import PricingCache
+
+
+@dataclass(frozen=True)
+class CartPricing:
+    """Resultado imutável da precificação de um carrinho."""
+
+    subtotal: Money
+    total: Money
+    applied_discount_ids: tuple[UUID, ...] = ()
+    valid_until: datetime | None = None
+
+    @property
+    def discount_total(self) -> Money:
+        """Valor total abatido pelos descontos."""
+        return self.subtotal - self.total
+
+
+class CartPricingService:
+    """Service for pricing carts.
+
+    Soma as linhas do carrinho e aplica, em ordem, os descontos associados
+    a ele cujo valor mínimo é atendido pelo subtotal, sem registrar uso
+    dos descontos. Com um `PricingCache`, carrinhos com o mesmo conteúdo
+    compartilham um único resultado.
+
+    Descontos direcionados a produtos ou categorias são aplicados antes,
+    sobre o total de cada linha que atingem; um desconto de valor fixo
+    abate o valor uma vez por linha, e o teto de um desconto percentual
+    vale para a soma do que ele abate em todas as linhas. Além dos
+    associados ao carrinho, as promoções de um `DiscountEligibilityIndex`
+    valem para qualquer carrinho com os produtos alvo; alterá-las deve
+    mudar a versão do catálogo usada pelo cache.
+    """
+
+    def __init__(
+        self,
+        currency: str = 'BRL',
+        cache: PricingCache | None = None,
+        catalog_version: Callable[[], int] | None = None,
+        promotions: DiscountEligibilityIndex | None = None,
+    ):
+        """Initialize the cart pricing service.
+
+        Args:
+            currency: Moeda dos preços dos itens
+            cache: Cache compartilhado de resultados de precificação
+            catalog_version: Retorna a versão atual do catálogo de
+                descontos; obrigatório quando há cache
+            promotions: Descontos direcionados aplicados automaticamente
+                às linhas dos produtos e categorias alvo
+
+        """
+        if cache is not None and catalog_version is None:
+            raise ValueError('catalog_version é obrigatório com cache')
+
+        self.currency = currency
+        self.cache = cache
+        self.catalog_version = catalog_version
+        self.promotions = promotions
+
+    def price(self, cart: Cart, now: datetime | None = None) -> CartPricing:
+        """Calcula subtotal e total com descontos de um carrinho.
+
+        Args:
+            cart: Carrinho a ser precificado
+            now: Instante da precificação (padrão: agora)
+
+        Returns:
+            Resultado da precificação
+
+        """
+        now = now or datetime.now()
+        if self.cache is None:
+            return self.compute(cart, now)
+
+        return self.cache.get_or_compute(
+            cart,
+            self.catalog_version(),
+            now,
+            lambda: self.compute(cart, now),
+        )
+
+    def compute(self, cart: Cart, now: datetime | None = None) -> CartPricing:
+        """Precifica o carrinho do zero, sem consultar o cache.
+
+        Args:
+            cart: Carrinho a ser precificado
+            now: Instante da precificação (padrão: agora)
+
+        Returns:
+            Resultado da precificação
+
+        """
+        now = now or datetime.now()
+        currency = self.currency
+        lines = [
+            Money(item.price, currency) * item.quantity for item in cart.items
+        ]
+        subtotal = Money(0, currency)
+        for line in lines:
+            subtotal += line
+
+        targeted = [d for d in cart.discounts if d.is_targeted]
+        applied: dict[UUID, None] = {}
+        valid_until = None
+
+        def eligible(discount: Discount) -> bool:
+            nonlocal valid_until
+            boundary = _next_boundary(discount, now)
+            if boundary and (valid_until is None or boundary < valid_until):
+                valid_until = boundary
+
+            # A elegibilidade considera o subtotal; os descontos são
+            # aplicados em sequência sobre o total parcial
+            return discount.is_valid(subtotal, now=now)
+
+        total = subtotal
+        if targeted or self.promotions:
+            total = Money(0, currency)
+            # Parte ainda disponível do teto de cada desconto percentual
+            remaining: dict[UUID, Decimal] = {}
+            for item, line in zip(cart.items, lines, strict=True):
+                for discount in self._line_candidates(item, targeted):
+                    if eligible(discount):
+                        line = _discount_line(discount, line, remaining)
+                        applied[discount.id] = None
+                total += line
+
+        for discount in cart.discounts:
+            if not discount.is_targeted and eligible(discount):
+                total = discount.discounted_value(total)
+                applied[discount.id] = None
+
+        return CartPricing(
+            subtotal=subtotal,
+            total=total,
+            applied_discount_ids=tuple(applied),
+            valid_until=valid_until,
+        )
+
+    def _line_candidates(
+        self, item: CartItem, targeted: list[Discount]
+    ) -> tuple[Discount, ...] | list[Discount]:
+        """Descontos direcionados que atingem uma linha do carrinho."""
+        candidates = (
+            self.promotions.candidates(item.product_id, item.category_id)
+            if self.promotions
+            else ()
+        )
+        if not targeted:
+            return candidates
+        own = [
+            discount
+            for discount in targeted
+            if discount.targets(item.product_id, item.category_id)
+            and discount.id not in (self.promotions or ())
+        ]
+        return [*candidates, *own] if candidates else own
+
+
+def _discount_line(
+    discount: Discount, line: Money, remaining: dict[UUID, Decimal]
+) -> Money:
+    """Aplica um desconto direcionado a uma linha, dentro do seu teto."""
+    result = discount.discounted_value(line)
+    limit = discount.maximum_discount_amount.amount
+    if discount.type != DiscountType.PERCENTAGE or limit <= 0:
+        return result
+
+    left = remaining.get(discount.id, limit)
+    taken = min(line.amount - result.amount, left)
+    remaining[discount.id] = left - taken
+    return Money(line.amount - taken, line.currency)
+
+
+def _next_boundary(discount: Discount, now: datetime) -> datetime | None:
+    """Próximo instante em que a validade temporal do desconto muda."""
+    if now < discount.valid_from:
+        return discount.valid_from
+    if discount.valid_until and now <= discount.valid_until:
+        return discount.valid_until
+    return None
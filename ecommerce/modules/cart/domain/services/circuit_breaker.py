@@ -0,0 +1,117 @@
+"""Disjuntor para chamadas a um serviço que pode ficar lento ou falhar."""
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+@dataclass
+class CircuitBreakerStats:
+    """Contadores do disjuntor."""
+
+    successes: int = 0
+    failures: int = 0
+    rejected: int = 0
+    trips: int = 0
+
+
+class CircuitBreaker:
+    """Interrompe as chamadas após falhas consecutivas.
+
+    Fechado, o disjuntor deixa todas as chamadas passarem. Após
+    `failure_threshold` falhas seguidas, abre e recusa as chamadas
+    durante `reset_timeout` segundos; depois disso, fica meio aberto e
+    libera uma única chamada de teste por vez. Um sucesso no teste fecha
+    o disjuntor; uma falha o abre de novo. Um teste sem resultado
+    registrado, por exemplo cancelado, é substituído por outro após
+    `reset_timeout` segundos.
+
+    Quem chama decide o que conta como falha: erros, estouros de prazo ou
+    chamadas bem-sucedidas porém lentas.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Inicializa o disjuntor fechado.
+
+        Args:
+            failure_threshold: Falhas consecutivas que abrem o disjuntor
+            reset_timeout: Segundos aberto antes de testar de novo
+            clock: Relógio monotônico em segundos
+
+        """
+        if failure_threshold <= 0:
+            raise ValueError('failure_threshold deve ser maior que zero')
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+        self._stats = CircuitBreakerStats()
+
+    @property
+    def state(self) -> str:
+        """Estado atual: `CLOSED`, `OPEN` ou `HALF_OPEN`."""
+        if (
+            self._state == OPEN
+            and self.clock() - self._opened_at >= self.reset_timeout
+        ):
+            self._state = HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Indica se uma chamada pode ser feita agora.
+
+        No estado meio aberto, apenas a primeira chamada é liberada até que
+        o seu resultado seja registrado.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN:
+            now = self.clock()
+            probe = self._probe_started_at
+            if probe is None or now - probe >= self.reset_timeout:
+                self._probe_started_at = now
+                return True
+        self._stats.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """Registra uma chamada bem-sucedida, fechando o disjuntor."""
+        self._stats.successes += 1
+        self._consecutive_failures = 0
+        self._probe_started_at = None
+        self._state = CLOSED
+
+    def record_failure(self) -> None:
+        """Registra uma chamada com falha, abrindo o disjuntor se preciso."""
+        self._stats.failures += 1
+        self._consecutive_failures += 1
+        self._probe_started_at = None
+        if (
+            self._state == HALF_OPEN
+            or self._consecutive_failures >= self.failure_threshold
+        ):
+            if self._state != OPEN:
+                self._stats.trips += 1
+            self._state = OPEN
+            self._opened_at = self.clock()
+
+    @property
+    def stats(self) -> CircuitBreakerStats:
+        """Retorna uma cópia dos contadores atuais."""
+        return CircuitBreakerStats(**vars(self._stats))
@@ -0,0 +1,148 @@
+"""Services for currency conversion."""
+
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+from decimal import Decimal
+
+from ..value_objects import Money, RateSnapshot
+
+
+class CurrencyConversionService:
+    """Service for converting Money values between currencies.
+
+    Cada carga de cotações gera uma nova versão da tabela; as versões
+    mais recentes ficam disponíveis para consultas reprodutíveis e os
+    resultados de conversão são memorizados por versão.
+    """
+
+    def __init__(self, max_snapshots: int = 5, max_memo_entries: int = 10000):
+        """Initialize the currency conversion service.
+
+        Args:
+            max_snapshots: Quantidade de versões de tabela mantidas
+            max_memo_entries: Limite de conversões memorizadas por versão
+
+        """
+        self.max_snapshots = max_snapshots
+        self.max_memo_entries = max_memo_entries
+        self._snapshots: OrderedDict[int, RateSnapshot] = OrderedDict()
+        self._memo: dict[int, dict[tuple[Decimal, str, str], Money]] = {}
+        self._current: RateSnapshot | None = None
+
+    @property
+    def version(self) -> int:
+        """Versão da tabela de câmbio vigente (0 se nenhuma foi carregada)."""
+        return self._current.version if self._current else 0
+
+    def load_rates(
+        self,
+        base_currency: str,
+        rates: Mapping[str, Decimal | float | int | str],
+    ) -> RateSnapshot:
+        """Carrega uma nova tabela de câmbio e a torna vigente.
+
+        Args:
+            base_currency: Moeda de referência das cotações
+            rates: Unidades de cada moeda equivalentes a uma unidade da base
+
+        Returns:
+            A nova versão da tabela
+
+        """
+        snapshot = RateSnapshot.from_rates(
+            self.version + 1, base_currency, rates
+        )
+
+        self._snapshots[snapshot.version] = snapshot
+        self._memo[snapshot.version] = {}
+        while len(self._snapshots) > self.max_snapshots:
+            version, _ = self._snapshots.popitem(last=False)
+            self._memo.pop(version, None)
+
+        self._current = snapshot
+        return snapshot
+
+    def snapshot(self, version: int | None = None) -> RateSnapshot:
+        """Retorna uma versão da tabela de câmbio (a vigente por padrão).
+
+        Raises:
+            ValueError: Se a versão não estiver disponível
+
+        """
+        if version is None:
+            if self._current is None:
+                raise ValueError('Nenhuma tabela de câmbio carregada')
+            return self._current
+
+        snapshot = self._snapshots.get(version)
+        if snapshot is None:
+            raise ValueError(f'Versão de câmbio indisponível: {version}')
+        return snapshot
+
+    def convert(
+        self, money: Money, currency: str, version: int | None = None
+    ) -> Money:
+        """Converta um valor monetário para outra moeda.
+
+        Args:
+            money: Valor a ser convertido
+            currency: Moeda de destino
+            version: Versão da tabela (a vigente por padrão)
+
+        Returns:
+            Valor convertido, arredondado para centavos
+
+        """
+        if money.currency == currency:
+            return money
+
+        snapshot = self.snapshot(version)
+        memo = self._memo[snapshot.version]
+        key = (money.amount, money.currency, currency)
+
+        converted = memo.get(key)
+        if converted is None:
+            rate = snapshot.rate(money.currency, currency)
+            converted = Money(money.amount * rate, currency)
+            if len(memo) >= self.max_memo_entries:
+                memo.clear()
+            memo[key] = converted
+
+        return converted
+
+    def convert_many(
+        self,
+        values: Iterable[Money],
+        currency: str,
+        version: int | None = None,
+    ) -> list[Money]:
+        """Converta vários valores para a mesma moeda de destino.
+
+        O fator de cada moeda de origem é buscado na matriz uma única vez
+        por lote.
+
+        Args:
+            values: Valores a serem convertidos
+            currency: Moeda de destino
+            version: Versão da tabela (a vigente por padrão)
+
+        Returns:
+            Valores convertidos, na mesma ordem da entrada
+
+        """
+        snapshot = self.snapshot(version)
+        rates: dict[str, Decimal] = {}
+        result = []
+
+        for money in values:
+            if money.currency == currency:
+                result.append(money)
+                continue
+
+            rate = rates.get(money.currency)
+            if rate is None:
+                rate = snapshot.rate(money.currency, currency)
+                rates[money.currency] = rate
+            result.append(Money(money.amount * rate, currency))
+
+        return result
@@ -0,0 +1,141 @@
+"""Índice invertido de descontos direcionados a produtos e categorias."""
+
+from collections.abc import Iterable
+from uuid import UUID
+
+from ..entities.discount import Discount
+
+_NO_CANDIDATES: tuple[Discount, ...] = ()
+
+
+class DiscountEligibilityIndex:
+    """Descontos direcionados, indexados por produto e por categoria.
+
+    Para cada produto e cada categoria, o índice guarda os descontos que
+    os têm como alvo. Uma linha do carrinho encontra os seus candidatos
+    com duas consultas a dicionário, de modo que precificar um carrinho
+    custa proporcionalmente às suas linhas e aos descontos encontrados, e
+    não ao tamanho do catálogo.
+
+    Os candidatos de cada chave ficam em listas, para que incluir um
+    desconto custe o mesmo em chaves com muitos descontos; a primeira
+    consulta após uma alteração congela a lista da chave em uma tupla,
+    devolvida sem cópia pelas consultas seguintes. O índice guarda os
+    alvos de cada desconto no momento da inclusão: alterar os alvos de um
+    desconto indexado exige incluí-lo de novo com `add`.
+    """
+
+    def __init__(self, discounts: Iterable[Discount] = ()):
+        """Inicializa o índice.
+
+        Args:
+            discounts: Descontos direcionados a indexar
+
+        """
+        self._by_product = _Postings()
+        self._by_category = _Postings()
+        # ID -> alvos indexados (produtos, categorias)
+        self._targets: dict[UUID, tuple[frozenset, frozenset]] = {}
+        for discount in discounts:
+            self.add(discount)
+
+    def __len__(self) -> int:
+        """Quantidade de descontos indexados."""
+        return len(self._targets)
+
+    def __contains__(self, discount_id: object) -> bool:
+        """Indica se um desconto, pelo ID, está no índice."""
+        return discount_id in self._targets
+
+    def add(self, discount: Discount) -> None:
+        """Inclui um desconto, substituindo a versão anterior dele.
+
+        Raises:
+            ValueError: Se o desconto não tiver produtos nem categorias
+
+        """
+        if not discount.is_targeted:
+            raise ValueError('Desconto sem produtos ou categorias alvo')
+
+        self.remove(discount.id)
+        self._targets[discount.id] = (
+            discount.product_ids,
+            discount.category_ids,
+        )
+        for product_id in discount.product_ids:
+            self._by_product.append(product_id, discount)
+        for category_id in discount.category_ids:
+            self._by_category.append(category_id, discount)
+
+    def remove(self, discount_id: UUID) -> None:
+        """Remove um desconto do índice, se estiver nele."""
+        targets = self._targets.pop(discount_id, None)
+        if targets is None:
+            return
+        product_ids, category_ids = targets
+        self._by_product.discard(product_ids, discount_id)
+        self._by_category.discard(category_ids, discount_id)
+
+    def candidates(
+        self, product_id: UUID, category_id: UUID | None = None
+    ) -> tuple[Discount, ...]:
+        """Descontos que têm o produto ou a sua categoria como alvo.
+
+        Args:
+            product_id: Produto da linha
+            category_id: Categoria do produto, se conhecida
+
+        Returns:
+            Descontos do produto seguidos dos da categoria, sem repetição,
+            na ordem em que foram incluídos
+
+        """
+        by_product = self._by_product.get(product_id)
+        if category_id is None:
+            return by_product
+        by_category = self._by_category.get(category_id)
+        if not by_category:
+            return by_product
+        if not by_product:
+            return by_category
+        return by_product + tuple(
+            discount
+            for discount in by_category
+            if product_id not in discount.product_ids
+        )
+
+
+class _Postings:
+    """Descontos de cada chave, com a tupla de consulta gerada sob demanda."""
+
+    __slots__ = ('_lists', '_frozen')
+
+    def __init__(self):
+        self._lists: dict[UUID, list[Discount]] = {}
+        self._frozen: dict[UUID, tuple[Discount, ...]] = {}
+
+    def append(self, key: UUID, discount: Discount) -> None:
+        self._lists.setdefault(key, []).append(discount)
+        self._frozen.pop(key, None)
+
+    def discard(self, keys: Iterable[UUID], discount_id: UUID) -> None:
+        for key in keys:
+            entries = [
+                discount
+                for discount in self._lists.get(key, ())
+                if discount.id != discount_id
+            ]
+            if entries:
+                self._lists[key] = entries
+            else:
+                self._lists.pop(key, None)
+            self._frozen.pop(key, None)
+
+    def get(self, key: UUID) -> tuple[Discount, ...]:
+        frozen = self._frozen.get(key)
+        if frozen is None:
+            entries = self._lists.get(key)
+            if entries is None:
+                return _NO_CANDIDATES
+            frozen = self._frozen[key] = tuple(entries)
+        return frozen
@@ -1,5 +1,6 @@
 """Services for the discount entity."""
 
+from collections.abc import AsyncIterator
 from datetime import datetime
 from uuid import UUID
 
@@ -8,14 +9,27 @@ from ..repositories.discount_repository import (
     DiscountRepository,
 )
 from ..value_objects import Money
+from .currency_conversion_service import CurrencyConversionService
 
 
 class DiscountService:
     """Service for the discount entity."""
 
-    def __init__(self, discount_repository: DiscountRepository):
-        """Initialize the discount service."""
+    def __init__(
+        self,
+        discount_repository: DiscountRepository,
+        currency_converter: CurrencyConversionService | None = None,
+    ):
+        """Initialize the discount service.
+
+        Args:
+            discount_repository: Repositório de descontos
+            currency_converter: Serviço de câmbio usado para validar pedidos
+                em moeda diferente da do desconto
+
+        """
         self.discount_repository = discount_repository
+        self.currency_converter = currency_converter
 
     async def apply_discount_to_cart(
         self,
@@ -37,12 +51,19 @@ class DiscountService:
         if not discount:
             raise ValueError('Desconto não encontrado')
 
-        if not discount.is_valid(cart_total):
+        if not discount.is_valid(cart_total, self.currency_converter):
             raise ValueError('Desconto inválido')
 
-        discount_value = discount.apply_to(cart_total)
+        # A validade já foi verificada; apply_to registraria o uso uma
+        # segunda vez para descontos com limite de uso
+        discount_value = discount.discounted_value(
+            cart_total, self.currency_converter
+        )
 
-        discount.use()
+        # Verificação do limite e incremento atômicos: outro resgate pode
+        # ter esgotado o desconto desde a validação
+        if not discount.try_use():
+            raise ValueError('Desconto esgotado')
         await self.discount_repository.save(discount)
 
         return discount_value
@@ -65,7 +86,7 @@ class DiscountService:
         if not discount:
             return None
 
-        if not discount.is_valid(order_value):
+        if not discount.is_valid(order_value, self.currency_converter):
             return None
 
         return discount
@@ -104,14 +125,14 @@ class DiscountService:
             value=percentage,
             code=code,
             description=description,
-            minimum_order_value=minimum_order_value,
+            minimum_order_value=minimum_order_value or Money.zero(),
             valid_until=valid_until,
             max_usage_count=max_usage_count,
         )
 
         return await self.discount_repository.save(discount)
 
-    async def create_fixed_amount_discount(
+    def build_fixed_amount_discount(
         self,
         amount: Money,
         code: str,
@@ -120,7 +141,7 @@ class DiscountService:
         valid_until: datetime | None = None,
         max_usage_count: int | None = None,
     ) -> Discount:
-        """Cria um novo desconto de valor fixo.
+        """Monta um desconto de valor fixo sem persisti-lo.
 
         Args:
             amount: Valor fixo do desconto
@@ -131,7 +152,7 @@ class DiscountService:
             max_usage_count: Número máximo de usos
 
         Returns:
-            O desconto criado e persistido
+            O desconto criado, ainda não persistido
 
         Raises:
             ValueError: Se o valor for negativo
@@ -140,9 +161,44 @@ class DiscountService:
         if not amount.is_positive():
             raise ValueError('Valor do desconto deve ser positivo')
 
-        discount = Discount(
+        return Discount(
             type=DiscountType.FIXED_AMOUNT,
-            value=amount.amount,  # Convertemos Money para valor numérico
+            value=amount,
+            code=code,
+            description=description,
+            minimum_order_value=minimum_order_value or Money.zero(),
+            valid_until=valid_until,
+            max_usage_count=max_usage_count,
+        )
+
+    async def create_fixed_amount_discount(
+        self,
+        amount: Money,
+        code: str,
+        description: str,
+        minimum_order_value: Money | None = None,
+        valid_until: datetime | None = None,
+        max_usage_count: int | None = None,
+    ) -> Discount:
+        """Cria um novo desconto de valor fixo.
+
+        Args:
+            amount: Valor fixo do desconto
+            code: Código do cupom/desconto
+            description: Descrição do desconto
+            minimum_order_value: Valor mínimo do pedido
+            valid_until: Data de expiração
+            max_usage_count: Número máximo de usos
+
+        Returns:
+            O desconto criado e persistido
+
+        Raises:
+            ValueError: Se o valor for negativo
+
+        """
+        discount = self.build_fixed_amount_discount(
+            amount=amount,
             code=code,
             description=description,
             minimum_order_value=minimum_order_value,
@@ -151,3 +207,31 @@ class DiscountService:
         )
 
         return await self.discount_repository.save(discount)
+
+    async def save_discounts(
+        self, discounts: list[Discount]
+    ) -> list[Discount]:
+        """Persista um lote de descontos já validados.
+
+        Args:
+            discounts: Descontos a serem persistidos
+
+        Returns:
+            Os descontos persistidos
+
+        """
+        return await self.discount_repository.save_many(discounts)
+
+    def stream_discounts(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorra todos os descontos do catálogo em lotes.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Returns:
+            Iterador assíncrono de lotes de descontos
+
+        """
+        return self.discount_repository.stream(batch_size)
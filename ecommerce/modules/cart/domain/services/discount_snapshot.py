@@ -0,0 +1,91 @@
+"""Cópia em memória do catálogo de descontos, com a idade de cada entrada."""
+
+from collections.abc import Callable
+from datetime import datetime
+
+from ..entities.discount import Discount
+from ..repositories.discount_repository import DiscountRepository
+
+
+class DiscountCatalogSnapshot:
+    """Última versão conhecida de cada desconto, indexada por código.
+
+    A cópia é carregada inteira com `refresh` e mantida com as leituras
+    bem-sucedidas do repositório (`remember`). Cada entrada guarda o
+    instante em que foi confirmada pela última vez; para códigos ausentes,
+    vale o instante da última carga completa. Usos registrados depois
+    desse instante não aparecem na cópia, e por isso ela serve apenas
+    para validar cupons enquanto o repositório não responde, nunca para
+    resgatá-los.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        """Inicializa a cópia vazia, ainda não carregada.
+
+        Args:
+            clock: Relógio usado para datar as entradas
+
+        """
+        self.clock = clock
+        self.loaded_at: datetime | None = None
+        self._entries: dict[str, tuple[Discount, datetime]] = {}
+
+    def __len__(self) -> int:
+        """Quantidade de descontos na cópia."""
+        return len(self._entries)
+
+    async def refresh(
+        self, repository: DiscountRepository, batch_size: int = 1000
+    ) -> int:
+        """Recarregue a cópia inteira a partir do repositório.
+
+        A cópia anterior continua em uso até o fim da leitura; se ela
+        falhar, nada é alterado.
+
+        Args:
+            repository: Repositório com o estado autoritativo
+            batch_size: Quantidade de descontos por lote lido
+
+        Returns:
+            Quantidade de descontos carregados
+
+        """
+        loaded_at = self.clock()
+        entries = {}
+        async for batch in repository.stream(batch_size):
+            for discount in batch:
+                if discount.code:
+                    entries[discount.code] = (discount, loaded_at)
+        self._entries = entries
+        self.loaded_at = loaded_at
+        return len(entries)
+
+    def remember(self, code: str, discount: Discount | None) -> None:
+        """Registre o resultado de uma leitura autoritativa por código.
+
+        Args:
+            code: Código consultado
+            discount: Desconto encontrado ou None se o código não existe
+
+        """
+        if discount is None:
+            self._entries.pop(code, None)
+        else:
+            self._entries[code] = (discount, self.clock())
+
+    def lookup(self, code: str) -> tuple[Discount | None, datetime | None]:
+        """Busca um desconto pelo código na cópia.
+
+        Args:
+            code: Código do cupom
+
+        Returns:
+            O desconto, ou None se ausente, e o instante em que essa
+            informação foi confirmada; None se a ausência não pode ser
+            afirmada porque a cópia nunca foi carregada
+
+        """
+        entry = self._entries.get(code)
+        if entry is None:
+            return None, self.loaded_at
+        return entry
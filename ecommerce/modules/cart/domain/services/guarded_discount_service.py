@@ -0,0 +1,316 @@
+"""Serviço de descontos com prazo por chamada e validação degradada."""
+
+import asyncio
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from ..entities.discount import Discount
+from ..repositories.discount_repository import DiscountRepository
+from ..value_objects.money import Money
+from .circuit_breaker import CircuitBreaker
+from .currency_conversion_service import CurrencyConversionService
+from .discount_service import DiscountService
+from .discount_snapshot import DiscountCatalogSnapshot
+
+SOURCE_STORE = 'store'
+SOURCE_SNAPSHOT = 'snapshot'
+
+REASON_TIMEOUT = 'timeout'
+REASON_ERROR = 'error'
+REASON_CIRCUIT_OPEN = 'circuit_open'
+
+# Falhas de E/S; drivers de banco acrescentam as suas via `store_errors`
+DEFAULT_STORE_ERRORS: tuple[type[Exception], ...] = (OSError,)
+
+
+class DiscountStoreUnavailable(Exception):
+    """O repositório não respondeu e não há alternativa para a operação."""
+
+
+@dataclass(frozen=True)
+class CouponValidation:
+    """Resultado de uma validação de cupom e de onde ele veio."""
+
+    discount: Discount | None
+    source: str = SOURCE_STORE
+    as_of: datetime | None = None
+    reason: str | None = None
+
+    @property
+    def stale(self) -> bool:
+        """Indica se o resultado veio da cópia em memória."""
+        return self.source == SOURCE_SNAPSHOT
+
+    def staleness(self, now: datetime | None = None) -> timedelta:
+        """Idade da informação usada na validação."""
+        if self.as_of is None:
+            return timedelta(0)
+        return (now or datetime.now()) - self.as_of
+
+
+@dataclass
+class GuardedServiceStats:
+    """Métricas das validações e resgates protegidos."""
+
+    validations: int = 0
+    fallbacks: int = 0
+    timeouts: int = 0
+    failures: int = 0
+    short_circuits: int = 0
+    slow_calls: int = 0
+    unavailable: int = 0
+    redemptions: int = 0
+    store_seconds: float = 0.0
+    fallback_seconds: float = 0.0
+    max_store_seconds: float = 0.0
+
+    @property
+    def fallback_rate(self) -> float:
+        """Proporção de validações atendidas pela cópia em memória."""
+        if not self.validations:
+            return 0.0
+        return self.fallbacks / self.validations
+
+    @property
+    def average_store_seconds(self) -> float:
+        """Latência média das validações atendidas pelo repositório."""
+        served = self.validations - self.fallbacks - self.unavailable
+        return self.store_seconds / served if served > 0 else 0.0
+
+    @property
+    def average_fallback_seconds(self) -> float:
+        """Latência média das validações degradadas, incluindo a espera."""
+        if not self.fallbacks:
+            return 0.0
+        return self.fallback_seconds / self.fallbacks
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta as métricas para um dicionário."""
+        return {
+            **asdict(self),
+            'fallback_rate': self.fallback_rate,
+            'average_store_seconds': self.average_store_seconds,
+            'average_fallback_seconds': self.average_fallback_seconds,
+        }
+
+
+class GuardedDiscountService(DiscountService):
+    """Serviço de descontos que não espera indefinidamente pelo repositório.
+
+    Cada leitura para validar um cupom tem um prazo. Estouros de prazo,
+    erros do repositório (`store_errors`) e leituras mais lentas que
+    `slow_call_seconds` são registrados no `CircuitBreaker`; com o
+    disjuntor aberto, o repositório nem é consultado. Nesses casos a
+    validação é respondida pela `DiscountCatalogSnapshot`, e o
+    `CouponValidation` indica a origem e a idade da informação. Sem cópia
+    utilizável, a validação falha com `DiscountStoreUnavailable`.
+
+    Resgates sempre consultam e gravam no repositório: com o disjuntor
+    aberto falham de imediato, e o prazo de `redeem_timeout`, se
+    configurado, pode interromper um resgate cuja gravação já foi
+    enviada. Outras exceções são erros de programação: propagam sem
+    contar no disjuntor.
+    """
+
+    def __init__(
+        self,
+        discount_repository: DiscountRepository,
+        snapshot: DiscountCatalogSnapshot | None = None,
+        breaker: CircuitBreaker | None = None,
+        timeout: float = 0.25,
+        slow_call_seconds: float | None = None,
+        redeem_timeout: float | None = None,
+        max_staleness: timedelta | None = None,
+        currency_converter: CurrencyConversionService | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+        store_errors: tuple[type[Exception], ...] = DEFAULT_STORE_ERRORS,
+    ):
+        """Inicializa o serviço.
+
+        Args:
+            discount_repository: Repositório com o estado autoritativo
+            snapshot: Cópia usada enquanto o repositório não responde
+            breaker: Disjuntor das chamadas ao repositório
+            timeout: Prazo de cada leitura de validação, em segundos
+            slow_call_seconds: Leituras concluídas acima desta duração
+                contam como falha no disjuntor (padrão: metade do prazo)
+            redeem_timeout: Prazo de cada resgate (padrão: sem prazo)
+            max_staleness: Idade máxima aceita da cópia em memória
+            currency_converter: Serviço de câmbio usado na validação
+            clock: Relógio usado para medir as latências
+            store_errors: Exceções tratadas como falha do repositório
+
+        """
+        super().__init__(discount_repository, currency_converter)
+        if timeout <= 0:
+            raise ValueError('Prazo deve ser maior que zero')
+
+        self.snapshot = snapshot
+        self.breaker = breaker or CircuitBreaker()
+        self.timeout = timeout
+        self.slow_call_seconds = (
+            timeout / 2 if slow_call_seconds is None else slow_call_seconds
+        )
+        self.redeem_timeout = redeem_timeout
+        self.max_staleness = max_staleness
+        self.clock = clock
+        self.store_errors = store_errors
+        self._stats = GuardedServiceStats()
+
+    async def validate_coupon(
+        self, code: str, order_value: Money
+    ) -> CouponValidation:
+        """Valida um cupom dentro do prazo, recorrendo à cópia se preciso.
+
+        Args:
+            code: Código do cupom
+            order_value: Valor total do pedido
+
+        Returns:
+            Desconto válido ou None, com a origem e a idade da informação
+
+        Raises:
+            DiscountStoreUnavailable: Se o repositório não respondeu e a
+                cópia não existe, nunca foi carregada ou está velha demais
+
+        """
+        stats = self._stats
+        stats.validations += 1
+        started_at = self.clock()
+
+        if not self.breaker.allow_request():
+            stats.short_circuits += 1
+            reason = REASON_CIRCUIT_OPEN
+        else:
+            try:
+                async with asyncio.timeout(self.timeout):
+                    discount = await self.discount_repository.get_by_code(code)
+            except TimeoutError:
+                stats.timeouts += 1
+                self.breaker.record_failure()
+                reason = REASON_TIMEOUT
+            except self.store_errors:
+                stats.failures += 1
+                self.breaker.record_failure()
+                reason = REASON_ERROR
+            else:
+                elapsed = self.clock() - started_at
+                if elapsed > self.slow_call_seconds:
+                    stats.slow_calls += 1
+                    self.breaker.record_failure()
+                else:
+                    self.breaker.record_success()
+                stats.store_seconds += elapsed
+                stats.max_store_seconds = max(stats.max_store_seconds, elapsed)
+                if self.snapshot is not None:
+                    self.snapshot.remember(code, discount)
+                return CouponValidation(
+                    self._valid_or_none(discount, order_value)
+                )
+
+        return self._fallback(code, order_value, reason, started_at)
+
+    async def validate_coupon_code(
+        self, code: str, order_value: Money
+    ) -> Discount | None:
+        """Valida um cupom; veja `validate_coupon`."""
+        validation = await self.validate_coupon(code, order_value)
+        return validation.discount
+
+    async def apply_discount_to_cart(
+        self, cart_total: Money, discount_id: UUID
+    ) -> Money | None:
+        """Resgata um desconto no repositório, nunca na cópia.
+
+        Raises:
+            ValueError: Se o desconto não existir ou não puder ser usado
+            DiscountStoreUnavailable: Se o disjuntor estiver aberto, o
+                prazo estourar ou o repositório falhar
+
+        """
+        self._stats.redemptions += 1
+        if not self.breaker.allow_request():
+            self._stats.short_circuits += 1
+            raise DiscountStoreUnavailable(
+                'Repositório de descontos indisponível'
+            )
+
+        try:
+            async with asyncio.timeout(self.redeem_timeout):
+                total = await super().apply_discount_to_cart(
+                    cart_total, discount_id
+                )
+        except ValueError:
+            self.breaker.record_success()
+            raise
+        except TimeoutError:
+            self._stats.timeouts += 1
+            self.breaker.record_failure()
+            raise DiscountStoreUnavailable(
+                'Prazo do resgate esgotado'
+            ) from None
+        except self.store_errors as error:
+            self._stats.failures += 1
+            self.breaker.record_failure()
+            raise DiscountStoreUnavailable(
+                'Repositório de descontos indisponível'
+            ) from error
+
+        self.breaker.record_success()
+        return total
+
+    async def refresh_snapshot(self, batch_size: int = 1000) -> int:
+        """Recarregue a cópia em memória a partir do repositório.
+
+        Returns:
+            Quantidade de descontos carregados
+
+        """
+        if self.snapshot is None:
+            raise ValueError('Serviço configurado sem cópia em memória')
+        return await self.snapshot.refresh(
+            self.discount_repository, batch_size
+        )
+
+    @property
+    def stats(self) -> GuardedServiceStats:
+        """Retorna uma cópia das métricas atuais."""
+        return GuardedServiceStats(**vars(self._stats))
+
+    def _fallback(
+        self, code: str, order_value: Money, reason: str, started_at: float
+    ) -> CouponValidation:
+        """Responde a validação pela cópia em memória."""
+        as_of = None
+        if self.snapshot is not None:
+            discount, as_of = self.snapshot.lookup(code)
+        if as_of is None or (
+            self.max_staleness is not None
+            and self.snapshot.clock() - as_of > self.max_staleness
+        ):
+            self._stats.unavailable += 1
+            raise DiscountStoreUnavailable(
+                'Repositório de descontos indisponível'
+            )
+
+        self._stats.fallbacks += 1
+        self._stats.fallback_seconds += self.clock() - started_at
+        return CouponValidation(
+            self._valid_or_none(discount, order_value),
+            SOURCE_SNAPSHOT,
+            as_of,
+            reason,
+        )
+
+    def _valid_or_none(
+        self, discount: Discount | None, order_value: Money
+    ) -> Discount | None:
+        if discount is None or not discount.is_valid(
+            order_value, self.currency_converter
+        ):
+            return None
+        return discount
@@ -0,0 +1,165 @@
+"""Cache de resultados de precificação endereçado por conteúdo."""
+
+import hashlib
+import struct
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from ..entities.cart import Cart
+
+if TYPE_CHECKING:
+    from .cart_pricing_service import CartPricing
+
+_LINE = struct.Struct('<16s16sq')
+_NO_CATEGORY = bytes(16)
+
+
+def cart_pricing_key(cart: Cart, catalog_version: int) -> bytes:
+    """Calcula a chave canônica de precificação de um carrinho.
+
+    A chave depende apenas do que influencia o preço: as linhas
+    (produto, categoria, quantidade e preço, independentemente da ordem),
+    os descontos aplicados, na ordem de aplicação, e a versão do catálogo.
+    IDs de carrinho, de itens e datas não fazem parte da chave, de modo
+    que carrinhos com o mesmo conteúdo compartilham o resultado.
+
+    Args:
+        cart: Carrinho a ser precificado
+        catalog_version: Versão do catálogo de descontos
+
+    Returns:
+        Resumo BLAKE2b de 16 bytes
+
+    """
+    lines = sorted(
+        (
+            item.product_id.bytes,
+            item.category_id.bytes if item.category_id else _NO_CATEGORY,
+            item.quantity,
+            repr(float(item.price)),
+        )
+        for item in cart.items
+    )
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(struct.pack('<qI', catalog_version, len(lines)))
+    for product_id, category_id, quantity, price in lines:
+        digest.update(_LINE.pack(product_id, category_id, quantity))
+        digest.update(price.encode())
+        digest.update(b'\0')
+    for discount in cart.discounts:
+        digest.update(discount.id.bytes)
+
+    return digest.digest()
+
+
+@dataclass
+class PricingCacheStats:
+    """Contadores do cache de precificação."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporção de precificações atendidas pelo cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class PricingCache:
+    """Cache limitado de resultados de precificação de carrinhos.
+
+    As entradas pertencem a uma versão do catálogo de descontos: ao
+    observar uma versão nova, todo o conteúdo anterior é descartado de uma
+    só vez. Resultados que dependem de descontos com validade temporal
+    expiram no próximo instante em que essa validade muda.
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        """Inicializa o cache.
+
+        Args:
+            max_entries: Quantidade máxima de resultados guardados
+
+        """
+        if max_entries <= 0:
+            raise ValueError('max_entries deve ser maior que zero')
+
+        self.max_entries = max_entries
+        self._version: int | None = None
+        self._entries: OrderedDict[bytes, CartPricing] = OrderedDict()
+        self._stats = PricingCacheStats()
+
+    def get_or_compute(
+        self,
+        cart: Cart,
+        catalog_version: int,
+        now: datetime,
+        compute: Callable[[], 'CartPricing'],
+    ) -> 'CartPricing':
+        """Retorna o resultado em cache ou o calcula e guarda.
+
+        Args:
+            cart: Carrinho a ser precificado
+            catalog_version: Versão atual do catálogo de descontos
+            now: Instante da precificação
+            compute: Calcula o resultado quando não há entrada válida
+
+        Returns:
+            Resultado da precificação
+
+        """
+        if catalog_version != self._version:
+            self.invalidate(catalog_version)
+
+        key = cart_pricing_key(cart, catalog_version)
+        entries = self._entries
+
+        pricing = entries.get(key)
+        if pricing is not None:
+            if pricing.valid_until is None or now < pricing.valid_until:
+                entries.move_to_end(key)
+                self._stats.hits += 1
+                return pricing
+
+            del entries[key]
+            self._stats.expirations += 1
+
+        self._stats.misses += 1
+        pricing = compute()
+        entries[key] = pricing
+        if len(entries) > self.max_entries:
+            entries.popitem(last=False)
+            self._stats.evictions += 1
+
+        return pricing
+
+    def invalidate(self, catalog_version: int | None = None) -> None:
+        """Descarta todos os resultados guardados.
+
+        Args:
+            catalog_version: Nova versão do catálogo, se conhecida
+
+        """
+        if self._entries:
+            self._stats.invalidations += 1
+        self._entries = OrderedDict()
+        self._version = catalog_version
+
+    def __len__(self) -> int:
+        """Quantidade de resultados guardados."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> PricingCacheStats:
+        """Retorna uma cópia dos contadores atuais."""
+        self._stats.entries = len(self._entries)
+        return PricingCacheStats(**vars(self._stats))
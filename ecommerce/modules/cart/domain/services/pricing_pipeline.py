@@ -0,0 +1,280 @@
+"""Pipeline incremental de precificação de carrinhos."""
+
+import bisect
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from uuid import UUID
+
+from ..entities.cart import Cart
+from ..entities.cart_item import CartItem
+from ..entities.discount import Discount
+from ..value_objects import Money
+from .cart_pricing_service import CartPricing
+
+_TARGETED_UNSUPPORTED = 'Descontos direcionados não são suportados'
+
+
+@dataclass
+class StageTiming:
+    """Tempo acumulado de execução de um estágio."""
+
+    runs: int = 0
+    total_seconds: float = 0.0
+    last_seconds: float = 0.0
+
+
+class PricingPipeline:
+    """Precifica um carrinho em estágios com resultados em cache.
+
+    Cada estágio declara de quais outros depende e guarda sua saída. As
+    alterações feitas pelos métodos do pipeline marcam como pendente
+    apenas o estágio diretamente afetado; ao recalcular, um estágio só
+    torna pendentes os seus dependentes se a sua saída mudou.
+
+    Estágios:
+        lines: total de cada linha (preço x quantidade), apenas das
+            linhas alteradas
+        subtotal: soma das linhas, atualizada pela diferença
+        eligibility: descontos cujo valor mínimo e validade são
+            atendidos; ao mudar o subtotal, só os descontos com valor
+            mínimo entre o subtotal anterior e o novo são reavaliados
+        discounts: aplicação em sequência dos descontos elegíveis
+
+    Descontos direcionados a produtos ou categorias não são suportados:
+    use o `CartPricingService` para carrinhos com eles.
+    """
+
+    DEPENDENCIES: dict[str, tuple[str, ...]] = {
+        'lines': (),
+        'subtotal': ('lines',),
+        'eligibility': ('subtotal',),
+        'discounts': ('subtotal', 'eligibility'),
+    }
+
+    def __init__(
+        self,
+        cart: Cart,
+        currency: str = 'BRL',
+        now: datetime | None = None,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Inicializa o pipeline para um carrinho.
+
+        Args:
+            cart: Carrinho a ser precificado; deve ser alterado apenas
+                pelos métodos do pipeline enquanto ele estiver em uso
+            currency: Moeda dos preços dos itens
+            now: Instante usado na validade dos descontos (padrão: agora)
+            clock: Relógio usado para medir os estágios
+
+        Raises:
+            ValueError: Se o carrinho tiver descontos direcionados
+
+        """
+        if any(discount.is_targeted for discount in cart.discounts):
+            raise ValueError(_TARGETED_UNSUPPORTED)
+
+        self.cart = cart
+        self.currency = currency
+        self.now = now
+        self.clock = clock
+
+        self._dependents: dict[str, list[str]] = {
+            stage: [
+                name
+                for name, inputs in self.DEPENDENCIES.items()
+                if stage in inputs
+            ]
+            for stage in self.DEPENDENCIES
+        }
+        self._runners: dict[str, Callable[[], bool]] = {
+            'lines': self._run_lines,
+            'subtotal': self._run_subtotal,
+            'eligibility': self._run_eligibility,
+            'discounts': self._run_discounts,
+        }
+        self.timings = {stage: StageTiming() for stage in self.DEPENDENCIES}
+        self.discount_evaluations = 0
+
+        self._items: dict[UUID, CartItem] = {
+            item.id: item for item in cart.items
+        }
+        self._line_totals: dict[UUID, Money] = {}
+        self._dirty_lines: set[UUID] = set(self._items)
+        self._subtotal_delta = Money(0, currency)
+        self._subtotal = Money(0, currency)
+        self._previous_subtotal: Money | None = None
+
+        self._thresholds: list[tuple[Decimal, int, Discount]] = []
+        self._threshold_amounts: list[Decimal] = []
+        self._eligible: set[UUID] = set()
+        self._reevaluate_all = True
+        self._pricing: CartPricing | None = None
+
+        self._dirty: set[str] = set(self.DEPENDENCIES)
+
+    def add_item(self, item: CartItem) -> None:
+        """Adiciona um item ao carrinho."""
+        self.cart.add_item(item)
+        self._items[item.id] = item
+        self._mark_line(item.id)
+
+    def remove_item(self, item_id: UUID) -> None:
+        """Remove um item do carrinho."""
+        item = self._items.pop(item_id)
+        self.cart.items.remove(item)
+        self._mark_line(item_id)
+
+    def set_quantity(self, item_id: UUID, quantity: int) -> None:
+        """Altera a quantidade de um item."""
+        item = self._items[item_id]
+        item.quantity = quantity
+        item.updated_at = datetime.now()
+        self._mark_line(item_id)
+
+    def set_price(self, item_id: UUID, price: float) -> None:
+        """Altera o preço unitário de um item."""
+        item = self._items[item_id]
+        item.price = price
+        item.updated_at = datetime.now()
+        self._mark_line(item_id)
+
+    def add_discount(self, discount: Discount) -> None:
+        """Associa um desconto ao carrinho.
+
+        Raises:
+            ValueError: Se o desconto for direcionado
+
+        """
+        if discount.is_targeted:
+            raise ValueError(_TARGETED_UNSUPPORTED)
+        self.cart.discounts.append(discount)
+        self._mark_discounts()
+
+    def remove_discount(self, discount_id: UUID) -> None:
+        """Remove um desconto do carrinho."""
+        self.cart.discounts = [
+            discount
+            for discount in self.cart.discounts
+            if discount.id != discount_id
+        ]
+        self._mark_discounts()
+
+    def refresh_discounts(self) -> None:
+        """Reavalia todos os descontos, por exemplo após um resgate."""
+        self._mark_discounts()
+
+    def set_now(self, now: datetime | None) -> None:
+        """Altera o instante usado na validade dos descontos."""
+        self.now = now
+        self._mark_discounts()
+
+    def result(self) -> CartPricing:
+        """Recalcula os estágios pendentes e retorna a precificação.
+
+        Returns:
+            Resultado da precificação
+
+        """
+        for stage in self.DEPENDENCIES:
+            if stage not in self._dirty:
+                continue
+
+            self._dirty.discard(stage)
+            started_at = self.clock()
+            changed = self._runners[stage]()
+            elapsed = self.clock() - started_at
+
+            timing = self.timings[stage]
+            timing.runs += 1
+            timing.total_seconds += elapsed
+            timing.last_seconds = elapsed
+
+            if changed:
+                self._dirty.update(self._dependents[stage])
+
+        return self._pricing
+
+    def _mark_line(self, item_id: UUID) -> None:
+        self._dirty_lines.add(item_id)
+        self._dirty.add('lines')
+
+    def _mark_discounts(self) -> None:
+        self._reevaluate_all = True
+        self._dirty.add('eligibility')
+
+    def _run_lines(self) -> bool:
+        delta = Money(0, self.currency)
+        for item_id in self._dirty_lines:
+            previous = self._line_totals.pop(item_id, None)
+            if previous is not None:
+                delta -= previous
+
+            item = self._items.get(item_id)
+            if item is not None:
+                line_total = Money(item.price, self.currency) * item.quantity
+                self._line_totals[item_id] = line_total
+                delta += line_total
+
+        self._dirty_lines.clear()
+        self._subtotal_delta += delta
+        return not delta.is_zero()
+
+    def _run_subtotal(self) -> bool:
+        delta = self._subtotal_delta
+        self._subtotal_delta = Money(0, self.currency)
+        if delta.is_zero() and self._pricing is not None:
+            return False
+
+        self._previous_subtotal = self._subtotal
+        self._subtotal += delta
+        return True
+
+    def _run_eligibility(self) -> bool:
+        if self._reevaluate_all:
+            self._reevaluate_all = False
+            self._thresholds = sorted(
+                (discount.minimum_order_value.amount, index, discount)
+                for index, discount in enumerate(self.cart.discounts)
+            )
+            self._threshold_amounts = [entry[0] for entry in self._thresholds]
+            candidates = [entry[2] for entry in self._thresholds]
+            previous = self._eligible
+            self._eligible = set()
+        else:
+            # Somente descontos cujo valor mínimo está entre o subtotal
+            # anterior e o atual podem ter mudado de elegibilidade
+            low, high = sorted(
+                (self._previous_subtotal.amount, self._subtotal.amount)
+            )
+            start = bisect.bisect_left(self._threshold_amounts, low)
+            end = bisect.bisect_right(self._threshold_amounts, high)
+            candidates = [entry[2] for entry in self._thresholds[start:end]]
+            previous = set(self._eligible)
+
+        for discount in candidates:
+            self.discount_evaluations += 1
+            if discount.is_valid(self._subtotal, now=self.now):
+                self._eligible.add(discount.id)
+            else:
+                self._eligible.discard(discount.id)
+
+        return self._eligible != previous or self._pricing is None
+
+    def _run_discounts(self) -> bool:
+        total = self._subtotal
+        applied = []
+        for discount in self.cart.discounts:
+            if discount.id in self._eligible:
+                total = discount.discounted_value(total)
+                applied.append(discount.id)
+
+        self._pricing = CartPricing(
+            subtotal=self._subtotal,
+            total=total,
+            applied_discount_ids=tuple(applied),
+        )
+        return True
@@ -1,5 +1,6 @@
 """Value objects for the cart module."""
 
 from .money import Money
+from .rate_snapshot import RateSnapshot
 
-__all__ = ['Money']
+__all__ = ['Money', 'RateSnapshot']
@@ -2,13 +2,25 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 from decimal import ROUND_HALF_UP, Decimal
 
+# Valores persistidos como inteiros usam centésimos, para que a leitura
+# devolva exatamente o valor salvo
+MINOR_UNITS = 100
 
-@dataclass(frozen=True)
+# Instâncias de valor zero compartilhadas, por moeda
+_ZEROS: dict[str, Money] = {}
+
+
+@dataclass(frozen=True, slots=True)
 class Money:
-    """Value object para representar um valor monetário."""
+    """Value object para representar um valor monetário.
+
+    O código da moeda é internado, de modo que todos os valores de uma
+    mesma moeda compartilham a mesma string.
+    """
 
     amount: Decimal
     currency: str = 'BRL'
@@ -29,7 +41,23 @@ class Money:
         amount = amount.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
         object.__setattr__(self, 'amount', amount)
-        object.__setattr__(self, 'currency', currency)
+        object.__setattr__(self, 'currency', sys.intern(currency))
+
+    @staticmethod
+    def zero(currency: str = 'BRL') -> Money:
+        """Retorna a instância compartilhada de valor zero da moeda.
+
+        Args:
+            currency: Código da moeda
+
+        Returns:
+            Money imutável com valor zero
+
+        """
+        zero = _ZEROS.get(currency)
+        if zero is None:
+            zero = _ZEROS[currency] = Money(0, currency)
+        return zero
 
     def __str__(self) -> str:
         """Representação de string formatada como moeda."""
@@ -264,19 +292,53 @@ class Money:
     def to_dict(self) -> dict:
         """Converta o objeto para um dicionário.
 
+        O valor é representado como texto para não perder precisão, já
+        que nem todo decimal tem representação exata em ponto flutuante.
+
         Returns:
             Dicionário com os dados do objeto
 
         """
         return {
-            'amount': float(
-                self.amount
-            ),  # Converter para float para serialização
+            'amount': str(self.amount),
             'currency': self.currency,
         }
 
+    @classmethod
+    def from_dict(cls, data: dict) -> Money:
+        """Crie um objeto Money a partir de um dicionário.
+
+        Args:
+            data: Dicionário no formato produzido por `to_dict`
+
+        Returns:
+            Novo objeto Money
+
+        """
+        return cls(data['amount'], data.get('currency', 'BRL'))
+
     def _get_incompatible_currency_message(self, other: Money) -> str:
         return (
             f'Não é possível comparar moedas diferentes: '
             f'{self.currency} e {other.currency}'
         )
+
+
+def to_minor_units(value: Decimal | float | int | str) -> int:
+    """Converta um valor decimal para centésimos inteiros.
+
+    Args:
+        value: Valor a ser convertido
+
+    Returns:
+        Valor em centésimos, arredondado meio para cima
+
+    """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int((value * MINOR_UNITS).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def from_minor_units(value: int) -> Decimal:
+    """Converta centésimos inteiros para um valor decimal exato."""
+    return Decimal(value).scaleb(-2)
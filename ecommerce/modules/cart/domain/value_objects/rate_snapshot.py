@@ -0,0 +1,78 @@
+"""Tabela de câmbio imutável usada nas conversões entre moedas."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from decimal import Decimal
+
+
+@dataclass(frozen=True)
+class RateSnapshot:
+    """Tabela de câmbio imutável, pré-calculada como uma matriz.
+
+    `matrix[i][j]` contém quantas unidades da moeda `currencies[j]`
+    equivalem a uma unidade da moeda `currencies[i]`, de modo que toda
+    conversão é uma multiplicação por um fator já calculado.
+    """
+
+    version: int
+    currencies: tuple[str, ...]
+    matrix: tuple[tuple[Decimal, ...], ...]
+    index: dict[str, int] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_rates(
+        cls,
+        version: int,
+        base_currency: str,
+        rates: Mapping[str, Decimal | float | int | str],
+    ) -> 'RateSnapshot':
+        """Monta a matriz de câmbio a partir das cotações de uma moeda base.
+
+        Args:
+            version: Versão da tabela
+            base_currency: Moeda de referência das cotações
+            rates: Unidades de cada moeda equivalentes a uma unidade da base
+
+        Returns:
+            Nova tabela de câmbio
+
+        Raises:
+            ValueError: Se alguma cotação não for positiva
+
+        """
+        normalized = {base_currency: Decimal(1)}
+        for currency, rate in rates.items():
+            rate = rate if isinstance(rate, Decimal) else Decimal(str(rate))
+            if rate <= 0:
+                raise ValueError(f'Cotação inválida para {currency}: {rate}')
+            normalized[currency] = rate
+
+        currencies = tuple(sorted(normalized))
+        matrix = tuple(
+            tuple(
+                normalized[target] / normalized[source]
+                for target in currencies
+            )
+            for source in currencies
+        )
+
+        return cls(
+            version=version,
+            currencies=currencies,
+            matrix=matrix,
+            index={currency: i for i, currency in enumerate(currencies)},
+        )
+
+    def rate(self, source: str, target: str) -> Decimal:
+        """Retorna o fator de conversão entre duas moedas.
+
+        Raises:
+            ValueError: Se alguma das moedas não estiver na tabela
+
+        """
+        try:
+            return self.matrix[self.index[source]][self.index[target]]
+        except KeyError as e:
+            raise ValueError(
+                f'Moeda sem cotação na versão {self.version}: {e.args[0]}'
+            ) from None
@@ -0,0 +1,202 @@
+"""Armazenamento em memória de carrinhos de sessões anônimas."""
+
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from ...domain.entities.cart import Cart
+from ..serialization.binary_codec import CartBinaryCodec
+
+# Custo aproximado, em bytes, das estruturas que indexam cada entrada
+# (entrada do OrderedDict, da roda de tempo e a tupla da própria entrada)
+ENTRY_OVERHEAD_BYTES = 240
+
+
+@dataclass
+class SessionCartStoreStats:
+    """Contadores do armazenamento de carrinhos de sessão."""
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Proporção de leituras atendidas pelo armazenamento."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SessionCartStore:
+    """Armazena carrinhos de convidados por `session_id`.
+
+    A expiração é deslizante: cada leitura ou gravação renova o prazo da
+    sessão. Os prazos são organizados em uma roda de tempo, de modo que a
+    expiração percorre apenas o compartimento do instante atual, sem
+    varrer todos os carrinhos. Um limite de memória, com descarte do
+    carrinho usado há mais tempo, mantém o consumo previsível; os
+    carrinhos ficam guardados na codificação binária compacta.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 1800,
+        max_bytes: int = 256 * 1024 * 1024,
+        resolution_seconds: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        codec: CartBinaryCodec | None = None,
+    ):
+        """Inicializa o armazenamento.
+
+        Args:
+            ttl_seconds: Tempo de inatividade até a sessão expirar
+            max_bytes: Orçamento de memória para os carrinhos guardados
+            resolution_seconds: Granularidade da roda de tempo
+            clock: Relógio monotônico em segundos
+            codec: Codec binário usado para guardar os carrinhos
+
+        """
+        if ttl_seconds <= 0 or resolution_seconds <= 0:
+            raise ValueError('TTL e resolução devem ser maiores que zero')
+
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.resolution_seconds = resolution_seconds
+        self.clock = clock
+        self.codec = codec or CartBinaryCodec()
+
+        self._ttl_ticks = max(1, math.ceil(ttl_seconds / resolution_seconds))
+        self._wheel: list[set[str]] = [
+            set() for _ in range(self._ttl_ticks + 1)
+        ]
+        self._entries: OrderedDict[str, tuple[bytes, int]] = OrderedDict()
+        self._tick = self._current_tick()
+        self._stats = SessionCartStoreStats()
+
+    def get(self, session_id: str) -> Cart | None:
+        """Retorna o carrinho da sessão, renovando o seu prazo.
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            Uma cópia do carrinho ou None se não existir ou tiver expirado
+
+        """
+        self._advance()
+
+        entry = self._entries.get(session_id)
+        if entry is None:
+            self._stats.misses += 1
+            return None
+
+        self._stats.hits += 1
+        self._touch(session_id, entry[0], entry[1])
+        return self.codec.decode(entry[0])
+
+    def put(self, cart: Cart) -> None:
+        """Guarda o carrinho de uma sessão anônima.
+
+        Args:
+            cart: Carrinho com `session_id` preenchido
+
+        Raises:
+            ValueError: Se o carrinho não tiver `session_id`
+
+        """
+        if not cart.session_id:
+            raise ValueError('Carrinho sem session_id')
+
+        self._advance()
+
+        payload = self.codec.encode(cart)
+        previous = self._entries.get(cart.session_id)
+        previous_deadline = None
+        if previous is not None:
+            self._stats.bytes -= self._size(previous[0])
+            previous_deadline = previous[1]
+
+        self._stats.bytes += self._size(payload)
+        self._touch(cart.session_id, payload, previous_deadline)
+        self._evict()
+
+    def delete(self, session_id: str) -> None:
+        """Remove o carrinho de uma sessão.
+
+        Args:
+            session_id: Identificador da sessão
+
+        """
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            self._forget(session_id, entry)
+
+    def __len__(self) -> int:
+        """Quantidade de carrinhos guardados."""
+        return len(self._entries)
+
+    @property
+    def stats(self) -> SessionCartStoreStats:
+        """Retorna uma cópia dos contadores atuais."""
+        self._advance()
+        self._stats.entries = len(self._entries)
+        return SessionCartStoreStats(**vars(self._stats))
+
+    def _current_tick(self) -> int:
+        return int(self.clock() / self.resolution_seconds)
+
+    def _size(self, payload: bytes) -> int:
+        return len(payload) + ENTRY_OVERHEAD_BYTES
+
+    def _touch(
+        self, session_id: str, payload: bytes, deadline: int | None
+    ) -> None:
+        """Renova o prazo da sessão e a marca como usada recentemente."""
+        if deadline is not None:
+            self._wheel[deadline % len(self._wheel)].discard(session_id)
+
+        new_deadline = self._tick + self._ttl_ticks
+        self._wheel[new_deadline % len(self._wheel)].add(session_id)
+        self._entries[session_id] = (payload, new_deadline)
+        self._entries.move_to_end(session_id)
+
+    def _forget(self, session_id: str, entry: tuple[bytes, int]) -> None:
+        self._wheel[entry[1] % len(self._wheel)].discard(session_id)
+        self._stats.bytes -= self._size(entry[0])
+
+    def _advance(self) -> None:
+        """Expira as sessões cujos prazos passaram desde a última chamada.
+
+        Cada compartimento vencido é visitado no máximo uma vez, mesmo
+        após longos períodos sem acesso.
+        """
+        now = self._current_tick()
+        if now <= self._tick:
+            return
+
+        start = max(self._tick + 1, now - len(self._wheel) + 1)
+        for tick in range(start, now + 1):
+            bucket = self._wheel[tick % len(self._wheel)]
+            if not bucket:
+                continue
+
+            for session_id in list(bucket):
+                entry = self._entries.get(session_id)
+                if entry is not None and entry[1] <= now:
+                    del self._entries[session_id]
+                    self._forget(session_id, entry)
+                    self._stats.expirations += 1
+
+        self._tick = now
+
+    def _evict(self) -> None:
+        """Descarta as sessões usadas há mais tempo até caber no orçamento."""
+        while self._stats.bytes > self.max_bytes and self._entries:
+            session_id, entry = self._entries.popitem(last=False)
+            self._forget(session_id, entry)
+            self._stats.evictions += 1
@@ -0,0 +1,168 @@
+"""Repositório de descontos que publica suas alterações no feed."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...domain.entities.discount import Discount
+from ...domain.repositories.discount_repository import DiscountRepository
+from ...domain.value_objects.money import Money
+from .discount_change_feed import (
+    OPERATION_DELETE,
+    OPERATION_SAVE,
+    DiscountChangeLog,
+)
+
+
+class ChangeFeedDiscountRepository:
+    """Decora um repositório de descontos registrando cada gravação no log.
+
+    Repositórios que confirmam cada operação, como os em memória ou o SQL
+    com um `SessionRouter`, têm a alteração registrada logo após a
+    chamada. Quando a gravação ocorre em uma sessão cuja transação é
+    confirmada por quem a criou, as alterações ficam pendentes até o
+    `commit` dessa sessão e são descartadas se ela for desfeita.
+
+    O log fica em outro banco, portanto as duas gravações não são
+    atômicas: se o processo falhar entre a confirmação e o registro, a
+    alteração não chega aos assinantes até a próxima gravação do mesmo
+    desconto.
+    """
+
+    def __init__(
+        self,
+        repository: DiscountRepository,
+        log: DiscountChangeLog,
+        session: AsyncSession | None = None,
+    ):
+        """Inicializa o repositório.
+
+        Args:
+            repository: Repositório com o estado autoritativo
+            log: Log onde as alterações são registradas
+            session: Sessão cuja confirmação libera o registro das
+                alterações (padrão: a sessão do repositório decorado,
+                se ele tiver uma)
+
+        """
+        self.repository = repository
+        self.log = log
+        self.session = session or getattr(repository, 'session', None)
+        self._pending: list[tuple[str, UUID, Discount | None]] = []
+
+        if self.session is not None:
+            sync_session = self.session.sync_session
+            event.listen(sync_session, 'after_commit', self._publish_pending)
+            event.listen(sync_session, 'after_rollback', self._discard_pending)
+
+    async def get_by_id(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo seu ID."""
+        return await self.repository.get_by_id(discount_id)
+
+    async def get_by_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo seu código."""
+        return await self.repository.get_by_code(code)
+
+    async def save(self, discount: Discount) -> Discount:
+        """Persista um desconto e registre a alteração.
+
+        Args:
+            discount: Objeto desconto a ser salvo
+
+        Returns:
+            O desconto salvo
+
+        """
+        saved = await self.repository.save(discount)
+        self._record([(OPERATION_SAVE, saved.id, saved)])
+        return saved
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote de descontos e registre as alterações juntas.
+
+        Args:
+            discounts: Descontos a serem salvos
+
+        Returns:
+            Os descontos salvos
+
+        """
+        saved = await self.repository.save_many(discounts)
+        self._record(
+            [(OPERATION_SAVE, discount.id, discount) for discount in saved]
+        )
+        return saved
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Remove um desconto e registre a alteração.
+
+        Args:
+            discount_id: ID do desconto a ser removido
+
+        """
+        await self.repository.delete(discount_id)
+        self._record([(OPERATION_DELETE, discount_id, None)])
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos e registre as alterações juntas.
+
+        Args:
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        await self.repository.delete_many(discount_ids)
+        self._record(
+            [
+                (OPERATION_DELETE, discount_id, None)
+                for discount_id in discount_ids
+            ]
+        )
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos do repositório."""
+        return await self.repository.list()
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos pelo início do código."""
+        return await self.repository.search_by_code_prefix(prefix, limit)
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos em um instante."""
+        return await self.repository.list_active(now, min_order_value)
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes."""
+        async for batch in self.repository.stream(batch_size):
+            yield batch
+
+    def _record(
+        self, changes: list[tuple[str, UUID, Discount | None]]
+    ) -> None:
+        """Registre as alterações agora ou no commit da sessão."""
+        if self.session is not None:
+            self._pending.extend(changes)
+        elif changes:
+            self.log.append_many(changes)
+
+    def _publish_pending(self, _session) -> None:
+        """Registre no log as alterações da transação confirmada."""
+        changes, self._pending = self._pending, []
+        if changes:
+            self.log.append_many(changes)
+
+    def _discard_pending(self, _session) -> None:
+        """Descarte as alterações da transação desfeita."""
+        self._pending.clear()
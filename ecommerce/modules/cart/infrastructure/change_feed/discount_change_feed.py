@@ -0,0 +1,320 @@
+"""Feed de alterações do catálogo de descontos entre processos.
+
+As alterações são registradas em um log versionado, guardado em um
+arquivo SQLite local compartilhado pelos processos de uma mesma máquina.
+Cada processo assinante acompanha o log a partir da última versão que
+aplicou e atualiza apenas os descontos alterados em sua cópia em memória.
+"""
+
+import asyncio
+import sqlite3
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import Protocol
+from uuid import UUID
+
+from ...domain.entities.discount import Discount
+from ..serialization.json_codec import CartJSONDecoder, CartJSONEncoder
+
+OPERATION_SAVE = 'save'
+OPERATION_DELETE = 'delete'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS discount_changes (
+    version INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    discount_id TEXT NOT NULL,
+    payload TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+
+@dataclass(frozen=True)
+class DiscountChange:
+    """Uma alteração registrada no log."""
+
+    version: int
+    operation: str
+    discount_id: UUID
+    discount: Discount | None
+    created_at: float
+
+
+class DiscountChangeLog:
+    """Log de alterações de descontos, monotonicamente versionado.
+
+    Cada processo deve abrir a sua própria instância apontando para o
+    mesmo arquivo. O SQLite serializa as escritas, de modo que as versões
+    ficam visíveis para os leitores na mesma ordem em que foram criadas.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Abre (ou cria) o log no arquivo informado.
+
+        Args:
+            path: Caminho do arquivo SQLite
+            clock: Relógio de parede compartilhado entre os processos
+
+        """
+        self.path = path
+        self.clock = clock
+        self._encoder = CartJSONEncoder()
+        self._decoder = CartJSONDecoder()
+        self._connection = sqlite3.connect(
+            path, timeout=30, isolation_level=None
+        )
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.execute(_SCHEMA)
+
+    def append(
+        self,
+        operation: str,
+        discount_id: UUID,
+        discount: Discount | None = None,
+    ) -> int:
+        """Registra uma alteração e retorna a sua versão.
+
+        Args:
+            operation: `OPERATION_SAVE` ou `OPERATION_DELETE`
+            discount_id: ID do desconto alterado
+            discount: Estado salvo do desconto (apenas para gravações)
+
+        Returns:
+            Versão atribuída à alteração
+
+        """
+        return self.append_many([(operation, discount_id, discount)])
+
+    def append_many(
+        self,
+        changes: Iterable[tuple[str, UUID, Discount | None]],
+    ) -> int:
+        """Registra várias alterações em uma única transação.
+
+        Args:
+            changes: Triplas (operação, ID do desconto, desconto)
+
+        Returns:
+            Versão da última alteração registrada
+
+        """
+        now = self.clock()
+        rows = [
+            (
+                operation,
+                str(discount_id),
+                self._encoder.encode(discount) if discount else None,
+                now,
+            )
+            for operation, discount_id, discount in changes
+        ]
+
+        cursor = self._connection.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.executemany(
+                'INSERT INTO discount_changes '
+                '(operation, discount_id, payload, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                rows,
+            )
+            version = cursor.execute(
+                'SELECT MAX(version) FROM discount_changes'
+            ).fetchone()[0]
+            cursor.execute('COMMIT')
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+
+        return version
+
+    def read_since(
+        self, version: int, limit: int = 1000
+    ) -> list[DiscountChange]:
+        """Lê as alterações posteriores a uma versão, em ordem.
+
+        Args:
+            version: Última versão já aplicada pelo leitor
+            limit: Quantidade máxima de alterações retornadas
+
+        Returns:
+            Alterações com versão maior que `version`
+
+        """
+        rows = self._connection.execute(
+            'SELECT version, operation, discount_id, payload, created_at '
+            'FROM discount_changes WHERE version > ? '
+            'ORDER BY version LIMIT ?',
+            (version, limit),
+        ).fetchall()
+
+        return [
+            DiscountChange(
+                version=row[0],
+                operation=row[1],
+                discount_id=UUID(row[2]),
+                discount=(
+                    self._decoder.decode(row[3], Discount) if row[3] else None
+                ),
+                created_at=row[4],
+            )
+            for row in rows
+        ]
+
+    def latest_version(self) -> int:
+        """Retorna a versão mais recente registrada (0 se vazio)."""
+        row = self._connection.execute(
+            'SELECT MAX(version) FROM discount_changes'
+        ).fetchone()
+        return row[0] or 0
+
+    def truncate_before(self, version: int) -> int:
+        """Remove as alterações anteriores a uma versão.
+
+        Deve receber a menor versão já aplicada por todos os assinantes.
+
+        Returns:
+            Quantidade de alterações removidas
+
+        """
+        cursor = self._connection.execute(
+            'DELETE FROM discount_changes WHERE version < ?', (version,)
+        )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Fecha a conexão com o arquivo do log."""
+        self._connection.close()
+
+
+class ChangeTarget(Protocol):
+    """Estrutura em memória atualizada pelo assinante."""
+
+    async def save(self, discount: Discount) -> Discount:
+        """Aplica a gravação de um desconto."""
+        ...
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Aplica a remoção de um desconto."""
+        ...
+
+
+@dataclass
+class SubscriberStats:
+    """Métricas de um assinante do feed."""
+
+    version: int = 0
+    applied: int = 0
+    polls: int = 0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+
+
+class DiscountChangeSubscriber:
+    """Acompanha o log e aplica as alterações a uma estrutura em memória.
+
+    A defasagem de cada alteração é medida entre o seu registro no log e
+    a sua aplicação local; com um intervalo de consulta `poll_interval`,
+    ela fica limitada a aproximadamente esse intervalo somado ao tempo de
+    aplicação de um lote.
+    """
+
+    def __init__(
+        self,
+        log: DiscountChangeLog,
+        target: ChangeTarget,
+        version: int = 0,
+        batch_size: int = 1000,
+        poll_interval: float = 0.05,
+    ):
+        """Inicializa o assinante.
+
+        Args:
+            log: Log de alterações aberto por este processo
+            target: Estrutura em memória a ser mantida atualizada
+            version: Versão a partir da qual acompanhar o log
+            batch_size: Quantidade máxima de alterações lidas por consulta
+            poll_interval: Intervalo entre consultas, em segundos
+
+        """
+        self.log = log
+        self.target = target
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.stats = SubscriberStats(version=version)
+
+    @property
+    def version(self) -> int:
+        """Última versão aplicada."""
+        return self.stats.version
+
+    async def bootstrap(self, source) -> int:
+        """Carrega o catálogo completo e passa a acompanhar o log.
+
+        A versão é lida antes da carga; alterações concorrentes à carga
+        são reaplicadas em seguida, o que é seguro porque aplicar uma
+        alteração é idempotente.
+
+        Args:
+            source: Repositório de descontos com o estado autoritativo
+
+        Returns:
+            Versão a partir da qual o log será acompanhado
+
+        """
+        version = self.log.latest_version()
+        async for batch in source.stream(self.batch_size):
+            for discount in batch:
+                await self.target.save(discount)
+
+        self.stats.version = version
+        return version
+
+    async def poll(self) -> int:
+        """Aplica as alterações pendentes.
+
+        Returns:
+            Quantidade de alterações aplicadas
+
+        """
+        self.stats.polls += 1
+        applied = 0
+
+        while True:
+            changes = self.log.read_since(self.stats.version, self.batch_size)
+            if not changes:
+                return applied
+
+            for change in changes:
+                if change.operation == OPERATION_DELETE:
+                    await self.target.delete(change.discount_id)
+                else:
+                    await self.target.save(change.discount)
+                self.stats.version = change.version
+
+            lag = self.log.clock() - changes[-1].created_at
+            self.stats.last_lag_seconds = lag
+            self.stats.max_lag_seconds = max(self.stats.max_lag_seconds, lag)
+            self.stats.applied += len(changes)
+            applied += len(changes)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Consulta o log periodicamente até `stop` ser sinalizado.
+
+        Args:
+            stop: Evento que encerra o acompanhamento
+
+        """
+        while not stop.is_set():
+            await self.poll()
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
@@ -0,0 +1,76 @@
+"""Migra os valores de desconto de Float para centésimos inteiros.
+
+Bancos criados antes desta mudança guardam `value` e
+`minimum_order_value` como ponto flutuante. A migração adiciona as
+colunas inteiras, converte as linhas existentes, remove as colunas
+antigas e cria os índices de descontos ativos. Pode ser executada mais
+de uma vez: bancos já migrados não são alterados.
+
+Uso com um engine assíncrono::
+
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+"""
+
+from sqlalchemy import Connection, inspect, text
+from sqlalchemy.schema import CreateIndex
+
+from ....domain.value_objects.money import MINOR_UNITS
+from ..models.discount_model import DiscountModel
+
+_LEGACY_COLUMNS = {
+    'value': 'value_minor',
+    'minimum_order_value': 'minimum_order_value_minor',
+}
+
+
+def upgrade(connection: Connection) -> int:
+    """Converta os valores legados e crie os índices de descontos ativos.
+
+    Args:
+        connection: Conexão síncrona dentro de uma transação
+
+    Returns:
+        Quantidade de descontos convertidos
+
+    """
+    table = DiscountModel.__table__
+    columns = {
+        column['name']
+        for column in inspect(connection).get_columns(table.name)
+    }
+
+    migrated = 0
+    legacy = [name for name in _LEGACY_COLUMNS if name in columns]
+    if legacy:
+        for new in _LEGACY_COLUMNS.values():
+            if new not in columns:
+                connection.execute(
+                    text(
+                        f'ALTER TABLE {table.name} '
+                        f'ADD COLUMN {new} BIGINT NOT NULL DEFAULT 0'
+                    )
+                )
+
+        # ROUND desfaz o erro de representação do ponto flutuante; os
+        # valores foram gravados a partir de decimais com duas casas
+        assignments = ', '.join(
+            f'{_LEGACY_COLUMNS[old]} = '
+            f'CAST(ROUND(COALESCE({old}, 0) * {MINOR_UNITS}) AS BIGINT)'
+            for old in legacy
+        )
+        migrated = connection.execute(
+            text(f'UPDATE {table.name} SET {assignments}')
+        ).rowcount
+
+        for old in legacy:
+            connection.execute(
+                text(f'ALTER TABLE {table.name} DROP COLUMN {old}')
+            )
+
+    # IF NOT EXISTS em vez de checkfirst: a reflexão do SQLite ignora
+    # índices sobre expressões, como o de lower(code)
+    for index in table.indexes:
+        connection.execute(CreateIndex(index, if_not_exists=True))
+
+    return migrated
@@ -0,0 +1,55 @@
+"""Adiciona as colunas de produtos e categorias alvo dos descontos.
+
+Bancos criados antes dos descontos direcionados não têm as colunas
+`product_ids` e `category_ids` em `discounts` e `discounts_archive`, nem
+`category_id` em `cart_items`. A migração as adiciona, nulas, o que não
+altera os descontos existentes: todos continuam valendo para o pedido
+inteiro. Pode ser executada mais de uma vez.
+
+Uso com um engine assíncrono::
+
+    async with engine.begin() as conn:
+        await conn.run_sync(upgrade)
+"""
+
+from sqlalchemy import Connection, inspect, text
+
+from ..models.cart_model import CartItemModel
+from ..models.discount_model import DiscountArchiveModel, DiscountModel
+
+_NEW_COLUMNS = (
+    (DiscountModel.__table__, 'product_ids'),
+    (DiscountModel.__table__, 'category_ids'),
+    (DiscountArchiveModel.__table__, 'product_ids'),
+    (DiscountArchiveModel.__table__, 'category_ids'),
+    (CartItemModel.__table__, 'category_id'),
+)
+
+
+def upgrade(connection: Connection) -> int:
+    """Adicione as colunas que faltam nas tabelas existentes.
+
+    Args:
+        connection: Conexão síncrona dentro de uma transação
+
+    Returns:
+        Quantidade de colunas adicionadas
+
+    """
+    inspector = inspect(connection)
+    tables = set(inspector.get_table_names())
+
+    added = 0
+    for table, column in _NEW_COLUMNS:
+        if table.name not in tables:
+            continue
+        existing = {item['name'] for item in inspector.get_columns(table.name)}
+        if column in existing:
+            continue
+        column_type = table.c[column].type.compile(connection.dialect)
+        connection.execute(
+            text(f'ALTER TABLE {table.name} ADD COLUMN {column} {column_type}')
+        )
+        added += 1
+
+    return added
@@ -0,0 +1,70 @@
+"""Modelos ORM para carrinho e itens de carrinho usando SQLAlchemy."""
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Uuid,
+)
+
+from .base import Base
+from .discount_model import DiscountModel
+
+
+class CartModel(Base):
+    """Modelo ORM para a entidade Cart."""
+
+    __tablename__ = 'carts'
+
+    id = Column(Uuid, primary_key=True, default=uuid4)
+    user_id = Column(Uuid, nullable=True, index=True)
+    session_id = Column(String, nullable=True, index=True)
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
+class CartItemModel(Base):
+    """Modelo ORM para a entidade CartItem."""
+
+    __tablename__ = 'cart_items'
+
+    id = Column(Uuid, primary_key=True, default=uuid4)
+    cart_id = Column(
+        Uuid,
+        ForeignKey('carts.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True,
+    )
+    product_id = Column(Uuid, nullable=False)
+    category_id = Column(Uuid, nullable=True)
+    quantity = Column(Integer, nullable=False)
+    price = Column(Float, nullable=False, default=0.0)
+
+    # Timestamps
+    added_at = Column(DateTime, default=datetime.now)
+    updated_at = Column(DateTime, default=datetime.now)
+
+
+class CartDiscountModel(Base):
+    """Associação entre carrinhos e descontos aplicados."""
+
+    __tablename__ = 'cart_discounts'
+
+    cart_id = Column(
+        Uuid,
+        ForeignKey('carts.id', ondelete='CASCADE'),
+        primary_key=True,
+    )
+    discount_id = Column(
+        Uuid,
+        ForeignKey(DiscountModel.id, ondelete='CASCADE'),
+        primary_key=True,
+    )
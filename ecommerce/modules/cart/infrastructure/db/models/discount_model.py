@@ -3,8 +3,17 @@
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, Float, Integer, String
-from sqlalchemy.dialects.postgresql import UUID as PgUUID
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    Uuid,
+    func,
+)
 
 from .base import Base
 
@@ -14,18 +23,68 @@ class DiscountModel(Base):
 
     __tablename__ = 'discounts'
 
-    id = Column(PgUUID(as_uuid=True), primary_key=True, default=uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid4)
     type = Column(String, nullable=False)  # PERCENTAGE, FIXED_AMOUNT, COUPON
-    value = Column(Float, nullable=False)
+    # Percentual ou valor fixo, em centésimos
+    value_minor = Column(BigInteger, nullable=False)
     code = Column(String, unique=True, nullable=True, index=True)
     description = Column(String, nullable=True)
-    minimum_order_value = Column(Float, default=0.0)
+    minimum_order_value_minor = Column(BigInteger, nullable=False, default=0)
     currency = Column(String, default='BRL')
     valid_from = Column(DateTime, default=datetime.now)
     valid_until = Column(DateTime, nullable=True)
     max_usage_count = Column(Integer, nullable=True)
     current_usage_count = Column(Integer, default=0)
+    # Produtos e categorias alvo, em hexadecimal separados por espaço;
+    # nulos nos descontos que valem para o pedido inteiro
+    product_ids = Column(Text, nullable=True)
+    category_ids = Column(Text, nullable=True)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        # Descontos sem data de término: busca por moeda e valor mínimo
+        Index(
+            'ix_discounts_open_ended',
+            'currency',
+            'minimum_order_value_minor',
+            'valid_from',
+            sqlite_where=valid_until.is_(None),
+            postgresql_where=valid_until.is_(None),
+        ),
+        # Descontos com data de término: busca pelo fim da validade, que
+        # descarta os já expirados sem visitá-los
+        Index('ix_discounts_validity', 'valid_until', 'valid_from'),
+        # Busca de cupons por prefixo sem distinção de caixa; no
+        # PostgreSQL, `text_pattern_ops` atende o LIKE em qualquer collation
+        Index(
+            'ix_discounts_code_lower',
+            func.lower(code).label('code_lower'),
+            postgresql_ops={'code_lower': 'text_pattern_ops'},
+        ),
+    )
+
+
+class DiscountArchiveModel(Base):
+    """Cópia dos descontos removidos pela limpeza de descontos inativos."""
+
+    __tablename__ = 'discounts_archive'
+
+    id = Column(Uuid, primary_key=True)
+    type = Column(String, nullable=False)
+    value_minor = Column(BigInteger, nullable=False)
+    code = Column(String, nullable=True, index=True)
+    description = Column(String, nullable=True)
+    minimum_order_value_minor = Column(BigInteger, nullable=False)
+    currency = Column(String)
+    valid_from = Column(DateTime)
+    valid_until = Column(DateTime, nullable=True)
+    max_usage_count = Column(Integer, nullable=True)
+    current_usage_count = Column(Integer)
+    product_ids = Column(Text, nullable=True)
+    category_ids = Column(Text, nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, nullable=False, default=datetime.now)
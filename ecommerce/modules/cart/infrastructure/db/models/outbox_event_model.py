@@ -0,0 +1,24 @@
+"""Modelo ORM para a caixa de saída de eventos de domínio."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String, Text, Uuid
+
+from .base import Base
+
+
+class OutboxEventModel(Base):
+    """Evento gravado na mesma transação da alteração que o originou.
+
+    As linhas são removidas pelo retransmissor depois de entregues, de
+    modo que a tabela contém apenas os eventos pendentes.
+    """
+
+    __tablename__ = 'outbox_events'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String, nullable=False)
+    aggregate_id = Column(Uuid, nullable=False)
+    # Estado do agregado após a alteração, em JSON
+    payload = Column(Text, nullable=True)
+    occurred_at = Column(DateTime, nullable=False, default=datetime.now)
@@ -0,0 +1,150 @@
+"""Rastreamento de alterações nos itens de carrinhos carregados."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from ....domain.entities.cart import Cart
+from ....domain.entities.cart_item import CartItem
+
+
+def item_state(item: CartItem) -> tuple:
+    """Retorna o estado persistível de um item, usado para comparação."""
+    return (
+        item.product_id,
+        item.category_id,
+        item.quantity,
+        item.price,
+        item.added_at,
+        item.updated_at,
+    )
+
+
+@dataclass
+class CartChanges:
+    """Diferença entre o estado carregado de um carrinho e o atual."""
+
+    added: list[CartItem] = field(default_factory=list)
+    changed: list[CartItem] = field(default_factory=list)
+    removed: list[UUID] = field(default_factory=list)
+    discounts_added: list[UUID] = field(default_factory=list)
+    discounts_removed: list[UUID] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Quantidade total de linhas a gravar."""
+        return (
+            len(self.added)
+            + len(self.changed)
+            + len(self.removed)
+            + len(self.discounts_added)
+            + len(self.discounts_removed)
+        )
+
+
+class CartChangeTracker:
+    """Guarda o estado dos carrinhos carregados para calcular diferenças.
+
+    Cada repositório mantém o seu rastreador, de modo que o estado
+    registrado acompanha a vida útil da sessão de banco de dados.
+    """
+
+    def __init__(self):
+        """Inicializa o rastreador sem carrinhos registrados."""
+        self._items: dict[UUID, dict[UUID, tuple]] = {}
+        self._discounts: dict[UUID, set[UUID]] = {}
+
+    def is_tracked(self, cart_id: UUID) -> bool:
+        """Indica se o carrinho foi carregado ou salvo por este repositório."""
+        return cart_id in self._items
+
+    def track(self, cart: Cart) -> None:
+        """Registra o estado atual do carrinho como persistido.
+
+        Args:
+            cart: Carrinho recém carregado ou salvo
+
+        """
+        self.track_state(
+            cart.id,
+            cart.items,
+            {discount.id for discount in cart.discounts},
+        )
+
+    def track_state(
+        self,
+        cart_id: UUID,
+        items: Iterable[CartItem],
+        discount_ids: set[UUID],
+    ) -> None:
+        """Registra diretamente o estado persistido de um carrinho.
+
+        Args:
+            cart_id: ID do carrinho
+            items: Itens gravados
+            discount_ids: IDs dos descontos associados
+
+        """
+        self._items[cart_id] = {item.id: item_state(item) for item in items}
+        self._discounts[cart_id] = set(discount_ids)
+
+    def changes(self, cart: Cart) -> CartChanges:
+        """Calcula o que mudou no carrinho desde o último registro.
+
+        Carrinhos nunca registrados são tratados como inteiramente novos.
+
+        Args:
+            cart: Carrinho com o estado atual
+
+        Returns:
+            Itens adicionados, alterados e removidos
+
+        """
+        loaded = self._items.get(cart.id, {})
+        changes = CartChanges()
+
+        current_ids = set()
+        for item in cart.items:
+            current_ids.add(item.id)
+            state = loaded.get(item.id)
+            if state is None:
+                changes.added.append(item)
+            elif state != item_state(item):
+                changes.changed.append(item)
+
+        changes.removed = [
+            item_id for item_id in loaded if item_id not in current_ids
+        ]
+
+        loaded_discounts = self._discounts.get(cart.id, set())
+        current_discounts = {discount.id for discount in cart.discounts}
+        changes.discounts_added = list(current_discounts - loaded_discounts)
+        changes.discounts_removed = list(loaded_discounts - current_discounts)
+
+        return changes
+
+    def apply(self, cart: Cart, changes: CartChanges) -> None:
+        """Incorpora ao estado registrado as alterações já gravadas.
+
+        Atualiza apenas as entradas afetadas, sem percorrer o carrinho.
+
+        Args:
+            cart: Carrinho que foi salvo
+            changes: Alterações gravadas
+
+        """
+        items = self._items.setdefault(cart.id, {})
+        for item in changes.added:
+            items[item.id] = item_state(item)
+        for item in changes.changed:
+            items[item.id] = item_state(item)
+        for item_id in changes.removed:
+            items.pop(item_id, None)
+
+        discounts = self._discounts.setdefault(cart.id, set())
+        discounts.update(changes.discounts_added)
+        discounts.difference_update(changes.discounts_removed)
+
+    def forget(self, cart_id: UUID) -> None:
+        """Descarta o estado registrado de um carrinho."""
+        self._items.pop(cart_id, None)
+        self._discounts.pop(cart_id, None)
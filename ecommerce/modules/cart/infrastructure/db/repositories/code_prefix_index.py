@@ -0,0 +1,90 @@
+"""Índice ordenado de códigos de cupom para buscas por prefixo."""
+
+from bisect import bisect_left
+
+
+class CodePrefixIndex:
+    """Lista ordenada de códigos para buscas por prefixo sem caixa.
+
+    Cada entrada é o par (código em minúsculas, código original). Uma
+    busca localiza o início do prefixo por bisseção e percorre apenas as
+    entradas que o compartilham, de modo que o custo depende do tamanho
+    do resultado e não do catálogo.
+
+    Inclusões ficam pendentes até a próxima busca, quando são ordenadas e
+    intercaladas de uma só vez; remoções apenas marcam a entrada, que é
+    ignorada nas buscas e descartada quando as marcadas passam da metade
+    do índice. Assim, cargas em lote não pagam uma inserção ordenada por
+    código.
+
+    Os códigos são comparados com `str.lower`, como o `lower()` do SQL.
+    """
+
+    def __init__(self):
+        """Inicializa o índice vazio."""
+        self._entries: list[tuple[str, str]] = []
+        self._pending: list[tuple[str, str]] = []
+        self._codes: set[str] = set()
+        self._stale = 0
+
+    def __len__(self) -> int:
+        """Quantidade de códigos indexados."""
+        return len(self._codes)
+
+    def add(self, code: str) -> None:
+        """Inclui um código no índice, se ainda não estiver nele."""
+        if code in self._codes:
+            return
+        self._codes.add(code)
+        self._pending.append((code.lower(), code))
+
+    def discard(self, code: str) -> None:
+        """Remove um código do índice, se estiver nele."""
+        if code in self._codes:
+            self._codes.remove(code)
+            self._stale += 1
+
+    def search(self, prefix: str, limit: int) -> list[str]:
+        """Busca os primeiros códigos que começam com o prefixo.
+
+        Args:
+            prefix: Início do código, sem distinção de caixa
+            limit: Quantidade máxima de códigos retornados
+
+        Returns:
+            Códigos encontrados, em ordem alfabética sem caixa
+
+        """
+        if limit <= 0:
+            return []
+        self._refresh()
+
+        key = prefix.lower()
+        entries = self._entries
+        codes: list[str] = []
+        previous = None
+        for index in range(bisect_left(entries, (key,)), len(entries)):
+            entry = entries[index]
+            if not entry[0].startswith(key):
+                break
+            # Um código removido e incluído de novo aparece duplicado
+            if entry != previous and entry[1] in self._codes:
+                codes.append(entry[1])
+                if len(codes) >= limit:
+                    break
+            previous = entry
+        return codes
+
+    def _refresh(self) -> None:
+        if self._stale > len(self._entries) // 2:
+            self._entries = sorted(
+                {(code.lower(), code) for code in self._codes}
+            )
+            self._pending.clear()
+            self._stale = 0
+        elif self._pending:
+            # Duas sequências ordenadas: o timsort as intercala em O(n)
+            self._pending.sort()
+            self._entries.extend(self._pending)
+            self._entries.sort()
+            self._pending.clear()
@@ -0,0 +1,410 @@
+"""Repositório de descontos em memória com armazenamento compacto."""
+
+from __future__ import annotations
+
+import sys
+from array import array
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from ....domain.entities.discount import Discount, DiscountType
+from ....domain.value_objects.money import (
+    Money,
+    from_minor_units,
+    to_minor_units,
+)
+from .code_prefix_index import CodePrefixIndex
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# Marca ausência de valor nas colunas inteiras
+_NONE = -(2**63)
+_NO_TARGETS = (frozenset(), frozenset())
+
+_TYPES = list(DiscountType)
+_TYPE_INDEX = {
+    discount_type: index for index, discount_type in enumerate(_TYPES)
+}
+
+
+def _to_micros(value: datetime | None) -> int:
+    if value is None:
+        return _NONE
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime | None:
+    if value == _NONE:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class CompactDiscountRepository:
+    """Repositório de descontos em memória organizado em colunas.
+
+    Em vez de guardar um objeto `Discount` por desconto, cada atributo
+    ocupa uma posição em um `array` tipado (estrutura de arrays): valores
+    em centésimos, datas em microssegundos e contadores como inteiros de
+    8 bytes, IDs como 16 bytes em um único `bytearray`. As moedas são
+    guardadas como índices em uma tabela de strings internadas. As
+    entidades são montadas apenas na leitura, compartilhando as
+    instâncias de `Money` zero.
+
+    Os alvos dos descontos direcionados ficam em um dicionário à parte,
+    indexado pela posição, que não ocupa espaço para os demais.
+
+    As datas devem ser ingênuas (sem fuso), como as criadas pelo domínio.
+    """
+
+    def __init__(self):
+        """Inicializa o repositório com as colunas vazias."""
+        self._ids = bytearray()
+        self._types = array('B')
+        self._values = array('q')
+        self._minimums = array('q')
+        self._maximums = array('q')
+        self._currencies = array('H')
+        # Moeda do valor de descontos de valor fixo e cupons
+        self._value_currencies = array('H')
+        self._valid_from = array('q')
+        self._valid_until = array('q')
+        self._max_usage = array('q')
+        self._usage = array('q')
+        self._codes: list[str | None] = []
+        self._descriptions: list[str] = []
+        # posição -> (produtos, categorias), apenas dos direcionados
+        self._targets: dict[int, tuple[frozenset, frozenset]] = {}
+
+        self._currency_table: list[str] = []
+        self._currency_index: dict[str, int] = {}
+        self._free: list[int] = []
+
+        self._id_index: dict[int, int] = {}
+        self.code_index: dict[str, int] = {}
+        # Criado na primeira busca por prefixo, para não pesar em quem
+        # não a usa
+        self._prefix_index: CodePrefixIndex | None = None
+        # Incrementada a cada alteração, para invalidar caches derivados
+        self.version = 0
+
+    def __len__(self) -> int:
+        """Quantidade de descontos guardados."""
+        return len(self._id_index)
+
+    async def get_by_id(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo seu ID.
+
+        Args:
+            discount_id: ID único do desconto
+
+        Returns:
+            O desconto encontrado ou None se não existir
+
+        """
+        row = self._id_index.get(discount_id.int)
+        return None if row is None else self._materialize(row)
+
+    async def get_by_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo seu código (para cupons).
+
+        Args:
+            code: Código do cupom/desconto
+
+        Returns:
+            O desconto encontrado ou None se não existir
+
+        """
+        row = self.code_index.get(code)
+        return None if row is None else self._materialize(row)
+
+    async def save(self, discount: Discount) -> Discount:
+        """Persista um desconto no repositório.
+
+        Args:
+            discount: Objeto desconto a ser salvo
+
+        Returns:
+            O desconto salvo
+
+        """
+        self._store(discount)
+        self.version += 1
+        return discount
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote de descontos no repositório.
+
+        Args:
+            discounts: Descontos a serem salvos
+
+        Returns:
+            Os descontos salvos
+
+        """
+        for discount in discounts:
+            self._store(discount)
+        self.version += 1
+        return discounts
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Remove um desconto do repositório.
+
+        A posição liberada é reaproveitada pelo próximo desconto novo.
+
+        Args:
+            discount_id: ID do desconto a ser removido
+
+        """
+        row = self._id_index.pop(discount_id.int, None)
+        if row is None:
+            return
+
+        code = self._codes[row]
+        if code is not None and self.code_index.get(code) == row:
+            del self.code_index[code]
+            if self._prefix_index is not None:
+                self._prefix_index.discard(code)
+        self._codes[row] = None
+        self._descriptions[row] = ''
+        self._targets.pop(row, None)
+        self._free.append(row)
+        self.version += 1
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos do repositório.
+
+        Args:
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        for discount_id in discount_ids:
+            await self.delete(discount_id)
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos do repositório.
+
+        Returns:
+            Lista com todos os descontos
+
+        """
+        return [self._materialize(row) for row in self._id_index.values()]
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos cujo código começa com o prefixo.
+
+        Args:
+            prefix: Início do código, sem distinção de caixa
+            limit: Quantidade máxima de descontos retornados
+
+        Returns:
+            Descontos encontrados, ordenados pelo código sem caixa
+
+        """
+        if self._prefix_index is None:
+            self._prefix_index = CodePrefixIndex()
+            for code in self.code_index:
+                self._prefix_index.add(code)
+
+        return [
+            self._materialize(self.code_index[code])
+            for code in self._prefix_index.search(prefix, limit)
+        ]
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos em um instante.
+
+        A filtragem percorre apenas as colunas numéricas; somente os
+        descontos selecionados são convertidos em entidades.
+
+        Args:
+            now: Instante da consulta (padrão: agora)
+            min_order_value: Se informado, retorna apenas descontos na
+                mesma moeda cujo valor mínimo de pedido não o excede
+
+        Returns:
+            Descontos ativos ordenados por ID
+
+        """
+        instant = _to_micros(now or datetime.now())
+        currency = None
+        limit = None
+        if min_order_value is not None:
+            currency = self._currency_index.get(min_order_value.currency)
+            if currency is None:
+                return []
+            limit = to_minor_units(min_order_value.amount)
+
+        valid_from, valid_until = self._valid_from, self._valid_until
+        max_usage, usage = self._max_usage, self._usage
+        rows = []
+        for row in self._id_index.values():
+            if valid_from[row] > instant:
+                continue
+            until = valid_until[row]
+            if until != _NONE and until < instant:
+                continue
+            maximum = max_usage[row]
+            if maximum != _NONE and usage[row] >= maximum:
+                continue
+            if limit is not None and (
+                self._currencies[row] != currency
+                or self._minimums[row] > limit
+            ):
+                continue
+            rows.append(row)
+
+        rows.sort(key=self._row_id)
+        return [self._materialize(row) for row in rows]
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Yields:
+            Lotes de descontos
+
+        """
+        ids = list(self._id_index)
+        for start in range(0, len(ids), batch_size):
+            batch = [
+                self._materialize(row)
+                for key in ids[start : start + batch_size]
+                if (row := self._id_index.get(key)) is not None
+            ]
+            if batch:
+                yield batch
+
+    def _intern_currency(self, currency: str) -> int:
+        index = self._currency_index.get(currency)
+        if index is None:
+            index = len(self._currency_table)
+            self._currency_table.append(sys.intern(currency))
+            self._currency_index[currency] = index
+        return index
+
+    def _row_id(self, row: int) -> bytes:
+        return bytes(self._ids[row * 16 : row * 16 + 16])
+
+    def _store(self, discount: Discount) -> None:
+        """Grava o desconto em uma posição nova ou na que já ocupava."""
+        minimum = discount.minimum_order_value or Money.zero()
+        currency = self._intern_currency(minimum.currency)
+
+        value = discount.value
+        value_currency = currency
+        if isinstance(value, Money):
+            value_currency = self._intern_currency(value.currency)
+            value = value.amount
+
+        values = (
+            _TYPE_INDEX[discount.type],
+            to_minor_units(value),
+            to_minor_units(minimum.amount),
+            to_minor_units(discount.maximum_discount_amount.amount),
+            currency,
+            value_currency,
+            _to_micros(discount.valid_from),
+            _to_micros(discount.valid_until),
+            _NONE
+            if discount.max_usage_count is None
+            else discount.max_usage_count,
+            discount.current_usage_count,
+        )
+        columns = (
+            self._types,
+            self._values,
+            self._minimums,
+            self._maximums,
+            self._currencies,
+            self._value_currencies,
+            self._valid_from,
+            self._valid_until,
+            self._max_usage,
+            self._usage,
+        )
+
+        key = discount.id.int
+        row = self._id_index.get(key)
+        if row is None and self._free:
+            row = self._free.pop()
+        if row is None:
+            row = len(self._types)
+            self._ids += discount.id.bytes
+            for column, item in zip(columns, values, strict=True):
+                column.append(item)
+            self._codes.append(None)
+            self._descriptions.append('')
+        else:
+            self._ids[row * 16 : row * 16 + 16] = discount.id.bytes
+            for column, item in zip(columns, values, strict=True):
+                column[row] = item
+
+        previous_code = self._codes[row]
+        if (
+            previous_code is not None
+            and self.code_index.get(previous_code) == row
+        ):
+            del self.code_index[previous_code]
+            if self._prefix_index is not None:
+                self._prefix_index.discard(previous_code)
+        if discount.code:
+            self.code_index[discount.code] = row
+            if self._prefix_index is not None:
+                self._prefix_index.add(discount.code)
+
+        self._codes[row] = discount.code
+        self._descriptions[row] = discount.description
+        if discount.is_targeted:
+            self._targets[row] = (
+                discount.product_ids,
+                discount.category_ids,
+            )
+        else:
+            self._targets.pop(row, None)
+        self._id_index[key] = row
+
+    def _money(self, minor_units: int, currency: str) -> Money:
+        if not minor_units:
+            return Money.zero(currency)
+        return Money(from_minor_units(minor_units), currency)
+
+    def _materialize(self, row: int) -> Discount:
+        """Monta a entidade a partir de uma posição das colunas."""
+        currency = self._currency_table[self._currencies[row]]
+        discount_type = _TYPES[self._types[row]]
+
+        value = from_minor_units(self._values[row])
+        if discount_type != DiscountType.PERCENTAGE:
+            value = Money(
+                value, self._currency_table[self._value_currencies[row]]
+            )
+
+        minimum = self._minimums[row]
+        max_usage = self._max_usage[row]
+        product_ids, category_ids = self._targets.get(row, _NO_TARGETS)
+        return Discount(
+            id=UUID(bytes=self._row_id(row)),
+            type=discount_type,
+            value=value,
+            code=self._codes[row],
+            description=self._descriptions[row],
+            minimum_order_value=self._money(minimum, currency),
+            maximum_discount_amount=self._money(self._maximums[row], currency),
+            valid_from=_from_micros(self._valid_from[row]),
+            valid_until=_from_micros(self._valid_until[row]),
+            max_usage_count=None if max_usage == _NONE else max_usage,
+            current_usage_count=self._usage[row],
+            product_ids=product_ids,
+            category_ids=category_ids,
+        )
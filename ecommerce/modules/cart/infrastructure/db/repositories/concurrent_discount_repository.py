@@ -0,0 +1,308 @@
+"""Repositório de descontos em memória seguro para uso entre threads."""
+
+from __future__ import annotations
+
+import copy
+import threading
+from collections.abc import AsyncIterator
+from datetime import datetime
+from uuid import UUID
+
+from ....domain.entities.discount import Discount
+from ....domain.value_objects.money import Money
+from .code_prefix_index import CodePrefixIndex
+
+
+class _Stripe:
+    """Parte do repositório protegida por uma única trava."""
+
+    __slots__ = ('lock', 'discounts', 'codes', 'indexed_codes')
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.discounts: dict[UUID, Discount] = {}
+        self.codes: dict[str, UUID] = {}
+        # Código sob o qual cada desconto desta partição está indexado
+        self.indexed_codes: dict[UUID, str] = {}
+
+
+class ConcurrentDiscountRepository:
+    """Repositório de descontos em memória com travas particionadas.
+
+    Descontos e códigos são distribuídos em `stripes` partições, cada uma
+    com a sua trava, de modo que gravações em descontos diferentes
+    raramente disputam a mesma trava. As leituras não adquirem travas:
+    consultas a um dicionário são atômicas tanto no CPython com GIL
+    quanto no build sem GIL, e as gravações publicam o desconto antes do
+    seu código, de modo que um código encontrado sempre aponta para um
+    desconto existente.
+
+    Os métodos síncronos (`lookup`, `lookup_code`, `store`, `remove` e
+    `redeem`) podem ser chamados diretamente de várias threads; os
+    métodos assíncronos implementam o `DiscountRepository`.
+    """
+
+    def __init__(self, stripes: int = 64):
+        """Inicializa o repositório.
+
+        Args:
+            stripes: Quantidade de partições, cada uma com a sua trava
+
+        """
+        if stripes <= 0:
+            raise ValueError('Quantidade de partições deve ser positiva')
+
+        self._stripes = tuple(_Stripe() for _ in range(stripes))
+        self._version_lock = threading.Lock()
+        self._prefix_index = CodePrefixIndex()
+        self._prefix_lock = threading.Lock()
+        # Incrementada a cada alteração, para invalidar caches derivados
+        self.version = 0
+
+    def lookup(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo seu ID sem adquirir travas."""
+        return self._stripe(discount_id).discounts.get(discount_id)
+
+    def lookup_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo seu código sem adquirir travas."""
+        discount_id = self._stripe(code).codes.get(code)
+        if discount_id is None:
+            return None
+        return self.lookup(discount_id)
+
+    def store(self, discount: Discount) -> Discount:
+        """Grava uma cópia do desconto e atualiza o índice de códigos.
+
+        Args:
+            discount: Desconto a ser gravado
+
+        Returns:
+            A cópia guardada
+
+        """
+        stripe = self._stripe(discount.id)
+        # A própria instância guardada, alterada no lugar (por exemplo por
+        # `redeem`), é mantida: substituí-la por uma cópia perderia os usos
+        # registrados concorrentemente
+        live = stripe.discounts.get(discount.id) is discount
+        saved = discount if live else copy.deepcopy(discount)
+        with stripe.lock:
+            if not live:
+                stripe.discounts[saved.id] = saved
+            previous_code = stripe.indexed_codes.get(saved.id)
+            if saved.code:
+                stripe.indexed_codes[saved.id] = saved.code
+            else:
+                stripe.indexed_codes.pop(saved.id, None)
+
+        if previous_code != saved.code:
+            self._unindex_code(previous_code, saved.id)
+        if saved.code and (not live or previous_code != saved.code):
+            code_stripe = self._stripe(saved.code)
+            with code_stripe.lock:
+                code_stripe.codes[saved.code] = saved.id
+            with self._prefix_lock:
+                self._prefix_index.add(saved.code)
+
+        self._bump_version()
+        return saved
+
+    def remove(self, discount_id: UUID) -> None:
+        """Remove um desconto e o seu código do índice."""
+        stripe = self._stripe(discount_id)
+        with stripe.lock:
+            discount = stripe.discounts.pop(discount_id, None)
+            code = stripe.indexed_codes.pop(discount_id, None)
+
+        if discount is not None:
+            self._unindex_code(code, discount_id)
+            self._bump_version()
+
+    def redeem(self, discount_id: UUID) -> bool:
+        """Registra um uso do desconto guardado, respeitando o limite.
+
+        Args:
+            discount_id: ID do desconto resgatado
+
+        Returns:
+            True se o uso foi registrado, False se o desconto não existe
+            ou está esgotado
+
+        """
+        discount = self.lookup(discount_id)
+        if discount is None:
+            return False
+        return discount.try_use()
+
+    async def get_by_id(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo seu ID.
+
+        Args:
+            discount_id: ID único do desconto
+
+        Returns:
+            O desconto encontrado ou None se não existir
+
+        """
+        return self.lookup(discount_id)
+
+    async def get_by_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo seu código (para cupons).
+
+        Args:
+            code: Código do cupom/desconto
+
+        Returns:
+            O desconto encontrado ou None se não existir
+
+        """
+        return self.lookup_code(code)
+
+    async def save(self, discount: Discount) -> Discount:
+        """Persista um desconto no repositório.
+
+        Args:
+            discount: Objeto desconto a ser salvo
+
+        Returns:
+            O desconto salvo
+
+        """
+        return self.store(discount)
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote de descontos no repositório.
+
+        Args:
+            discounts: Descontos a serem salvos
+
+        Returns:
+            Os descontos salvos
+
+        """
+        return [self.store(discount) for discount in discounts]
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Remove um desconto do repositório.
+
+        Args:
+            discount_id: ID do desconto a ser removido
+
+        """
+        self.remove(discount_id)
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos do repositório.
+
+        Args:
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        for discount_id in discount_ids:
+            self.remove(discount_id)
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos do repositório.
+
+        Returns:
+            Lista com todos os descontos
+
+        """
+        discounts = []
+        for stripe in self._stripes:
+            with stripe.lock:
+                discounts.extend(stripe.discounts.values())
+        return discounts
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos cujo código começa com o prefixo.
+
+        Args:
+            prefix: Início do código, sem distinção de caixa
+            limit: Quantidade máxima de descontos retornados
+
+        Returns:
+            Descontos encontrados, ordenados pelo código sem caixa
+
+        """
+        with self._prefix_lock:
+            codes = self._prefix_index.search(prefix, limit)
+        return [
+            discount
+            for code in codes
+            if (discount := self.lookup_code(code)) is not None
+        ]
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos em um instante.
+
+        Args:
+            now: Instante da consulta (padrão: agora)
+            min_order_value: Se informado, retorna apenas descontos na
+                mesma moeda cujo valor mínimo de pedido não o excede
+
+        Returns:
+            Descontos ativos ordenados por ID
+
+        """
+        now = now or datetime.now()
+        active = []
+        for discount in await self.list():
+            if now < discount.valid_from:
+                continue
+            if discount.valid_until and now > discount.valid_until:
+                continue
+            if (
+                discount.max_usage_count is not None
+                and discount.current_usage_count >= discount.max_usage_count
+            ):
+                continue
+            minimum = discount.minimum_order_value
+            if min_order_value is not None and (
+                minimum.currency != min_order_value.currency
+                or minimum.amount > min_order_value.amount
+            ):
+                continue
+            active.append(discount)
+
+        return sorted(active, key=lambda discount: discount.id)
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Yields:
+            Lotes de descontos
+
+        """
+        discounts = await self.list()
+        for start in range(0, len(discounts), batch_size):
+            yield discounts[start : start + batch_size]
+
+    def _stripe(self, key: UUID | str) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def _unindex_code(self, code: str | None, discount_id: UUID) -> None:
+        if not code:
+            return
+        stripe = self._stripe(code)
+        with stripe.lock:
+            if stripe.codes.get(code) != discount_id:
+                return
+            del stripe.codes[code]
+        with self._prefix_lock:
+            self._prefix_index.discard(code)
+
+    def _bump_version(self) -> None:
+        with self._version_lock:
+            self.version += 1
@@ -0,0 +1,107 @@
+"""Implementação em memória do repositório de carrinhos para testes e prototipagem."""  # noqa: D205 E501
+
+import copy
+from dataclasses import replace
+from uuid import UUID
+
+from ....domain.entities.cart import Cart
+from ....domain.entities.cart_item import CartItem
+from .cart_change_tracker import item_state
+
+
+class InMemoryCartRepository:
+    """Implementação em memória do repositório de carrinhos.
+
+    Os itens de cada carrinho ficam indexados por ID, de modo que salvar
+    um carrinho copia apenas os itens adicionados ou alterados.
+    """
+
+    def __init__(self):
+        """Inicializa o repositório com dicionários em memória."""
+        self.carts: dict[UUID, Cart] = {}
+        self.items: dict[UUID, dict[UUID, CartItem]] = {}
+        self.session_index: dict[str, UUID] = {}
+
+    async def get_by_id(self, cart_id: UUID) -> Cart | None:
+        """Busca um carrinho pelo seu ID.
+
+        Args:
+            cart_id: ID único do carrinho
+
+        Returns:
+            Uma cópia do carrinho com seus itens, ou None se não existir
+
+        """
+        header = self.carts.get(cart_id)
+        if header is None:
+            return None
+
+        return replace(
+            header,
+            items=[copy.copy(item) for item in self.items[cart_id].values()],
+            discounts=copy.deepcopy(header.discounts),
+        )
+
+    async def get_by_session_id(self, session_id: str) -> Cart | None:
+        """Busca o carrinho associado a uma sessão anônima.
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            O carrinho encontrado ou None se não existir
+
+        """
+        cart_id = self.session_index.get(session_id)
+        if cart_id is None:
+            return None
+        return await self.get_by_id(cart_id)
+
+    async def save(self, cart: Cart) -> Cart:
+        """Persista um carrinho, copiando apenas os itens alterados.
+
+        Args:
+            cart: Carrinho a ser salvo
+
+        Returns:
+            O carrinho salvo
+
+        """
+        previous = self.carts.get(cart.id)
+        if previous and previous.session_id != cart.session_id:
+            self.session_index.pop(previous.session_id, None)
+
+        self.carts[cart.id] = replace(
+            cart, items=[], discounts=copy.deepcopy(cart.discounts)
+        )
+        if cart.session_id:
+            self.session_index[cart.session_id] = cart.id
+
+        stored = self.items.setdefault(cart.id, {})
+        current_ids = set()
+        for item in cart.items:
+            current_ids.add(item.id)
+            existing = stored.get(item.id)
+            if existing is None or item_state(existing) != item_state(item):
+                stored[item.id] = copy.copy(item)
+
+        if len(stored) != len(current_ids):
+            for item_id in [i for i in stored if i not in current_ids]:
+                del stored[item_id]
+
+        return cart
+
+    async def delete(self, cart_id: UUID) -> None:
+        """Remove um carrinho e seus itens do repositório.
+
+        Args:
+            cart_id: ID do carrinho a ser removido
+
+        """
+        header = self.carts.pop(cart_id, None)
+        if header is None:
+            return
+
+        self.items.pop(cart_id, None)
+        if header.session_id:
+            self.session_index.pop(header.session_id, None)
@@ -1,8 +1,15 @@
 """Implementação em memória do repositório de descontos para testes e prototipagem."""  # noqa: D205 E501
 
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from dataclasses import fields
+from datetime import datetime
 from uuid import UUID
 
 from ....domain.entities.discount import Discount
+from ....domain.value_objects.money import Money
+from .code_prefix_index import CodePrefixIndex
 
 
 class InMemoryDiscountRepository:
@@ -15,6 +22,21 @@ class InMemoryDiscountRepository:
         """Inicializa o repositório com um dicionário em memória."""
         self.discounts: dict[UUID, Discount] = {}
         self.code_index: dict[str, UUID] = {}  # Índice para busca por código
+        # Códigos ordenados, para a busca por prefixo
+        self.prefix_index = CodePrefixIndex()
+        # Instante da última gravação de cada desconto
+        self.updated_at: dict[UUID, datetime] = {}
+        # Descontos removidos pela limpeza com arquivamento
+        self.archive: dict[UUID, Discount] = {}
+        # Passada da limpeza em andamento: limites, IDs e próxima posição
+        self._purge_cursor: (
+            tuple[tuple[datetime, datetime], list[UUID], int] | None
+        ) = None
+        # Incrementada a cada alteração do catálogo, para invalidar caches
+        # derivados; usos que não esgotam o desconto não contam
+        self.version = 0
+        # Condições de cada desconto na última alteração do catálogo
+        self._catalog_terms: dict[UUID, tuple] = {}
 
     async def get_by_id(self, discount_id: UUID) -> Discount | None:
         """Busca um desconto pelo seu ID.
@@ -59,14 +81,37 @@ class InMemoryDiscountRepository:
 
         saved_discount = copy.deepcopy(discount)
 
+        previous = self.discounts.get(saved_discount.id)
+        if previous and previous.code and previous.code != saved_discount.code:
+            self._unindex_code(previous.code, saved_discount.id)
+
         self.discounts[saved_discount.id] = saved_discount
+        self.updated_at[saved_discount.id] = datetime.now()
 
         # Manter índice de códigos atualizado
         if saved_discount.code:
             self.code_index[saved_discount.code] = saved_discount.id
+            self.prefix_index.add(saved_discount.code)
+
+        terms = _catalog_terms(saved_discount)
+        if self._catalog_terms.get(saved_discount.id) != terms:
+            self._catalog_terms[saved_discount.id] = terms
+            self.version += 1
 
         return saved_discount
 
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote de descontos no repositório.
+
+        Args:
+            discounts: Descontos a serem salvos
+
+        Returns:
+            Os descontos salvos
+
+        """
+        return [await self.save(discount) for discount in discounts]
+
     async def delete(self, discount_id: UUID) -> None:
         """Remove um desconto do repositório.
 
@@ -78,8 +123,199 @@ class InMemoryDiscountRepository:
             discount = self.discounts[discount_id]
 
             # Remover do índice de códigos
-            if discount.code and discount.code in self.code_index:
-                del self.code_index[discount.code]
+            if discount.code:
+                self._unindex_code(discount.code, discount_id)
 
             # Remover do dicionário principal
             del self.discounts[discount_id]
+            self.updated_at.pop(discount_id, None)
+            self._catalog_terms.pop(discount_id, None)
+            self.version += 1
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos do repositório.
+
+        Args:
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        for discount_id in discount_ids:
+            await self.delete(discount_id)
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos do repositório.
+
+        Returns:
+            Lista com todos os descontos
+
+        """
+        return list(self.discounts.values())
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos cujo código começa com o prefixo.
+
+        Args:
+            prefix: Início do código, sem distinção de caixa
+            limit: Quantidade máxima de descontos retornados
+
+        Returns:
+            Descontos encontrados, ordenados pelo código sem caixa
+
+        """
+        return [
+            self.discounts[self.code_index[code]]
+            for code in self.prefix_index.search(prefix, limit)
+        ]
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos em um instante.
+
+        Args:
+            now: Instante da consulta (padrão: agora)
+            min_order_value: Se informado, retorna apenas descontos na
+                mesma moeda cujo valor mínimo de pedido não o excede
+
+        Returns:
+            Descontos ativos ordenados por ID
+
+        """
+        now = now or datetime.now()
+        active = []
+        for discount in self.discounts.values():
+            if now < discount.valid_from:
+                continue
+            if discount.valid_until and now > discount.valid_until:
+                continue
+            if (
+                discount.max_usage_count is not None
+                and discount.current_usage_count >= discount.max_usage_count
+            ):
+                continue
+            minimum = discount.minimum_order_value
+            if min_order_value is not None and (
+                minimum.currency != min_order_value.currency
+                or minimum.amount > min_order_value.amount
+            ):
+                continue
+            active.append(discount)
+
+        return sorted(active, key=lambda discount: discount.id)
+
+    async def purge(
+        self,
+        expired_before: datetime,
+        exhausted_before: datetime,
+        limit: int,
+        archive: bool = False,
+    ) -> int:
+        """Remove um lote de descontos expirados ou esgotados.
+
+        Chamadas seguidas com os mesmos limites continuam a verificação
+        de onde a anterior parou, de modo que uma limpeza completa
+        percorre cada desconto uma única vez. A lista de IDs é copiada no
+        início de cada passada; descontos gravados depois dela ficam para
+        a passada seguinte.
+
+        Args:
+            expired_before: Remove descontos cuja validade terminou antes
+                deste instante
+            exhausted_before: Remove descontos esgotados cuja última
+                gravação ocorreu antes deste instante
+            limit: Quantidade máxima de descontos removidos
+            archive: Se True, guarda os descontos removidos em `archive`
+
+        Returns:
+            Quantidade de descontos removidos
+
+        """
+        thresholds = (expired_before, exhausted_before)
+        cursor = self._purge_cursor
+        if cursor is None or cursor[0] != thresholds:
+            cursor = (thresholds, list(self.discounts), 0)
+        _, ids, position = cursor
+
+        purged = []
+        while position < len(ids) and len(purged) < limit:
+            discount = self.discounts.get(ids[position])
+            position += 1
+            if discount is None:
+                continue
+
+            expired = (
+                discount.valid_until is not None
+                and discount.valid_until < expired_before
+            )
+            exhausted = (
+                discount.max_usage_count is not None
+                and discount.current_usage_count >= discount.max_usage_count
+                and self.updated_at[discount.id] < exhausted_before
+            )
+            if expired or exhausted:
+                purged.append(discount)
+
+        self._purge_cursor = (
+            (thresholds, ids, position) if position < len(ids) else None
+        )
+
+        for discount in purged:
+            await self.delete(discount.id)
+            if archive:
+                self.archive[discount.id] = discount
+
+        return len(purged)
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes.
+
+        Apenas os IDs são copiados antecipadamente, para que o repositório
+        possa ser alterado entre um lote e outro; descontos removidos nesse
+        intervalo são ignorados.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Yields:
+            Lotes de descontos
+
+        """
+        ids = list(self.discounts)
+        for start in range(0, len(ids), batch_size):
+            batch = [
+                discount
+                for discount_id in ids[start : start + batch_size]
+                if (discount := self.discounts.get(discount_id)) is not None
+            ]
+            if batch:
+                yield batch
+
+    def _unindex_code(self, code: str, discount_id: UUID) -> None:
+        if self.code_index.get(code) == discount_id:
+            del self.code_index[code]
+            self.prefix_index.discard(code)
+
+
+_TERM_FIELDS = tuple(
+    field.name
+    for field in fields(Discount)
+    if field.compare and field.name != 'current_usage_count'
+)
+
+
+def _catalog_terms(discount: Discount) -> tuple:
+    """Resume o que a precificação enxerga de um desconto.
+
+    Os usos registrados só entram no resumo quando esgotam o desconto.
+    """
+    exhausted = bool(
+        discount.max_usage_count
+        and discount.current_usage_count >= discount.max_usage_count
+    )
+    return (exhausted, *(getattr(discount, name) for name in _TERM_FIELDS))
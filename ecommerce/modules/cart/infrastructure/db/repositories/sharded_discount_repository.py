@@ -0,0 +1,536 @@
+"""Repositório de descontos distribuído entre bancos por hash consistente."""
+
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import heapq
+from collections import OrderedDict, defaultdict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from ....domain.entities.discount import Discount
+from ....domain.value_objects.money import Money
+from .sql_discount_repository import SQLDiscountRepository
+
+
+def _hash(key: str) -> int:
+    digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def shard_key(discount: Discount) -> str:
+    """Chave de distribuição de um desconto: o código ou, sem ele, o ID."""
+    return discount.code or str(discount.id)
+
+
+class HashRing:
+    """Anel de hash consistente com nós virtuais.
+
+    Cada fragmento ocupa `virtual_nodes` posições do anel, e uma chave
+    pertence ao fragmento da primeira posição a partir do hash dela.
+    Incluir um fragmento move para ele apenas as chaves das faixas que
+    passa a ocupar, cerca de 1/N do total; as demais não mudam de lugar.
+    """
+
+    def __init__(self, names: Iterable[str] = (), virtual_nodes: int = 64):
+        """Inicializa o anel.
+
+        Args:
+            names: Nomes dos fragmentos
+            virtual_nodes: Posições de cada fragmento no anel
+
+        """
+        if virtual_nodes <= 0:
+            raise ValueError('virtual_nodes deve ser maior que zero')
+
+        self.virtual_nodes = virtual_nodes
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self._names: set[str] = set()
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        """Quantidade de fragmentos no anel."""
+        return len(self._names)
+
+    def __contains__(self, name: object) -> bool:
+        """Indica se um fragmento está no anel."""
+        return name in self._names
+
+    def add(self, name: str) -> None:
+        """Inclui um fragmento no anel."""
+        if name in self._names:
+            raise ValueError(f'Fragmento já existe: {name}')
+        self._names.add(name)
+        self._rebuild()
+
+    def remove(self, name: str) -> None:
+        """Remove um fragmento do anel."""
+        self._names.remove(name)
+        self._rebuild()
+
+    def owner(self, key: str) -> str:
+        """Fragmento responsável por uma chave."""
+        if not self._points:
+            raise LookupError('Anel sem fragmentos')
+        index = bisect.bisect(self._points, _hash(key))
+        return self._owners[index % len(self._owners)]
+
+    def copy(self) -> HashRing:
+        """Cópia independente do anel."""
+        return HashRing(sorted(self._names), self.virtual_nodes)
+
+    def _rebuild(self) -> None:
+        points = sorted(
+            (_hash(f'{name}#{replica}'), name)
+            for name in self._names
+            for replica in range(self.virtual_nodes)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [name for _, name in points]
+
+
+@dataclass
+class ShardedRepositoryStats:
+    """Contadores do repositório distribuído."""
+
+    routed_reads: dict[str, int] = field(default_factory=dict)
+    routed_writes: dict[str, int] = field(default_factory=dict)
+    location_hits: int = 0
+    fan_outs: int = 0
+    fallback_reads: int = 0
+    moved: int = 0
+
+
+class ShardedDiscountRepository:
+    """Distribui os descontos entre vários `SQLDiscountRepository`.
+
+    Cada desconto é gravado no fragmento escolhido pelo `HashRing` a
+    partir do seu código ou, sem código, do seu ID. Buscas por código e
+    gravações vão a um único fragmento; remoções, listagens e buscas por
+    prefixo consultam todos os fragmentos ao mesmo tempo e combinam os
+    resultados. Buscas por ID vão ao fragmento em que o desconto foi
+    gravado ou encontrado recentemente, guardado em um cache limitado a
+    `max_locations` IDs, e só consultam todos quando o ID não está no
+    cache ou não é encontrado no fragmento esperado. O código é a chave de
+    distribuição: quando uma gravação muda o responsável por um desconto,
+    por exemplo ao trocar o seu código, a cópia é removida do fragmento
+    anterior. Esse fragmento vem do cache; para IDs fora dele, a remoção
+    é enviada a todos os outros fragmentos, com um único DELETE por
+    fragmento e por lote.
+
+    Fragmentos podem ser incluídos ou removidos com o repositório em
+    uso. Até o fim de `rebalance`, buscas por código que não encontram o
+    desconto no novo responsável consultam o anterior, e cada gravação
+    remove a cópia que estiver no fragmento anterior. `rebalance` move os
+    descontos em lotes; enquanto move um lote, as gravações aguardam, de
+    modo que uma gravação nunca é sobrescrita pela cópia antiga.
+    """
+
+    def __init__(
+        self,
+        shards: dict[str, SQLDiscountRepository],
+        virtual_nodes: int = 64,
+        max_locations: int = 100_000,
+    ):
+        """Inicializa o repositório.
+
+        Args:
+            shards: Repositório de cada fragmento, pelo nome do fragmento
+            virtual_nodes: Posições de cada fragmento no anel
+            max_locations: IDs cujo fragmento é lembrado
+
+        """
+        if not shards:
+            raise ValueError('Informe ao menos um fragmento')
+
+        self.shards = dict(shards)
+        self.ring = HashRing(self.shards, virtual_nodes)
+        self.max_locations = max_locations
+        self._locations: OrderedDict[UUID, str] = OrderedDict()
+        self._previous_ring: HashRing | None = None
+        self._migration_lock = asyncio.Lock()
+        self._stats = ShardedRepositoryStats()
+
+    @property
+    def rebalancing(self) -> bool:
+        """Indica se há descontos a mover após uma mudança de fragmentos."""
+        return self._previous_ring is not None
+
+    def shard_for(self, discount: Discount) -> str:
+        """Nome do fragmento responsável por um desconto."""
+        return self.ring.owner(shard_key(discount))
+
+    async def get_by_id(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo ID no fragmento conhecido ou em todos."""
+        name = self._locations.get(discount_id)
+        if name is not None and name in self.shards:
+            discount = await self.shards[name].get_by_id(discount_id)
+            if discount is not None:
+                self._stats.location_hits += 1
+                self._count(self._stats.routed_reads, name)
+                return discount
+
+        results = await self._fan_out(
+            lambda repository: repository.get_by_id(discount_id)
+        )
+        for name, discount in zip(self.shards, results, strict=True):
+            if discount is not None:
+                self._remember(discount.id, name)
+                return discount
+        self._locations.pop(discount_id, None)
+        return None
+
+    async def get_by_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo código no fragmento responsável."""
+        name = self.ring.owner(code)
+        self._count(self._stats.routed_reads, name)
+        discount = await self.shards[name].get_by_code(code)
+        if discount is None and self._previous_ring is not None:
+            previous = self._previous_ring.owner(code)
+            if previous != name:
+                self._stats.fallback_reads += 1
+                name = previous
+                discount = await self.shards[name].get_by_code(code)
+        if discount is not None:
+            self._remember(discount.id, name)
+        return discount
+
+    async def save(self, discount: Discount) -> Discount:
+        """Persista um desconto no fragmento responsável.
+
+        Args:
+            discount: Objeto desconto a ser salvo
+
+        Returns:
+            O desconto salvo
+
+        """
+        async with self._migration():
+            name = self.shard_for(discount)
+            await self.shards[name].save(discount)
+            self._count(self._stats.routed_writes, name)
+            await self._remove_other_copies({discount.id: name})
+            self._remember(discount.id, name)
+            await self._forget_previous([discount])
+        return discount
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote, com um `save_many` por fragmento envolvido.
+
+        Args:
+            discounts: Descontos a serem salvos
+
+        Returns:
+            Os descontos salvos
+
+        """
+        if not discounts:
+            return []
+
+        async with self._migration():
+            groups = self._group(discounts, self.ring)
+            await asyncio.gather(
+                *(
+                    self.shards[name].save_many(batch)
+                    for name, batch in groups.items()
+                )
+            )
+            await self._remove_other_copies(
+                {
+                    discount.id: name
+                    for name, batch in groups.items()
+                    for discount in batch
+                }
+            )
+            for name, batch in groups.items():
+                self._count(self._stats.routed_writes, name, len(batch))
+                for discount in batch:
+                    self._remember(discount.id, name)
+            await self._forget_previous(discounts)
+
+        return discounts
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Remove um desconto de todos os fragmentos.
+
+        Args:
+            discount_id: ID do desconto a ser removido
+
+        """
+        async with self._migration():
+            await self._fan_out(
+                lambda repository: repository.delete(discount_id)
+            )
+            self._locations.pop(discount_id, None)
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos de todos os fragmentos.
+
+        Args:
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        if not discount_ids:
+            return
+
+        async with self._migration():
+            await self._fan_out(
+                lambda repository: repository.delete_many(discount_ids)
+            )
+            for discount_id in discount_ids:
+                self._locations.pop(discount_id, None)
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos, ordenados por ID."""
+        results = await self._fan_out(lambda repository: repository.list())
+        return _unique_by_id(heapq.merge(*results, key=_by_id))
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes, um fragmento após o outro.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Yields:
+            Lotes de descontos, ordenados por ID dentro de cada fragmento
+
+        """
+        for repository in list(self.shards.values()):
+            async for batch in repository.stream(batch_size):
+                yield batch
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos pelo início do código em todos os fragmentos.
+
+        Cada fragmento devolve até `limit` descontos já ordenados pelo
+        código sem caixa; as listas são intercaladas e cortadas em
+        `limit`.
+        """
+        if limit <= 0:
+            return []
+
+        results = await self._fan_out(
+            lambda repository: repository.search_by_code_prefix(prefix, limit)
+        )
+        merged = heapq.merge(
+            *results, key=lambda discount: discount.code.lower()
+        )
+        return _unique_by_id(merged)[:limit]
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos de todos os fragmentos, por ID."""
+        now = now or datetime.now()
+        results = await self._fan_out(
+            lambda repository: repository.list_active(now, min_order_value)
+        )
+        return _unique_by_id(heapq.merge(*results, key=_by_id))
+
+    async def purge(
+        self,
+        expired_before: datetime,
+        exhausted_before: datetime,
+        limit: int,
+        archive: bool = False,
+    ) -> int:
+        """Remove um lote de descontos expirados ou esgotados.
+
+        Cada fragmento remove até `limit` descontos.
+
+        Returns:
+            Quantidade de descontos removidos em todos os fragmentos
+
+        """
+        removed = await self._fan_out(
+            lambda repository: repository.purge(
+                expired_before, exhausted_before, limit, archive
+            )
+        )
+        return sum(removed)
+
+    def add_shard(self, name: str, repository: SQLDiscountRepository) -> None:
+        """Inclui um fragmento; os descontos são movidos por `rebalance`.
+
+        Raises:
+            ValueError: Se o fragmento já existir ou houver outro
+                rebalanceamento pendente
+
+        """
+        self._begin_change()
+        previous = self.ring.copy()
+        self.ring.add(name)
+        self.shards[name] = repository
+        self._previous_ring = previous
+
+    def remove_shard(self, name: str) -> None:
+        """Retira um fragmento do anel; `rebalance` esvazia e o descarta.
+
+        Raises:
+            ValueError: Se for o último fragmento ou houver outro
+                rebalanceamento pendente
+            KeyError: Se o fragmento não existir
+
+        """
+        self._begin_change()
+        if len(self.ring) == 1:
+            raise ValueError('O último fragmento não pode ser removido')
+        previous = self.ring.copy()
+        self.ring.remove(name)
+        self._previous_ring = previous
+
+    async def rebalance(self, batch_size: int = 500) -> int:
+        """Mova os descontos que mudaram de fragmento.
+
+        Cada fragmento é percorrido em lotes. Para cada lote, os descontos
+        de outro responsável são gravados nele e removidos do fragmento
+        de origem, com as gravações do repositório suspensas.
+
+        Args:
+            batch_size: Quantidade de descontos lidos por lote
+
+        Returns:
+            Quantidade de descontos movidos
+
+        """
+        moved = 0
+        for name, repository in list(self.shards.items()):
+            batches = repository.stream(batch_size)
+            try:
+                while True:
+                    async with self._migration_lock:
+                        batch = await anext(batches, None)
+                        if batch is None:
+                            break
+                        moved += await self._move(name, batch)
+            finally:
+                await batches.aclose()
+
+        for name in [name for name in self.shards if name not in self.ring]:
+            del self.shards[name]
+        self._previous_ring = None
+        self._stats.moved += moved
+        return moved
+
+    @property
+    def stats(self) -> ShardedRepositoryStats:
+        """Retorna uma cópia dos contadores atuais."""
+        return ShardedRepositoryStats(
+            routed_reads=dict(self._stats.routed_reads),
+            routed_writes=dict(self._stats.routed_writes),
+            location_hits=self._stats.location_hits,
+            fan_outs=self._stats.fan_outs,
+            fallback_reads=self._stats.fallback_reads,
+            moved=self._stats.moved,
+        )
+
+    async def _move(self, source: str, batch: list[Discount]) -> int:
+        """Grave no novo responsável e remova da origem os que mudaram."""
+        groups = self._group(batch, self.ring)
+        groups.pop(source, None)
+        for target, discounts in groups.items():
+            await self.shards[target].save_many(discounts)
+            for discount in discounts:
+                await self.shards[source].delete(discount.id)
+                self._remember(discount.id, target)
+        return sum(len(discounts) for discounts in groups.values())
+
+    def _remember(self, discount_id: UUID, name: str) -> None:
+        """Guarda o fragmento de um ID, descartando o mais antigo."""
+        locations = self._locations
+        locations[discount_id] = name
+        locations.move_to_end(discount_id)
+        if len(locations) > self.max_locations:
+            locations.popitem(last=False)
+
+    async def _remove_other_copies(self, owners: dict[UUID, str]) -> None:
+        """Remove as cópias gravadas fora do fragmento responsável."""
+        stale: dict[str, list[UUID]] = defaultdict(list)
+        for discount_id, owner in owners.items():
+            known = self._locations.get(discount_id)
+            if known == owner:
+                continue
+            if known is not None:
+                if known in self.shards:
+                    stale[known].append(discount_id)
+                continue
+            for name in self.shards:
+                if name != owner:
+                    stale[name].append(discount_id)
+
+        if stale:
+            await asyncio.gather(
+                *(
+                    self.shards[name].delete_many(discount_ids)
+                    for name, discount_ids in stale.items()
+                )
+            )
+
+    async def _forget_previous(self, discounts: list[Discount]) -> None:
+        """Remove as cópias que `rebalance` ainda não moveu."""
+        if self._previous_ring is None:
+            return
+        for name, batch in self._group(discounts, self._previous_ring).items():
+            for discount in batch:
+                if self.shard_for(discount) != name:
+                    await self.shards[name].delete(discount.id)
+
+    def _migration(self) -> AbstractAsyncContextManager[object]:
+        """Trava das gravações, necessária apenas durante a migração."""
+        if self._previous_ring is None:
+            return nullcontext()
+        return self._migration_lock
+
+    def _begin_change(self) -> None:
+        if self._previous_ring is not None:
+            raise ValueError('Execute rebalance antes de outra mudança')
+
+    async def _fan_out(
+        self, call: Callable[[SQLDiscountRepository], Awaitable[Any]]
+    ) -> list[Any]:
+        self._stats.fan_outs += 1
+        return await asyncio.gather(
+            *(call(repository) for repository in self.shards.values())
+        )
+
+    @staticmethod
+    def _group(
+        discounts: Iterable[Discount], ring: HashRing
+    ) -> dict[str, list[Discount]]:
+        groups: dict[str, list[Discount]] = defaultdict(list)
+        for discount in discounts:
+            groups[ring.owner(shard_key(discount))].append(discount)
+        return groups
+
+    @staticmethod
+    def _count(counters: dict[str, int], name: str, amount: int = 1) -> None:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def _by_id(discount: Discount) -> UUID:
+    return discount.id
+
+
+def _unique_by_id(discounts: Iterable[Discount]) -> list[Discount]:
+    """Descarta cópias de um desconto vistas em dois fragmentos."""
+    seen: set[UUID] = set()
+    unique = []
+    for discount in discounts:
+        if discount.id not in seen:
+            seen.add(discount.id)
+            unique.append(discount)
+    return unique
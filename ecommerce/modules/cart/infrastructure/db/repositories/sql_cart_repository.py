@@ -0,0 +1,273 @@
+"""Implementação concreta do repositório de carrinhos usando SQLAlchemy."""
+
+from uuid import UUID
+
+from sqlalchemy import Row, bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ....domain.entities.cart import Cart
+from ....domain.entities.cart_item import CartItem
+from ..models.cart_model import CartDiscountModel, CartItemModel, CartModel
+from ..models.discount_model import DiscountModel
+from .cart_change_tracker import CartChangeTracker, CartChanges, item_state
+from .sql_discount_repository import map_discount_row
+
+carts = CartModel.__table__
+cart_items = CartItemModel.__table__
+cart_discounts = CartDiscountModel.__table__
+discounts = DiscountModel.__table__
+
+_ITEM_COLUMNS = (
+    cart_items.c.id.label('item_id'),
+    cart_items.c.product_id,
+    cart_items.c.category_id,
+    cart_items.c.quantity,
+    cart_items.c.price,
+    cart_items.c.added_at,
+    cart_items.c.updated_at.label('item_updated_at'),
+)
+
+# As colunas do SET vêm dos parâmetros de cada linha (executemany)
+_UPDATE_ITEM = update(cart_items).where(
+    cart_items.c.id == bindparam('item_id')
+)
+
+
+class SQLCartRepository:
+    """Implementação do repositório de carrinhos usando SQLAlchemy.
+
+    O carrinho e seus itens são lidos com uma única consulta (junção
+    externa), e os descontos aplicados com uma segunda consulta. Os
+    carrinhos carregados têm seu estado registrado, de modo que `save`
+    grava apenas os itens adicionados, alterados ou removidos.
+    """
+
+    def __init__(self, session: AsyncSession):
+        """Inicializa o repositório com uma sessão do SQLAlchemy.
+
+        Args:
+            session: Sessão assíncrona do SQLAlchemy
+
+        """
+        self.session = session
+        self.tracker = CartChangeTracker()
+
+    async def get_by_id(self, cart_id: UUID) -> Cart | None:
+        """Busca um carrinho, com seus itens, pelo seu ID.
+
+        Args:
+            cart_id: ID único do carrinho
+
+        Returns:
+            O carrinho encontrado ou None se não existir
+
+        """
+        return await self._load(carts.c.id == cart_id)
+
+    async def get_by_session_id(self, session_id: str) -> Cart | None:
+        """Busca o carrinho associado a uma sessão anônima.
+
+        Args:
+            session_id: Identificador da sessão
+
+        Returns:
+            O carrinho encontrado ou None se não existir
+
+        """
+        return await self._load(carts.c.session_id == session_id)
+
+    async def save(self, cart: Cart) -> Cart:
+        """Persista um carrinho gravando apenas as linhas alteradas.
+
+        Args:
+            cart: Carrinho a ser salvo
+
+        Returns:
+            O carrinho salvo
+
+        """
+        if not self.tracker.is_tracked(cart.id):
+            await self._track_persisted_state(cart.id)
+
+        changes = self.tracker.changes(cart)
+        await self._write_header(cart)
+        await self._write_changes(cart.id, changes)
+        await self.session.flush()
+
+        self.tracker.apply(cart, changes)
+        return cart
+
+    async def delete(self, cart_id: UUID) -> None:
+        """Remove um carrinho e seus itens.
+
+        Args:
+            cart_id: ID do carrinho a ser removido
+
+        """
+        await self.session.execute(
+            delete(cart_items).where(cart_items.c.cart_id == cart_id)
+        )
+        await self.session.execute(
+            delete(cart_discounts).where(cart_discounts.c.cart_id == cart_id)
+        )
+        await self.session.execute(delete(carts).where(carts.c.id == cart_id))
+        await self.session.flush()
+        self.tracker.forget(cart_id)
+
+    async def _load(self, criteria) -> Cart | None:
+        """Carrega um carrinho e seus itens com uma única consulta."""
+        stmt = (
+            select(carts, *_ITEM_COLUMNS)
+            .outerjoin(cart_items, cart_items.c.cart_id == carts.c.id)
+            .where(criteria)
+            .order_by(cart_items.c.added_at, cart_items.c.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        if not rows:
+            return None
+
+        header = rows[0]
+        cart = Cart(
+            id=header.id,
+            user_id=header.user_id,
+            session_id=header.session_id,
+            created_at=header.created_at,
+            updated_at=header.updated_at,
+            items=[
+                _map_row_to_item(row, header.id)
+                for row in rows
+                if row.item_id is not None
+            ],
+        )
+
+        discount_stmt = (
+            select(*discounts.c)
+            .join(
+                cart_discounts, cart_discounts.c.discount_id == discounts.c.id
+            )
+            .where(cart_discounts.c.cart_id == cart.id)
+        )
+        result = await self.session.execute(discount_stmt)
+        cart.discounts = [map_discount_row(row) for row in result]
+
+        self.tracker.track(cart)
+        return cart
+
+    async def _track_persisted_state(self, cart_id: UUID) -> None:
+        """Registra o estado gravado de um carrinho que não foi carregado.
+
+        Permite salvar carrinhos recebidos de fora do repositório (ou
+        novos) sem regravar itens que já estejam no banco.
+        """
+        exists = await self.session.scalar(
+            select(carts.c.id).where(carts.c.id == cart_id)
+        )
+        if exists is None:
+            return
+
+        items = await self.session.execute(
+            select(*_ITEM_COLUMNS).where(cart_items.c.cart_id == cart_id)
+        )
+        links = await self.session.execute(
+            select(cart_discounts.c.discount_id).where(
+                cart_discounts.c.cart_id == cart_id
+            )
+        )
+        self.tracker.track_state(
+            cart_id,
+            [_map_row_to_item(row, cart_id) for row in items],
+            {discount_id for (discount_id,) in links},
+        )
+
+    async def _write_header(self, cart: Cart) -> None:
+        values = {
+            'user_id': cart.user_id,
+            'session_id': cart.session_id,
+            'created_at': cart.created_at,
+            'updated_at': cart.updated_at,
+        }
+        if self.tracker.is_tracked(cart.id):
+            await self.session.execute(
+                update(carts).where(carts.c.id == cart.id).values(**values)
+            )
+        else:
+            await self.session.execute(
+                insert(carts).values(id=cart.id, **values)
+            )
+
+    async def _write_changes(
+        self, cart_id: UUID, changes: CartChanges
+    ) -> None:
+        if changes.added:
+            await self.session.execute(
+                insert(cart_items),
+                [
+                    {'id': item.id, 'cart_id': cart_id, **_item_values(item)}
+                    for item in changes.added
+                ],
+            )
+
+        if changes.changed:
+            await self.session.execute(
+                _UPDATE_ITEM,
+                [
+                    {'item_id': item.id, **_item_values(item)}
+                    for item in changes.changed
+                ],
+            )
+
+        if changes.removed:
+            await self.session.execute(
+                delete(cart_items).where(cart_items.c.id.in_(changes.removed))
+            )
+
+        if changes.discounts_added:
+            await self.session.execute(
+                insert(cart_discounts),
+                [
+                    {'cart_id': cart_id, 'discount_id': discount_id}
+                    for discount_id in changes.discounts_added
+                ],
+            )
+
+        if changes.discounts_removed:
+            await self.session.execute(
+                delete(cart_discounts).where(
+                    cart_discounts.c.cart_id == cart_id,
+                    cart_discounts.c.discount_id.in_(
+                        changes.discounts_removed
+                    ),
+                )
+            )
+
+
+def _map_row_to_item(row: Row, cart_id: UUID) -> CartItem:
+    return CartItem(
+        id=row.item_id,
+        cart_id=cart_id,
+        product_id=row.product_id,
+        category_id=row.category_id,
+        quantity=row.quantity,
+        price=row.price,
+        added_at=row.added_at,
+        updated_at=row.item_updated_at,
+    )
+
+
+def _item_values(item: CartItem) -> dict:
+    (
+        product_id,
+        category_id,
+        quantity,
+        price,
+        added_at,
+        updated_at,
+    ) = item_state(item)
+    return {
+        'product_id': product_id,
+        'category_id': category_id,
+        'quantity': quantity,
+        'price': price,
+        'added_at': added_at,
+        'updated_at': updated_at,
+    }
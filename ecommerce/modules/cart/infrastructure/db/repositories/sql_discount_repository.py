@@ -1,13 +1,82 @@
 """Implementação concreta do repositório de descontos usando SQLAlchemy."""
 
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    nullcontext,
+)
+from datetime import datetime
+from decimal import Decimal
+from operator import itemgetter
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Row,
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    union_all,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ....domain.entities.discount import Discount, DiscountType
-from ....domain.value_objects.money import Money
-from ..models.discount_model import DiscountModel
+from ....domain.value_objects.money import (
+    Money,
+    from_minor_units,
+    to_minor_units,
+)
+from ...outbox.outbox_relay import (
+    DISCOUNT_CREATED,
+    DISCOUNT_DELETED,
+    DISCOUNT_REDEEMED,
+    DISCOUNT_UPDATED,
+)
+from ...serialization.json_codec import CartJSONEncoder
+from ..models.discount_model import DiscountArchiveModel, DiscountModel
+from ..models.outbox_event_model import OutboxEventModel
+from ..session_router import SessionRouter
+
+_COLUMNS = DiscountModel.__table__.c
+
+# Consultas montadas uma única vez: o SQLAlchemy reaproveita a forma
+# compilada de cada uma a cada execução
+_SELECT_BY_ID = select(*_COLUMNS).where(
+    _COLUMNS.id == bindparam('discount_id')
+)
+_SELECT_BY_CODE = select(*_COLUMNS).where(_COLUMNS.code == bindparam('code'))
+
+# Posições das colunas usadas pelo mapeamento, extraídas de uma só vez
+_ROW_FIELDS = itemgetter(
+    *(
+        list(_COLUMNS.keys()).index(name)
+        for name in (
+            'id',
+            'type',
+            'value_minor',
+            'code',
+            'description',
+            'minimum_order_value_minor',
+            'currency',
+            'valid_from',
+            'valid_until',
+            'max_usage_count',
+            'current_usage_count',
+            'product_ids',
+            'category_ids',
+        )
+    )
+)
+_DISCOUNT_TYPES = {
+    discount_type.name: discount_type for discount_type in DiscountType
+}
 
 
 class SQLDiscountRepository:
@@ -15,16 +84,45 @@ class SQLDiscountRepository:
 
     Esta classe implementa a interface DiscountRepository usando
     SQLAlchemy para persistência em banco de dados SQL.
+
+    Com uma sessão, todas as operações usam essa sessão e a confirmação
+    da transação fica a cargo de quem a criou. Com um `SessionRouter`,
+    cada operação abre a sua própria sessão: leituras vão para as
+    réplicas e gravações são confirmadas no primário.
+
+    Com `publish_events`, cada alteração grava também um evento na
+    tabela `outbox_events`, na mesma transação, para ser entregue pelo
+    `OutboxRelay` sem atrasar quem alterou o desconto.
     """
 
-    def __init__(self, session: AsyncSession):
-        """Inicializa o repositório com uma sessão do SQLAlchemy.
+    def __init__(
+        self,
+        session: AsyncSession | None = None,
+        router: SessionRouter | None = None,
+        publish_events: bool = False,
+        savepoints: bool = True,
+    ):
+        """Inicializa o repositório com uma sessão ou um roteador.
 
         Args:
             session: Sessão assíncrona do SQLAlchemy
+            router: Roteador entre o banco primário e as réplicas
+            publish_events: Se True, grava eventos na caixa de saída
+            savepoints: Se False, `save_many` dispensa o savepoint, para
+                quem já torna a transação inteira atômica
+
+        Raises:
+            ValueError: Se não for informado exatamente um dos dois
 
         """
+        if (session is None) == (router is None):
+            raise ValueError('Informe uma sessão ou um roteador')
+
         self.session = session
+        self.router = router
+        self.publish_events = publish_events
+        self.savepoints = savepoints
+        self._encoder = CartJSONEncoder()
 
     async def get_by_id(self, discount_id: UUID) -> Discount | None:
         """Busca um desconto pelo seu ID.
@@ -36,14 +134,9 @@ class SQLDiscountRepository:
             O desconto encontrado ou None se não existir
 
         """
-        stmt = select(DiscountModel).where(DiscountModel.id == discount_id)
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        if not model:
-            return None
-
-        return self._map_model_to_entity(model)
+        return await self._fetch_one(
+            _SELECT_BY_ID, {'discount_id': discount_id}
+        )
 
     async def get_by_code(self, code: str) -> Discount | None:
         """Busca um desconto pelo seu código (para cupons).
@@ -55,14 +148,7 @@ class SQLDiscountRepository:
             O desconto encontrado ou None se não existir
 
         """
-        stmt = select(DiscountModel).where(DiscountModel.code == code)
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
-
-        if not model:
-            return None
-
-        return self._map_model_to_entity(model)
+        return await self._fetch_one(_SELECT_BY_CODE, {'code': code})
 
     async def save(self, discount: Discount) -> Discount:
         """Persista um desconto no repositório.
@@ -74,52 +160,67 @@ class SQLDiscountRepository:
             O desconto salvo (possivelmente com ID atualizado)
 
         """
-        # Verificar se é uma atualização ou nova inserção
-        existing_model = None
-        if discount.id:
-            stmt = select(DiscountModel).where(DiscountModel.id == discount.id)
-            result = await self.session.execute(stmt)
-            existing_model = result.scalar_one_or_none()
-
-        if existing_model:
-            # Atualizar modelo existente
-            existing_model.type = discount.type.name
-            existing_model.value = discount.value
-            existing_model.code = discount.code
-            existing_model.description = discount.description
-            existing_model.minimum_order_value = (
-                discount.minimum_order_value.amount
-            )
-            existing_model.currency = discount.minimum_order_value.currency
-            existing_model.valid_from = discount.valid_from
-            existing_model.valid_until = discount.valid_until
-            existing_model.max_usage_count = discount.max_usage_count
-            existing_model.current_usage_count = discount.current_usage_count
-
-            await self.session.flush()
-            return discount
-        else:
-            # Criar novo modelo
-            model = DiscountModel(
-                id=discount.id,
-                type=discount.type.name,
-                value=discount.value,
-                code=discount.code,
-                description=discount.description,
-                minimum_order_value=discount.minimum_order_value.amount,
-                currency=discount.minimum_order_value.currency,
-                valid_from=discount.valid_from,
-                valid_until=discount.valid_until,
-                max_usage_count=discount.max_usage_count,
-                current_usage_count=discount.current_usage_count,
-            )
+        async with self._writing() as session:
+            # Verificar se é uma atualização ou nova inserção
+            existing_model = None
+            if discount.id:
+                stmt = select(DiscountModel).where(
+                    DiscountModel.id == discount.id
+                )
+                result = await session.execute(stmt)
+                existing_model = result.scalar_one_or_none()
+
+            if existing_model:
+                # Atualizar modelo existente
+                event_type = self._change_type(existing_model, discount)
+                self._update_model(existing_model, discount)
+            else:
+                # Criar novo modelo
+                event_type = DISCOUNT_CREATED
+                session.add(self._map_entity_to_model(discount))
+            self._record(session, event_type, discount.id, discount)
+
+            await session.flush()
+
+        return discount
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Persista um lote de descontos com um único flush.
+
+        O lote é gravado dentro de um savepoint: se qualquer desconto
+        falhar, nenhum deles é mantido e a sessão continua utilizável.
+        Sem `savepoints`, a atomicidade fica a cargo da transação.
+
+        Args:
+            discounts: Descontos a serem salvos
 
-            self.session.add(model)
-            await self.session.flush()
+        Returns:
+            Os descontos salvos
+
+        """
+        if not discounts:
+            return []
 
-            # Garantir que o ID do modelo seja propagado para a entidade
-            # (relevante somente para novas entidades)
-            return discount
+        ids = [discount.id for discount in discounts]
+        stmt = select(DiscountModel).where(DiscountModel.id.in_(ids))
+
+        async with self._writing() as session, self._savepoint(session):
+            result = await session.execute(stmt)
+            existing = {model.id: model for model in result.scalars()}
+
+            for discount in discounts:
+                model = existing.get(discount.id)
+                if model:
+                    event_type = self._change_type(model, discount)
+                    self._update_model(model, discount)
+                else:
+                    event_type = DISCOUNT_CREATED
+                    session.add(self._map_entity_to_model(discount))
+                self._record(session, event_type, discount.id, discount)
+
+            await session.flush()
+
+        return discounts
 
     async def delete(self, discount_id: UUID) -> None:
         """Remove um desconto do repositório.
@@ -129,34 +230,457 @@ class SQLDiscountRepository:
 
         """
         stmt = select(DiscountModel).where(DiscountModel.id == discount_id)
-        result = await self.session.execute(stmt)
-        model = result.scalar_one_or_none()
+        async with self._writing() as session:
+            result = await session.execute(stmt)
+            model = result.scalar_one_or_none()
 
-        if model:
-            await self.session.delete(model)
-            await self.session.flush()
+            if model:
+                await session.delete(model)
+                self._record(session, DISCOUNT_DELETED, discount_id)
+                await session.flush()
 
-    def _map_model_to_entity(self, model: DiscountModel) -> Discount:
-        """Mapeia um modelo ORM para uma entidade de domínio.
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Remove um lote de descontos com um único DELETE.
 
         Args:
-            model: Modelo ORM do desconto
+            discount_ids: IDs dos descontos a serem removidos
+
+        """
+        if not discount_ids:
+            return
+
+        stmt = delete(DiscountModel).where(DiscountModel.id.in_(discount_ids))
+        async with self._writing() as session:
+            if not self.publish_events:
+                await session.execute(stmt)
+                return
+
+            result = await session.execute(stmt.returning(DiscountModel.id))
+            for discount_id in result.scalars().all():
+                self._record(session, DISCOUNT_DELETED, discount_id)
+            await session.flush()
+
+    async def list(self) -> list[Discount]:
+        """Lista todos os descontos.
 
         Returns:
-            Entidade de domínio Discount
+            Lista com todos os descontos
 
         """
-        return Discount(
-            id=model.id,
-            type=DiscountType[model.type],  # Converter string para enum
-            value=model.value,
-            code=model.code,
-            description=model.description,
-            minimum_order_value=Money(
-                model.minimum_order_value, model.currency
+        return [
+            discount async for batch in self.stream() for discount in batch
+        ]
+
+    async def stream(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos em lotes usando paginação por chave.
+
+        As linhas são lidas como tuplas do Core, sem passar pelo mapa de
+        identidade da sessão, de modo que a memória usada depende apenas
+        do tamanho do lote.
+
+        Args:
+            batch_size: Quantidade de descontos por lote
+
+        Yields:
+            Lotes de descontos ordenados por ID
+
+        """
+        columns = DiscountModel.__table__.c
+        last_id = None
+
+        async with self._reading() as session:
+            while True:
+                stmt = select(*columns).order_by(columns.id).limit(batch_size)
+                if last_id is not None:
+                    stmt = stmt.where(columns.id > last_id)
+
+                result = await session.execute(stmt)
+                rows = result.all()
+                if not rows:
+                    return
+
+                yield [map_discount_row(row) for row in rows]
+                last_id = rows[-1].id
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos cujo código começa com o prefixo.
+
+        A comparação é `lower(code) LIKE lower(padrão)`, em que o padrão
+        é o prefixo com os curingas escapados seguido de `%`; as duas
+        partes passam pelo mesmo `lower()` do banco. No SQLite ele só
+        converte letras ASCII, de modo que outros caracteres precisam
+        coincidir em caixa. A ordem do resultado segue a collation do
+        banco.
+
+        O índice `ix_discounts_code_lower` atende a busca: no PostgreSQL
+        ele usa `text_pattern_ops`, que serve ao `LIKE` com prefixo em
+        qualquer collation. O SQLite não usa índices de expressão para o
+        `LIKE`; para prefixos ASCII, a consulta recebe também o intervalo
+        equivalente, que na sua ordenação binária cobre exatamente os
+        códigos com o prefixo e é percorrido pelo índice.
+
+        Args:
+            prefix: Início do código, sem distinção de caixa
+            limit: Quantidade máxima de descontos retornados
+
+        Returns:
+            Descontos encontrados, ordenados pelo código sem caixa
+
+        """
+        if limit <= 0:
+            return []
+
+        columns = DiscountModel.__table__.c
+        lowered = func.lower(columns.code)
+        stmt = (
+            select(*columns)
+            .where(lowered.like(func.lower(_like_prefix(prefix)), escape='\\'))
+            .order_by(lowered)
+            .limit(limit)
+        )
+
+        async with self._reading() as session:
+            key = prefix.lower()
+            if (
+                key
+                and key.isascii()
+                and session.get_bind().dialect.name == 'sqlite'
+            ):
+                # Menor texto maior que todos os que começam com o prefixo
+                upper = key[:-1] + chr(ord(key[-1]) + 1)
+                stmt = stmt.where(lowered >= key, lowered < upper)
+
+            result = await session.execute(stmt)
+            return [map_discount_row(row) for row in result]
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos em um instante.
+
+        Um desconto está ativo se o instante está dentro da sua validade e
+        o limite de uso não foi atingido. Descontos sem data de término e
+        com data de término são buscados em consultas separadas, unidas
+        com UNION ALL, para que cada uma use o seu próprio índice.
+
+        Args:
+            now: Instante da consulta (padrão: agora)
+            min_order_value: Se informado, retorna apenas descontos na
+                mesma moeda cujo valor mínimo de pedido não o excede
+
+        Returns:
+            Descontos ativos ordenados por ID
+
+        """
+        now = now or datetime.now()
+        columns = DiscountModel.__table__.c
+
+        conditions = [
+            columns.valid_from <= now,
+            or_(
+                columns.max_usage_count.is_(None),
+                columns.current_usage_count < columns.max_usage_count,
             ),
-            valid_from=model.valid_from,
-            valid_until=model.valid_until,
-            max_usage_count=model.max_usage_count,
-            current_usage_count=model.current_usage_count,
+        ]
+        if min_order_value is not None:
+            conditions += [
+                columns.currency == min_order_value.currency,
+                columns.minimum_order_value_minor
+                <= to_minor_units(min_order_value.amount),
+            ]
+
+        open_ended = select(*columns).where(
+            columns.valid_until.is_(None), *conditions
+        )
+        expiring = select(*columns).where(
+            columns.valid_until >= now, *conditions
         )
+        # A ordenação é feita em memória: um ORDER BY sobre a união levaria
+        # o SQLite a percorrer a chave primária em vez dos índices
+        async with self._reading() as session:
+            result = await session.execute(union_all(open_ended, expiring))
+            rows = sorted(result, key=lambda row: row.id)
+
+        return [map_discount_row(row) for row in rows]
+
+    async def purge(
+        self,
+        expired_before: datetime,
+        exhausted_before: datetime,
+        limit: int,
+        archive: bool = False,
+    ) -> int:
+        """Remove um lote de descontos expirados ou esgotados.
+
+        Os IDs do lote são escolhidos primeiro e a condição é verificada
+        novamente no DELETE, de modo que um desconto reativado nesse
+        intervalo (por exemplo, com a validade estendida) é preservado.
+        Com um roteador, cada lote é uma transação curta no primário; com
+        uma sessão, a confirmação fica a cargo de quem a criou.
+
+        Args:
+            expired_before: Remove descontos cuja validade terminou antes
+                deste instante
+            exhausted_before: Remove descontos esgotados cuja última
+                alteração ocorreu antes deste instante
+            limit: Quantidade máxima de descontos removidos
+            archive: Se True, copia os descontos removidos para a tabela
+                de arquivo
+
+        Returns:
+            Quantidade de descontos removidos
+
+        """
+        columns = DiscountModel.__table__.c
+        condition = or_(
+            columns.valid_until < expired_before,
+            and_(
+                columns.max_usage_count.is_not(None),
+                columns.current_usage_count >= columns.max_usage_count,
+                columns.updated_at < exhausted_before,
+            ),
+        )
+
+        async with self._writing() as session:
+            result = await session.execute(
+                select(columns.id).where(condition).limit(limit)
+            )
+            ids = result.scalars().all()
+            if not ids:
+                return 0
+
+            stmt = delete(DiscountModel.__table__).where(
+                columns.id.in_(ids), condition
+            )
+            if not archive and not self.publish_events:
+                result = await session.execute(stmt)
+                return result.rowcount
+
+            returned = columns if archive else [columns.id]
+            rows = (await session.execute(stmt.returning(*returned))).all()
+            for row in rows:
+                self._record(session, DISCOUNT_DELETED, row.id)
+            if not archive:
+                await session.flush()
+                return len(rows)
+
+            if rows:
+                archived_at = datetime.now()
+                await session.execute(
+                    insert(DiscountArchiveModel.__table__),
+                    [
+                        {**row._mapping, 'archived_at': archived_at}
+                        for row in rows
+                    ],
+                )
+            await session.flush()
+            return len(rows)
+
+    def _savepoint(
+        self, session: AsyncSession
+    ) -> AbstractAsyncContextManager[object]:
+        """Savepoint para gravações em lote, se habilitado."""
+        if self.savepoints:
+            return session.begin_nested()
+        return nullcontext()
+
+    async def _fetch_one(
+        self, stmt: Select, parameters: dict[str, object]
+    ) -> Discount | None:
+        """Executa uma consulta de uma linha sem passar pelo ORM.
+
+        A consulta vai direto à conexão da sessão: a linha não entra no
+        mapa de identidade nem dispara o autoflush, e é convertida em
+        entidade por `map_discount_row`.
+        """
+        async with self._reading() as session:
+            connection = await session.connection()
+            result = await connection.execute(stmt, parameters)
+            row = result.one_or_none()
+
+        return None if row is None else map_discount_row(row)
+
+    @asynccontextmanager
+    async def _reading(self) -> AsyncIterator[AsyncSession]:
+        """Sessão para leitura: a do repositório ou a de uma réplica."""
+        if self.router is None:
+            yield self.session
+        else:
+            async with self.router.read() as session:
+                yield session
+
+    @asynccontextmanager
+    async def _writing(self) -> AsyncIterator[AsyncSession]:
+        """Sessão para gravação: a do repositório ou a do primário."""
+        if self.router is None:
+            yield self.session
+        else:
+            async with self.router.write() as session:
+                yield session
+
+    def _change_type(self, model: DiscountModel, discount: Discount) -> str:
+        """Classifica a alteração de um desconto já gravado."""
+        if discount.current_usage_count > (model.current_usage_count or 0):
+            return DISCOUNT_REDEEMED
+        return DISCOUNT_UPDATED
+
+    def _record(
+        self,
+        session: AsyncSession,
+        event_type: str,
+        discount_id: UUID,
+        discount: Discount | None = None,
+    ) -> None:
+        """Adiciona um evento à caixa de saída na transação da sessão."""
+        if not self.publish_events:
+            return
+        session.add(
+            OutboxEventModel(
+                event_type=event_type,
+                aggregate_id=discount_id,
+                payload=self._encoder.encode(discount) if discount else None,
+                occurred_at=datetime.now(),
+            )
+        )
+
+    def _update_model(self, model: DiscountModel, discount: Discount) -> None:
+        """Copia os dados da entidade para um modelo ORM existente.
+
+        Args:
+            model: Modelo ORM a ser atualizado
+            discount: Entidade de domínio com os novos dados
+
+        """
+        model.type = discount.type.name
+        model.value_minor = _value_to_minor_units(discount.value)
+        model.code = discount.code
+        model.description = discount.description
+        model.minimum_order_value_minor = to_minor_units(
+            discount.minimum_order_value.amount
+        )
+        model.currency = discount.minimum_order_value.currency
+        model.valid_from = discount.valid_from
+        model.valid_until = discount.valid_until
+        model.max_usage_count = discount.max_usage_count
+        model.current_usage_count = discount.current_usage_count
+        model.product_ids = encode_targets(discount.product_ids)
+        model.category_ids = encode_targets(discount.category_ids)
+
+    def _map_entity_to_model(self, discount: Discount) -> DiscountModel:
+        """Mapeia uma entidade de domínio para um novo modelo ORM.
+
+        Args:
+            discount: Entidade de domínio Discount
+
+        Returns:
+            Modelo ORM do desconto
+
+        """
+        return DiscountModel(
+            id=discount.id,
+            type=discount.type.name,
+            value_minor=_value_to_minor_units(discount.value),
+            code=discount.code,
+            description=discount.description,
+            minimum_order_value_minor=to_minor_units(
+                discount.minimum_order_value.amount
+            ),
+            currency=discount.minimum_order_value.currency,
+            valid_from=discount.valid_from,
+            valid_until=discount.valid_until,
+            max_usage_count=discount.max_usage_count,
+            current_usage_count=discount.current_usage_count,
+            product_ids=encode_targets(discount.product_ids),
+            category_ids=encode_targets(discount.category_ids),
+        )
+
+
+def encode_targets(ids: frozenset[UUID]) -> str | None:
+    """Converta os IDs alvo de um desconto para a coluna de texto.
+
+    Returns:
+        IDs em hexadecimal, ordenados e separados por espaço, ou None se
+        o desconto não for direcionado
+
+    """
+    if not ids:
+        return None
+    return ' '.join(sorted(target.hex for target in ids))
+
+
+def decode_targets(value: str | None) -> frozenset[UUID]:
+    """Converta a coluna de texto de volta para os IDs alvo."""
+    if not value:
+        return frozenset()
+    return frozenset(UUID(target) for target in value.split())
+
+
+def _value_to_minor_units(value: Money | Decimal | float) -> int:
+    """Converta o valor do desconto (percentual ou Money) para centésimos."""
+    if isinstance(value, Money):
+        value = value.amount
+    return to_minor_units(value)
+
+
+def _like_prefix(prefix: str) -> str:
+    """Monte o padrão `LIKE` dos textos que começam com o prefixo."""
+    escaped = (
+        prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+    return f'{escaped}%'
+
+
+def map_discount_row(row: Row | tuple) -> Discount:
+    """Converta uma linha com as colunas de `discounts` em entidade.
+
+    Args:
+        row: Linha de um `select` com todas as colunas da tabela, na
+            ordem da tabela
+
+    Returns:
+        Entidade de domínio Discount
+
+    """
+    (
+        discount_id,
+        type_name,
+        value_minor,
+        code,
+        description,
+        minimum_minor,
+        currency,
+        valid_from,
+        valid_until,
+        max_usage_count,
+        current_usage_count,
+        product_ids,
+        category_ids,
+    ) = _ROW_FIELDS(row)
+
+    discount_type = _DISCOUNT_TYPES[type_name]
+    value = from_minor_units(value_minor)
+    if discount_type is not DiscountType.PERCENTAGE:
+        value = Money(value, currency)
+
+    return Discount(
+        id=discount_id,
+        type=discount_type,
+        value=value,
+        code=code,
+        description=description,
+        minimum_order_value=Money(from_minor_units(minimum_minor), currency)
+        if minimum_minor
+        else Money.zero(currency),
+        valid_from=valid_from,
+        valid_until=valid_until,
+        max_usage_count=max_usage_count,
+        current_usage_count=current_usage_count,
+        product_ids=decode_targets(product_ids),
+        category_ids=decode_targets(category_ids),
+    )
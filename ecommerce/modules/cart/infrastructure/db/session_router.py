@@ -0,0 +1,202 @@
+"""Roteamento de sessões entre o banco primário e réplicas de leitura."""
+
+import itertools
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+ROUND_ROBIN = 'round_robin'
+LEAST_LATENCY = 'least_latency'
+STRATEGIES = (ROUND_ROBIN, LEAST_LATENCY)
+
+PRIMARY = 'primary'
+
+# Acima deste número de chamadores, as janelas já encerradas são descartadas
+MAX_TRACKED_CALLERS = 10_000
+
+# Identifica quem está fazendo as chamadas (uma requisição, um usuário),
+# para que as leituras após uma gravação sejam feitas no primário
+current_caller: ContextVar[str | None] = ContextVar(
+    'current_caller', default=None
+)
+
+
+@contextmanager
+def caller_context(caller_id: str) -> Iterator[None]:
+    """Associa as chamadas feitas dentro do bloco a um chamador.
+
+    Args:
+        caller_id: Identificador do chamador
+
+    """
+    token = current_caller.set(caller_id)
+    try:
+        yield
+    finally:
+        current_caller.reset(token)
+
+
+@dataclass
+class SessionRouterStats:
+    """Contadores do roteador de sessões."""
+
+    writes: int = 0
+    reads: dict[str, int] = field(default_factory=dict)
+    sticky_reads: int = 0
+    latency_seconds: dict[str, float] = field(default_factory=dict)
+
+
+class SessionRouter:
+    """Distribui leituras entre réplicas e gravações para o primário.
+
+    As réplicas são escolhidas em rodízio ou pela menor latência média
+    observada. Como as réplicas podem estar atrasadas, um chamador que
+    gravou no primário continua lendo do primário durante
+    `sticky_seconds`, e assim sempre enxerga as próprias gravações.
+    Chamadas fora de um `caller_context` não têm essa garantia: as
+    gravações anônimas não desviam as leituras para o primário.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: Sequence[async_sessionmaker[AsyncSession]] = (),
+        strategy: str = ROUND_ROBIN,
+        sticky_seconds: float = 5.0,
+        latency_smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Inicializa o roteador.
+
+        Args:
+            primary: Fábrica de sessões do banco primário
+            replicas: Fábricas de sessões das réplicas de leitura
+            strategy: `ROUND_ROBIN` ou `LEAST_LATENCY`
+            sticky_seconds: Janela após uma gravação em que as leituras
+                do mesmo chamador vão para o primário
+            latency_smoothing: Peso de cada nova medição na média móvel
+                exponencial de latência
+            clock: Relógio monotônico em segundos
+
+        Raises:
+            ValueError: Se a estratégia não for suportada
+
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(f'Estratégia não suportada: {strategy}')
+
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.sticky_seconds = sticky_seconds
+        self.latency_smoothing = latency_smoothing
+        self.clock = clock
+
+        self._names = [f'replica-{index}' for index in range(len(replicas))]
+        self._rotation = itertools.cycle(range(len(replicas)))
+        self._latencies: list[float | None] = [None] * len(replicas)
+        self._last_write: dict[str, float] = {}
+        self._stats = SessionRouterStats()
+
+    @asynccontextmanager
+    async def write(self) -> AsyncIterator[AsyncSession]:
+        """Abre uma sessão no primário e confirma a transação ao final.
+
+        Yields:
+            Sessão do banco primário
+
+        """
+        async with self.primary() as session, session.begin():
+            yield session
+
+        self._stats.writes += 1
+        caller = current_caller.get()
+        if caller is None:
+            return
+
+        now = self.clock()
+        self._last_write[caller] = now
+        if len(self._last_write) > MAX_TRACKED_CALLERS:
+            self._last_write = {
+                caller: written_at
+                for caller, written_at in self._last_write.items()
+                if now - written_at < self.sticky_seconds
+            }
+
+    @asynccontextmanager
+    async def read(self) -> AsyncIterator[AsyncSession]:
+        """Abre uma sessão de leitura no destino escolhido.
+
+        Yields:
+            Sessão de uma réplica ou, na janela após uma gravação do
+            mesmo chamador, do primário
+
+        """
+        index = self._choose()
+        name = PRIMARY if index is None else self._names[index]
+        factory = self.primary if index is None else self.replicas[index]
+        self._stats.reads[name] = self._stats.reads.get(name, 0) + 1
+
+        started_at = self.clock()
+        async with factory() as session:
+            yield session
+
+        if index is not None:
+            self.record_latency(index, self.clock() - started_at)
+
+    def record_latency(self, index: int, seconds: float) -> None:
+        """Atualiza a latência média de uma réplica.
+
+        Args:
+            index: Posição da réplica
+            seconds: Duração observada de uma leitura
+
+        """
+        previous = self._latencies[index]
+        if previous is None:
+            self._latencies[index] = seconds
+        else:
+            weight = self.latency_smoothing
+            self._latencies[index] = previous + weight * (seconds - previous)
+
+    @property
+    def stats(self) -> SessionRouterStats:
+        """Retorna uma cópia dos contadores atuais."""
+        return SessionRouterStats(
+            writes=self._stats.writes,
+            reads=dict(self._stats.reads),
+            sticky_reads=self._stats.sticky_reads,
+            latency_seconds={
+                name: latency
+                for name, latency in zip(
+                    self._names, self._latencies, strict=True
+                )
+                if latency is not None
+            },
+        )
+
+    def _choose(self) -> int | None:
+        """Retorna a posição da réplica a ser lida ou None para o primário."""
+        if not self.replicas:
+            return None
+
+        caller = current_caller.get()
+        written_at = None if caller is None else self._last_write.get(caller)
+        if written_at is not None:
+            if self.clock() - written_at < self.sticky_seconds:
+                self._stats.sticky_reads += 1
+                return None
+            del self._last_write[caller]
+
+        if self.strategy == LEAST_LATENCY:
+            # Réplicas ainda não medidas são experimentadas primeiro
+            return min(
+                range(len(self.replicas)),
+                key=lambda index: self._latencies[index] or 0.0,
+            )
+
+        return next(self._rotation)
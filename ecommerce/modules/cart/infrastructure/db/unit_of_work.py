@@ -0,0 +1,237 @@
+"""Unidades de trabalho sobre os repositórios SQL e em memória."""
+
+from __future__ import annotations
+
+import copy
+from collections.abc import AsyncIterator
+from datetime import datetime
+from types import TracebackType
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ...domain.entities.discount import Discount
+from ...domain.repositories.discount_repository import DiscountRepository
+from ...domain.value_objects.money import Money
+from .repositories.sql_discount_repository import SQLDiscountRepository
+
+
+class PendingDiscountRepository:
+    """Repositório que registra as gravações em vez de executá-las.
+
+    `save` e `delete` apenas anotam a alteração; `flush` as envia ao
+    repositório de origem com um único `delete_many` seguido de um único
+    `save_many`, para que um código removido possa ser reaproveitado na
+    mesma unidade. Buscas por ID e por código consideram as alterações
+    pendentes; listagens e buscas por prefixo refletem apenas o que já
+    foi gravado.
+    """
+
+    def __init__(
+        self, repository: DiscountRepository, copy_reads: bool = False
+    ):
+        """Inicializa o repositório sobre o repositório de origem.
+
+        Args:
+            repository: Repositório que recebe as gravações no `flush`
+            copy_reads: Se True, devolve cópias dos descontos lidos, para
+                repositórios que entregam as próprias instâncias guardadas
+
+        """
+        self.repository = repository
+        self.copy_reads = copy_reads
+        self._saved: dict[UUID, Discount] = {}
+        self._deleted: set[UUID] = set()
+
+    @property
+    def has_changes(self) -> bool:
+        """Indica se há gravações pendentes."""
+        return bool(self._saved or self._deleted)
+
+    async def get_by_id(self, discount_id: UUID) -> Discount | None:
+        """Busca um desconto pelo seu ID, incluindo os pendentes."""
+        if discount_id in self._deleted:
+            return None
+        pending = self._saved.get(discount_id)
+        if pending is not None:
+            return pending
+        return self._read(await self.repository.get_by_id(discount_id))
+
+    async def get_by_code(self, code: str) -> Discount | None:
+        """Busca um desconto pelo seu código, incluindo os pendentes."""
+        for discount in self._saved.values():
+            if discount.code == code:
+                return discount
+        discount = await self.repository.get_by_code(code)
+        if discount is None or discount.id in self._deleted:
+            return None
+        if discount.id in self._saved:
+            # A gravação pendente trocou o código do desconto
+            return None
+        return self._read(discount)
+
+    async def save(self, discount: Discount) -> Discount:
+        """Registra a gravação do desconto no próximo `flush`."""
+        self._deleted.discard(discount.id)
+        self._saved[discount.id] = discount
+        return discount
+
+    async def save_many(self, discounts: list[Discount]) -> list[Discount]:
+        """Registra a gravação de um lote de descontos."""
+        for discount in discounts:
+            await self.save(discount)
+        return discounts
+
+    async def delete(self, discount_id: UUID) -> None:
+        """Registra a remoção do desconto no próximo `flush`."""
+        self._saved.pop(discount_id, None)
+        self._deleted.add(discount_id)
+
+    async def delete_many(self, discount_ids: list[UUID]) -> None:
+        """Registra a remoção de um lote de descontos."""
+        for discount_id in discount_ids:
+            await self.delete(discount_id)
+
+    async def list(self) -> list[Discount]:
+        """Lista os descontos já gravados."""
+        return await self.repository.list()
+
+    async def list_active(
+        self,
+        now: datetime | None = None,
+        min_order_value: Money | None = None,
+    ) -> list[Discount]:
+        """Lista os descontos ativos já gravados."""
+        return await self.repository.list_active(now, min_order_value)
+
+    async def search_by_code_prefix(
+        self, prefix: str, limit: int = 20
+    ) -> list[Discount]:
+        """Busca descontos já gravados pelo início do código."""
+        return await self.repository.search_by_code_prefix(prefix, limit)
+
+    def stream(self, batch_size: int = 1000) -> AsyncIterator[list[Discount]]:
+        """Percorre os descontos já gravados em lotes."""
+        return self.repository.stream(batch_size)
+
+    async def flush(self) -> None:
+        """Envia as gravações pendentes ao repositório de origem."""
+        if self._deleted:
+            await self.repository.delete_many(list(self._deleted))
+        if self._saved:
+            await self.repository.save_many(list(self._saved.values()))
+        self.clear()
+
+    def clear(self) -> None:
+        """Descarta as gravações pendentes."""
+        self._saved.clear()
+        self._deleted.clear()
+
+    def _read(self, discount: Discount | None) -> Discount | None:
+        if discount is None or not self.copy_reads:
+            return discount
+        return copy.deepcopy(discount)
+
+
+class _UnitOfWork:
+    """Ciclo de vida comum: confirmação explícita ou descarte na saída."""
+
+    discounts: PendingDiscountRepository
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.rollback()
+
+    async def commit(self) -> None:
+        await self.discounts.flush()
+
+    async def rollback(self) -> None:
+        self.discounts.clear()
+
+
+class InMemoryUnitOfWork(_UnitOfWork):
+    """Unidade de trabalho sobre um repositório em memória.
+
+    As gravações são aplicadas ao repositório apenas em `commit`, de modo
+    que um caso de uso interrompido não deixa alterações parciais. Os
+    descontos lidos são cópias: alterá-los não afeta o repositório antes
+    da confirmação.
+    """
+
+    def __init__(self, repository: DiscountRepository):
+        """Inicializa a unidade de trabalho.
+
+        Args:
+            repository: Repositório em memória compartilhado
+
+        """
+        self.repository = repository
+        self.discounts = PendingDiscountRepository(repository, copy_reads=True)
+
+
+class SQLUnitOfWork(_UnitOfWork):
+    """Unidade de trabalho sobre uma sessão do SQLAlchemy.
+
+    Cada bloco `async with` abre uma sessão. As gravações pendentes são
+    enviadas em `commit`: as remoções com um único DELETE e as demais com
+    um único flush, em que o SQLAlchemy agrupa os INSERTs e UPDATEs,
+    seguidos de uma única confirmação.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        publish_events: bool = False,
+    ):
+        """Inicializa a unidade de trabalho.
+
+        Args:
+            sessions: Fábrica de sessões do banco primário
+            publish_events: Se True, grava eventos na caixa de saída
+
+        """
+        self.sessions = sessions
+        self.publish_events = publish_events
+        self.session: AsyncSession | None = None
+
+    async def __aenter__(self) -> SQLUnitOfWork:
+        """Abre a sessão da unidade de trabalho."""
+        self.session = self.sessions()
+        self.discounts = PendingDiscountRepository(
+            SQLDiscountRepository(
+                self.session,
+                publish_events=self.publish_events,
+                savepoints=False,
+            )
+        )
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Descarta o que não foi confirmado e fecha a sessão."""
+        try:
+            await self.rollback()
+        finally:
+            await self.session.close()
+            self.session = None
+
+    async def commit(self) -> None:
+        """Grava as alterações pendentes com um flush e as confirma."""
+        await self.discounts.flush()
+        await self.session.commit()
+
+    async def rollback(self) -> None:
+        """Descarta as alterações pendentes e desfaz a transação."""
+        self.discounts.clear()
+        await self.session.rollback()
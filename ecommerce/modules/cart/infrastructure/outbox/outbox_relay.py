@@ -0,0 +1,244 @@
+"""Retransmissão dos eventos de descontos gravados na caixa de saída.
+
+O `SQLDiscountRepository`, quando configurado com `publish_events`,
+grava um evento em `outbox_events` na mesma transação de cada alteração
+de desconto. O `OutboxRelay` lê os eventos pendentes em lotes, entrega
+cada lote a um destino e só então os remove: uma falha entre a entrega e
+a remoção faz o lote ser entregue de novo (entrega pelo menos uma vez).
+Os consumidores devem, portanto, ignorar eventos com `id` repetido.
+"""
+
+import asyncio
+import json
+import os
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Protocol
+from uuid import UUID
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..db.models.outbox_event_model import OutboxEventModel
+
+DISCOUNT_CREATED = 'discount.created'
+DISCOUNT_UPDATED = 'discount.updated'
+DISCOUNT_REDEEMED = 'discount.redeemed'
+DISCOUNT_DELETED = 'discount.deleted'
+
+
+@dataclass(frozen=True)
+class OutboxEvent:
+    """Evento lido da caixa de saída."""
+
+    id: int
+    event_type: str
+    aggregate_id: UUID
+    payload: str | None
+    occurred_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta o evento para um dicionário serializável em JSON."""
+        return {
+            'id': self.id,
+            'event_type': self.event_type,
+            'aggregate_id': str(self.aggregate_id),
+            'payload': json.loads(self.payload) if self.payload else None,
+            'occurred_at': self.occurred_at.isoformat(),
+        }
+
+
+class OutboxSink(Protocol):
+    """Destino dos eventos retransmitidos."""
+
+    async def publish(self, events: list[OutboxEvent]) -> None:
+        """Entrega um lote de eventos, na ordem, ou levanta uma exceção."""
+        ...
+
+
+class FileOutboxSink:
+    """Destino que acrescenta os eventos a um arquivo JSONL local."""
+
+    def __init__(self, path: str, fsync: bool = False):
+        """Inicializa o destino.
+
+        Args:
+            path: Arquivo que recebe um evento por linha
+            fsync: Se True, força a gravação em disco a cada lote
+
+        """
+        self.path = path
+        self.fsync = fsync
+
+    async def publish(self, events: list[OutboxEvent]) -> None:
+        """Acrescenta o lote ao arquivo com uma única escrita."""
+        lines = ''.join(
+            json.dumps(event.to_dict(), separators=(',', ':')) + '\n'
+            for event in events
+        )
+        with open(self.path, 'a', encoding='utf-8') as output:
+            output.write(lines)
+            if self.fsync:
+                output.flush()
+                os.fsync(output.fileno())
+
+
+class QueueOutboxSink:
+    """Destino que repassa os eventos para uma fila asyncio do processo."""
+
+    def __init__(self, queue: asyncio.Queue[OutboxEvent]):
+        """Inicializa o destino.
+
+        Args:
+            queue: Fila consumida pelos interessados nos eventos
+
+        """
+        self.queue = queue
+
+    async def publish(self, events: list[OutboxEvent]) -> None:
+        """Enfileira os eventos, aguardando se a fila estiver cheia."""
+        for event in events:
+            await self.queue.put(event)
+
+
+@dataclass
+class RelayStats:
+    """Métricas acumuladas do retransmissor."""
+
+    published: int = 0
+    batches: int = 0
+    failures: int = 0
+    busy_seconds: float = 0.0
+    last_lag_seconds: float = 0.0
+    max_lag_seconds: float = 0.0
+
+    @property
+    def events_per_second(self) -> float:
+        """Vazão de entrega durante o tempo gasto com lotes."""
+        if self.busy_seconds <= 0:
+            return 0.0
+        return self.published / self.busy_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta as métricas para um dicionário."""
+        return {**asdict(self), 'events_per_second': self.events_per_second}
+
+
+class OutboxRelay:
+    """Entrega os eventos pendentes da caixa de saída em lotes.
+
+    Deve haver um único retransmissor por banco: dois retransmissores
+    entregariam os mesmos eventos. O atraso de cada lote é medido entre a
+    gravação do evento mais antigo e a sua entrega.
+    """
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker[AsyncSession],
+        sink: OutboxSink,
+        batch_size: int = 500,
+        poll_interval: float = 0.1,
+        retry_interval: float = 1.0,
+        now: Callable[[], datetime] = datetime.now,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """Inicializa o retransmissor.
+
+        Args:
+            sessions: Fábrica de sessões do banco primário
+            sink: Destino dos eventos
+            batch_size: Quantidade máxima de eventos por lote
+            poll_interval: Pausa quando não há eventos pendentes
+            retry_interval: Pausa após uma falha do destino
+            now: Relógio usado para o atraso, comparável a `occurred_at`
+            clock: Relógio usado para medir a duração dos lotes
+
+        """
+        if batch_size <= 0:
+            raise ValueError('Tamanho do lote deve ser maior que zero')
+
+        self.sessions = sessions
+        self.sink = sink
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.now = now
+        self.clock = clock
+        self.stats = RelayStats()
+
+    async def relay_batch(self) -> int:
+        """Entrega e remove um lote de eventos pendentes.
+
+        Returns:
+            Quantidade de eventos entregues
+
+        Raises:
+            Exception: A falha do destino; os eventos continuam pendentes
+
+        """
+        started_at = self.clock()
+        columns = OutboxEventModel.__table__.c
+        stmt = select(*columns).order_by(columns.id).limit(self.batch_size)
+        async with self.sessions() as session:
+            rows = (await session.execute(stmt)).all()
+        if not rows:
+            return 0
+
+        events = [OutboxEvent(*row) for row in rows]
+        try:
+            await self.sink.publish(events)
+        except Exception:
+            self.stats.failures += 1
+            raise
+
+        ids = [event.id for event in events]
+        async with self.sessions() as session, session.begin():
+            await session.execute(
+                delete(OutboxEventModel).where(OutboxEventModel.id.in_(ids))
+            )
+
+        lag = (self.now() - events[0].occurred_at).total_seconds()
+        self.stats.published += len(events)
+        self.stats.batches += 1
+        self.stats.busy_seconds += self.clock() - started_at
+        self.stats.last_lag_seconds = lag
+        self.stats.max_lag_seconds = max(self.stats.max_lag_seconds, lag)
+        return len(events)
+
+    async def drain(self) -> int:
+        """Entrega lotes até não restar evento pendente.
+
+        Returns:
+            Quantidade de eventos entregues
+
+        """
+        total = 0
+        while published := await self.relay_batch():
+            total += published
+        return total
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Retransmite continuamente até `stop` ser sinalizado.
+
+        Lotes cheios são seguidos imediatamente pelo próximo; falhas do
+        destino são contadas em `stats` e repetidas após uma pausa.
+
+        Args:
+            stop: Evento que encerra a execução
+
+        """
+        while not stop.is_set():
+            try:
+                published = await self.relay_batch()
+            except Exception:
+                pause = self.retry_interval
+            else:
+                if published >= self.batch_size:
+                    continue
+                pause = self.poll_interval
+            try:
+                await asyncio.wait_for(stop.wait(), pause)
+            except TimeoutError:
+                pass
@@ -0,0 +1,204 @@
+"""Codificação binária compacta de carrinhos.
+
+Cada carrinho é gravado com um cabeçalho de tamanho fixo seguido de um
+registro de 60 bytes por item. UUIDs ocupam 16 bytes, datas são inteiros
+de microssegundos e o ID do carrinho não é repetido nos itens. As
+categorias dos itens, quando algum item tem uma, vêm em seguida, 16 bytes
+por item (zeros para item sem categoria). Descontos aplicados, raros em
+carrinhos anônimos, são anexados em JSON.
+"""
+
+import struct
+from datetime import datetime, timedelta
+from uuid import UUID
+
+from ...domain.entities.cart import Cart
+from ...domain.entities.cart_item import CartItem
+from ...domain.entities.discount import Discount
+from .json_codec import CartJSONDecoder, CartJSONEncoder
+
+FORMAT_VERSION = 1
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+_FLAG_USER_ID = 0b01
+_FLAG_SESSION_ID = 0b10
+_FLAG_CATEGORIES = 0b100
+_NO_CATEGORY = bytes(16)
+
+# versão, flags, id, criado, atualizado, tamanho da sessão, itens, descontos
+_HEADER = struct.Struct('<BB16sqqHII')
+# id, produto, quantidade, preço, adicionado, atualizado
+_ITEM = struct.Struct('<16s16sidqq')
+_UUID = struct.Struct('<16s')
+
+
+def _to_micros(value: datetime) -> int:
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class CartBinaryCodec:
+    """Codifica e decodifica carrinhos em um formato binário compacto."""
+
+    def __init__(self):
+        """Inicializa o codec."""
+        self._json_encoder = CartJSONEncoder()
+        self._json_decoder = CartJSONDecoder()
+
+    def encode(self, cart: Cart) -> bytes:
+        """Codifique um carrinho.
+
+        Args:
+            cart: Carrinho a ser codificado
+
+        Returns:
+            Representação binária do carrinho
+
+        """
+        flags = 0
+        user_id = b''
+        if cart.user_id is not None:
+            flags |= _FLAG_USER_ID
+            user_id = cart.user_id.bytes
+
+        session_id = b''
+        if cart.session_id is not None:
+            flags |= _FLAG_SESSION_ID
+            session_id = cart.session_id.encode()
+
+        categories = b''
+        if any(item.category_id is not None for item in cart.items):
+            flags |= _FLAG_CATEGORIES
+            categories = b''.join(
+                _NO_CATEGORY
+                if item.category_id is None
+                else item.category_id.bytes
+                for item in cart.items
+            )
+
+        discounts = b''
+        if cart.discounts:
+            discounts = self._json_encoder.encode(cart.discounts).encode()
+
+        parts = [
+            _HEADER.pack(
+                FORMAT_VERSION,
+                flags,
+                cart.id.bytes,
+                _to_micros(cart.created_at),
+                _to_micros(cart.updated_at),
+                len(session_id),
+                len(cart.items),
+                len(discounts),
+            ),
+            user_id,
+            session_id,
+        ]
+
+        pack_item = _ITEM.pack
+        parts.extend(
+            pack_item(
+                item.id.bytes,
+                item.product_id.bytes,
+                item.quantity,
+                item.price,
+                _to_micros(item.added_at),
+                _to_micros(item.updated_at),
+            )
+            for item in cart.items
+        )
+        parts.append(categories)
+        parts.append(discounts)
+
+        return b''.join(parts)
+
+    def decode(self, data: bytes) -> Cart:
+        """Decodifique um carrinho.
+
+        Args:
+            data: Representação produzida por `encode`
+
+        Returns:
+            O carrinho reconstruído
+
+        Raises:
+            ValueError: Se a versão do formato não for suportada
+
+        """
+        (
+            version,
+            flags,
+            cart_id,
+            created_at,
+            updated_at,
+            session_length,
+            item_count,
+            discounts_length,
+        ) = _HEADER.unpack_from(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Versão de formato não suportada: {version}')
+
+        offset = _HEADER.size
+        user_id = None
+        if flags & _FLAG_USER_ID:
+            user_id = UUID(bytes=_UUID.unpack_from(data, offset)[0])
+            offset += _UUID.size
+
+        session_id = None
+        if flags & _FLAG_SESSION_ID:
+            session_id = data[offset : offset + session_length].decode()
+            offset += session_length
+
+        cart = Cart(
+            id=UUID(bytes=cart_id),
+            user_id=user_id,
+            session_id=session_id,
+            created_at=_from_micros(created_at),
+            updated_at=_from_micros(updated_at),
+        )
+
+        items_end = offset + item_count * _ITEM.size
+        cart.items = [
+            CartItem(
+                id=UUID(bytes=item_id),
+                cart_id=cart.id,
+                product_id=UUID(bytes=product_id),
+                quantity=quantity,
+                price=price,
+                added_at=_from_micros(added_at),
+                updated_at=_from_micros(item_updated_at),
+            )
+            for (
+                item_id,
+                product_id,
+                quantity,
+                price,
+                added_at,
+                item_updated_at,
+            ) in _ITEM.iter_unpack(data[offset:items_end])
+        ]
+
+        if flags & _FLAG_CATEGORIES:
+            for item, (category_id,) in zip(
+                cart.items,
+                _UUID.iter_unpack(
+                    data[items_end : items_end + item_count * _UUID.size]
+                ),
+                strict=True,
+            ):
+                if category_id != _NO_CATEGORY:
+                    item.category_id = UUID(bytes=category_id)
+            items_end += item_count * _UUID.size
+
+        if discounts_length:
+            cart.discounts = self._json_decoder.decode(
+                data[items_end : items_end + discounts_length],
+                list[Discount],
+            )
+
+        return cart
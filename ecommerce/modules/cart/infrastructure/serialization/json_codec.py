@@ -0,0 +1,303 @@
+"""Codec JSON exato para as entidades do módulo de carrinho.
+
+Valores decimais e monetários são serializados como texto, preservando
+todas as casas decimais. Para cada tipo de entidade é montado uma única
+vez um plano de campos (nomes e conversores), reaproveitado em todas as
+chamadas seguintes em vez de refazer a introspecção a cada objeto.
+"""
+
+import dataclasses
+import json
+import types
+import typing
+from collections.abc import Callable, Iterator
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from operator import attrgetter
+from typing import Any, ClassVar, TextIO, TypeVar
+from uuid import UUID
+
+from ...domain.value_objects.money import Money
+
+T = TypeVar('T')
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+
+class CartJSONEncoder:
+    """Codifica entidades do carrinho em JSON sem perda de precisão."""
+
+    _converters: ClassVar[dict[type, Callable[[Any], Any]]] = {}
+
+    def __init__(self, chunk_size: int = 500):
+        """Inicializa o encoder.
+
+        Args:
+            chunk_size: Quantidade de elementos de listas grandes agrupados
+                em cada pedaço produzido por `iterencode`
+
+        """
+        self.chunk_size = chunk_size
+        self._dumps = json.JSONEncoder(
+            ensure_ascii=False, separators=(',', ':')
+        ).encode
+
+    def to_primitive(self, value: Any) -> Any:
+        """Converta um valor em estruturas compatíveis com JSON.
+
+        Args:
+            value: Entidade, value object ou valor simples
+
+        Returns:
+            Valor composto apenas por dict, list, str, int, float e None
+
+        Raises:
+            TypeError: Se o tipo não for suportado
+
+        """
+        value_type = type(value)
+        if value_type in _PRIMITIVES:
+            return value
+
+        converter = self._converters.get(value_type)
+        if converter is None:
+            converter = self._build_converter(value_type)
+            self._converters[value_type] = converter
+        return converter(value)
+
+    def encode(self, value: Any) -> str:
+        """Codifique um valor como um documento JSON.
+
+        Args:
+            value: Valor a ser codificado
+
+        Returns:
+            Documento JSON
+
+        """
+        return self._dumps(self.to_primitive(value))
+
+    def iterencode(self, value: Any) -> Iterator[str]:
+        """Codifique um valor em pedaços, sem montar o documento inteiro.
+
+        Listas de uma entidade (como os itens de um carrinho) são emitidas
+        em grupos de `chunk_size` elementos, o que mantém limitada a
+        memória usada para carrinhos muito grandes.
+
+        Args:
+            value: Valor a ser codificado
+
+        Yields:
+            Pedaços consecutivos do documento JSON
+
+        """
+        if not dataclasses.is_dataclass(value) or isinstance(value, Money):
+            yield self.encode(value)
+            return
+
+        dumps = self._dumps
+        yield '{'
+        for index, field in enumerate(_init_fields(type(value))):
+            prefix = ',' if index else ''
+            yield f'{prefix}{dumps(field.name)}:'
+
+            field_value = getattr(value, field.name)
+            if not isinstance(field_value, list):
+                yield self.encode(field_value)
+                continue
+
+            yield '['
+            for start in range(0, len(field_value), self.chunk_size):
+                chunk = field_value[start : start + self.chunk_size]
+                body = dumps([self.to_primitive(item) for item in chunk])
+                yield (',' if start else '') + body[1:-1]
+            yield ']'
+        yield '}'
+
+    def dump(self, value: Any, file: TextIO) -> None:
+        """Grave um valor codificado em um arquivo texto, em pedaços.
+
+        Args:
+            value: Valor a ser codificado
+            file: Arquivo de destino
+
+        """
+        for chunk in self.iterencode(value):
+            file.write(chunk)
+
+    def _build_converter(self, value_type: type) -> Callable[[Any], Any]:
+        if value_type is Money:
+            return Money.to_dict
+        if issubclass(value_type, Enum):
+            return attrgetter('name')
+        if issubclass(value_type, (UUID, Decimal)):
+            return str
+        if issubclass(value_type, (datetime, date)):
+            return value_type.isoformat
+        if issubclass(value_type, (list, tuple)):
+            convert = self.to_primitive
+            return lambda items: [convert(item) for item in items]
+        if issubclass(value_type, (set, frozenset)):
+            convert = self.to_primitive
+            return lambda items: sorted(
+                (convert(item) for item in items), key=str
+            )
+        if issubclass(value_type, dict):
+            convert = self.to_primitive
+            return lambda mapping: {
+                str(key): convert(item) for key, item in mapping.items()
+            }
+        if dataclasses.is_dataclass(value_type):
+            return self._build_dataclass_converter(value_type)
+
+        raise TypeError(
+            f'Tipo não suportado pelo codec: {value_type.__name__}'
+        )
+
+    def _build_dataclass_converter(
+        self, value_type: type
+    ) -> Callable[[Any], dict[str, Any]]:
+        names = tuple(field.name for field in _init_fields(value_type))
+        getter = attrgetter(*names)
+        convert = self.to_primitive
+        if len(names) == 1:
+            return lambda obj: {names[0]: convert(getter(obj))}
+
+        def converter(obj: Any) -> dict[str, Any]:
+            return {
+                name: convert(item)
+                for name, item in zip(names, getter(obj), strict=True)
+            }
+
+        return converter
+
+
+class CartJSONDecoder:
+    """Reconstrói entidades do carrinho a partir de JSON."""
+
+    _parsers: ClassVar[dict[Any, Callable[[Any], Any]]] = {}
+
+    def decode(self, data: str | bytes, target: type[T]) -> T:
+        """Decodifique um documento JSON para o tipo informado.
+
+        Args:
+            data: Documento JSON
+            target: Classe da entidade esperada (ex: Cart, Discount, Money)
+
+        Returns:
+            A entidade reconstruída
+
+        """
+        return self.from_primitive(json.loads(data), target)
+
+    def load(self, file: TextIO, target: type[T]) -> T:
+        """Decodifique o conteúdo de um arquivo texto.
+
+        Args:
+            file: Arquivo com o documento JSON
+            target: Classe da entidade esperada
+
+        Returns:
+            A entidade reconstruída
+
+        """
+        return self.decode(file.read(), target)
+
+    def from_primitive(self, data: Any, target: Any) -> Any:
+        """Converta estruturas JSON no tipo informado.
+
+        Args:
+            data: Valor produzido por `json.loads`
+            target: Tipo ou anotação de destino
+
+        Returns:
+            Valor convertido
+
+        """
+        parser = self._parsers.get(target)
+        if parser is None:
+            parser = self._build_parser(target)
+            self._parsers[target] = parser
+        return parser(data)
+
+    def _build_parser(self, target: Any) -> Callable[[Any], Any]:
+        origin = typing.get_origin(target)
+
+        if origin in (types.UnionType, typing.Union):
+            options = [
+                arg for arg in typing.get_args(target) if arg is not type(None)
+            ]
+            if len(options) != 1:
+                return _identity
+            inner = self._parser_for(options[0])
+            return lambda data: None if data is None else inner(data)
+
+        if origin in (list, tuple, set, frozenset):
+            (item_type, *_) = typing.get_args(target) or (Any,)
+            item_parser = self._parser_for(item_type)
+            return lambda items: origin(item_parser(item) for item in items)
+
+        if target is Money:
+            return Money.from_dict
+        if target is float:
+            return _parse_number
+        if not isinstance(target, type):
+            return _identity
+        if issubclass(target, Enum):
+            return target.__getitem__
+        if target in (UUID, Decimal):
+            return target
+        if issubclass(target, datetime):
+            return target.fromisoformat
+        if dataclasses.is_dataclass(target):
+            return self._build_dataclass_parser(target)
+
+        return _identity
+
+    def _parser_for(self, target: Any) -> Callable[[Any], Any]:
+        return lambda data: self.from_primitive(data, target)
+
+    def _build_dataclass_parser(
+        self, target: type
+    ) -> Callable[[dict[str, Any]], Any]:
+        hints = typing.get_type_hints(target)
+        plan = tuple(
+            (field.name, self._parser_for(hints[field.name]))
+            for field in _init_fields(target)
+        )
+
+        def parser(data: dict[str, Any]) -> Any:
+            return target(
+                **{
+                    name: parse(data[name])
+                    for name, parse in plan
+                    if name in data
+                }
+            )
+
+        return parser
+
+
+def _init_fields(value_type: type) -> tuple[dataclasses.Field, ...]:
+    return tuple(
+        field for field in dataclasses.fields(value_type) if field.init
+    )
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _parse_number(value: Any) -> Any:
+    """Interprete campos numéricos que podem conter decimais exatos.
+
+    Campos anotados como `float` (como `Discount.value`) também aceitam
+    Decimal e Money; por isso textos voltam como Decimal e dicionários
+    como Money.
+    """
+    if isinstance(value, str):
+        return Decimal(value)
+    if isinstance(value, dict):
+        return Money.from_dict(value)
+    return value
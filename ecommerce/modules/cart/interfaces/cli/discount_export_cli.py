@@ -0,0 +1,53 @@
+"""Interface de linha de comando para exportação de descontos."""
+
+from ...application.use_cases.export_discounts import (
+    ExportDiscountsUseCase,
+    ExportReport,
+)
+
+
+class DiscountExportCLI:
+    """Interface não interativa para exportar o catálogo de descontos."""
+
+    def __init__(self, export_discounts_use_case: ExportDiscountsUseCase):
+        """Inicializa a CLI com o caso de uso de exportação.
+
+        Args:
+            export_discounts_use_case: Caso de uso de exportação
+
+        """
+        self.export_discounts_use_case = export_discounts_use_case
+
+    async def run(
+        self,
+        path: str,
+        file_format: str = 'jsonl',
+        compress: bool = False,
+        chunk_size: int = 1000,
+    ) -> ExportReport:
+        """Exporta o catálogo para o arquivo informado.
+
+        Args:
+            path: Caminho do arquivo de saída
+            file_format: Formato de saída (csv, jsonl ou columnar)
+            compress: Se True, comprime a saída com gzip
+            chunk_size: Quantidade de descontos por lote
+
+        Returns:
+            Resumo da exportação
+
+        """
+        with open(path, 'wb') as output:
+            report = await self.export_discounts_use_case.execute(
+                output,
+                file_format=file_format,
+                compress=compress,
+                chunk_size=chunk_size,
+            )
+
+        print('\n==== Exportação concluída ====')
+        print(f'Linhas exportadas: {report.rows}')
+        print(f'Bytes gravados: {report.bytes_written}')
+        print(f'Tempo: {report.elapsed_seconds:.2f}s')
+        print(f'Vazão: {report.rows_per_second:.0f} linhas/s')
+        return report
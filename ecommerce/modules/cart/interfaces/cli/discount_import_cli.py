@@ -0,0 +1,143 @@
+"""Interface de linha de comando para importação em lote de descontos."""
+
+import csv
+import json
+import os
+from collections.abc import Iterator
+from typing import Any, TextIO
+
+from ...application.use_cases.import_discounts import (
+    ImportDiscountsUseCase,
+    ImportReport,
+    RejectedRow,
+)
+
+SUPPORTED_FORMATS = ('csv', 'jsonl')
+
+
+def iter_csv_rows(file: TextIO) -> Iterator[tuple[int, dict[str, str]]]:
+    """Lê um arquivo CSV com cabeçalho, uma linha por vez.
+
+    Args:
+        file: Arquivo CSV aberto em modo texto
+
+    Yields:
+        Pares (número da linha, registro)
+
+    """
+    reader = csv.DictReader(file)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def iter_jsonl_rows(file: TextIO) -> Iterator[tuple[int, Any]]:
+    """Lê um arquivo JSONL, um objeto por linha.
+
+    Linhas que não são JSON válido são repassadas como texto bruto
+    para que o caso de uso as registre como recusadas.
+
+    Args:
+        file: Arquivo JSONL aberto em modo texto
+
+    Yields:
+        Pares (número da linha, registro)
+
+    """
+    for line_number, line in enumerate(file, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, line
+
+
+def detect_format(path: str) -> str:
+    """Deduz o formato do arquivo a partir da extensão.
+
+    Raises:
+        ValueError: Se a extensão não for suportada
+
+    """
+    extension = os.path.splitext(path)[1].lstrip('.').lower()
+    if extension == 'json':
+        extension = 'jsonl'
+    if extension not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f'Formato não suportado: {extension or path}. '
+            f'Use um de: {", ".join(SUPPORTED_FORMATS)}'
+        )
+    return extension
+
+
+class DiscountImportCLI:
+    """Interface não interativa para importar descontos de arquivos."""
+
+    def __init__(self, import_discounts_use_case: ImportDiscountsUseCase):
+        """Inicializa a CLI com o caso de uso de importação.
+
+        Args:
+            import_discounts_use_case: Caso de uso de importação em lote
+
+        """
+        self.import_discounts_use_case = import_discounts_use_case
+
+    async def run(
+        self,
+        path: str,
+        file_format: str | None = None,
+        reject_path: str | None = None,
+    ) -> ImportReport:
+        """Importa o arquivo informado e imprime o progresso.
+
+        Args:
+            path: Caminho do arquivo CSV ou JSONL
+            file_format: Formato do arquivo; deduzido da extensão se omitido
+            reject_path: Arquivo JSONL que recebe as linhas recusadas
+
+        Returns:
+            Resumo da importação
+
+        """
+        file_format = file_format or detect_format(path)
+        read_rows = iter_csv_rows if file_format == 'csv' else iter_jsonl_rows
+
+        reject_file = (
+            open(reject_path, 'w', encoding='utf-8') if reject_path else None
+        )
+
+        def on_reject(rejected: RejectedRow) -> None:
+            if reject_file:
+                record = {
+                    'line': rejected.line_number,
+                    'row': rejected.row,
+                    'error': rejected.error,
+                }
+                reject_file.write(
+                    json.dumps(record, ensure_ascii=False) + '\n'
+                )
+
+        def on_progress(report: ImportReport) -> None:
+            print(
+                f'{report.processed} linhas processadas '
+                f'({report.rows_per_second:.0f} linhas/s)'
+            )
+
+        try:
+            with open(path, encoding='utf-8', newline='') as file:
+                report = await self.import_discounts_use_case.execute(
+                    read_rows(file),
+                    on_reject=on_reject,
+                    on_progress=on_progress,
+                )
+        finally:
+            if reject_file:
+                reject_file.close()
+
+        print('\n==== Importação concluída ====')
+        print(f'Importados: {report.accepted}')
+        print(f'Recusados: {report.rejected}')
+        print(f'Tempo: {report.elapsed_seconds:.2f}s')
+        print(f'Vazão: {report.rows_per_second:.0f} linhas/s')
+        return report
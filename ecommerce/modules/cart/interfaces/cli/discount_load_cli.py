@@ -0,0 +1,50 @@
+"""Interface de linha de comando para a simulação de carga de descontos."""
+
+import json
+
+from ...application.use_cases.simulate_discount_load import (
+    LoadProfile,
+    LoadReport,
+    SimulateDiscountLoadUseCase,
+)
+
+
+class DiscountLoadCLI:
+    """Interface não interativa para executar a simulação de carga."""
+
+    def __init__(
+        self, simulate_discount_load_use_case: SimulateDiscountLoadUseCase
+    ):
+        """Inicializa a CLI com o caso de uso de simulação.
+
+        Args:
+            simulate_discount_load_use_case: Caso de uso de simulação
+
+        """
+        self.simulate_discount_load_use_case = simulate_discount_load_use_case
+
+    async def run(
+        self,
+        profile: LoadProfile,
+        output_path: str | None = None,
+    ) -> LoadReport:
+        """Executa a simulação e publica o relatório em JSON.
+
+        Args:
+            profile: Configuração da simulação
+            output_path: Arquivo que recebe o relatório (padrão: apenas
+                a saída padrão)
+
+        Returns:
+            Relatório da simulação
+
+        """
+        report = await self.simulate_discount_load_use_case.execute(profile)
+        document = json.dumps(report.to_dict(), indent=2, sort_keys=True)
+
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as output:
+                output.write(document + '\n')
+
+        print(document)
+        return report
@@ -0,0 +1,53 @@
+"""Interface de linha de comando para a reprodução de eventos de carrinho."""
+
+import json
+
+from ...application.use_cases.replay_cart_events import (
+    ReplayCartEventsUseCase,
+    ReplayReport,
+)
+
+
+class DiscountReplayCLI:
+    """Interface não interativa para comparar catálogos sobre um log."""
+
+    def __init__(self, replay_cart_events_use_case: ReplayCartEventsUseCase):
+        """Inicializa a CLI com o caso de uso de reprodução.
+
+        Args:
+            replay_cart_events_use_case: Caso de uso de reprodução
+
+        """
+        self.replay_cart_events_use_case = replay_cart_events_use_case
+
+    def run(
+        self,
+        path: str,
+        file_format: str | None = None,
+        processes: int = 1,
+        output_path: str | None = None,
+    ) -> ReplayReport:
+        """Reproduz o log e publica o relatório em JSON.
+
+        Args:
+            path: Arquivo do log de eventos
+            file_format: 'jsonl' ou 'binary' (padrão: deduzido da extensão)
+            processes: Quantidade de processos
+            output_path: Arquivo que recebe o relatório (padrão: apenas
+                a saída padrão)
+
+        Returns:
+            Relatório da reprodução
+
+        """
+        report = self.replay_cart_events_use_case.execute_file(
+            path, file_format=file_format, processes=processes
+        )
+        document = json.dumps(report.to_dict(), indent=2, sort_keys=True)
+
+        if output_path:
+            with open(output_path, 'w', encoding='utf-8') as output:
+                output.write(document + '\n')
+
+        print(document)
+        return report
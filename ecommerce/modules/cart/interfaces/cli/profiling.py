@@ -0,0 +1,359 @@
+"""Perfis de execução dos comandos da CLI.
+
+Dois modos estão disponíveis: `cprofile`, determinístico, que registra
+todas as chamadas, e `sampling`, que apenas amostra a pilha da thread
+principal em intervalos fixos, com custo muito menor. Ambos gravam:
+
+- `<prefixo>.pstats`: estatísticas no formato do módulo `pstats`; no modo
+  `sampling`, as "chamadas" são quantidades de amostras;
+- `<prefixo>.collapsed`: pilhas colapsadas, uma por linha, prontas para o
+  `flamegraph.pl` ou o speedscope;
+- `<prefixo>.summary.txt`: tempo próprio por camada e as funções mais
+  custosas, também impresso na saída de erro.
+
+No modo `cprofile` as pilhas colapsadas são aproximadas a partir do grafo
+de chamadas, distribuindo o tempo de cada função entre quem a chamou.
+Processos filhos, como os da reprodução particionada, não são incluídos.
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+
+PROFILE_MODES = ('cprofile', 'sampling')
+
+# Ordem de verificação importa: repositórios antes de infraestrutura
+LAYERS = (
+    ('repositories', ('/domain/repositories/', '/db/repositories/')),
+    ('domain', ('/modules/cart/domain/',)),
+    ('application', ('/modules/cart/application/',)),
+    ('infrastructure', ('/modules/cart/infrastructure/',)),
+    ('interfaces', ('/modules/cart/interfaces/', '/ecommerce/main_')),
+)
+OTHER_LAYER = 'other'
+
+_MAX_COLLAPSED_DEPTH = 64
+_MIN_COLLAPSED_MICROSECONDS = 1.0
+
+FrameKey = tuple[str, int, str]
+
+
+def layer_of(filename: str) -> str:
+    """Camada da aplicação a que pertence um arquivo de código."""
+    path = filename.replace(os.sep, '/')
+    for layer, markers in LAYERS:
+        if any(marker in path for marker in markers):
+            return layer
+    return OTHER_LAYER
+
+
+def frame_label(key: FrameKey) -> str:
+    """Rótulo curto de uma função nas pilhas e no resumo."""
+    filename, lineno, name = key
+    if filename == '~':
+        return name
+    path = filename.replace(os.sep, '/')
+    start = path.rfind('/ecommerce/')
+    path = path[start + 1 :] if start >= 0 else os.path.basename(path)
+    return f'{path}:{lineno}({name})'
+
+
+class SamplingProfiler:
+    """Amostrador da pilha de uma thread, executado em segundo plano.
+
+    A cada intervalo, uma thread auxiliar copia a pilha da thread
+    observada com `sys._current_frames`. A thread observada não executa
+    nenhum código extra; o custo é o da thread auxiliar disputar o GIL.
+    Como a thread auxiliar pode esperar pelo GIL além do intervalo, cada
+    amostra vale a duração total da amostragem dividida pela quantidade
+    de amostras.
+    """
+
+    def __init__(self, interval: float = 0.005, thread_id: int | None = None):
+        """Inicializa o amostrador.
+
+        Args:
+            interval: Intervalo entre amostras, em segundos
+            thread_id: Thread observada (padrão: a que chama `start`)
+
+        """
+        if interval <= 0:
+            raise ValueError('Intervalo deve ser maior que zero')
+
+        self.interval = interval
+        self.thread_id = thread_id
+        self.samples: Counter[tuple[FrameKey, ...]] = Counter()
+        self.stats: dict = {}
+        self.elapsed = 0.0
+        self._started_at = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Inicia a amostragem."""
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name='sampling-profiler', daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Encerra a amostragem e aguarda a thread auxiliar."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+            self.elapsed += time.perf_counter() - self._started_at
+
+    @property
+    def seconds_per_sample(self) -> float:
+        """Duração efetiva representada por uma amostra."""
+        total = sum(self.samples.values())
+        if not total or not self.elapsed:
+            return self.interval
+        return self.elapsed / total
+
+    def collapsed(self) -> dict[str, int]:
+        """Pilhas colapsadas, da raiz à folha, com a quantidade de amostras."""
+        stacks: Counter[str] = Counter()
+        for stack, count in self.samples.items():
+            stacks[';'.join(frame_label(key) for key in stack)] += count
+        return dict(stacks)
+
+    def create_stats(self) -> None:
+        """Converta as amostras para o formato lido por `pstats.Stats`."""
+        interval = self.seconds_per_sample
+        stats: dict[FrameKey, list] = {}
+
+        def entry(key: FrameKey) -> list:
+            if key not in stats:
+                stats[key] = [0, 0, 0.0, 0.0, defaultdict(_new_edge)]
+            return stats[key]
+
+        for stack, count in self.samples.items():
+            elapsed = count * interval
+            entry(stack[-1])[2] += elapsed
+            for key in set(stack):
+                current = entry(key)
+                current[0] += count
+                current[1] += count
+                current[3] += elapsed
+            for caller, callee in zip(stack, stack[1:], strict=False):
+                edge = entry(callee)[4][caller]
+                edge[0] += count
+                edge[1] += count
+                edge[3] += elapsed
+
+        self.stats = {
+            key: (
+                cc,
+                nc,
+                tt,
+                ct,
+                {caller: tuple(edge) for caller, edge in callers.items()},
+            )
+            for key, (cc, nc, tt, ct, callers) in stats.items()
+        }
+
+    def _run(self) -> None:
+        current_frames = sys._current_frames
+        while not self._stop.wait(self.interval):
+            frame = current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    (code.co_filename, code.co_firstlineno, code.co_name)
+                )
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+
+def _new_edge() -> list:
+    return [0, 0, 0.0, 0.0]
+
+
+def collapse_call_graph(stats: pstats.Stats) -> dict[str, int]:
+    """Aproxima pilhas colapsadas a partir do grafo de chamadas do cProfile.
+
+    O tempo próprio de cada função é repartido entre quem a chamou, na
+    proporção do tempo acumulado em cada chamada, subindo até as raízes.
+    Ramos recursivos, muito profundos ou abaixo de um microssegundo são
+    encerrados no ponto em que estão.
+
+    Args:
+        stats: Estatísticas de um perfil determinístico
+
+    Returns:
+        Pilhas da raiz à folha, com o tempo próprio em microssegundos
+
+    """
+    raw = stats.stats
+    stacks: Counter[str] = Counter()
+
+    def climb(path: list[FrameKey], weight: float) -> None:
+        callers = raw[path[-1]][4]
+        total = sum(edge[3] for edge in callers.values())
+        if (
+            not callers
+            or total <= 0
+            or len(path) >= _MAX_COLLAPSED_DEPTH
+            or weight < 2 * _MIN_COLLAPSED_MICROSECONDS
+        ):
+            label = ';'.join(frame_label(key) for key in reversed(path))
+            stacks[label] += weight
+            return
+        for caller, edge in callers.items():
+            share = weight * edge[3] / total
+            if caller in path or caller not in raw:
+                label = ';'.join(frame_label(key) for key in reversed(path))
+                stacks[label] += share
+            else:
+                path.append(caller)
+                climb(path, share)
+                path.pop()
+
+    for key, (_, _, tt, _, _) in raw.items():
+        weight = tt * 1_000_000
+        if weight >= _MIN_COLLAPSED_MICROSECONDS:
+            climb([key], weight)
+
+    return {
+        stack: round(weight) for stack, weight in stacks.items() if weight >= 1
+    }
+
+
+def summarize(stats: pstats.Stats, mode: str, top: int = 15) -> str:
+    """Resume o perfil por camada e pelas funções com mais tempo próprio.
+
+    Args:
+        stats: Estatísticas do perfil
+        mode: Modo em que o perfil foi capturado
+        top: Quantidade de funções listadas
+
+    Returns:
+        Texto do resumo
+
+    """
+    by_layer: Counter[str] = Counter()
+    functions = []
+    for key, (_, _, tt, _, _) in stats.stats.items():
+        layer = layer_of(key[0])
+        by_layer[layer] += tt
+        if tt > 0:
+            functions.append((tt, layer, key))
+
+    total = sum(by_layer.values()) or 1.0
+    lines = [f'Perfil ({mode}): {total:.3f} s de tempo próprio', '']
+    lines.append('Tempo próprio por camada:')
+    for layer, seconds in by_layer.most_common():
+        lines.append(
+            f'  {layer:<16}{seconds:>10.3f} s {100 * seconds / total:6.1f}%'
+        )
+
+    lines += ['', 'Funções com mais tempo próprio:']
+    functions.sort(key=lambda item: item[0], reverse=True)
+    for seconds, layer, key in functions[:top]:
+        lines.append(f'  {seconds:>8.3f} s  {layer:<16}{frame_label(key)}')
+    return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def _profiling(
+    mode: str, output_prefix: str, interval: float
+) -> Iterator[None]:
+    if mode == 'cprofile':
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = SamplingProfiler(interval)
+        profiler.start()
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        if mode == 'cprofile':
+            profiler.disable()
+        else:
+            profiler.stop()
+        elapsed = time.perf_counter() - started_at
+        write_profile(profiler, mode, output_prefix, elapsed)
+
+
+def write_profile(
+    profiler: cProfile.Profile | SamplingProfiler,
+    mode: str,
+    output_prefix: str,
+    elapsed: float | None = None,
+) -> str:
+    """Grave as saídas de um perfil e imprima o resumo na saída de erro.
+
+    Args:
+        profiler: Perfil determinístico ou amostrador, já encerrado
+        mode: Modo em que o perfil foi capturado
+        output_prefix: Prefixo dos arquivos gravados
+        elapsed: Duração do trecho observado, incluída no resumo
+
+    Returns:
+        Texto do resumo
+
+    """
+    stats = pstats.Stats(profiler)
+    stats.dump_stats(f'{output_prefix}.pstats')
+
+    if isinstance(profiler, SamplingProfiler):
+        stacks = profiler.collapsed()
+    else:
+        stacks = collapse_call_graph(stats)
+    with open(f'{output_prefix}.collapsed', 'w', encoding='utf-8') as output:
+        for stack, weight in sorted(stacks.items()):
+            output.write(f'{stack} {weight}\n')
+
+    summary = summarize(stats, mode)
+    if elapsed is not None:
+        summary = f'Duração: {elapsed:.3f} s\n' + summary
+    with open(f'{output_prefix}.summary.txt', 'w', encoding='utf-8') as output:
+        output.write(summary)
+    print(summary, file=sys.stderr)
+    return summary
+
+
+def profile_session(
+    mode: str | None,
+    output_prefix: str = 'discount_profile',
+    interval: float = 0.005,
+) -> AbstractContextManager[None]:
+    """Contexto que perfila o trecho executado dentro dele.
+
+    Sem modo, devolve um `nullcontext`: nada é instalado e o trecho
+    executa sem custo adicional.
+
+    Args:
+        mode: 'cprofile', 'sampling' ou None para não perfilar
+        output_prefix: Prefixo dos arquivos gravados
+        interval: Intervalo entre amostras do modo 'sampling'
+
+    Returns:
+        Gerenciador de contexto
+
+    Raises:
+        ValueError: Se o modo for desconhecido
+
+    """
+    if mode is None:
+        return nullcontext()
+    if mode not in PROFILE_MODES:
+        raise ValueError(f'Modo de perfil desconhecido: {mode}')
+    return _profiling(mode, output_prefix, interval)
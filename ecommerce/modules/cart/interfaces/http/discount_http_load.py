@@ -0,0 +1,176 @@
+"""Teste de carga local para o servidor HTTP de descontos."""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from ...application.use_cases.simulate_discount_load import (
+    PERCENTILES,
+    percentile,
+)
+from .discount_http_server import APPLY_PREFIX, APPLY_SUFFIX, VALIDATE_PATH
+
+
+@dataclass(frozen=True)
+class HTTPLoadProfile:
+    """Configuração de um teste de carga HTTP."""
+
+    connections: int = 32
+    requests: int = 50_000
+    pipeline_depth: int = 16
+    apply_ratio: float = 0.2
+    unknown_ratio: float = 0.1
+    order_value: str = '200.00'
+    seed: int = 0
+
+
+@dataclass
+class HTTPLoadReport:
+    """Resultado de um teste de carga HTTP."""
+
+    requests: int = 0
+    elapsed_seconds: float = 0.0
+    requests_per_second: float = 0.0
+    latency_ms: dict[str, float] = field(default_factory=dict)
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta o relatório para um dicionário serializável em JSON."""
+        return asdict(self)
+
+
+def encode_request(path: str, payload: dict[str, Any]) -> bytes:
+    """Monta uma requisição POST persistente com corpo JSON."""
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    head = (
+        f'POST {path} HTTP/1.1\r\n'
+        'Host: localhost\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        '\r\n'
+    )
+    return head.encode('latin-1') + body
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    """Lê uma resposta HTTP/1.1 com Content-Length.
+
+    Returns:
+        Código de status e corpo da resposta
+
+    """
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length) if length else b''
+    return status, body
+
+
+async def run_http_load(
+    host: str,
+    port: int,
+    codes: list[str],
+    discount_ids: list[str],
+    profile: HTTPLoadProfile,
+) -> HTTPLoadReport:
+    """Envia requisições em pipeline por conexões persistentes.
+
+    Cada conexão envia lotes de `pipeline_depth` requisições de uma vez
+    e então lê as respostas, na ordem. A latência de cada requisição é
+    medida do envio do lote até a leitura da sua resposta.
+
+    Args:
+        host: Endereço do servidor
+        port: Porta do servidor
+        codes: Códigos de cupons cadastrados, para as validações
+        discount_ids: IDs de descontos cadastrados, para os resgates
+        profile: Configuração do teste
+
+    Returns:
+        Relatório com vazão, latências e contagem de status
+
+    """
+    rng = random.Random(profile.seed)
+    requests = []
+    for index in range(profile.requests):
+        draw = rng.random()
+        if draw < profile.apply_ratio:
+            path = f'{APPLY_PREFIX}{rng.choice(discount_ids)}{APPLY_SUFFIX}'
+            payload = {'cart_total': profile.order_value}
+        else:
+            if draw < profile.apply_ratio + profile.unknown_ratio:
+                code = f'HTTP-UNKNOWN-{index}'
+            else:
+                code = rng.choice(codes)
+            path = VALIDATE_PATH
+            payload = {'code': code, 'order_value': profile.order_value}
+        requests.append(encode_request(path, payload))
+
+    latencies: list[float] = []
+    statuses: Counter[str] = Counter()
+    connections = max(1, min(profile.connections, len(requests)))
+    depth = max(1, profile.pipeline_depth)
+
+    async def connection(offset: int) -> None:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            share = requests[offset::connections]
+            for start in range(0, len(share), depth):
+                batch = share[start : start + depth]
+                sent_at = time.perf_counter()
+                writer.write(b''.join(batch))
+                await writer.drain()
+                for _ in batch:
+                    status, _ = await read_response(reader)
+                    latencies.append(time.perf_counter() - sent_at)
+                    statuses[str(status)] += 1
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(connection(index) for index in range(connections)))
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return HTTPLoadReport(
+        requests=len(latencies),
+        elapsed_seconds=elapsed,
+        requests_per_second=len(latencies) / elapsed if elapsed else 0.0,
+        latency_ms={
+            f'p{rank:g}'.replace('.', ''): percentile(latencies, rank) * 1000
+            for rank in PERCENTILES
+        },
+        statuses=dict(statuses),
+    )
+
+
+def run_http_load_process(
+    host: str,
+    port: int,
+    codes: list[str],
+    discount_ids: list[str],
+    profile: HTTPLoadProfile,
+) -> dict[str, Any]:
+    """Executa `run_http_load` em um novo loop, para uso em outro processo.
+
+    Manter o cliente fora do processo do servidor deixa o núcleo do
+    servidor dedicado a atender as requisições.
+
+    Returns:
+        Relatório convertido em dicionário
+
+    """
+    report = asyncio.run(
+        run_http_load(host, port, codes, discount_ids, profile)
+    )
+    return report.to_dict()
@@ -0,0 +1,411 @@
+"""Servidor HTTP asyncio para validação e resgate de cupons."""
+
+import asyncio
+import json
+from dataclasses import asdict, dataclass
+from decimal import InvalidOperation
+from http import HTTPStatus
+from typing import Any
+from uuid import UUID
+
+from ...domain.services.discount_service import DiscountService
+from ...domain.services.guarded_discount_service import (
+    DiscountStoreUnavailable,
+    GuardedDiscountService,
+)
+from ...domain.value_objects.money import Money
+
+VALIDATE_PATH = '/coupons/validate'
+APPLY_PREFIX = '/discounts/'
+APPLY_SUFFIX = '/apply'
+HEALTH_PATH = '/health'
+METRICS_PATH = '/metrics'
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+
+_NOT_FOUND_MESSAGE = 'Desconto não encontrado'
+
+
+class BadRequest(Exception):
+    """Requisição HTTP malformada ou com corpo inválido."""
+
+    def __init__(
+        self, message: str, status: HTTPStatus = HTTPStatus.BAD_REQUEST
+    ):
+        """Inicializa o erro com a resposta a ser enviada.
+
+        Args:
+            message: Descrição do erro devolvida ao cliente
+            status: Código de status da resposta
+
+        """
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class HTTPRequest:
+    """Requisição HTTP já lida da conexão."""
+
+    method: str
+    path: str
+    headers: dict[str, str]
+    body: bytes
+    keep_alive: bool
+
+
+@dataclass
+class HTTPServerStats:
+    """Contadores acumulados do servidor."""
+
+    connections: int = 0
+    open_connections: int = 0
+    requests: int = 0
+    errors: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Converta os contadores para um dicionário."""
+        return asdict(self)
+
+
+def encode_response(
+    status: HTTPStatus, payload: dict[str, Any], keep_alive: bool = True
+) -> bytes:
+    """Monta uma resposta HTTP/1.1 com corpo JSON.
+
+    Args:
+        status: Código de status da resposta
+        payload: Documento enviado no corpo
+        keep_alive: Se False, anuncia o encerramento da conexão
+
+    Returns:
+        Bytes da resposta completa
+
+    """
+    body = json.dumps(payload, separators=(',', ':')).encode()
+    head = (
+        f'HTTP/1.1 {status.value} {status.phrase}\r\n'
+        'Content-Type: application/json\r\n'
+        f'Content-Length: {len(body)}\r\n'
+        f'Connection: {"keep-alive" if keep_alive else "close"}\r\n'
+        '\r\n'
+    )
+    return head.encode('latin-1') + body
+
+
+async def read_request(reader: asyncio.StreamReader) -> HTTPRequest | None:
+    """Lê a próxima requisição de uma conexão.
+
+    Args:
+        reader: Fluxo de leitura da conexão
+
+    Returns:
+        A requisição lida ou None se o cliente encerrou a conexão entre
+        requisições
+
+    Raises:
+        BadRequest: Se a requisição estiver malformada
+
+    """
+    try:
+        head = await reader.readuntil(b'\r\n\r\n')
+    except asyncio.IncompleteReadError as error:
+        if not error.partial.strip():
+            return None
+        raise BadRequest('Requisição incompleta') from None
+    except asyncio.LimitOverrunError:
+        raise BadRequest(
+            'Cabeçalhos muito grandes',
+            HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE,
+        ) from None
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise BadRequest('Linha de requisição inválida') from None
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise BadRequest('Cabeçalho inválido')
+        headers[name.strip().lower()] = value.strip()
+
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        raise BadRequest(
+            'Corpo em partes não suportado', HTTPStatus.LENGTH_REQUIRED
+        )
+
+    try:
+        length = int(headers.get('content-length', 0))
+    except ValueError:
+        raise BadRequest('Content-Length inválido') from None
+    if length < 0:
+        raise BadRequest('Content-Length inválido')
+    if length > MAX_BODY_BYTES:
+        raise BadRequest(
+            'Corpo muito grande', HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+        )
+
+    try:
+        body = await reader.readexactly(length) if length else b''
+    except asyncio.IncompleteReadError:
+        raise BadRequest('Corpo incompleto') from None
+
+    connection = headers.get('connection', '').lower()
+    if version == 'HTTP/1.1':
+        keep_alive = connection != 'close'
+    else:
+        keep_alive = connection == 'keep-alive'
+
+    path = target.split('?', 1)[0]
+    return HTTPRequest(method, path, headers, body, keep_alive)
+
+
+class DiscountHTTPServer:
+    """Servidor HTTP/1.1 sobre o `DiscountService`.
+
+    Expõe a validação de cupons (`POST /coupons/validate`) e o resgate de
+    descontos (`POST /discounts/<id>/apply`), com corpos JSON. As
+    conexões são persistentes por padrão e aceitam requisições em
+    pipeline: o cliente pode enviar várias requisições sem aguardar as
+    respostas, que são processadas e devolvidas na ordem de chegada.
+
+    O serviço e o seu repositório são criados uma única vez, fora do
+    servidor, e compartilhados por todas as conexões. Com um
+    `GuardedDiscountService`, as validações respondidas pela cópia em
+    memória trazem `stale` e `as_of`, o repositório indisponível resulta
+    em 503 e `GET /metrics` inclui as métricas do serviço.
+    """
+
+    def __init__(
+        self,
+        discount_service: DiscountService,
+        host: str = '127.0.0.1',
+        port: int = 8080,
+    ):
+        """Inicializa o servidor.
+
+        Args:
+            discount_service: Serviço de descontos compartilhado
+            host: Endereço de escuta
+            port: Porta de escuta (0 escolhe uma porta livre)
+
+        """
+        self.discount_service = discount_service
+        self.host = host
+        self.port = port
+        self.stats = HTTPServerStats()
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        """Começa a aceitar conexões e atualiza `port` com a porta real."""
+        self._server = await asyncio.start_server(
+            self._handle_connection,
+            self.host,
+            self.port,
+            limit=MAX_HEADER_BYTES,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self) -> None:
+        """Atende conexões até o servidor ser encerrado."""
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Para de aceitar conexões e aguarda o encerramento do servidor."""
+        if self._server is None:
+            return
+        self._server.close()
+        await self._server.wait_closed()
+        self._server = None
+
+    async def handle(
+        self, request: HTTPRequest
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        """Encaminha uma requisição para a operação correspondente.
+
+        Args:
+            request: Requisição lida da conexão
+
+        Returns:
+            Código de status e documento da resposta
+
+        Raises:
+            BadRequest: Se a rota, o método ou o corpo forem inválidos
+
+        """
+        path = request.path
+        if path == HEALTH_PATH:
+            self._require_method(request, 'GET')
+            return HTTPStatus.OK, {'status': 'ok'}
+
+        if path == METRICS_PATH:
+            self._require_method(request, 'GET')
+            return HTTPStatus.OK, self.metrics()
+
+        if path == VALIDATE_PATH:
+            self._require_method(request, 'POST')
+            return await self._validate(request)
+
+        if path.startswith(APPLY_PREFIX) and path.endswith(APPLY_SUFFIX):
+            self._require_method(request, 'POST')
+            raw_id = path[len(APPLY_PREFIX) : -len(APPLY_SUFFIX)]
+            try:
+                discount_id = UUID(raw_id)
+            except ValueError:
+                raise BadRequest('ID de desconto inválido') from None
+            return await self._apply(discount_id, request)
+
+        raise BadRequest('Rota não encontrada', HTTPStatus.NOT_FOUND)
+
+    def metrics(self) -> dict[str, Any]:
+        """Métricas do servidor e, se disponíveis, do serviço."""
+        metrics: dict[str, Any] = {'server': self.stats.to_dict()}
+        service = self.discount_service
+        if isinstance(service, GuardedDiscountService):
+            metrics['service'] = service.stats.to_dict()
+            metrics['circuit'] = {
+                'state': service.breaker.state,
+                **asdict(service.breaker.stats),
+            }
+        return metrics
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.stats.connections += 1
+        self.stats.open_connections += 1
+        try:
+            while True:
+                try:
+                    request = await read_request(reader)
+                except BadRequest as error:
+                    self.stats.errors += 1
+                    writer.write(
+                        encode_response(
+                            error.status, {'error': str(error)}, False
+                        )
+                    )
+                    break
+                if request is None:
+                    break
+
+                self.stats.requests += 1
+                status, payload = await self._respond(request)
+                writer.write(
+                    encode_response(status, payload, request.keep_alive)
+                )
+                if not request.keep_alive:
+                    break
+                # Só aguarda quando o buffer de saída passa do limite; com
+                # pipeline, as respostas seguintes são escritas em seguida
+                await writer.drain()
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.stats.open_connections -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(
+        self, request: HTTPRequest
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        try:
+            return await self.handle(request)
+        except BadRequest as error:
+            self.stats.errors += 1
+            return error.status, {'error': str(error)}
+        except DiscountStoreUnavailable as error:
+            self.stats.errors += 1
+            return HTTPStatus.SERVICE_UNAVAILABLE, {'error': str(error)}
+        except Exception as error:
+            self.stats.errors += 1
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(error)}
+
+    async def _validate(
+        self, request: HTTPRequest
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        document = self._json(request)
+        code = document.get('code')
+        if not isinstance(code, str):
+            raise BadRequest('Campo code é obrigatório')
+        order_value = self._money(document, 'order_value')
+
+        service = self.discount_service
+        freshness = {}
+        if isinstance(service, GuardedDiscountService):
+            validation = await service.validate_coupon(code, order_value)
+            discount = validation.discount
+            if validation.stale:
+                freshness = {
+                    'stale': True,
+                    'as_of': validation.as_of.isoformat(),
+                }
+        else:
+            discount = await service.validate_coupon_code(code, order_value)
+        if discount is None:
+            return HTTPStatus.OK, {'valid': False, **freshness}
+
+        total = discount.discounted_value(
+            order_value, service.currency_converter
+        )
+        return HTTPStatus.OK, {
+            'valid': True,
+            'discount_id': str(discount.id),
+            'total': str(total.amount),
+            'currency': total.currency,
+            **freshness,
+        }
+
+    async def _apply(
+        self, discount_id: UUID, request: HTTPRequest
+    ) -> tuple[HTTPStatus, dict[str, Any]]:
+        cart_total = self._money(self._json(request), 'cart_total')
+        try:
+            total = await self.discount_service.apply_discount_to_cart(
+                cart_total, discount_id
+            )
+        except ValueError as error:
+            status = (
+                HTTPStatus.NOT_FOUND
+                if str(error) == _NOT_FOUND_MESSAGE
+                else HTTPStatus.CONFLICT
+            )
+            return status, {'error': str(error)}
+
+        return HTTPStatus.OK, {
+            'total': str(total.amount),
+            'currency': total.currency,
+        }
+
+    def _require_method(self, request: HTTPRequest, method: str) -> None:
+        if request.method != method:
+            raise BadRequest(
+                'Método não permitido', HTTPStatus.METHOD_NOT_ALLOWED
+            )
+
+    def _json(self, request: HTTPRequest) -> dict[str, Any]:
+        try:
+            document = json.loads(request.body)
+        except ValueError:
+            raise BadRequest('Corpo JSON inválido') from None
+        if not isinstance(document, dict):
+            raise BadRequest('Corpo JSON deve ser um objeto')
+        return document
+
+    def _money(self, document: dict[str, Any], field: str) -> Money:
+        try:
+            return Money(str(document[field]), document.get('currency', 'BRL'))
+        except (KeyError, TypeError, InvalidOperation):
+            raise BadRequest(f'Campo {field} inválido') from None
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ecommerce.modules.cart.application.use_cases.cart_event_log import (
+    ADD_ITEM,
+    APPLY_COUPON,
+    CHECKOUT,
+    SET_QUANTITY,
+    CartEvent,
+    read_events,
+    shard_of,
+    write_events,
+)
+
+
+def make_events():
+    cart_id = uuid4()
+    product_id = uuid4()
+    at = datetime(2026, 3, 1, 12, 30, 15, 123456)
+    return [
+        CartEvent(ADD_ITEM, cart_id, at, product_id, 2, Decimal('19.90')),
+        CartEvent(
+            SET_QUANTITY, cart_id, at + timedelta(seconds=1), product_id, 3
+        ),
+        CartEvent(
+            APPLY_COUPON, cart_id, at + timedelta(seconds=2), code='PROMO10'
+        ),
+        CartEvent(CHECKOUT, cart_id, at + timedelta(seconds=3)),
+    ]
+
+
+class TestCartEventLog:
+    @pytest.mark.parametrize('name', ['events.jsonl', 'events.bin'])
+    def test_round_trip(self, tmp_path, name):
+        """Testa que os eventos lidos são iguais aos gravados."""
+        # Arrange
+        events = make_events()
+        path = str(tmp_path / name)
+
+        # Act
+        written = write_events(path, events)
+        loaded = list(read_events(path))
+
+        # Assert
+        assert written == len(events)
+        assert loaded == events
+
+    @pytest.mark.parametrize('name', ['events.jsonl', 'events.bin'])
+    def test_shards_partition_carts(self, tmp_path, name):
+        """Testa que cada carrinho aparece em uma única partição."""
+        # Arrange
+        events = [event for _ in range(20) for event in make_events()]
+        path = str(tmp_path / name)
+        write_events(path, events)
+
+        # Act
+        shards = [list(read_events(path, shard=i, shards=3)) for i in range(3)]
+
+        # Assert
+        assert sum(len(shard) for shard in shards) == len(events)
+        for index, shard in enumerate(shards):
+            assert all(shard_of(e.cart_id, 3) == index for e in shard)
+
+    def test_binary_rejects_long_code(self, tmp_path):
+        """Testa que códigos maiores que o registro binário são recusados."""
+        # Arrange
+        event = CartEvent(APPLY_COUPON, uuid4(), datetime.now(), code='X' * 33)
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            write_events(str(tmp_path / 'events.bin'), [event])
+
+    def test_binary_rejects_truncated_file(self, tmp_path):
+        """Testa que um log binário truncado é recusado."""
+        # Arrange
+        path = tmp_path / 'events.bin'
+        write_events(str(path), make_events())
+        path.write_bytes(path.read_bytes()[:-1])
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            list(read_events(str(path)))
@@ -0,0 +1,115 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.application.use_cases.export_discounts import (
+    EXPORT_FIELDS,
+    ExportDiscountsUseCase,
+)
+from ecommerce.modules.cart.domain.entities.discount import (
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (
+    InMemoryDiscountRepository,
+)
+
+
+def make_use_case(count):
+    repository = InMemoryDiscountRepository()
+    for i in range(count):
+        asyncio.run(
+            repository.save(
+                Discount(
+                    type=DiscountType.FIXED_AMOUNT,
+                    value=Money(Decimal('10.05')),
+                    code=f'CODE{i}',
+                    minimum_order_value=Money(Decimal('99.99')),
+                    max_usage_count=10,
+                    current_usage_count=i % 10,
+                )
+            )
+        )
+    return ExportDiscountsUseCase(DiscountService(repository))
+
+
+class TestExportDiscounts:
+    def test_export_jsonl_in_chunks(self):
+        """Testa exportação JSONL gravada em vários lotes."""
+        # Arrange
+        use_case = make_use_case(25)
+        output = io.BytesIO()
+        progress = []
+
+        # Act
+        report = asyncio.run(
+            use_case.execute(
+                output,
+                chunk_size=10,
+                on_progress=lambda r: progress.append(r.rows),
+            )
+        )
+
+        # Assert
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        assert report.rows == 25 == len(records)
+        assert report.chunks == 3
+        assert progress == [10, 20, 25]
+        assert report.bytes_written == len(output.getvalue())
+        assert records[3]['value'] == '10.05'
+        assert records[3]['minimum_order_value'] == '99.99'
+        assert records[3]['current_usage_count'] == 3
+
+    def test_export_csv_gzip(self):
+        """Testa exportação CSV comprimida incrementalmente."""
+        # Arrange
+        use_case = make_use_case(7)
+        output = io.BytesIO()
+
+        # Act
+        report = asyncio.run(
+            use_case.execute(
+                output, file_format='csv', compress=True, chunk_size=3
+            )
+        )
+
+        # Assert
+        text = gzip.decompress(output.getvalue()).decode()
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert report.rows == len(rows) == 7
+        assert tuple(rows[0]) == EXPORT_FIELDS
+        assert {row['code'] for row in rows} == {f'CODE{i}' for i in range(7)}
+
+    def test_export_columnar(self):
+        """Testa exportação no formato colunar."""
+        # Arrange
+        use_case = make_use_case(5)
+        output = io.BytesIO()
+
+        # Act
+        asyncio.run(
+            use_case.execute(output, file_format='columnar', chunk_size=2)
+        )
+
+        # Assert
+        header, *groups = [
+            json.loads(line) for line in output.getvalue().splitlines()
+        ]
+        assert header['fields'] == list(EXPORT_FIELDS)
+        assert [group['rows'] for group in groups] == [2, 2, 1]
+        codes = EXPORT_FIELDS.index('code')
+        assert groups[0]['columns'][codes] == ['CODE0', 'CODE1']
+
+    def test_invalid_format(self):
+        """Testa que formatos desconhecidos são recusados."""
+        with pytest.raises(ValueError):
+            asyncio.run(make_use_case(0).execute(io.BytesIO(), 'xml'))
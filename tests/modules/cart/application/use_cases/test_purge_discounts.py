@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from ecommerce.modules.cart.application.use_cases.purge_discounts import (
+    PurgeDiscountsUseCase,
+)
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+class SteppingClock:
+    """Relógio que avança um passo fixo a cada leitura."""
+
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+
+def make_discount(code, **kwargs):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        valid_from=NOW - timedelta(days=30),
+        **kwargs,
+    )
+
+
+class TestPurgeDiscountsUseCase:
+    def test_purges_in_chunks_respecting_grace_periods(self):
+        """Testa a remoção em lotes com carências e arquivamento."""
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            old = [
+                make_discount(f'OLD{i}', valid_until=NOW - timedelta(days=10))
+                for i in range(25)
+            ]
+            recent = make_discount(
+                'RECENT', valid_until=NOW - timedelta(days=1)
+            )
+            exhausted = make_discount(
+                'EXHAUSTED', max_usage_count=1, current_usage_count=1
+            )
+            active = make_discount('ACTIVE', valid_until=NOW + timedelta(1))
+            await repository.save_many([*old, recent, exhausted, active])
+            repository.updated_at[exhausted.id] = NOW - timedelta(days=2)
+
+            progress = []
+            use_case = PurgeDiscountsUseCase(
+                repository,
+                chunk_size=10,
+                pause_seconds=0,
+                archive=True,
+            )
+
+            # Act
+            report = await use_case.execute(
+                now=NOW, on_progress=lambda r: progress.append(r.purged)
+            )
+            return repository, report, progress
+
+        repository, report, progress = asyncio.run(scenario())
+
+        # Assert
+        assert report.purged == 26
+        assert report.chunks == 3
+        assert progress == [10, 20, 26]
+        assert sorted(repository.code_index) == ['ACTIVE', 'RECENT']
+        assert len(repository.archive) == 26
+
+    def test_chunk_size_adapts_to_time_budget(self):
+        """Testa a redução do lote quando ele excede o orçamento de tempo."""
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            await repository.save_many(
+                [
+                    make_discount(f'OLD{i}', valid_until=NOW - timedelta(30))
+                    for i in range(40)
+                ]
+            )
+            sizes = []
+            use_case = PurgeDiscountsUseCase(
+                repository,
+                chunk_size=16,
+                chunk_time_budget=0.5,
+                pause_seconds=0,
+                clock=SteppingClock(1.0),
+            )
+
+            # Act
+            report = await use_case.execute(
+                now=NOW, on_progress=lambda r: sizes.append(r.chunk_size)
+            )
+            return report, sizes
+
+        report, sizes = asyncio.run(scenario())
+
+        # Assert
+        assert report.purged == 40
+        assert sizes[:4] == [16, 8, 4, 2]
+        assert report.max_chunk_seconds == 1.0
+
+    def test_memory_purge_resumes_where_previous_chunk_stopped(self):
+        """Testa que os lotes em memória não voltam ao início do catálogo."""
+
+        class CountingDict(dict):
+            lookups = 0
+
+            def get(self, key, default=None):
+                CountingDict.lookups += 1
+                return super().get(key, default)
+
+            def values(self):
+                for value in super().values():
+                    CountingDict.lookups += 1
+                    yield value
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            await repository.save_many(
+                [
+                    make_discount(
+                        f'D{i}',
+                        valid_until=NOW - timedelta(30) if i % 2 else None,
+                    )
+                    for i in range(200)
+                ]
+            )
+            repository.discounts = CountingDict(repository.discounts)
+            use_case = PurgeDiscountsUseCase(
+                repository, chunk_size=10, pause_seconds=0
+            )
+
+            # Act
+            report = await use_case.execute(now=NOW)
+            return repository, report
+
+        repository, report = asyncio.run(scenario())
+
+        # Assert
+        assert report.purged == 100
+        assert report.chunks == 11
+        assert len(repository.discounts) == 100
+        assert CountingDict.lookups <= 200 + 100
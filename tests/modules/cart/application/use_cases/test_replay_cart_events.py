@@ -0,0 +1,261 @@
+import asyncio
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from ecommerce.main_discount_cli import load_catalog
+from ecommerce.modules.cart.application.use_cases.cart_event_log import (
+    ADD_ITEM,
+    APPLY_COUPON,
+    CHECKOUT,
+    SET_QUANTITY,
+    CartEvent,
+    write_events,
+)
+from ecommerce.modules.cart.application.use_cases.replay_cart_events import (
+    ReplayCartEventsUseCase,
+)
+from ecommerce.modules.cart.domain.entities.discount import (
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+
+START = datetime(2026, 3, 1)
+
+
+def make_catalogs():
+    return {
+        'baseline': [],
+        'promo': [
+            Discount(
+                type=DiscountType.PERCENTAGE,
+                value=Decimal(10),
+                code='TEN',
+                valid_from=START,
+            ),
+            Discount(
+                type=DiscountType.FIXED_AMOUNT,
+                value=Money(Decimal(5)),
+                code='FIVE',
+                minimum_order_value=Money(Decimal(50)),
+                valid_from=START,
+            ),
+        ],
+    }
+
+
+def generate_events(count, open_carts=200, seed=0):
+    rnd = random.Random(seed)
+    products = [UUID(int=rnd.getrandbits(128)) for _ in range(50)]
+    carts = [UUID(int=rnd.getrandbits(128)) for _ in range(open_carts)]
+    at = START
+    for _ in range(count):
+        at += timedelta(seconds=1)
+        slot = rnd.randrange(open_carts)
+        cart_id = carts[slot]
+        roll = rnd.random()
+        if roll < 0.6:
+            price = Decimal(rnd.randint(100, 9999)).scaleb(-2)
+            yield CartEvent(
+                ADD_ITEM, cart_id, at, rnd.choice(products), 1, price
+            )
+        elif roll < 0.7:
+            yield CartEvent(
+                SET_QUANTITY, cart_id, at, rnd.choice(products), 2
+            )
+        elif roll < 0.85:
+            code = rnd.choice(['TEN', 'FIVE', 'UNKNOWN'])
+            yield CartEvent(APPLY_COUPON, cart_id, at, code=code)
+        else:
+            carts[slot] = UUID(int=rnd.getrandbits(128))
+            yield CartEvent(CHECKOUT, cart_id, at)
+
+
+class TestReplayCartEvents:
+    def test_compares_catalogs(self):
+        """Testa a receita de um carrinho com e sem o catálogo promocional."""
+        # Arrange
+        cart_id = UUID(int=1)
+        events = [
+            CartEvent(ADD_ITEM, cart_id, START, UUID(int=2), 2, Decimal(30)),
+            CartEvent(ADD_ITEM, cart_id, START, UUID(int=3), 1, Decimal(40)),
+            CartEvent(SET_QUANTITY, cart_id, START, UUID(int=3), 0),
+            CartEvent(APPLY_COUPON, cart_id, START, code='TEN'),
+            CartEvent(APPLY_COUPON, cart_id, START, code='UNKNOWN'),
+            CartEvent(CHECKOUT, cart_id, START + timedelta(minutes=1)),
+        ]
+        use_case = ReplayCartEventsUseCase(make_catalogs())
+
+        # Act
+        report = use_case.execute(events)
+
+        # Assert
+        assert report.events == 6
+        assert report.checkouts == 1
+        assert report.gross_revenue == Decimal(60)
+        baseline = report.scenarios['baseline']
+        promo = report.scenarios['promo']
+        assert baseline.revenue == Decimal(60)
+        assert baseline.coupons_rejected == 2
+        # Apenas TEN foi aplicado: 10% sobre 60
+        assert promo.revenue == Decimal(54)
+        assert promo.discount_total == Decimal(6)
+        assert promo.coupons_applied == 1
+        assert promo.coupons_rejected == 1
+        assert promo.discounted_orders == 1
+
+    def test_codeless_promotions_apply_without_coupons(self):
+        """Testa promoções sem código, direcionadas ou não, na reprodução."""
+        # Arrange
+        cart_id, shoes, socks = UUID(int=1), UUID(int=2), UUID(int=3)
+        catalogs = {
+            'baseline': [],
+            'automatic': [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(50),
+                    valid_from=START,
+                    product_ids=frozenset({shoes}),
+                ),
+                Discount(
+                    type=DiscountType.FIXED_AMOUNT,
+                    value=Money(Decimal(5)),
+                    valid_from=START,
+                ),
+            ],
+        }
+        events = [
+            CartEvent(ADD_ITEM, cart_id, START, shoes, 1, Decimal(100)),
+            CartEvent(ADD_ITEM, cart_id, START, socks, 1, Decimal(20)),
+            CartEvent(CHECKOUT, cart_id, START),
+        ]
+
+        # Act
+        report = ReplayCartEventsUseCase(catalogs).execute(events)
+
+        # Assert
+        assert report.scenarios['baseline'].revenue == Decimal(120)
+        automatic = report.scenarios['automatic']
+        # 50% sobre os sapatos (100 -> 50) e 5 sobre o total (70 -> 65)
+        assert automatic.revenue == Decimal(65)
+        assert automatic.promotions_applied == 2
+        assert automatic.coupons_applied == 0
+        assert automatic.discounted_orders == 1
+
+    def test_imported_catalog(self, tmp_path):
+        """Testa a reprodução com um catálogo lido de arquivo de importação."""
+        # Arrange
+        source = tmp_path / 'catalog.csv'
+        source.write_text('code,amount\nTEN,10\n', encoding='utf-8')
+        catalog = asyncio.run(load_catalog(str(source)))
+        cart_id = UUID(int=1)
+        at = datetime.now() + timedelta(days=1)
+        events = [
+            CartEvent(ADD_ITEM, cart_id, at, UUID(int=2), 1, Decimal(30)),
+            CartEvent(APPLY_COUPON, cart_id, at, code='TEN'),
+            CartEvent(CHECKOUT, cart_id, at),
+        ]
+
+        # Act
+        report = ReplayCartEventsUseCase(
+            {'baseline': [], 'imported': catalog}
+        ).execute(events)
+
+        # Assert
+        imported = report.scenarios['imported']
+        assert imported.revenue == Decimal(20)
+        assert imported.coupons_applied == 1
+
+    def test_usage_limit_is_counted_per_replay(self):
+        """Testa que o limite de uso vale dentro de uma reprodução."""
+        # Arrange
+        catalogs = {
+            'limited': [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(50),
+                    code='HALF',
+                    valid_from=START,
+                    max_usage_count=2,
+                )
+            ]
+        }
+        events = []
+        for index in range(3):
+            cart_id = UUID(int=index + 1)
+            events += [
+                CartEvent(ADD_ITEM, cart_id, START, UUID(int=99), 1, Decimal(10)),
+                CartEvent(APPLY_COUPON, cart_id, START, code='HALF'),
+                CartEvent(CHECKOUT, cart_id, START),
+            ]
+        use_case = ReplayCartEventsUseCase(catalogs)
+
+        # Act
+        first = use_case.execute(events)
+        second = use_case.execute(events)
+
+        # Assert
+        assert first.scenarios['limited'].coupons_applied == 2
+        assert first.scenarios['limited'].revenue == Decimal(20)
+        assert second.scenarios['limited'].coupons_applied == 2
+        assert catalogs['limited'][0].current_usage_count == 0
+
+    def test_open_carts_are_bounded(self):
+        """Testa que carrinhos inativos são descartados acima do limite."""
+        # Arrange
+        events = [
+            CartEvent(ADD_ITEM, UUID(int=i + 1), START, UUID(int=99), 1, Decimal(1))
+            for i in range(10)
+        ]
+        events.append(CartEvent(CHECKOUT, UUID(int=1), START))
+        events.append(CartEvent(CHECKOUT, UUID(int=10), START))
+        use_case = ReplayCartEventsUseCase({}, max_open_carts=4)
+
+        # Act
+        report = use_case.execute(events)
+
+        # Assert
+        assert report.evicted_carts == 6
+        assert report.orphan_checkouts == 1
+        assert report.checkouts == 1
+        assert report.abandoned_carts == 3
+
+    @pytest.mark.parametrize('name', ['events.jsonl', 'events.bin'])
+    def test_sharded_replay_matches_single_process(self, tmp_path, name):
+        """Testa que a reprodução particionada soma o mesmo resultado."""
+        # Arrange
+        path = str(tmp_path / name)
+        write_events(path, generate_events(3000))
+        use_case = ReplayCartEventsUseCase(make_catalogs())
+
+        # Act
+        single = use_case.execute_file(path)
+        sharded = use_case.execute_file(path, processes=2)
+
+        # Assert
+        assert sharded.events == single.events == 3000
+        expected = single.to_dict()
+        actual = sharded.to_dict()
+        for key in ('elapsed_seconds', 'events_per_second'):
+            expected.pop(key)
+            actual.pop(key)
+        assert actual == expected
+
+    @pytest.mark.slow
+    def test_replay_throughput(self, tmp_path):
+        """Mede a vazão da reprodução de um log binário."""
+        # Arrange
+        path = str(tmp_path / 'events.bin')
+        write_events(path, generate_events(200_000, open_carts=5000))
+        use_case = ReplayCartEventsUseCase(make_catalogs())
+
+        # Act
+        report = use_case.execute_file(path)
+
+        # Assert
+        assert report.events == 200_000
+        assert report.checkouts > 0
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+from ecommerce.modules.cart.application.use_cases.simulate_discount_load import (  # noqa: E501
+    LoadProfile,
+    SimulateDiscountLoadUseCase,
+    TrafficMix,
+    percentile,
+)
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+
+class TestSimulateDiscountLoadUseCase:
+    def test_percentile_nearest_rank(self):
+        """Testa o cálculo de percentis pelo posto mais próximo."""
+        values = list(range(1, 101))
+
+        assert percentile(values, 50) == 50
+        assert percentile(values, 99) == 99
+        assert percentile(values, 99.9) == 100
+        assert percentile([], 50) == 0.0
+
+    def test_report_with_in_memory_repository(self):
+        """Testa o relatório de uma simulação pequena em memória."""
+        # Arrange
+        use_case = SimulateDiscountLoadUseCase(
+            DiscountService(InMemoryDiscountRepository())
+        )
+        profile = LoadProfile(
+            concurrency=200,
+            requests=2000,
+            mix=TrafficMix(valid=0.4, unknown=0.2, hot=0.4, expiring=0),
+            valid_coupons=50,
+            hot_coupon_limit=25,
+        )
+
+        # Act
+        report = asyncio.run(use_case.execute(profile))
+
+        # Assert
+        assert sum(report.outcomes.values()) == 2000
+        assert sum(report.requests_by_kind.values()) == 2000
+        assert report.errors == {}
+        assert report.over_redemptions == 0
+        assert report.lost_usage_updates == 0
+        assert report.outcomes['redeemed'] == (
+            report.requests_by_kind['valid'] + 25
+        )
+        latencies = report.latency_ms
+        assert list(latencies) == ['p50', 'p95', 'p99', 'p999']
+        assert latencies['p50'] <= latencies['p99'] <= latencies['p999']
+        assert json.loads(json.dumps(report.to_dict()))['requests'] == 2000
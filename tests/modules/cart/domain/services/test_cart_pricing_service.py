@@ -0,0 +1,323 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import (
+    Cart,
+    CartItem,
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.services.cart_pricing_service import (
+    CartPricingService,
+)
+from ecommerce.modules.cart.domain.services.discount_eligibility_index import (  # noqa: E501
+    DiscountEligibilityIndex,
+)
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.services.pricing_cache import (
+    PricingCache,
+    cart_pricing_key,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (
+    InMemoryDiscountRepository,
+)
+
+PRODUCT = uuid4()
+OTHER_PRODUCT = uuid4()
+
+
+def make_cart(discount=None, reverse=False):
+    cart = Cart()
+    items = [
+        CartItem(cart_id=cart.id, product_id=PRODUCT, quantity=2, price=49.9),
+        CartItem(
+            cart_id=cart.id, product_id=OTHER_PRODUCT, quantity=1, price=0.2
+        ),
+    ]
+    for item in reversed(items) if reverse else items:
+        cart.add_item(item)
+    if discount:
+        cart.discounts.append(discount)
+    return cart
+
+
+class TestCartPricingService:
+    def test_price_applies_discounts_without_using_them(self):
+        """Testa subtotal, total e que o uso do desconto não é registrado."""
+        # Arrange
+        discount = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            max_usage_count=1,
+        )
+        cart = make_cart(discount)
+
+        # Act
+        pricing = CartPricingService().price(cart)
+
+        # Assert
+        assert pricing.subtotal == Money('100.00')
+        assert pricing.total == Money('90.00')
+        assert pricing.discount_total == Money('10.00')
+        assert pricing.applied_discount_ids == (discount.id,)
+        assert discount.current_usage_count == 0
+
+    def test_targeted_coupon_discounts_only_matching_line(self):
+        """Testa que um cupom direcionado atinge apenas a linha do produto."""
+        # Arrange
+        discount = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            product_ids=frozenset([OTHER_PRODUCT]),
+        )
+        cart = make_cart(discount)
+
+        # Act
+        pricing = CartPricingService().price(cart)
+
+        # Assert
+        assert pricing.subtotal == Money('100.00')
+        assert pricing.discount_total == Money('0.02')
+        assert pricing.applied_discount_ids == (discount.id,)
+
+    def test_promotions_apply_by_category_before_cart_discounts(self):
+        """Testa promoções por categoria seguidas do desconto do carrinho."""
+        # Arrange
+        category = uuid4()
+        promotion = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('50'),
+            category_ids=frozenset([category]),
+        )
+        coupon = Discount(type=DiscountType.PERCENTAGE, value=Decimal('10'))
+        cart = make_cart(coupon)
+        cart.items[0].category_id = category
+        service = CartPricingService(
+            promotions=DiscountEligibilityIndex([promotion])
+        )
+
+        # Act
+        pricing = service.price(cart)
+
+        # Assert
+        assert pricing.total == Money('45.09')
+        assert pricing.applied_discount_ids == (promotion.id, coupon.id)
+
+    def test_fixed_amount_is_deducted_per_line(self):
+        """Testa que o valor fixo direcionado é abatido em cada linha."""
+        # Arrange
+        discount = Discount(
+            type=DiscountType.FIXED_AMOUNT,
+            value=Money(5),
+            product_ids=frozenset([PRODUCT, OTHER_PRODUCT]),
+        )
+        cart = make_cart(discount)
+
+        # Act
+        pricing = CartPricingService().price(cart)
+
+        # Assert
+        assert pricing.total == Money('94.80')
+        assert pricing.applied_discount_ids == (discount.id,)
+
+    def test_percentage_cap_applies_across_lines(self):
+        """Testa que o teto do desconto direcionado vale para o carrinho."""
+        # Arrange
+        products = [uuid4() for _ in range(4)]
+        discount = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            maximum_discount_amount=Money(5),
+            product_ids=frozenset(products),
+        )
+        cart = Cart()
+        for product_id in products:
+            cart.add_item(
+                CartItem(
+                    cart_id=cart.id, product_id=product_id, quantity=1, price=100
+                )
+            )
+        cart.discounts.append(discount)
+
+        # Act
+        pricing = CartPricingService().price(cart)
+
+        # Assert
+        assert pricing.subtotal == Money('400.00')
+        assert pricing.discount_total == Money('5.00')
+
+    @pytest.mark.slow
+    def test_pricing_time_independent_of_catalog_size(self):
+        """Testa que o custo por carrinho não cresce com o catálogo."""
+
+        def elapsed(catalog_size):
+            index = DiscountEligibilityIndex(
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal('5'),
+                    product_ids=frozenset([uuid4()]),
+                )
+                for _ in range(catalog_size)
+            )
+            index.add(
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal('5'),
+                    product_ids=frozenset([PRODUCT]),
+                )
+            )
+            service = CartPricingService(promotions=index)
+            cart = make_cart()
+            started_at = time.perf_counter()
+            for _ in range(2000):
+                service.price(cart)
+            return time.perf_counter() - started_at
+
+        small = min(elapsed(10) for _ in range(3))
+        large = min(elapsed(50_000) for _ in range(3))
+
+        assert large < small * 2
+
+
+class TestPricingCache:
+    def test_key_ignores_cart_identity_and_line_order(self):
+        """Testa que carrinhos de mesmo conteúdo têm a mesma chave."""
+        assert cart_pricing_key(make_cart(), 1) == cart_pricing_key(
+            make_cart(reverse=True), 1
+        )
+        assert cart_pricing_key(make_cart(), 1) != cart_pricing_key(
+            make_cart(), 2
+        )
+
+    def test_identical_carts_share_result(self):
+        """Testa que carrinhos idênticos reaproveitam o mesmo resultado."""
+        # Arrange
+        discount = Discount(type=DiscountType.PERCENTAGE, value=Decimal('10'))
+        version = [1]
+        cache = PricingCache()
+        service = CartPricingService(
+            cache=cache, catalog_version=lambda: version[0]
+        )
+
+        # Act
+        first = service.price(make_cart(discount))
+        second = service.price(make_cart(discount, reverse=True))
+        version[0] = 2
+        third = service.price(make_cart(discount))
+
+        # Assert
+        assert second is first
+        assert third is not first
+        stats = cache.stats
+        assert (stats.hits, stats.misses) == (1, 2)
+        assert stats.invalidations == 1
+        assert stats.hit_rate == 1 / 3
+
+    def test_carts_differing_only_in_category_do_not_share_result(self):
+        """Testa que a categoria dos itens faz parte da chave do cache."""
+        # Arrange
+        category = uuid4()
+        promotion = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('50'),
+            category_ids=frozenset([category]),
+        )
+        service = CartPricingService(
+            cache=PricingCache(),
+            catalog_version=lambda: 1,
+            promotions=DiscountEligibilityIndex([promotion]),
+        )
+        promoted = make_cart()
+        promoted.items[0].category_id = category
+
+        # Act
+        first = service.price(promoted)
+        second = service.price(make_cart())
+
+        # Assert
+        assert first.total == Money('50.10')
+        assert second.total == Money('100.00')
+        assert cart_pricing_key(promoted, 1) != cart_pricing_key(
+            make_cart(), 1
+        )
+
+    def test_entry_expires_when_discount_validity_changes(self):
+        """Testa expiração do resultado no fim da validade do desconto."""
+        # Arrange
+        now = datetime(2026, 1, 1, 12, 0)
+        discount = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            valid_from=now - timedelta(days=1),
+            valid_until=now + timedelta(hours=1),
+        )
+        cache = PricingCache()
+        service = CartPricingService(cache=cache, catalog_version=lambda: 1)
+
+        # Act
+        before = service.price(make_cart(discount), now=now)
+        after = service.price(
+            make_cart(discount), now=now + timedelta(hours=2)
+        )
+
+        # Assert
+        assert before.total == Money('90.00')
+        assert after.total == Money('100.00')
+        assert cache.stats.expirations == 1
+
+    def test_redemptions_keep_cached_results(self):
+        """Testa que só o resgate que esgota o desconto invalida o cache."""
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            discount = await repository.save(
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal('10'),
+                    max_usage_count=3,
+                )
+            )
+            discounts = DiscountService(repository)
+            cache = PricingCache()
+            service = CartPricingService(
+                cache=cache, catalog_version=lambda: repository.version
+            )
+            first = service.price(make_cart(discount))
+
+            # Act
+            await discounts.apply_discount_to_cart(Money(100), discount.id)
+            await discounts.apply_discount_to_cart(Money(100), discount.id)
+            second = service.price(make_cart(discount))
+            await discounts.apply_discount_to_cart(Money(100), discount.id)
+            service.price(make_cart(discount))
+
+            return first, second, cache.stats
+
+        first, second, stats = asyncio.run(scenario())
+
+        # Assert
+        assert second is first
+        assert (stats.hits, stats.misses) == (1, 2)
+        assert stats.invalidations == 1
+
+    def test_bounded_size(self):
+        """Testa que o cache descarta as entradas menos usadas."""
+        cache = PricingCache(max_entries=2)
+        service = CartPricingService(cache=cache, catalog_version=lambda: 1)
+        for _ in range(3):
+            cart = make_cart()
+            cart.add_item(
+                CartItem(cart_id=cart.id, product_id=uuid4(), quantity=1)
+            )
+            service.price(cart)
+        assert len(cache) == 2
+        assert cache.stats.evictions == 1
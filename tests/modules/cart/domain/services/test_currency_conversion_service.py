@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities.discount import (
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.services.currency_conversion_service import (
+    CurrencyConversionService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+
+
+def make_service():
+    service = CurrencyConversionService()
+    service.load_rates('BRL', {'USD': Decimal('0.20'), 'EUR': Decimal('0.18')})
+    return service
+
+
+class TestCurrencyConversionService:
+    def test_convert_through_matrix(self):
+        """Testa conversões diretas e cruzadas pela matriz."""
+        # Arrange
+        service = make_service()
+
+        # Act & Assert
+        assert service.convert(Money(100), 'USD') == Money(20, 'USD')
+        assert service.convert(Money(20, 'USD'), 'BRL') == Money(100)
+        assert service.convert(Money(20, 'USD'), 'EUR') == Money(18, 'EUR')
+
+    def test_convert_many_keeps_order(self):
+        """Testa conversão em lote de moedas mistas."""
+        # Arrange
+        service = make_service()
+        values = [Money(10, 'USD'), Money(50), Money(9, 'EUR')]
+
+        # Act
+        result = service.convert_many(values, 'BRL')
+
+        # Assert
+        assert result == [Money(50), Money(50), Money(50)]
+
+    def test_versions_and_memoization(self):
+        """Testa que cada versão de cotação tem sua própria memória."""
+        # Arrange
+        service = make_service()
+        first = service.convert(Money(100), 'USD')
+
+        # Act
+        service.load_rates('BRL', {'USD': Decimal('0.25')})
+
+        # Assert
+        assert service.version == 2
+        assert service.convert(Money(100), 'USD') == Money(25, 'USD')
+        assert service.convert(Money(100), 'USD', version=1) is first
+
+    def test_unknown_currency(self):
+        """Testa erro ao converter moeda sem cotação."""
+        with pytest.raises(ValueError):
+            make_service().convert(Money(1, 'JPY'), 'BRL')
+
+    def test_discount_validates_across_currencies(self):
+        """Testa validação de valor mínimo em moeda diferente."""
+        # Arrange
+        service = make_service()
+        discount = Discount(
+            type=DiscountType.FIXED_AMOUNT,
+            value=Money(10),
+            minimum_order_value=Money(100),
+        )
+
+        # Act & Assert
+        assert discount.is_valid(Money(25, 'USD'), service) is True
+        assert discount.is_valid(Money(15, 'USD'), service) is False
+        assert discount.apply_to(Money(25, 'USD'), service) == Money(
+            23, 'USD'
+        )
+
+        service.load_rates('BRL', {'USD': Decimal('0.10')})
+        assert discount.is_valid(Money(15, 'USD'), service) is True
+
+    def test_discount_without_converter_rejects_other_currency(self):
+        """Testa que sem serviço de câmbio moedas diferentes continuam inválidas."""
+        discount = Discount(type=DiscountType.PERCENTAGE, value=Decimal('10'))
+        with pytest.raises(ValueError):
+            discount.is_valid(Money(10, 'USD'))
+
+    def test_converted_minimum_follows_converter_and_minimum(self):
+        """Testa que o mínimo convertido não vaza entre serviços nem valores."""
+        # Arrange
+        discount = Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            minimum_order_value=Money(100),
+        )
+        other = CurrencyConversionService()
+        other.load_rates('BRL', {'USD': Decimal('0.50')})
+
+        # Act & Assert
+        assert discount.minimum_order_value_in('USD', make_service()) == Money(
+            20, 'USD'
+        )
+        assert discount.minimum_order_value_in('USD', other) == Money(
+            50, 'USD'
+        )
+
+        discount.minimum_order_value = Money(200)
+        assert discount.minimum_order_value_in('USD', other) == Money(
+            100, 'USD'
+        )
@@ -0,0 +1,90 @@
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_eligibility_index import (  # noqa: E501
+    DiscountEligibilityIndex,
+)
+
+PRODUCT = uuid4()
+CATEGORY = uuid4()
+
+
+def make_discount(product_ids=(), category_ids=()):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal('10'),
+        product_ids=frozenset(product_ids),
+        category_ids=frozenset(category_ids),
+    )
+
+
+class TestDiscountEligibilityIndex:
+    def test_candidates_by_product_and_category(self):
+        """Testa que produto e categoria encontram os seus descontos."""
+        # Arrange
+        by_product = make_discount(product_ids=[PRODUCT])
+        by_category = make_discount(category_ids=[CATEGORY])
+        unrelated = make_discount(product_ids=[uuid4()])
+        index = DiscountEligibilityIndex([by_product, by_category, unrelated])
+
+        # Act
+        candidates = index.candidates(PRODUCT, CATEGORY)
+
+        # Assert
+        assert candidates == (by_product, by_category)
+        assert index.candidates(PRODUCT) == (by_product,)
+        assert index.candidates(uuid4(), CATEGORY) == (by_category,)
+        assert index.candidates(uuid4()) == ()
+
+    def test_discount_targeting_both_is_returned_once(self):
+        """Testa que um desconto do produto e da categoria não se repete."""
+        discount = make_discount(product_ids=[PRODUCT], category_ids=[CATEGORY])
+        index = DiscountEligibilityIndex([discount])
+
+        assert index.candidates(PRODUCT, CATEGORY) == (discount,)
+
+    def test_add_replaces_and_remove_unlinks(self):
+        """Testa substituição e remoção de um desconto indexado."""
+        # Arrange
+        discount = make_discount(product_ids=[PRODUCT])
+        index = DiscountEligibilityIndex([discount])
+
+        # Act
+        discount.product_ids = frozenset()
+        discount.category_ids = frozenset([CATEGORY])
+        index.add(discount)
+
+        # Assert
+        assert len(index) == 1
+        assert index.candidates(PRODUCT) == ()
+        assert index.candidates(uuid4(), CATEGORY) == (discount,)
+
+        index.remove(discount.id)
+        assert discount.id not in index
+        assert index.candidates(uuid4(), CATEGORY) == ()
+
+    def test_candidates_are_frozen_until_the_next_change(self):
+        """Testa que consultas reaproveitam a tupla até a próxima inclusão."""
+        # Arrange
+        discounts = [make_discount(category_ids=[CATEGORY]) for _ in range(500)]
+        index = DiscountEligibilityIndex(discounts)
+        first = index.candidates(uuid4(), CATEGORY)
+
+        # Act
+        again = index.candidates(uuid4(), CATEGORY)
+        extra = make_discount(category_ids=[CATEGORY])
+        index.add(extra)
+        after_add = index.candidates(uuid4(), CATEGORY)
+
+        # Assert
+        assert first == tuple(discounts)
+        assert again is first
+        assert after_add == (*discounts, extra)
+
+    def test_rejects_untargeted_discount(self):
+        """Testa que descontos sem alvo não entram no índice."""
+        with pytest.raises(ValueError):
+            DiscountEligibilityIndex([make_discount()])
@@ -0,0 +1,42 @@
+import asyncio
+from decimal import Decimal
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+
+class TestDiscountService:
+    def test_apply_discount_records_one_use(self):
+        """Testa que cada resgate conta um único uso do desconto."""
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            service = DiscountService(repository)
+            discount = await repository.save(
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(10),
+                    max_usage_count=2,
+                )
+            )
+
+            # Act
+            totals = [
+                await service.apply_discount_to_cart(Money(100), discount.id)
+                for _ in range(2)
+            ]
+            stored = await repository.get_by_id(discount.id)
+            return totals, stored
+
+        totals, stored = asyncio.run(scenario())
+
+        # Assert
+        assert totals == [Money(90), Money(90)]
+        assert stored.current_usage_count == 2
@@ -0,0 +1,276 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+)
+from ecommerce.modules.cart.domain.services.discount_snapshot import (
+    DiscountCatalogSnapshot,
+)
+from ecommerce.modules.cart.domain.services.guarded_discount_service import (  # noqa: E501
+    REASON_CIRCUIT_OPEN,
+    REASON_TIMEOUT,
+    SOURCE_SNAPSHOT,
+    DiscountStoreUnavailable,
+    GuardedDiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowRepository(InMemoryDiscountRepository):
+    """Repositório em memória com atraso ou falha configuráveis."""
+
+    def __init__(self):
+        super().__init__()
+        self.delay = 0.0
+        self.error = None
+        self.calls = 0
+
+    async def get_by_code(self, code):
+        self.calls += 1
+        await self._wait()
+        return await super().get_by_code(code)
+
+    async def get_by_id(self, discount_id):
+        self.calls += 1
+        await self._wait()
+        return await super().get_by_id(discount_id)
+
+    async def _wait(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+
+
+def make_discount(code='CUPOM', max_usage_count=None):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        valid_from=datetime.now() - timedelta(days=1),
+        max_usage_count=max_usage_count,
+    )
+
+
+async def make_service(*discounts, **options):
+    repository = SlowRepository()
+    await repository.save_many(list(discounts))
+    service = GuardedDiscountService(
+        repository,
+        DiscountCatalogSnapshot(),
+        CircuitBreaker(failure_threshold=2, reset_timeout=30),
+        timeout=0.05,
+        **options,
+    )
+    await service.refresh_snapshot()
+    return repository, service
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures_and_probes(self):
+        """Testa abertura, teste único no estado meio aberto e fechamento."""
+        # Arrange
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=clock)
+
+        # Act / Assert
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+        clock.now += 5
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_failure()
+        assert breaker.state == OPEN
+
+        clock.now += 5
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.stats.trips == 2
+        assert breaker.stats.rejected == 2
+
+    def test_abandoned_probe_is_replaced(self):
+        """Testa que um teste sem resultado não trava o disjuntor."""
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5, clock=clock)
+        breaker.record_failure()
+        clock.now += 5
+        assert breaker.allow_request()
+
+        clock.now += 5
+
+        assert breaker.allow_request()
+
+
+class TestGuardedDiscountService:
+    def test_validation_reads_store_within_deadline(self):
+        """Testa a validação normal, atendida pelo repositório."""
+
+        async def scenario():
+            _, service = await make_service(make_discount())
+            return await service.validate_coupon('CUPOM', Money(100)), service
+
+        validation, service = asyncio.run(scenario())
+
+        assert validation.discount.code == 'CUPOM'
+        assert not validation.stale
+        assert service.stats.fallback_rate == 0.0
+
+    def test_slow_store_falls_back_to_snapshot(self):
+        """Testa o prazo, a cópia em memória e a abertura do disjuntor."""
+
+        async def scenario():
+            # Arrange
+            repository, service = await make_service(make_discount())
+            repository.delay = 1.0
+
+            # Act
+            started_at = asyncio.get_running_loop().time()
+            results = [
+                await service.validate_coupon('CUPOM', Money(100))
+                for _ in range(4)
+            ]
+            elapsed = asyncio.get_running_loop().time() - started_at
+            missing = await service.validate_coupon('NENHUM', Money(100))
+            return repository, service, results, elapsed, missing
+
+        repository, service, results, elapsed, missing = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert elapsed < 0.5
+        assert all(result.discount.code == 'CUPOM' for result in results)
+        assert all(result.source == SOURCE_SNAPSHOT for result in results)
+        assert [result.reason for result in results] == [
+            REASON_TIMEOUT,
+            REASON_TIMEOUT,
+            REASON_CIRCUIT_OPEN,
+            REASON_CIRCUIT_OPEN,
+        ]
+        assert results[0].as_of is not None
+        assert missing.stale and missing.discount is None
+        assert repository.calls == 2
+        stats = service.stats
+        assert stats.timeouts == 2
+        assert stats.short_circuits == 3
+        assert stats.fallback_rate == 1.0
+
+    def test_unavailable_without_usable_snapshot(self):
+        """Testa a falha quando a cópia nunca foi carregada ou é velha."""
+
+        async def scenario():
+            repository = SlowRepository()
+            repository.error = ConnectionError('sem conexão')
+            service = GuardedDiscountService(
+                repository, DiscountCatalogSnapshot()
+            )
+            with pytest.raises(DiscountStoreUnavailable):
+                await service.validate_coupon('CUPOM', Money(100))
+
+            repository, service = await make_service(
+                make_discount(), max_staleness=timedelta(0)
+            )
+            repository.error = ConnectionError('sem conexão')
+            with pytest.raises(DiscountStoreUnavailable):
+                await service.validate_coupon('CUPOM', Money(100))
+            return service
+
+        service = asyncio.run(scenario())
+
+        assert service.stats.failures == 1
+        assert service.stats.unavailable == 1
+
+    def test_redemption_requires_store(self):
+        """Testa que o resgate nunca usa a cópia em memória."""
+
+        async def scenario():
+            # Arrange
+            discount = make_discount(max_usage_count=5)
+            repository, service = await make_service(discount)
+            total = await service.apply_discount_to_cart(
+                Money(100), discount.id
+            )
+
+            # Act
+            repository.delay = 1.0
+            service.redeem_timeout = 0.05
+            errors = []
+            for _ in range(3):
+                try:
+                    await service.apply_discount_to_cart(
+                        Money(100), discount.id
+                    )
+                except DiscountStoreUnavailable as error:
+                    errors.append(error)
+            validation = await service.validate_coupon('CUPOM', Money(100))
+            return total, errors, validation, repository
+
+        total, errors, validation, repository = asyncio.run(scenario())
+
+        # Assert
+        assert total == Money(90)
+        assert len(errors) == 3
+        assert repository.calls == 3
+        assert validation.stale
+
+    def test_programming_errors_do_not_trip_breaker(self):
+        """Testa que só erros do repositório contam como indisponibilidade."""
+
+        async def scenario():
+            # Arrange
+            discount = make_discount(max_usage_count=5)
+            repository, service = await make_service(discount)
+            repository.error = AttributeError('bug no domínio')
+
+            # Act
+            raised = []
+            for _ in range(3):
+                with pytest.raises(AttributeError) as error:
+                    await service.apply_discount_to_cart(
+                        Money(100), discount.id
+                    )
+                raised.append(error.value)
+                with pytest.raises(AttributeError):
+                    await service.validate_coupon('CUPOM', Money(100))
+
+            repository.error = ConnectionError('sem conexão')
+            with pytest.raises(DiscountStoreUnavailable):
+                await service.apply_discount_to_cart(Money(100), discount.id)
+            return service, raised
+
+        service, raised = asyncio.run(scenario())
+
+        # Assert
+        assert len(raised) == 3
+        assert service.breaker.state == CLOSED
+        assert service.stats.failures == 1
+        assert service.stats.fallbacks == 0
@@ -0,0 +1,102 @@
+from decimal import Decimal
+from uuid import uuid4
+
+from ecommerce.modules.cart.domain.entities import (
+    Cart,
+    CartItem,
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.services.cart_pricing_service import (
+    CartPricingService,
+)
+from ecommerce.modules.cart.domain.services.pricing_pipeline import (
+    PricingPipeline,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+
+
+def make_cart(lines=100):
+    cart = Cart()
+    for _ in range(lines):
+        cart.add_item(
+            CartItem(cart_id=cart.id, product_id=uuid4(), quantity=1, price=10)
+        )
+    cart.discounts = [
+        Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('10'),
+            minimum_order_value=Money(threshold),
+        )
+        for threshold in (0, 500, 1005, 5000)
+    ]
+    return cart
+
+
+class TestPricingPipeline:
+    def test_matches_full_pricing(self):
+        """Testa que o pipeline produz o mesmo resultado do cálculo completo."""
+        # Arrange
+        cart = make_cart()
+
+        # Act
+        pricing = PricingPipeline(cart).result()
+
+        # Assert
+        expected = CartPricingService().price(cart)
+        assert pricing.subtotal == expected.subtotal == Money(1000)
+        assert pricing.total == expected.total
+        assert pricing.applied_discount_ids == expected.applied_discount_ids
+
+    def test_quantity_change_recomputes_only_affected_work(self):
+        """Testa que alterar uma linha reavalia só os descontos afetados."""
+        # Arrange
+        cart = make_cart()
+        pipeline = PricingPipeline(cart)
+        pipeline.result()
+        evaluations = pipeline.discount_evaluations
+
+        # Act: 1000 -> 1010 cruza apenas o valor mínimo de 1005
+        pipeline.set_quantity(cart.items[0].id, 2)
+        pricing = pipeline.result()
+
+        # Assert
+        assert pricing.subtotal == Money(1010)
+        assert pipeline.discount_evaluations - evaluations == 1
+        assert len(pricing.applied_discount_ids) == 3
+        assert pricing.total == CartPricingService().price(cart).total
+        assert pipeline.timings['lines'].runs == 2
+        assert pipeline.timings['discounts'].runs == 2
+
+    def test_unchanged_subtotal_skips_downstream_stages(self):
+        """Testa o corte antecipado quando a saída de um estágio não muda."""
+        # Arrange
+        cart = make_cart()
+        pipeline = PricingPipeline(cart)
+        pipeline.result()
+
+        # Act: troca de preço e quantidade que mantém o total da linha
+        pipeline.set_quantity(cart.items[0].id, 2)
+        pipeline.set_price(cart.items[0].id, 5)
+        pipeline.result()
+
+        # Assert
+        assert pipeline.timings['lines'].runs == 2
+        assert pipeline.timings['subtotal'].runs == 1
+        assert pipeline.timings['discounts'].runs == 1
+
+    def test_item_and_discount_changes(self):
+        """Testa inclusão e remoção de itens e descontos."""
+        cart = make_cart(lines=2)
+        pipeline = PricingPipeline(cart)
+        assert pipeline.result().total == Money(18)
+
+        item = CartItem(cart_id=cart.id, product_id=uuid4(), quantity=3, price=1)
+        pipeline.add_item(item)
+        assert pipeline.result().subtotal == Money(23)
+
+        pipeline.remove_item(item.id)
+        pipeline.remove_discount(cart.discounts[0].id)
+        pricing = pipeline.result()
+        assert pricing.total == Money(20)
+        assert pricing.applied_discount_ids == ()
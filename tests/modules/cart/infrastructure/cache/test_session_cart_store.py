@@ -0,0 +1,144 @@
+from datetime import datetime
+from uuid import uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import (
+    Cart,
+    CartItem,
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.cache.session_cart_store import (
+    ENTRY_OVERHEAD_BYTES,
+    SessionCartStore,
+)
+from ecommerce.modules.cart.infrastructure.serialization.binary_codec import (
+    CartBinaryCodec,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_cart(session_id, lines=2):
+    cart = Cart(session_id=session_id)
+    for _ in range(lines):
+        cart.add_item(
+            CartItem(
+                cart_id=cart.id,
+                product_id=uuid4(),
+                quantity=2,
+                price=12.34,
+                added_at=datetime(2026, 1, 2, 3, 4, 5, 678),
+            )
+        )
+    return cart
+
+
+class TestCartBinaryCodec:
+    def test_roundtrip(self):
+        """Testa ida e volta da codificação binária."""
+        # Arrange
+        codec = CartBinaryCodec()
+        cart = make_cart('sessao', lines=3)
+        cart.user_id = uuid4()
+        cart.discounts.append(
+            Discount(type=DiscountType.FIXED_AMOUNT, value=Money(5))
+        )
+
+        # Act
+        decoded = codec.decode(codec.encode(cart))
+
+        # Assert
+        assert decoded == cart
+
+    def test_roundtrip_with_categories(self):
+        """Testa ida e volta de itens com e sem categoria."""
+        # Arrange
+        codec = CartBinaryCodec()
+        cart = make_cart('sessao', lines=3)
+        cart.items[1].category_id = uuid4()
+
+        # Act
+        decoded = codec.decode(codec.encode(cart))
+
+        # Assert
+        assert decoded == cart
+        assert decoded.items[0].category_id is None
+        assert decoded.items[1].category_id == cart.items[1].category_id
+
+    def test_item_size_is_fixed(self):
+        """Testa que cada item ocupa um registro de tamanho fixo."""
+        codec = CartBinaryCodec()
+        small = len(codec.encode(make_cart('s', lines=1)))
+        large = len(codec.encode(make_cart('s', lines=11)))
+        assert large - small == 10 * 60
+
+
+class TestSessionCartStore:
+    def test_sliding_expiration(self):
+        """Testa que acessos renovam o prazo da sessão."""
+        # Arrange
+        clock = FakeClock()
+        store = SessionCartStore(ttl_seconds=10, clock=clock)
+        store.put(make_cart('a'))
+        store.put(make_cart('b'))
+
+        # Act
+        clock.now += 8
+        assert store.get('a') is not None
+        clock.now += 8
+
+        # Assert
+        assert store.get('a') is not None
+        assert store.get('b') is None
+        stats = store.stats
+        assert stats.expirations == 1
+        assert (stats.hits, stats.misses) == (2, 1)
+
+        clock.now += 100
+        assert len(store) == 1  # expiração ocorre apenas no próximo acesso
+        assert store.stats.entries == 0
+
+    def test_lru_eviction_under_memory_cap(self):
+        """Testa descarte do carrinho menos usado ao exceder o orçamento."""
+        # Arrange
+        codec = CartBinaryCodec()
+        entry_size = len(codec.encode(make_cart('x'))) + ENTRY_OVERHEAD_BYTES
+        store = SessionCartStore(
+            max_bytes=entry_size * 2, clock=FakeClock(), codec=codec
+        )
+
+        # Act
+        store.put(make_cart('a'))
+        store.put(make_cart('b'))
+        store.get('a')
+        store.put(make_cart('c'))
+
+        # Assert
+        assert store.get('b') is None
+        assert store.get('a') is not None
+        assert store.stats.evictions == 1
+        assert store.stats.bytes == entry_size * 2
+
+    def test_overwrite_and_delete(self):
+        """Testa regravação e remoção de uma sessão."""
+        store = SessionCartStore(clock=FakeClock())
+        store.put(make_cart('a', lines=1))
+        store.put(make_cart('a', lines=3))
+        assert len(store.get('a').items) == 3
+        store.delete('a')
+        assert store.get('a') is None
+        assert store.stats.bytes == 0
+
+    def test_requires_session_id(self):
+        """Testa que carrinhos sem sessão são recusados."""
+        with pytest.raises(ValueError):
+            SessionCartStore().put(Cart())
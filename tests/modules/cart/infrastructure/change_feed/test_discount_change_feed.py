@@ -0,0 +1,224 @@
+import asyncio
+import multiprocessing
+import time
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.change_feed.change_feed_discount_repository import (  # noqa: E501
+    ChangeFeedDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.change_feed.discount_change_feed import (  # noqa: E501
+    DiscountChangeLog,
+    DiscountChangeSubscriber,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+
+def make_discount(code):
+    return Discount(type=DiscountType.PERCENTAGE, value=Decimal(10), code=code)
+
+
+def run_subscriber(path, target_version, results):
+    """Processo assinante: acompanha o log até a versão final."""
+
+    async def follow():
+        log = DiscountChangeLog(path)
+        catalog = InMemoryDiscountRepository()
+        subscriber = DiscountChangeSubscriber(log, catalog)
+        results.put(('ready', None))
+
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            await subscriber.poll()
+            target = target_version.value
+            if target and subscriber.version >= target:
+                break
+            await asyncio.sleep(0.01)
+
+        results.put(
+            (
+                'done',
+                {
+                    'version': subscriber.version,
+                    'codes': sorted(catalog.code_index),
+                    'values': sorted(
+                        str(discount.value)
+                        for discount in catalog.discounts.values()
+                    ),
+                    'max_lag': subscriber.stats.max_lag_seconds,
+                },
+            )
+        )
+        log.close()
+
+    asyncio.run(follow())
+
+
+class TestDiscountChangeFeed:
+    def test_subscriber_applies_incremental_changes(self, tmp_path):
+        """Testa carga inicial seguida de alterações incrementais."""
+
+        async def scenario():
+            # Arrange
+            log = DiscountChangeLog(str(tmp_path / 'changes.db'))
+            repository = ChangeFeedDiscountRepository(
+                InMemoryDiscountRepository(), log
+            )
+            first, second = make_discount('A'), make_discount('B')
+            await repository.save_many([first, second])
+
+            catalog = InMemoryDiscountRepository()
+            subscriber = DiscountChangeSubscriber(log, catalog)
+            await subscriber.bootstrap(repository)
+            saves_after_bootstrap = catalog.version
+
+            # Act
+            first.value = Decimal(25)
+            await repository.save(first)
+            await repository.delete(second.id)
+            applied = await subscriber.poll()
+
+            return log, catalog, subscriber, saves_after_bootstrap, applied
+
+        log, catalog, subscriber, saves_after_bootstrap, applied = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert applied == 2
+        assert catalog.version == saves_after_bootstrap + 2
+        assert sorted(catalog.code_index) == ['A']
+        assert next(iter(catalog.discounts.values())).value == Decimal(25)
+        assert subscriber.version == log.latest_version()
+        assert subscriber.stats.max_lag_seconds >= 0
+
+    def test_truncate_keeps_pending_changes(self, tmp_path):
+        """Testa que o truncamento preserva alterações ainda não lidas."""
+        # Arrange
+        log = DiscountChangeLog(str(tmp_path / 'changes.db'))
+        discount = make_discount('A')
+        versions = [log.append('save', discount.id, discount) for _ in '123']
+
+        # Act
+        removed = log.truncate_before(versions[-1])
+
+        # Assert
+        assert versions == sorted(versions)
+        assert removed == 2
+        assert [change.version for change in log.read_since(0)] == [
+            versions[-1]
+        ]
+        assert log.read_since(0)[0].discount == discount
+
+    def test_session_changes_wait_for_commit(self, tmp_path):
+        """Testa que alterações desfeitas na sessão não chegam ao log."""
+        pytest.importorskip('aiosqlite')
+        pytest.importorskip('greenlet')
+        from sqlalchemy.ext.asyncio import (
+            async_sessionmaker,
+            create_async_engine,
+        )
+
+        from ecommerce.modules.cart.infrastructure.db.models.base import Base
+        from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+            SQLDiscountRepository,
+        )
+
+        async def scenario():
+            # Arrange
+            engine = create_async_engine(
+                f'sqlite+aiosqlite:///{tmp_path / "discounts.db"}'
+            )
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            log = DiscountChangeLog(str(tmp_path / 'changes.db'))
+            rolled_back, committed = make_discount('A'), make_discount('B')
+
+            # Act
+            async with async_sessionmaker(engine)() as session:
+                repository = ChangeFeedDiscountRepository(
+                    SQLDiscountRepository(session), log
+                )
+                await repository.save(rolled_back)
+                await session.rollback()
+                after_rollback = log.read_since(0)
+
+                await repository.save_many([committed])
+                await repository.delete(committed.id)
+                before_commit = log.read_since(0)
+                await session.commit()
+
+            await engine.dispose()
+            return committed, after_rollback, before_commit, log.read_since(0)
+
+        committed, after_rollback, before_commit, changes = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert after_rollback == []
+        assert before_commit == []
+        assert [(c.operation, c.discount_id) for c in changes] == [
+            ('save', committed.id),
+            ('delete', committed.id),
+        ]
+
+    @pytest.mark.integration
+    def test_subscriber_processes_converge(self, tmp_path):
+        """Testa vários processos acompanhando o mesmo log."""
+        # Arrange
+        path = str(tmp_path / 'changes.db')
+        log = DiscountChangeLog(path)
+        context = multiprocessing.get_context('spawn')
+        target_version = context.Value('q', 0)
+        results = context.Queue()
+        processes = [
+            context.Process(
+                target=run_subscriber, args=(path, target_version, results)
+            )
+            for _ in range(3)
+        ]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            assert results.get(timeout=30)[0] == 'ready'
+
+        async def write():
+            repository = ChangeFeedDiscountRepository(
+                InMemoryDiscountRepository(), log
+            )
+            discounts = [make_discount(f'CODE{i}') for i in range(50)]
+            for start in range(0, 50, 10):
+                await repository.save_many(discounts[start : start + 10])
+                await asyncio.sleep(0.02)
+            for discount in discounts[:5]:
+                await repository.delete(discount.id)
+            discounts[5].value = Money(3)
+            discounts[5].type = DiscountType.FIXED_AMOUNT
+            await repository.save(discounts[5])
+            return repository
+
+        # Act
+        repository = asyncio.run(write())
+        target_version.value = log.latest_version()
+        reports = [results.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join(timeout=30)
+
+        # Assert
+        expected_codes = sorted(repository.repository.code_index)
+        expected_values = sorted(
+            str(discount.value)
+            for discount in repository.repository.discounts.values()
+        )
+        for kind, report in reports:
+            assert kind == 'done'
+            assert report['version'] == target_version.value
+            assert report['codes'] == expected_codes
+            assert report['values'] == expected_values
+            assert report['max_lag'] < 2.0
@@ -0,0 +1,58 @@
+import pytest
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ecommerce.modules.cart.infrastructure.db.models import cart_model  # noqa: F401
+from ecommerce.modules.cart.infrastructure.db.models.base import Base
+
+
+class StatementCounter:
+    """Conta comandos e linhas de parâmetros enviados ao banco."""
+
+    def __init__(self, engine):
+        self.statements = []
+        self.parameters = []
+        event.listen(engine.sync_engine, 'before_cursor_execute', self)
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        rows = len(parameters) if executemany else 1
+        self.statements.append((statement, rows))
+        self.parameters.append(parameters)
+
+    def reset(self):
+        self.statements.clear()
+        self.parameters.clear()
+
+    def count(self, prefix):
+        return sum(
+            1 for statement, _ in self.statements
+            if statement.lstrip().upper().startswith(prefix)
+        )
+
+    def rows(self, prefix):
+        return sum(
+            rows for statement, rows in self.statements
+            if statement.lstrip().upper().startswith(prefix)
+        )
+
+
+@pytest.fixture
+def database(tmp_path):
+    """Retorna uma função assíncrona que cria um banco SQLite com o esquema."""
+
+    async def create(name='test.db'):
+        engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / name}')
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+    return create
+
+
+@pytest.fixture
+def statement_counter():
+    return StatementCounter
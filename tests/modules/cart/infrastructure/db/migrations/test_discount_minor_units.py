@@ -0,0 +1,115 @@
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ecommerce.modules.cart.domain.entities import DiscountType
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.migrations import (
+    discount_targets,
+)
+from ecommerce.modules.cart.infrastructure.db.migrations.discount_minor_units import (  # noqa: E501
+    upgrade,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+
+LEGACY_SCHEMA = """
+CREATE TABLE discounts (
+    id CHAR(32) PRIMARY KEY,
+    type VARCHAR NOT NULL,
+    value FLOAT NOT NULL,
+    code VARCHAR UNIQUE,
+    description VARCHAR,
+    minimum_order_value FLOAT,
+    currency VARCHAR,
+    valid_from DATETIME,
+    valid_until DATETIME,
+    max_usage_count INTEGER,
+    current_usage_count INTEGER,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+class TestDiscountMinorUnitsMigration:
+    def test_upgrade_converts_legacy_float_columns(self, tmp_path):
+        """Testa a conversão de um banco com colunas Float."""
+
+        async def scenario():
+            # Arrange
+            engine = create_async_engine(
+                f'sqlite+aiosqlite:///{tmp_path / "legacy.db"}'
+            )
+            fixed_id, percentage_id = uuid4(), uuid4()
+            async with engine.begin() as conn:
+                await conn.execute(text(LEGACY_SCHEMA))
+                await conn.execute(
+                    text(
+                        'INSERT INTO discounts (id, type, value, code, '
+                        'minimum_order_value, currency, valid_from, '
+                        'current_usage_count) VALUES '
+                        "(:id, :type, :value, :code, :minimum, 'BRL', "
+                        "'2026-01-01 00:00:00', 0)"
+                    ),
+                    [
+                        {
+                            'id': fixed_id.hex,
+                            'type': 'FIXED_AMOUNT',
+                            'value': 0.1 + 0.2,
+                            'code': 'FIXO',
+                            'minimum': 19.99,
+                        },
+                        {
+                            'id': percentage_id.hex,
+                            'type': 'PERCENTAGE',
+                            'value': 12.5,
+                            'code': 'PCT',
+                            'minimum': None,
+                        },
+                    ],
+                )
+
+            # Act
+            async with engine.begin() as conn:
+                migrated = await conn.run_sync(upgrade)
+            async with engine.begin() as conn:
+                rerun = await conn.run_sync(upgrade)
+                columns, indexes = await conn.run_sync(
+                    lambda sync: (
+                        {c['name'] for c in inspect(sync).get_columns('discounts')},
+                        {i['name'] for i in inspect(sync).get_indexes('discounts')},
+                    )
+                )
+
+            # Migração seguinte, necessária para ler com o repositório atual
+            async with engine.begin() as conn:
+                await conn.run_sync(discount_targets.upgrade)
+
+            sessions = async_sessionmaker(engine, expire_on_commit=False)
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                fixed = await repository.get_by_id(fixed_id)
+                percentage = await repository.get_by_id(percentage_id)
+
+            await engine.dispose()
+            return migrated, rerun, columns, indexes, fixed, percentage
+
+        migrated, rerun, columns, indexes, fixed, percentage = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert (migrated, rerun) == (2, 0)
+        assert 'value' not in columns
+        assert 'minimum_order_value' not in columns
+        assert {'ix_discounts_open_ended', 'ix_discounts_validity'} <= indexes
+        assert fixed.type == DiscountType.FIXED_AMOUNT
+        assert fixed.value == Money('0.30')
+        assert fixed.minimum_order_value == Money('19.99')
+        assert percentage.value == Decimal('12.50')
+        assert percentage.minimum_order_value == Money(0)
@@ -0,0 +1,80 @@
+import asyncio
+from uuid import uuid4
+
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ecommerce.modules.cart.infrastructure.db.migrations.discount_targets import (  # noqa: E501
+    upgrade,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+
+PREVIOUS_SCHEMA = """
+CREATE TABLE discounts (
+    id CHAR(32) PRIMARY KEY,
+    type VARCHAR NOT NULL,
+    value_minor BIGINT NOT NULL,
+    code VARCHAR UNIQUE,
+    description VARCHAR,
+    minimum_order_value_minor BIGINT NOT NULL,
+    currency VARCHAR,
+    valid_from DATETIME,
+    valid_until DATETIME,
+    max_usage_count INTEGER,
+    current_usage_count INTEGER,
+    created_at DATETIME,
+    updated_at DATETIME
+)
+"""
+
+
+class TestDiscountTargetsMigration:
+    def test_upgrade_adds_target_columns(self, tmp_path):
+        """Testa a inclusão das colunas de alvo em um banco existente."""
+
+        async def scenario():
+            # Arrange
+            engine = create_async_engine(
+                f'sqlite+aiosqlite:///{tmp_path / "previous.db"}'
+            )
+            discount_id = uuid4()
+            async with engine.begin() as conn:
+                await conn.execute(text(PREVIOUS_SCHEMA))
+                await conn.execute(
+                    text(
+                        'INSERT INTO discounts (id, type, value_minor, code, '
+                        'minimum_order_value_minor, currency, valid_from, '
+                        "current_usage_count) VALUES (:id, 'PERCENTAGE', "
+                        "1000, 'DEZ', 0, 'BRL', '2026-01-01 00:00:00', 0)"
+                    ),
+                    {'id': discount_id.hex},
+                )
+
+            # Act
+            async with engine.begin() as conn:
+                added = await conn.run_sync(upgrade)
+            async with engine.begin() as conn:
+                rerun = await conn.run_sync(upgrade)
+                columns = await conn.run_sync(
+                    lambda sync: {
+                        c['name'] for c in inspect(sync).get_columns('discounts')
+                    }
+                )
+
+            sessions = async_sessionmaker(engine, expire_on_commit=False)
+            async with sessions() as session:
+                discount = await SQLDiscountRepository(session).get_by_id(
+                    discount_id
+                )
+
+            await engine.dispose()
+            return added, rerun, columns, discount
+
+        added, rerun, columns, discount = asyncio.run(scenario())
+
+        # Assert
+        assert (added, rerun) == (2, 0)
+        assert {'product_ids', 'category_ids'} <= columns
+        assert not discount.is_targeted
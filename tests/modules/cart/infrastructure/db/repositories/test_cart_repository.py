@@ -0,0 +1,243 @@
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import (
+    Cart,
+    CartItem,
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_cart_repository import (
+    InMemoryCartRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_cart_repository import (
+    SQLCartRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (
+    SQLDiscountRepository,
+)
+
+
+def make_cart(lines):
+    cart = Cart(session_id='sessao-1')
+    for i in range(lines):
+        cart.add_item(
+            CartItem(
+                cart_id=cart.id,
+                product_id=uuid4(),
+                quantity=1 + i % 3,
+                price=10.5,
+            )
+        )
+    return cart
+
+
+class TestInMemoryCartRepository:
+    def test_roundtrip_and_isolation(self):
+        """Testa que o repositório devolve cópias independentes."""
+        # Arrange
+        repository = InMemoryCartRepository()
+        cart = make_cart(3)
+
+        # Act
+        asyncio.run(repository.save(cart))
+        loaded = asyncio.run(repository.get_by_session_id('sessao-1'))
+        loaded.items[0].quantity = 99
+
+        # Assert
+        assert loaded.id == cart.id
+        assert asyncio.run(repository.get_by_id(cart.id)).items[0].quantity != 99
+
+    def test_save_applies_line_changes(self):
+        """Testa inclusão, alteração e remoção de itens."""
+        # Arrange
+        repository = InMemoryCartRepository()
+        cart = make_cart(3)
+        asyncio.run(repository.save(cart))
+        loaded = asyncio.run(repository.get_by_id(cart.id))
+
+        # Act
+        loaded.items[0].quantity = 7
+        removed = loaded.items.pop(1)
+        loaded.add_item(CartItem(cart_id=cart.id, product_id=uuid4(), quantity=1))
+        asyncio.run(repository.save(loaded))
+
+        # Assert
+        stored = asyncio.run(repository.get_by_id(cart.id))
+        assert [item.id for item in stored.items] == [
+            item.id for item in loaded.items
+        ]
+        assert stored.items[0].quantity == 7
+        assert removed.id not in repository.items[cart.id]
+
+        asyncio.run(repository.delete(cart.id))
+        assert asyncio.run(repository.get_by_session_id('sessao-1')) is None
+
+
+class TestSQLCartRepository:
+    def test_roundtrip_with_discounts(self, database, statement_counter):
+        """Testa carga do carrinho com itens em uma única consulta."""
+
+        async def scenario():
+            engine, sessions = await database()
+            counter = statement_counter(engine)
+            discount = Discount(
+                type=DiscountType.FIXED_AMOUNT, value=Money(5), code='CINCO'
+            )
+            cart = make_cart(20)
+            cart.discounts.append(discount)
+
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+
+            async with sessions() as session:
+                counter.reset()
+                loaded = await SQLCartRepository(session).get_by_id(cart.id)
+                selects = counter.count('SELECT')
+
+            await engine.dispose()
+            return cart, loaded, selects
+
+        cart, loaded, selects = asyncio.run(scenario())
+
+        assert selects == 2  # itens (junção) + descontos
+        assert [item.id for item in loaded.items] == [item.id for item in cart.items]
+        assert loaded.items[5].quantity == cart.items[5].quantity
+        assert loaded.discounts[0].code == 'CINCO'
+        assert loaded.discounts[0].value == Money(5)
+
+    def test_save_writes_only_changed_lines(self, database, statement_counter):
+        """Testa que save grava somente as linhas alteradas."""
+
+        async def scenario():
+            engine, sessions = await database()
+            counter = statement_counter(engine)
+            cart = make_cart(200)
+
+            async with sessions() as session:
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+
+            async with sessions() as session:
+                repository = SQLCartRepository(session)
+                loaded = await repository.get_by_id(cart.id)
+                loaded.items[0].quantity = 50
+                loaded.items[1].price = 1.25
+                removed = loaded.items.pop(2)
+                loaded.add_item(
+                    CartItem(cart_id=cart.id, product_id=uuid4(), quantity=4)
+                )
+
+                counter.reset()
+                await repository.save(loaded)
+                await session.commit()
+                written = {
+                    'insert': counter.rows('INSERT'),
+                    'update': counter.rows('UPDATE'),
+                    'delete': counter.count('DELETE'),
+                }
+
+                counter.reset()
+                await repository.save(loaded)
+                unchanged = counter.rows('INSERT') + counter.count('DELETE')
+
+            async with sessions() as session:
+                stored = await SQLCartRepository(session).get_by_id(cart.id)
+
+            await engine.dispose()
+            return loaded, removed, stored, written, unchanged
+
+        loaded, removed, stored, written, unchanged = asyncio.run(scenario())
+
+        assert written == {'insert': 1, 'update': 3, 'delete': 1}
+        assert unchanged == 0
+        assert len(stored.items) == 200
+        assert removed.id not in {item.id for item in stored.items}
+        assert stored.items[0].quantity == 50
+
+    def test_save_untracked_cart_does_not_rewrite_items(
+        self, database, statement_counter
+    ):
+        """Testa salvar um carrinho que não foi carregado pelo repositório."""
+
+        async def scenario():
+            engine, sessions = await database()
+            counter = statement_counter(engine)
+            cart = make_cart(10)
+
+            async with sessions() as session:
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+
+            cart.items[0].quantity = 9
+            async with sessions() as session:
+                counter.reset()
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+                rows = counter.rows('INSERT'), counter.rows('UPDATE')
+
+            await engine.dispose()
+            return rows
+
+        assert asyncio.run(scenario()) == (0, 2)  # carrinho + 1 item
+
+    def test_roundtrip_numeric_looking_uuids(self, database):
+        """Testa UUIDs cujo hex o SQLite leria como número."""
+
+        async def scenario():
+            engine, sessions = await database()
+            cart = make_cart(1)
+            cart.items[0].product_id = UUID('12345678-9012-4456-8890-1234567e0123')
+
+            async with sessions() as session:
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+
+            async with sessions() as session:
+                loaded = await SQLCartRepository(session).get_by_id(cart.id)
+
+            await engine.dispose()
+            return cart, loaded
+
+        cart, loaded = asyncio.run(scenario())
+
+        assert loaded.items[0].product_id == cart.items[0].product_id
+
+    @pytest.mark.slow
+    def test_save_cost_proportional_to_changes(self, database):
+        """Mede o custo de save em um carrinho de 10k linhas."""
+
+        async def scenario():
+            engine, sessions = await database()
+            cart = make_cart(10_000)
+            timings = {}
+
+            async with sessions() as session:
+                started_at = time.perf_counter()
+                await SQLCartRepository(session).save(cart)
+                await session.commit()
+                timings['full'] = time.perf_counter() - started_at
+
+            for changed in (10, 1000):
+                async with sessions() as session:
+                    repository = SQLCartRepository(session)
+                    loaded = await repository.get_by_id(cart.id)
+                    for item in loaded.items[:changed]:
+                        item.quantity += 1
+
+                    started_at = time.perf_counter()
+                    await repository.save(loaded)
+                    await session.commit()
+                    timings[changed] = time.perf_counter() - started_at
+
+            await engine.dispose()
+            return timings
+
+        timings = asyncio.run(scenario())
+        assert timings[10] < timings[1000] < timings['full'], timings
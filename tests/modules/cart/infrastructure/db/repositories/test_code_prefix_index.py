@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from ecommerce.modules.cart.infrastructure.db.repositories.code_prefix_index import (  # noqa: E501
+    CodePrefixIndex,
+)
+
+
+class TestCodePrefixIndex:
+    def test_search_ignores_case_and_respects_limit(self):
+        """Testa a busca sem caixa, em ordem e limitada."""
+        # Arrange
+        index = CodePrefixIndex()
+        for code in ['BLACK10', 'black20', 'Black-VIP', 'BLUE', 'NATAL']:
+            index.add(code)
+
+        # Act / Assert
+        assert index.search('black', 10) == ['Black-VIP', 'BLACK10', 'black20']
+        assert index.search('BL', 2) == ['Black-VIP', 'BLACK10']
+        assert index.search('', 1) == ['Black-VIP']
+        assert index.search('zzz', 10) == []
+        assert index.search('b', 0) == []
+
+    def test_discard_and_readd(self):
+        """Códigos removidos somem da busca e voltam sem duplicar."""
+        # Arrange
+        index = CodePrefixIndex()
+        for code in ['A1', 'A2', 'A3']:
+            index.add(code)
+        index.search('A', 10)
+
+        # Act
+        index.discard('A2')
+        removed = index.search('A', 10)
+        index.add('A2')
+        index.add('A2')
+        restored = index.search('A', 10)
+
+        # Assert
+        assert removed == ['A1', 'A3']
+        assert restored == ['A1', 'A2', 'A3']
+        assert len(index) == 3
+
+    def test_compacts_after_many_removals(self):
+        """O índice descarta as entradas removidas quando acumulam."""
+        # Arrange
+        index = CodePrefixIndex()
+        for number in range(100):
+            index.add(f'C{number:03d}')
+        index.search('C', 1)
+
+        # Act
+        for number in range(60):
+            index.discard(f'C{number:03d}')
+        result = index.search('C', 100)
+
+        # Assert
+        assert result == [f'C{number:03d}' for number in range(60, 100)]
+        assert len(index._entries) == 40
+
+    @pytest.mark.slow
+    def test_search_time_does_not_grow_with_catalog(self):
+        """A busca custa o tamanho do resultado, não o do catálogo."""
+
+        def search_seconds(size):
+            index = CodePrefixIndex()
+            for number in range(size):
+                index.add(f'CUPOM{number:08d}')
+            index.search('', 1)
+            started_at = time.perf_counter()
+            for number in range(1000):
+                index.search(f'cupom{number * 7 % size:08d}'[:10], 20)
+            return time.perf_counter() - started_at
+
+        small = search_seconds(10_000)
+        large = search_seconds(1_000_000)
+        assert large < small * 5, f'10k: {small:.4f}s, 1M: {large:.4f}s'
@@ -0,0 +1,172 @@
+import asyncio
+import tracemalloc
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.compact_discount_repository import (  # noqa: E501
+    CompactDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0, 0, 123456)
+
+
+def make_discounts(count):
+    return [
+        Discount(
+            type=DiscountType.PERCENTAGE
+            if index % 2
+            else DiscountType.FIXED_AMOUNT,
+            value=Decimal(10) if index % 2 else Money('7.50'),
+            code=f'CUPOM{index:07d}',
+            description='Desconto de campanha',
+            valid_from=NOW - timedelta(days=1),
+            valid_until=NOW + timedelta(days=index % 3 - 1)
+            if index % 5
+            else None,
+            max_usage_count=100 if index % 4 == 0 else None,
+        )
+        for index in range(count)
+    ]
+
+
+def bytes_per_discount(repository_class, count):
+    """Memória retida pelo repositório, por desconto, após a carga."""
+
+    async def load():
+        repository = repository_class()
+        await repository.save_many(make_discounts(count))
+        return repository
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        repository = asyncio.run(load())
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(
+        stat.size_diff for stat in after.compare_to(before, 'filename')
+    )
+    assert len(repository.code_index) == count
+    return allocated / count
+
+
+class TestCompactDiscountRepository:
+    def test_roundtrip_update_and_delete(self):
+        """Testa leitura por ID e código, atualização e remoção."""
+
+        async def scenario():
+            # Arrange
+            repository = CompactDiscountRepository()
+            first, second = make_discounts(2)
+            first.value = Money('7.50', 'USD')
+            first.minimum_order_value = Money('49.90', 'USD')
+            first.maximum_discount_amount = Money(15, 'USD')
+            first.current_usage_count = 3
+            first.product_ids = frozenset([uuid4(), uuid4()])
+            second.category_ids = frozenset([uuid4()])
+            await repository.save_many([first, second])
+
+            # Act
+            by_id = await repository.get_by_id(first.id)
+            by_code = await repository.get_by_code(second.code)
+            first.code = 'RENOMEADO'
+            await repository.save(first)
+            await repository.delete(second.id)
+            third = make_discounts(3)[2]
+            await repository.save(third)
+
+            return repository, first, second, third, by_id, by_code
+
+        repository, first, second, third, by_id, by_code = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert by_id == Discount(**{**vars_of(first), 'code': 'CUPOM0000000'})
+        assert by_code == second
+        assert by_id.minimum_order_value.currency is by_id.value.currency
+        assert asyncio.run(repository.get_by_code('CUPOM0000000')) is None
+        assert asyncio.run(repository.get_by_code('RENOMEADO')) == first
+        assert asyncio.run(repository.get_by_id(second.id)) is None
+        assert asyncio.run(repository.get_by_id(third.id)) == third
+        assert len(repository) == 2
+        assert len(repository._types) == 2  # posição reaproveitada
+
+    def test_value_keeps_its_own_currency(self):
+        """Testa valores fixos e cupons em moeda diferente do mínimo."""
+
+        async def scenario():
+            # Arrange
+            repository = CompactDiscountRepository()
+            fixed = Discount(
+                type=DiscountType.FIXED_AMOUNT, value=Money('10', 'USD')
+            )
+            coupon = Discount(type=DiscountType.COUPON, value=Money('5', 'EUR'))
+
+            # Act
+            await repository.save_many([fixed, coupon])
+            return (
+                await repository.get_by_id(fixed.id),
+                await repository.get_by_id(coupon.id),
+            )
+
+        fixed, coupon = asyncio.run(scenario())
+
+        # Assert
+        assert fixed.value == Money('10', 'USD')
+        assert fixed.minimum_order_value == Money.zero()
+        assert coupon.value == Money('5', 'EUR')
+
+    def test_list_active_matches_in_memory_repository(self):
+        """Testa a consulta de descontos ativos contra o repositório comum."""
+
+        async def scenario():
+            discounts = make_discounts(200)
+            results = []
+            for repository in (
+                CompactDiscountRepository(),
+                InMemoryDiscountRepository(),
+            ):
+                await repository.save_many(discounts)
+                results.append(
+                    (
+                        await repository.list_active(NOW),
+                        await repository.list_active(NOW, Money(5)),
+                    )
+                )
+            return results
+
+        compact, memory = asyncio.run(scenario())
+
+        assert compact == memory
+        assert 0 < len(compact[0]) < 200
+
+    @pytest.mark.slow
+    def test_bytes_per_discount_report(self):
+        """Mede a memória por desconto dos dois repositórios em memória."""
+        # Act
+        compact = bytes_per_discount(CompactDiscountRepository, 10_000)
+        baseline = bytes_per_discount(InMemoryDiscountRepository, 10_000)
+        report = f'compacto={compact:.0f} B, memória={baseline:.0f} B'
+
+        # Assert
+        assert compact < 300, report
+        assert compact * 2 < baseline, report
+
+
+def vars_of(discount):
+    return {
+        name: getattr(discount, name)
+        for name in Discount.__dataclass_fields__
+        if not name.startswith('_')
+    }
@@ -0,0 +1,196 @@
+import asyncio
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.concurrent_discount_repository import (  # noqa: E501
+    ConcurrentDiscountRepository,
+)
+
+
+def make_discount(code, max_usage_count=None):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        description='Desconto de teste',
+        max_usage_count=max_usage_count,
+    )
+
+
+def run_threads(threads, target):
+    barrier = threading.Barrier(threads)
+
+    def worker(index):
+        barrier.wait()
+        return target(index)
+
+    with ThreadPoolExecutor(threads) as executor:
+        return list(executor.map(worker, range(threads)))
+
+
+class TestConcurrentDiscountRepository:
+    def test_redeem_respects_limit_across_threads(self):
+        """Resgates concorrentes nunca ultrapassam o limite de uso."""
+        # Arrange
+        repository = ConcurrentDiscountRepository()
+        discount = repository.store(make_discount('LIMITADO', 500))
+
+        def redeem(_index):
+            return sum(repository.redeem(discount.id) for _ in range(200))
+
+        # Act
+        successes = run_threads(8, redeem)
+
+        # Assert
+        assert sum(successes) == 500
+        assert repository.lookup(discount.id).current_usage_count == 500
+
+    def test_concurrent_stores_keep_code_index_consistent(self):
+        """Gravações concorrentes mantêm o índice de códigos coerente."""
+        # Arrange
+        repository = ConcurrentDiscountRepository(stripes=4)
+
+        def store(index):
+            for number in range(250):
+                repository.store(make_discount(f'T{index}-{number}'))
+            return index
+
+        # Act
+        run_threads(8, store)
+        discounts = asyncio.run(repository.list())
+
+        # Assert
+        assert len(discounts) == 2000
+        assert repository.version == 2000
+        for discount in discounts:
+            assert repository.lookup_code(discount.code) is discount
+
+    def test_code_change_and_removal_update_index(self):
+        """Troca de código e remoção atualizam o índice de códigos."""
+        # Arrange
+        repository = ConcurrentDiscountRepository()
+        discount = make_discount('ANTIGO')
+        repository.store(discount)
+
+        # Act
+        discount.code = 'NOVO'
+        repository.store(discount)
+        old = repository.lookup_code('ANTIGO')
+        new = repository.lookup_code('NOVO')
+        repository.remove(discount.id)
+
+        # Assert
+        assert old is None
+        assert new.id == discount.id
+        assert repository.lookup_code('NOVO') is None
+        assert repository.lookup(discount.id) is None
+
+    def test_renaming_the_stored_instance_updates_index(self):
+        """Troca de código na instância guardada atualiza os índices."""
+
+        async def scenario():
+            # Arrange
+            repository = ConcurrentDiscountRepository()
+            saved = await repository.save(make_discount('OLD'))
+            discount = await repository.get_by_id(saved.id)
+
+            # Act
+            discount.code = 'NEW'
+            await repository.save(discount)
+
+            return (
+                discount,
+                await repository.get_by_code('NEW'),
+                await repository.get_by_code('OLD'),
+                await repository.search_by_code_prefix('o'),
+                await repository.search_by_code_prefix('n'),
+            )
+
+        discount, new, old, by_old_prefix, by_new_prefix = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert new is discount
+        assert old is None
+        assert by_old_prefix == []
+        assert by_new_prefix == [discount]
+
+    def test_service_redemptions_from_threads_are_not_lost(self):
+        """Resgates pelo serviço em várias threads não se perdem."""
+        # Arrange
+        repository = ConcurrentDiscountRepository()
+        service = DiscountService(repository)
+        discount = repository.store(make_discount('SERVICO', 300))
+
+        async def apply_many():
+            applied = 0
+            for _ in range(100):
+                try:
+                    await service.apply_discount_to_cart(
+                        Money(100), discount.id
+                    )
+                    applied += 1
+                except ValueError:
+                    pass
+            return applied
+
+        # Act
+        applied = run_threads(4, lambda _index: asyncio.run(apply_many()))
+
+        # Assert
+        assert sum(applied) == 300
+        assert repository.lookup(discount.id).current_usage_count == 300
+
+
+@pytest.mark.slow
+class TestConcurrentDiscountRepositoryScaling:
+    def test_mixed_workload_throughput_by_thread_count(self):
+        """Mede a vazão de leituras e resgates com 1 a 8 threads."""
+        # Arrange
+        repository = ConcurrentDiscountRepository()
+        discounts = [
+            repository.store(make_discount(f'CUPOM{index:05d}'))
+            for index in range(10_000)
+        ]
+        operations = 200_000
+
+        def workload(threads):
+            per_thread = operations // threads
+
+            def work(index):
+                for number in range(per_thread):
+                    discount = discounts[(index * 7919 + number) % 10_000]
+                    if number % 10:
+                        repository.lookup_code(discount.code)
+                    else:
+                        repository.redeem(discount.id)
+
+            started_at = time.perf_counter()
+            run_threads(threads, work)
+            return per_thread * threads / (time.perf_counter() - started_at)
+
+        # Act
+        throughput = {threads: workload(threads) for threads in (1, 2, 4, 8)}
+
+        # Assert
+        redeemed = sum(
+            discount.current_usage_count for discount in discounts
+        )
+        assert redeemed == sum(
+            operations // threads // 10 * threads
+            for threads in (1, 2, 4, 8)
+        )
+        if not getattr(sys, '_is_gil_enabled', lambda: True)():
+            # Sem GIL, as leituras sem trava devem escalar com as threads
+            assert throughput[4] > throughput[1] * 2, throughput
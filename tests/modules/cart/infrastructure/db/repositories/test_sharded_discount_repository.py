@@ -0,0 +1,285 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sharded_discount_repository import (  # noqa: E501
+    HashRing,
+    ShardedDiscountRepository,
+    shard_key,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.session_router import (
+    SessionRouter,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def make_discounts(count, prefix='GERADO'):
+    return [
+        Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal(5 + index % 10),
+            code=f'{prefix}{index:05d}' if index % 7 else None,
+            valid_from=NOW - timedelta(days=1),
+            valid_until=NOW - timedelta(hours=1) if index % 5 == 0 else None,
+            minimum_order_value=Money(index % 50),
+        )
+        for index in range(count)
+    ]
+
+
+async def make_shard(database, name):
+    _, sessions = await database(f'{name}.db')
+    return SQLDiscountRepository(router=SessionRouter(sessions))
+
+
+async def make_repository(database, count=3):
+    return ShardedDiscountRepository(
+        {
+            f'shard-{index}': await make_shard(database, f'shard-{index}')
+            for index in range(count)
+        }
+    )
+
+
+async def shard_contents(repository):
+    return {
+        name: {discount.id for discount in await shard.list()}
+        for name, shard in repository.shards.items()
+    }
+
+
+class TestHashRing:
+    def test_adding_a_node_moves_a_fraction_of_keys(self):
+        """Testa que um fragmento novo recebe apenas parte das chaves."""
+        # Arrange
+        keys = [f'CUPOM{index}' for index in range(20_000)]
+        ring = HashRing(['a', 'b', 'c'])
+        before = {key: ring.owner(key) for key in keys}
+
+        # Act
+        ring.add('d')
+        after = {key: ring.owner(key) for key in keys}
+
+        # Assert
+        moved = [key for key in keys if before[key] != after[key]]
+        assert all(after[key] == 'd' for key in moved)
+        assert 0.15 < len(moved) / len(keys) < 0.35
+        for name in 'abcd':
+            share = sum(owner == name for owner in after.values())
+            assert 0.15 < share / len(keys) < 0.35
+
+
+class TestShardedDiscountRepository:
+    def test_queries_match_in_memory_repository(self, database):
+        """Testa roteamento e consultas distribuídas contra a memória."""
+
+        async def scenario():
+            # Arrange
+            discounts = make_discounts(300)
+            sharded = await make_repository(database)
+            memory = InMemoryDiscountRepository()
+            await sharded.save_many(discounts)
+            await memory.save_many(discounts)
+            first = discounts[1]
+            first.use()
+            await sharded.save(first)
+
+            # Act
+            results = {}
+            for name, repository in (('sharded', sharded), ('memory', memory)):
+                results[name] = (
+                    sorted(d.id for d in await repository.list()),
+                    [d.id for d in await repository.list_active(NOW)],
+                    [
+                        d.id
+                        for d in await repository.list_active(
+                            NOW, Money(10)
+                        )
+                    ],
+                    [
+                        d.code
+                        for d in await repository.search_by_code_prefix(
+                            'gerado001', 8
+                        )
+                    ],
+                    await repository.get_by_code(first.code),
+                    await repository.get_by_id(discounts[7].id),
+                )
+            contents = await shard_contents(sharded)
+            return discounts, sharded, results, contents
+
+        discounts, sharded, results, contents = asyncio.run(scenario())
+
+        # Assert
+        assert results['sharded'][:4] == results['memory'][:4]
+        assert results['sharded'][4].current_usage_count == 1
+        assert results['sharded'][5].id == discounts[7].id
+        for discount in discounts:
+            assert discount.id in contents[sharded.shard_for(discount)]
+        assert all(len(ids) > 50 for ids in contents.values())
+        assert sum(len(ids) for ids in contents.values()) == 300
+        assert sharded.stats.location_hits == 1
+
+    def test_delete_and_purge_reach_every_shard(self, database):
+        """Testa remoções que precisam consultar todos os fragmentos."""
+
+        async def scenario():
+            discounts = make_discounts(100)
+            repository = await make_repository(database)
+            await repository.save_many(discounts)
+            await repository.delete(discounts[3].id)
+            purged = await repository.purge(NOW, NOW, limit=1000)
+            return purged, await repository.list(), discounts
+
+        purged, remaining, discounts = asyncio.run(scenario())
+
+        assert purged == 20
+        assert len(remaining) == 79
+        assert discounts[3].id not in {d.id for d in remaining}
+
+    def test_renaming_moves_the_discount_to_its_new_shard(self, database):
+        """Testa trocas de código que mudam o fragmento responsável."""
+
+        def code_on_another_shard(repository, discount):
+            owner = repository.shard_for(discount)
+            return next(
+                code
+                for code in (f'NOVO{index}' for index in range(1000))
+                if repository.ring.owner(code) != owner
+            )
+
+        async def scenario():
+            # Arrange
+            repository = await make_repository(database)
+            cached, uncached = make_discounts(2, prefix='ANTIGO')
+            cached.code, uncached.code = 'ANTIGO1', 'ANTIGO2'
+            await repository.save_many([cached, uncached])
+            fresh = ShardedDiscountRepository(repository.shards)
+
+            # Act
+            cached.code = code_on_another_shard(repository, cached)
+            await repository.save(cached)
+            uncached.code = code_on_another_shard(fresh, uncached)
+            await fresh.save_many([uncached])
+
+            contents = await shard_contents(repository)
+            return (
+                repository,
+                cached,
+                uncached,
+                contents,
+                await repository.get_by_id(cached.id),
+                await repository.list(),
+            )
+
+        repository, cached, uncached, contents, found, listed = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        for discount in (cached, uncached):
+            holders = [
+                name for name, ids in contents.items() if discount.id in ids
+            ]
+            assert holders == [repository.shard_for(discount)]
+        assert found.code == cached.code
+        assert sorted(d.code for d in listed) == sorted(
+            [cached.code, uncached.code]
+        )
+
+    def test_online_rebalance_after_adding_a_shard(self, database):
+        """Testa leituras e gravações durante a inclusão de um fragmento."""
+
+        async def scenario():
+            # Arrange
+            discounts = make_discounts(400)
+            repository = await make_repository(database)
+            await repository.save_many(discounts)
+            new_shard = await make_shard(database, 'shard-3')
+
+            # Act
+            repository.add_shard('shard-3', new_shard)
+            moving = [
+                d
+                for d in discounts
+                if repository.shard_for(d) == 'shard-3'
+            ]
+            during = [
+                await repository.get_by_code(d.code)
+                for d in moving
+                if d.code
+            ]
+
+            async def writes():
+                for discount in moving[:20]:
+                    discount.use()
+                    await repository.save(discount)
+                    await asyncio.sleep(0)
+
+            moved, _ = await asyncio.gather(
+                repository.rebalance(batch_size=50), writes()
+            )
+            contents = await shard_contents(repository)
+            after = [
+                await repository.get_by_code(d.code)
+                for d in moving[:20]
+                if d.code
+            ]
+            return repository, discounts, moving, during, moved, contents, after
+
+        (
+            repository,
+            discounts,
+            moving,
+            during,
+            moved,
+            contents,
+            after,
+        ) = asyncio.run(scenario())
+
+        # Assert
+        assert not repository.rebalancing
+        assert all(found is not None for found in during)
+        assert 0 < moved <= len(moving)
+        assert contents['shard-3'] == {d.id for d in moving}
+        for discount in discounts:
+            owner = repository.shard_for(discount)
+            others = [ids for name, ids in contents.items() if name != owner]
+            assert discount.id in contents[owner]
+            assert all(discount.id not in ids for ids in others)
+        assert all(found.current_usage_count == 1 for found in after)
+        assert len(moving) < len(discounts) / 2
+
+    def test_remove_shard_drains_it(self, database):
+        """Testa a retirada de um fragmento com os seus descontos."""
+
+        async def scenario():
+            discounts = make_discounts(120)
+            repository = await make_repository(database)
+            await repository.save_many(discounts)
+
+            repository.remove_shard('shard-0')
+            with pytest.raises(ValueError):
+                repository.remove_shard('shard-1')
+            await repository.rebalance()
+            return repository, discounts, await shard_contents(repository)
+
+        repository, discounts, contents = asyncio.run(scenario())
+
+        assert set(contents) == {'shard-1', 'shard-2'}
+        assert sum(len(ids) for ids in contents.values()) == 120
+        assert all(
+            repository.shard_for(d) != 'shard-0' for d in discounts
+        )
+        assert shard_key(discounts[0]) == str(discounts[0].id)
@@ -0,0 +1,518 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.models.discount_model import (
+    DiscountArchiveModel,
+    DiscountModel,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.session_router import (
+    SessionRouter,
+)
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def make_catalog():
+    """Descontos ativos, expirados, futuros, esgotados e por valor mínimo."""
+    return {
+        'open': Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal('12.5'),
+            code='OPEN',
+            valid_from=NOW - timedelta(days=1),
+        ),
+        'expiring': Discount(
+            type=DiscountType.FIXED_AMOUNT,
+            value=Money('19.99'),
+            code='EXPIRING',
+            valid_from=NOW - timedelta(days=1),
+            valid_until=NOW + timedelta(hours=1),
+        ),
+        'expired': Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal(5),
+            code='EXPIRED',
+            valid_from=NOW - timedelta(days=2),
+            valid_until=NOW - timedelta(days=1),
+        ),
+        'future': Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal(5),
+            code='FUTURE',
+            valid_from=NOW + timedelta(days=1),
+        ),
+        'exhausted': Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal(5),
+            code='EXHAUSTED',
+            valid_from=NOW - timedelta(days=1),
+            max_usage_count=1,
+            current_usage_count=1,
+        ),
+        'high_minimum': Discount(
+            type=DiscountType.PERCENTAGE,
+            value=Decimal(5),
+            code='HIGH',
+            minimum_order_value=Money('100.01'),
+            valid_from=NOW - timedelta(days=1),
+        ),
+    }
+
+
+class TestSQLDiscountRepository:
+    def test_money_values_roundtrip_exactly(self, database):
+        """Testa que valores decimais voltam do banco sem arredondamento."""
+
+        async def scenario():
+            # Arrange
+            _, sessions = await database()
+            discount = Discount(
+                type=DiscountType.FIXED_AMOUNT,
+                value=Money('0.10') + Money('0.20'),
+                code='EXACT',
+                minimum_order_value=Money('1234567.89', 'USD'),
+            )
+
+            # Act
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await session.commit()
+            async with sessions() as session:
+                return discount, await SQLDiscountRepository(
+                    session
+                ).get_by_code('EXACT')
+
+        discount, loaded = asyncio.run(scenario())
+
+        # Assert
+        assert loaded.value == Money('0.30', 'USD')
+        assert loaded.minimum_order_value == discount.minimum_order_value
+
+    def test_coupon_value_roundtrips_as_money(self, database):
+        """Testa que o valor de um cupom volta do banco como Money."""
+
+        async def scenario():
+            # Arrange
+            _, sessions = await database()
+            coupon = Discount(
+                type=DiscountType.COUPON, value=Money('15'), code='COUPON'
+            )
+
+            # Act
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(coupon)
+                await session.commit()
+            async with sessions() as session:
+                return await SQLDiscountRepository(session).get_by_code(
+                    'COUPON'
+                )
+
+        loaded = asyncio.run(scenario())
+
+        # Assert
+        assert loaded.value == Money('15')
+        assert loaded.calculate(Money('40')) == Money('15')
+
+    def test_targets_roundtrip(self, database):
+        """Testa a gravação e a leitura dos produtos e categorias alvo."""
+
+        async def scenario():
+            # Arrange
+            _, sessions = await database()
+            targeted = Discount(
+                type=DiscountType.PERCENTAGE,
+                value=Decimal(15),
+                code='ALVO',
+                product_ids=frozenset([uuid4(), uuid4()]),
+                category_ids=frozenset([uuid4()]),
+            )
+            untargeted = Discount(
+                type=DiscountType.PERCENTAGE, value=Decimal(5), code='GERAL'
+            )
+
+            # Act
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                await repository.save_many([targeted, untargeted])
+                await session.commit()
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                loaded = (
+                    await repository.get_by_code('ALVO'),
+                    await repository.get_by_id(untargeted.id),
+                )
+                targeted.category_ids = frozenset()
+                await repository.save(targeted)
+                await session.commit()
+            async with sessions() as session:
+                updated = await SQLDiscountRepository(session).get_by_code(
+                    'ALVO'
+                )
+            return targeted, untargeted, loaded, updated
+
+        targeted, untargeted, loaded, updated = asyncio.run(scenario())
+
+        # Assert
+        assert loaded[0].product_ids == targeted.product_ids
+        assert loaded[0].category_ids
+        assert loaded[1].product_ids == frozenset()
+        assert not loaded[1].is_targeted
+        assert updated.product_ids == targeted.product_ids
+        assert updated.category_ids == frozenset()
+
+    def test_list_active_matches_in_memory_repository(self, database):
+        """Testa a consulta de descontos ativos nas duas implementações."""
+
+        async def scenario():
+            # Arrange
+            _, sessions = await database()
+            catalog = make_catalog()
+            memory = InMemoryDiscountRepository()
+            await memory.save_many(list(catalog.values()))
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save_many(
+                    list(catalog.values())
+                )
+                await session.commit()
+
+            # Act
+            results = []
+            async with sessions() as session:
+                sql = SQLDiscountRepository(session)
+                for repository in (memory, sql):
+                    results.append(
+                        (
+                            await repository.list_active(NOW),
+                            await repository.list_active(NOW, Money(100)),
+                            await repository.list_active(
+                                NOW, Money(500, 'USD')
+                            ),
+                        )
+                    )
+            return catalog, results
+
+        catalog, results = asyncio.run(scenario())
+
+        # Assert
+        def codes(discounts):
+            return sorted(discount.code for discount in discounts)
+
+        for every, below_minimum, other_currency in results:
+            assert codes(every) == ['EXPIRING', 'HIGH', 'OPEN']
+            assert codes(below_minimum) == ['EXPIRING', 'OPEN']
+            assert other_currency == []
+        assert results[0][0] == results[1][0]
+
+    def test_list_active_uses_indexes(self, database, statement_counter):
+        """Testa que o plano de execução usa os índices de descontos ativos."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            counter = statement_counter(engine)
+            async with sessions() as session:
+                await SQLDiscountRepository(session).list_active(
+                    NOW, Money(100)
+                )
+            statement, parameters = next(
+                (statement, parameters)
+                for (statement, _), parameters in zip(
+                    counter.statements, counter.parameters
+                )
+                if 'UNION ALL' in statement
+            )
+
+            # Act
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f'EXPLAIN QUERY PLAN {statement}', parameters
+                )
+                plan = ' '.join(row[3] for row in result)
+
+            await engine.dispose()
+            return plan
+
+        plan = asyncio.run(scenario())
+
+        # Assert
+        assert 'USING INDEX ix_discounts_open_ended' in plan
+        assert 'USING INDEX ix_discounts_validity' in plan
+
+    def test_search_by_code_prefix_matches_memory(self, database):
+        """Testa a busca por prefixo no SQL e em memória."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            codes = ['VERAO10', 'verao20', 'Verao-VIP', 'INVERNO', 'VER']
+            discounts = [
+                Discount(
+                    type=DiscountType.PERCENTAGE,
+                    value=Decimal(10),
+                    code=code,
+                    valid_from=NOW,
+                )
+                for code in codes
+            ]
+            memory = InMemoryDiscountRepository()
+            await memory.save_many(discounts)
+            async with sessions() as session:
+                sql = SQLDiscountRepository(session)
+                await sql.save_many(discounts)
+
+                # Act
+                results = [
+                    (
+                        await repository.search_by_code_prefix('verao', 10),
+                        await repository.search_by_code_prefix('VER', 2),
+                        await repository.search_by_code_prefix('xyz', 10),
+                    )
+                    for repository in (memory, sql)
+                ]
+
+            await engine.dispose()
+            return results
+
+        results = asyncio.run(scenario())
+
+        # Assert
+        def codes(discounts):
+            return [discount.code for discount in discounts]
+
+        for prefix, limited, missing in results:
+            assert codes(prefix) == ['Verao-VIP', 'VERAO10', 'verao20']
+            assert codes(limited) == ['VER', 'Verao-VIP']
+            assert missing == []
+
+    def test_search_by_code_prefix_escapes_wildcards(self, database):
+        """Testa prefixos com curingas do LIKE e caracteres não ASCII."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            codes = ['50%OFF', '50XOFF', 'A_B', 'AXB', 'ÉTÉ10', 'ETE20']
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                await repository.save_many(
+                    [
+                        Discount(
+                            type=DiscountType.PERCENTAGE,
+                            value=Decimal(10),
+                            code=code,
+                            valid_from=NOW,
+                        )
+                        for code in codes
+                    ]
+                )
+
+                # Act
+                results = [
+                    [
+                        discount.code
+                        for discount in await repository.search_by_code_prefix(
+                            prefix, 10
+                        )
+                    ]
+                    for prefix in ['50%', 'a_', 'ÉT', 'et', '\U0010ffff']
+                ]
+
+            await engine.dispose()
+            return results
+
+        results = asyncio.run(scenario())
+
+        # Assert
+        assert results == [['50%OFF'], ['A_B'], ['ÉTÉ10'], ['ETE20'], []]
+
+    def test_search_by_code_prefix_uses_index(
+        self, database, statement_counter
+    ):
+        """Testa que a busca por prefixo percorre o índice de lower(code)."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            counter = statement_counter(engine)
+            async with sessions() as session:
+                await SQLDiscountRepository(session).search_by_code_prefix(
+                    'ver', 5
+                )
+            statement, parameters = next(
+                (statement, parameters)
+                for (statement, _), parameters in zip(
+                    counter.statements, counter.parameters
+                )
+                if 'lower(discounts.code)' in statement
+            )
+
+            # Act
+            async with engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    f'EXPLAIN QUERY PLAN {statement}', parameters
+                )
+                plan = ' '.join(row[3] for row in result)
+
+            await engine.dispose()
+            return plan
+
+        plan = asyncio.run(scenario())
+
+        # Assert
+        assert 'SEARCH discounts USING INDEX ix_discounts_code_lower' in plan
+        assert 'TEMP B-TREE' not in plan
+
+    def test_lookups_bypass_identity_map(self, database):
+        """Buscas por ID e código não carregam modelos ORM na sessão."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            catalog = make_catalog()
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save_many(
+                    list(catalog.values())
+                )
+                await session.commit()
+
+            # Act
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                by_id = await repository.get_by_id(catalog['expiring'].id)
+                by_code = await repository.get_by_code('HIGH')
+                missing = await repository.get_by_code('NENHUM')
+                loaded = len(session.identity_map)
+
+            await engine.dispose()
+            return catalog, by_id, by_code, missing, loaded
+
+        catalog, by_id, by_code, missing, loaded = asyncio.run(scenario())
+
+        # Assert
+        assert by_id == catalog['expiring']
+        assert by_code == catalog['high_minimum']
+        assert missing is None
+        assert loaded == 0
+
+    @pytest.mark.slow
+    def test_lookup_overhead_against_orm_path(
+        self, database, statement_counter
+    ):
+        """Compara 3000 buscas pelo caminho Core e pelo ORM."""
+
+        async def scenario():
+            engine, sessions = await database()
+            discounts = [
+                Discount(
+                    type=DiscountType.FIXED_AMOUNT,
+                    value=Money('7.50'),
+                    code=f'BUSCA{index}',
+                )
+                for index in range(1000)
+            ]
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                await repository.save_many(discounts)
+                await session.commit()
+
+            async def orm_lookup(session, discount_id):
+                # Caminho anterior: modelo ORM no mapa de identidade
+                result = await session.execute(
+                    select(DiscountModel).where(DiscountModel.id == discount_id)
+                )
+                model = result.scalar_one_or_none()
+                return Discount(
+                    id=model.id,
+                    type=DiscountType[model.type],
+                    value=Money(
+                        Decimal(model.value_minor) / 100, model.currency
+                    ),
+                    code=model.code,
+                    description=model.description,
+                    minimum_order_value=Money(
+                        Decimal(model.minimum_order_value_minor) / 100,
+                        model.currency,
+                    ),
+                    valid_from=model.valid_from,
+                    valid_until=model.valid_until,
+                    max_usage_count=model.max_usage_count,
+                    current_usage_count=model.current_usage_count,
+                )
+
+            counter = statement_counter(engine)
+            results = {}
+            for name in ('orm', 'core'):
+                counter.reset()
+                async with sessions() as session:
+                    repository = SQLDiscountRepository(session)
+                    for _ in range(3):
+                        loaded = [
+                            await orm_lookup(session, discount.id)
+                            if name == 'orm'
+                            else await repository.get_by_id(discount.id)
+                            for discount in discounts
+                        ]
+                    results[name] = loaded, counter.count('SELECT')
+
+            await engine.dispose()
+            return discounts, results
+
+        discounts, results = asyncio.run(scenario())
+        orm, orm_selects = results['orm']
+        core, core_selects = results['core']
+        assert core == orm == discounts
+        assert core_selects == orm_selects == 3 * len(discounts)
+
+    def test_purge_archives_inactive_discounts(self, database):
+        """Testa a remoção com arquivamento, por lotes, via roteador."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            router = SessionRouter(sessions)
+            repository = SQLDiscountRepository(router=router)
+            catalog = make_catalog()
+            await repository.save_many(list(catalog.values()))
+
+            # Act
+            purged = await repository.purge(
+                expired_before=NOW,
+                exhausted_before=datetime.now() + timedelta(seconds=1),
+                limit=1,
+                archive=True,
+            )
+            purged += await repository.purge(
+                expired_before=NOW,
+                exhausted_before=datetime.now() + timedelta(seconds=1),
+                limit=10,
+                archive=True,
+            )
+            remaining = sorted(d.code for d in await repository.list())
+            async with sessions() as session:
+                archived = (
+                    await session.execute(
+                        select(DiscountArchiveModel.code)
+                    )
+                ).scalars().all()
+
+            await engine.dispose()
+            return purged, remaining, sorted(archived)
+
+        purged, remaining, archived = asyncio.run(scenario())
+
+        # Assert
+        assert purged == 2
+        assert archived == ['EXHAUSTED', 'EXPIRED']
+        assert remaining == ['EXPIRING', 'FUTURE', 'HIGH', 'OPEN']
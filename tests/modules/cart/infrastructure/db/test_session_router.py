@@ -0,0 +1,139 @@
+import asyncio
+from decimal import Decimal
+
+from sqlalchemy import delete, insert, select
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.infrastructure.db.models.discount_model import (
+    DiscountModel,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.session_router import (
+    LEAST_LATENCY,
+    SessionRouter,
+    caller_context,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+async def replicate(primary, replica):
+    """Copia a tabela de descontos do primário para a réplica."""
+    table = DiscountModel.__table__
+    async with primary() as source:
+        rows = (await source.execute(select(table))).mappings().all()
+    async with replica() as target, target.begin():
+        await target.execute(delete(table))
+        if rows:
+            await target.execute(insert(table), [dict(row) for row in rows])
+
+
+class TestSessionRouter:
+    def test_reads_stick_to_primary_after_write(self, database):
+        """Testa que o chamador que gravou lê as próprias gravações."""
+
+        async def scenario():
+            # Arrange
+            _, primary = await database('primary.db')
+            _, replica = await database('replica.db')
+            clock = FakeClock()
+            router = SessionRouter(
+                primary, [replica], sticky_seconds=5, clock=clock
+            )
+            repository = SQLDiscountRepository(router=router)
+            discount = Discount(
+                type=DiscountType.PERCENTAGE, value=Decimal(10), code='DEZ'
+            )
+
+            # Act
+            with caller_context('writer'):
+                await repository.save(discount)
+                own_read = await repository.get_by_code('DEZ')
+            with caller_context('other'):
+                stale_read = await repository.get_by_code('DEZ')
+
+            await replicate(primary, replica)
+            clock.now += 10
+            with caller_context('writer'):
+                replica_read = await repository.get_by_code('DEZ')
+
+            return own_read, stale_read, replica_read, router.stats
+
+        own_read, stale_read, replica_read, stats = asyncio.run(scenario())
+
+        # Assert
+        assert own_read.code == 'DEZ'
+        assert stale_read is None
+        assert replica_read.code == 'DEZ'
+        assert stats.writes == 1
+        assert stats.sticky_reads == 1
+        assert stats.reads == {'primary': 1, 'replica-0': 2}
+
+    def test_anonymous_writes_do_not_pin_reads(self, database):
+        """Testa que gravações sem chamador não desviam as leituras."""
+
+        async def scenario():
+            # Arrange
+            _, primary = await database('primary.db')
+            _, replica = await database('replica.db')
+            router = SessionRouter(primary, [replica], clock=FakeClock())
+            repository = SQLDiscountRepository(router=router)
+
+            # Act
+            for index in range(3):
+                await repository.save(
+                    Discount(
+                        type=DiscountType.PERCENTAGE,
+                        value=Decimal(10),
+                        code=f'ANON-{index}',
+                    )
+                )
+                await repository.get_by_code(f'ANON-{index}')
+
+            return router.stats
+
+        stats = asyncio.run(scenario())
+
+        # Assert
+        assert stats.writes == 3
+        assert stats.sticky_reads == 0
+        assert stats.reads == {'replica-0': 3}
+
+    def test_replica_selection_strategies(self, database):
+        """Testa rodízio e escolha pela menor latência entre réplicas."""
+
+        async def scenario():
+            # Arrange
+            _, primary = await database('primary.db')
+            replicas = [
+                (await database(f'replica{index}.db'))[1] for index in range(2)
+            ]
+            round_robin = SessionRouter(primary, replicas)
+            least_latency = SessionRouter(
+                primary, replicas, strategy=LEAST_LATENCY
+            )
+            least_latency.record_latency(0, 0.5)
+            least_latency.record_latency(1, 0.001)
+
+            # Act
+            for router in (round_robin, least_latency):
+                repository = SQLDiscountRepository(router=router)
+                for _ in range(4):
+                    await repository.get_by_code('NENHUM')
+
+            return round_robin.stats, least_latency.stats
+
+        round_robin, least_latency = asyncio.run(scenario())
+
+        # Assert
+        assert round_robin.reads == {'replica-0': 2, 'replica-1': 2}
+        assert least_latency.reads == {'replica-1': 4}
+        assert set(least_latency.latency_seconds) == {'replica-0', 'replica-1'}
@@ -0,0 +1,276 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.modules.cart.application.use_cases.redeem_discount import (
+    RedeemDiscountUseCase,
+)
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.unit_of_work import (
+    InMemoryUnitOfWork,
+    SQLUnitOfWork,
+)
+
+
+def make_discount(code='RESGATE', max_usage_count=10):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        max_usage_count=max_usage_count,
+    )
+
+
+async def redeem_without_unit_of_work(sessions, discount_id, reward_code):
+    """Mesmo fluxo do caso de uso, gravando a cada chamada."""
+    async with sessions() as session:
+        service = DiscountService(SQLDiscountRepository(session))
+        await service.apply_discount_to_cart(Money(100), discount_id)
+        await service.create_percentage_discount(
+            5, reward_code, 'Cupom de retorno', max_usage_count=1
+        )
+        await session.commit()
+
+
+class TestUnitOfWork:
+    def test_sql_unit_of_work_sends_fewer_statements(
+        self, database, statement_counter
+    ):
+        """O resgate com cupom de retorno usa um único flush."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            discount = make_discount()
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await session.commit()
+            counter = statement_counter(engine)
+            use_case = RedeemDiscountUseCase(
+                lambda: SQLUnitOfWork(sessions), reward_percentage=5
+            )
+
+            # Act
+            await redeem_without_unit_of_work(sessions, discount.id, 'SEM')
+            baseline = list(counter.statements)
+            counter.reset()
+            redemption = await use_case.execute(
+                Money(100), discount.id, 'COM'
+            )
+            batched = list(counter.statements)
+
+            async with sessions() as session:
+                repository = SQLDiscountRepository(session)
+                stored = await repository.get_by_id(discount.id)
+                reward = await repository.get_by_code('COM')
+
+            await engine.dispose()
+            return baseline, batched, redemption, stored, reward
+
+        baseline, batched, redemption, stored, reward = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        def count(statements, prefix):
+            return sum(
+                1 for statement, _ in statements
+                if statement.lstrip().upper().startswith(prefix)
+            )
+
+        assert len(batched) < len(baseline)
+        assert count(batched, 'SELECT') < count(baseline, 'SELECT')
+        assert count(batched, 'SAVEPOINT') == 0
+        assert redemption.total == Money(90)
+        assert stored.current_usage_count == 2
+        assert reward.id == redemption.reward.id
+
+    def test_sql_unit_of_work_discards_on_error(self, database):
+        """Uma falha no caso de uso não grava o resgate."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            discount = make_discount()
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await session.commit()
+
+            # Act
+            with pytest.raises(RuntimeError):
+                async with SQLUnitOfWork(sessions) as uow:
+                    service = DiscountService(uow.discounts)
+                    await service.apply_discount_to_cart(
+                        Money(100), discount.id
+                    )
+                    raise RuntimeError('falha no pagamento')
+
+            async with sessions() as session:
+                stored = await SQLDiscountRepository(session).get_by_id(
+                    discount.id
+                )
+
+            await engine.dispose()
+            return stored
+
+        assert asyncio.run(scenario()).current_usage_count == 0
+
+    def test_in_memory_unit_of_work_applies_only_on_commit(self):
+        """Em memória, as alterações só aparecem após a confirmação."""
+
+        async def scenario():
+            # Arrange
+            repository = InMemoryDiscountRepository()
+            discount = await repository.save(make_discount())
+            use_case = RedeemDiscountUseCase(
+                lambda: InMemoryUnitOfWork(repository), reward_percentage=5
+            )
+
+            # Act
+            async with InMemoryUnitOfWork(repository) as uow:
+                pending = await uow.discounts.get_by_id(discount.id)
+                pending.use()
+                await uow.discounts.save(pending)
+                await uow.discounts.delete(discount.id)
+                deleted = await uow.discounts.get_by_id(discount.id)
+            untouched = await repository.get_by_id(discount.id)
+            usage_before = untouched.current_usage_count
+
+            redemption = await use_case.execute(
+                Money(100), discount.id, 'RETORNO'
+            )
+
+            return (
+                deleted,
+                usage_before,
+                redemption,
+                await repository.get_by_id(discount.id),
+                await repository.get_by_code('RETORNO'),
+            )
+
+        deleted, usage_before, redemption, stored, reward = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert deleted is None
+        assert usage_before == 0
+        assert redemption.total == Money(90)
+        assert stored.current_usage_count == 1
+        assert reward.max_usage_count == 1
+
+    def test_sql_unit_of_work_renames_and_deletes_in_batch(
+        self, database, statement_counter
+    ):
+        """Renomeações somem do código antigo e remoções usam um DELETE."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            renamed = make_discount('ANTIGO')
+            removed = [make_discount(f'REMOVER{i}') for i in range(5)]
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save_many(
+                    [renamed, *removed]
+                )
+                await session.commit()
+            counter = statement_counter(engine)
+
+            # Act
+            async with SQLUnitOfWork(sessions, publish_events=True) as uow:
+                pending = await uow.discounts.get_by_code('ANTIGO')
+                pending.code = 'NOVO'
+                await uow.discounts.save(pending)
+                old_code = await uow.discounts.get_by_code('ANTIGO')
+                new_code = await uow.discounts.get_by_code('NOVO')
+                for discount in removed:
+                    await uow.discounts.delete(discount.id)
+                await uow.commit()
+
+            async with sessions() as session:
+                remaining = await SQLDiscountRepository(session).list()
+
+            await engine.dispose()
+            return old_code, new_code, counter, remaining
+
+        old_code, new_code, counter, remaining = asyncio.run(scenario())
+
+        # Assert
+        assert old_code is None
+        assert new_code.code == 'NOVO'
+        assert counter.count('DELETE') == 1
+        assert [discount.code for discount in remaining] == ['NOVO']
+
+    def test_sql_unit_of_work_reuses_deleted_code(self, database):
+        """Um cupom removido pode ser recriado na mesma unidade."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await database()
+            discount = make_discount('TROCA')
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await session.commit()
+            replacement = make_discount('TROCA', max_usage_count=1)
+
+            # Act
+            async with SQLUnitOfWork(sessions) as uow:
+                await uow.discounts.delete(discount.id)
+                await uow.discounts.save(replacement)
+                await uow.commit()
+
+            async with sessions() as session:
+                stored = await SQLDiscountRepository(session).list()
+
+            await engine.dispose()
+            return replacement, stored
+
+        replacement, stored = asyncio.run(scenario())
+
+        # Assert
+        assert [discount.id for discount in stored] == [replacement.id]
+
+    @pytest.mark.slow
+    def test_unit_of_work_statements_under_load(
+        self, database, statement_counter
+    ):
+        """Compara os comandos de 300 resgates com e sem unidade de trabalho."""
+
+        async def scenario():
+            engine, sessions = await database()
+            discount = make_discount(max_usage_count=None)
+            async with sessions() as session:
+                await SQLDiscountRepository(session).save(discount)
+                await session.commit()
+            use_case = RedeemDiscountUseCase(
+                lambda: SQLUnitOfWork(sessions), reward_percentage=5
+            )
+            counter = statement_counter(engine)
+
+            for index in range(300):
+                await redeem_without_unit_of_work(
+                    sessions, discount.id, f'SEM{index}'
+                )
+            baseline = len(counter.statements)
+            counter.reset()
+
+            for index in range(300):
+                await use_case.execute(Money(100), discount.id, f'COM{index}')
+            batched = len(counter.statements)
+
+            await engine.dispose()
+            return baseline, batched
+
+        baseline, batched = asyncio.run(scenario())
+        assert batched < baseline
@@ -0,0 +1,241 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+pytest.importorskip('aiosqlite')
+pytest.importorskip('greenlet')
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.models.base import Base
+from ecommerce.modules.cart.infrastructure.db.models.outbox_event_model import (  # noqa: E501
+    OutboxEventModel,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.sql_discount_repository import (  # noqa: E501
+    SQLDiscountRepository,
+)
+from ecommerce.modules.cart.infrastructure.db.session_router import (
+    SessionRouter,
+)
+from ecommerce.modules.cart.infrastructure.outbox.outbox_relay import (
+    DISCOUNT_CREATED,
+    DISCOUNT_DELETED,
+    DISCOUNT_REDEEMED,
+    FileOutboxSink,
+    OutboxRelay,
+    QueueOutboxSink,
+)
+
+
+def make_discount(code, max_usage_count=None):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        max_usage_count=max_usage_count,
+    )
+
+
+async def create_database(tmp_path):
+    engine = create_async_engine(f'sqlite+aiosqlite:///{tmp_path / "o.db"}')
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def pending(sessions):
+    async with sessions() as session:
+        return await session.scalar(
+            select(func.count()).select_from(OutboxEventModel)
+        )
+
+
+class FlakySink:
+    """Destino que falha na primeira entrega."""
+
+    def __init__(self):
+        self.calls = 0
+        self.delivered = []
+
+    async def publish(self, events):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError('destino indisponível')
+        self.delivered.extend(events)
+
+
+class TestOutboxRelay:
+    def test_events_are_written_in_the_same_transaction(self, tmp_path):
+        """Eventos só existem se a alteração do desconto for confirmada."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await create_database(tmp_path)
+
+            # Act
+            async with sessions() as session:
+                repository = SQLDiscountRepository(
+                    session, publish_events=True
+                )
+                await repository.save(make_discount('DESFEITO'))
+                await session.rollback()
+            rolled_back = await pending(sessions)
+
+            async with sessions() as session:
+                repository = SQLDiscountRepository(
+                    session, publish_events=True
+                )
+                await repository.save(make_discount('CONFIRMADO'))
+                await session.commit()
+            committed = await pending(sessions)
+
+            await engine.dispose()
+            return rolled_back, committed
+
+        assert asyncio.run(scenario()) == (0, 1)
+
+    def test_relay_delivers_service_events_in_order(self, tmp_path):
+        """Criação, resgate e remoção chegam à fila na ordem."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await create_database(tmp_path)
+            repository = SQLDiscountRepository(
+                router=SessionRouter(sessions), publish_events=True
+            )
+            service = DiscountService(repository)
+            discount = await service.create_percentage_discount(
+                10, 'FILA', 'Desconto', max_usage_count=5
+            )
+            await service.apply_discount_to_cart(Money(100), discount.id)
+            await repository.delete(discount.id)
+            queue = asyncio.Queue()
+            relay = OutboxRelay(sessions, QueueOutboxSink(queue), batch_size=2)
+
+            # Act
+            delivered = await relay.drain()
+            events = [queue.get_nowait() for _ in range(queue.qsize())]
+            remaining = await pending(sessions)
+
+            await engine.dispose()
+            return discount, delivered, events, remaining, relay.stats
+
+        discount, delivered, events, remaining, stats = asyncio.run(
+            scenario()
+        )
+
+        # Assert
+        assert delivered == 3
+        assert [event.event_type for event in events] == [
+            DISCOUNT_CREATED,
+            DISCOUNT_REDEEMED,
+            DISCOUNT_DELETED,
+        ]
+        assert {event.aggregate_id for event in events} == {discount.id}
+        assert json.loads(events[1].payload)['current_usage_count'] == 1
+        assert events[2].payload is None
+        assert remaining == 0
+        assert (stats.published, stats.batches) == (3, 2)
+        assert stats.max_lag_seconds >= 0
+
+    def test_failed_delivery_is_retried(self, tmp_path):
+        """Uma falha do destino mantém os eventos para nova entrega."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await create_database(tmp_path)
+            repository = SQLDiscountRepository(
+                router=SessionRouter(sessions), publish_events=True
+            )
+            await repository.save_many(
+                [make_discount(f'LOTE{index}') for index in range(3)]
+            )
+            sink = FlakySink()
+            relay = OutboxRelay(sessions, sink, retry_interval=0.01)
+
+            # Act
+            with pytest.raises(ConnectionError):
+                await relay.relay_batch()
+            after_failure = await pending(sessions)
+            delivered = await relay.drain()
+
+            await engine.dispose()
+            return after_failure, delivered, sink, relay.stats
+
+        after_failure, delivered, sink, stats = asyncio.run(scenario())
+
+        # Assert
+        assert after_failure == 3
+        assert delivered == 3
+        assert [event.id for event in sink.delivered] == [1, 2, 3]
+        assert stats.failures == 1
+
+    def test_background_relay_writes_jsonl(self, tmp_path):
+        """O retransmissor em segundo plano grava os eventos em arquivo."""
+
+        async def scenario():
+            # Arrange
+            engine, sessions = await create_database(tmp_path)
+            repository = SQLDiscountRepository(
+                router=SessionRouter(sessions), publish_events=True
+            )
+            path = tmp_path / 'events.jsonl'
+            relay = OutboxRelay(
+                sessions, FileOutboxSink(str(path)), poll_interval=0.01
+            )
+            stop = asyncio.Event()
+            task = asyncio.create_task(relay.run(stop))
+
+            # Act
+            await repository.save(make_discount('ARQUIVO'))
+            while relay.stats.published < 1:
+                await asyncio.sleep(0.01)
+            stop.set()
+            await task
+
+            await engine.dispose()
+            return path.read_text().splitlines()
+
+        lines = asyncio.run(scenario())
+
+        # Assert
+        assert len(lines) == 1
+        event = json.loads(lines[0])
+        assert event['event_type'] == DISCOUNT_CREATED
+        assert event['payload']['code'] == 'ARQUIVO'
+
+    @pytest.mark.slow
+    def test_relay_throughput(self, tmp_path):
+        """Entrega um acúmulo de 20 mil eventos em lotes."""
+
+        async def scenario():
+            engine, sessions = await create_database(tmp_path)
+            repository = SQLDiscountRepository(
+                router=SessionRouter(sessions), publish_events=True
+            )
+            for start in range(0, 20_000, 1000):
+                await repository.save_many(
+                    [
+                        make_discount(f'CARGA{index}')
+                        for index in range(start, start + 1000)
+                    ]
+                )
+            queue = asyncio.Queue()
+            relay = OutboxRelay(sessions, QueueOutboxSink(queue))
+
+            delivered = await relay.drain()
+
+            await engine.dispose()
+            return delivered, relay.stats
+
+        delivered, stats = asyncio.run(scenario())
+        assert delivered == 20_000
+        assert stats.batches == 40
@@ -0,0 +1,135 @@
+import dataclasses
+import io
+import json
+import time
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID, uuid4
+
+import pytest
+
+from ecommerce.modules.cart.domain.entities import (
+    Cart,
+    CartItem,
+    Discount,
+    DiscountType,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.serialization.json_codec import (
+    CartJSONDecoder,
+    CartJSONEncoder,
+)
+
+
+def make_cart(lines):
+    cart = Cart(user_id=uuid4(), session_id='sessao-1')
+    for i in range(lines):
+        cart.add_item(
+            CartItem(
+                cart_id=cart.id,
+                product_id=uuid4(),
+                quantity=i % 5 + 1,
+                price=19.9,
+            )
+        )
+    cart.discounts.append(
+        Discount(
+            type=DiscountType.FIXED_AMOUNT,
+            value=Money(Decimal('10.05')),
+            code='PROMO',
+            minimum_order_value=Money(Decimal('0.10'), 'USD'),
+            valid_until=datetime(2099, 1, 1),
+            max_usage_count=3,
+        )
+    )
+    return cart
+
+
+class TestCartJSONCodec:
+    def test_money_keeps_exact_amount(self):
+        """Testa que valores monetários não passam por float."""
+        # Arrange
+        money = Money(Decimal('12345678901234.99'))
+
+        # Act
+        payload = CartJSONEncoder().encode(money)
+
+        # Assert
+        assert json.loads(payload) == {
+            'amount': '12345678901234.99',
+            'currency': 'BRL',
+        }
+        assert CartJSONDecoder().decode(payload, Money) == money
+
+    def test_cart_roundtrip(self):
+        """Testa ida e volta de um carrinho com itens e descontos."""
+        # Arrange
+        cart = make_cart(3)
+
+        # Act
+        payload = CartJSONEncoder().encode(cart)
+        decoded = CartJSONDecoder().decode(payload, Cart)
+
+        # Assert
+        assert decoded == cart
+        assert isinstance(decoded.items[0].product_id, UUID)
+        assert decoded.discounts[0].type is DiscountType.FIXED_AMOUNT
+        assert decoded.discounts[0].minimum_order_value.currency == 'USD'
+
+    def test_streaming_matches_full_encoding(self):
+        """Testa que a codificação em pedaços gera o mesmo documento."""
+        # Arrange
+        cart = make_cart(25)
+        encoder = CartJSONEncoder(chunk_size=10)
+        output = io.StringIO()
+
+        # Act
+        chunks = list(encoder.iterencode(cart))
+        encoder.dump(cart, output)
+
+        # Assert
+        assert ''.join(chunks) == encoder.encode(cart) == output.getvalue()
+        assert len(chunks) > 3
+
+    def test_unsupported_type(self):
+        """Testa que tipos desconhecidos geram TypeError."""
+        with pytest.raises(TypeError):
+            CartJSONEncoder().encode(object())
+
+    @pytest.mark.slow
+    def test_faster_than_asdict(self):
+        """Testa que o codec supera json.dumps(asdict(...)) em 5k linhas."""
+        # Arrange
+        cart = make_cart(5000)
+        encoder = CartJSONEncoder()
+
+        def default(value):
+            if isinstance(value, (UUID, Decimal)):
+                return str(value)
+            if isinstance(value, datetime):
+                return value.isoformat()
+            if isinstance(value, Enum):
+                return value.name
+            if isinstance(value, frozenset):
+                return list(value)
+            raise TypeError
+
+        def baseline():
+            return json.dumps(dataclasses.asdict(cart), default=default)
+
+        def best_of(function, rounds=5):
+            function()
+            timings = []
+            for _ in range(rounds):
+                started_at = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - started_at)
+            return min(timings)
+
+        # Act
+        baseline_time = best_of(baseline)
+        codec_time = best_of(lambda: encoder.encode(cart))
+
+        # Assert
+        assert codec_time < baseline_time
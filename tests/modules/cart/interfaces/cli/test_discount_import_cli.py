@@ -0,0 +1,135 @@
+import asyncio
+import json
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.main_discount_cli import build_sqlite_repository, main
+from ecommerce.modules.cart.application.use_cases.create_fixed_discount import (
+    CreateFixedDiscountUseCase,
+)
+from ecommerce.modules.cart.application.use_cases.import_discounts import (
+    ImportDiscountsUseCase,
+)
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (
+    InMemoryDiscountRepository,
+)
+from ecommerce.modules.cart.interfaces.cli.discount_import_cli import (
+    DiscountImportCLI,
+)
+
+
+def make_cli(repository, batch_size=2):
+    use_case = CreateFixedDiscountUseCase(DiscountService(repository))
+    return DiscountImportCLI(
+        ImportDiscountsUseCase(use_case, batch_size=batch_size)
+    )
+
+
+class TestDiscountImportCLI:
+    def test_import_csv_with_rejects(self, tmp_path, capsys):
+        """Testa importação de CSV enviando linhas inválidas ao arquivo de recusa."""
+        # Arrange
+        source = tmp_path / 'feed.csv'
+        source.write_text(
+            'code,amount,description,minimum_order_value,valid_until,max_usage_count\n'
+            'PROMO10,10.00,Promo,50,2099-01-01,5\n'
+            ',10.00,Sem código,,,\n'
+            'PROMO20,abc,Valor inválido,,,\n'
+            'PROMO30,30.55,,,,\n'
+            'PROMO40,-1,Negativo,,,\n',
+            encoding='utf-8',
+        )
+        rejects = tmp_path / 'rejects.jsonl'
+        repository = InMemoryDiscountRepository()
+
+        # Act
+        report = asyncio.run(
+            make_cli(repository).run(str(source), reject_path=str(rejects))
+        )
+
+        # Assert
+        assert report.accepted == 2
+        assert report.rejected == 3
+        promo = asyncio.run(repository.get_by_code('PROMO30'))
+        assert promo.value == Money('30.55')
+        assert promo.description == 'Desconto de R$ 30.55'
+        promo = asyncio.run(repository.get_by_code('PROMO10'))
+        assert promo.max_usage_count == 5
+        assert promo.minimum_order_value.amount == Decimal('50.00')
+
+        rejected = [json.loads(line) for line in rejects.read_text().splitlines()]
+        assert [item['line'] for item in rejected] == [3, 4, 6]
+        assert 'linhas/s' in capsys.readouterr().out
+
+    def test_import_jsonl_in_batches(self, tmp_path):
+        """Testa importação de JSONL persistida em lotes."""
+        # Arrange
+        source = tmp_path / 'feed.jsonl'
+        lines = [
+            json.dumps({'code': f'C{i}', 'amount': '5', 'currency': 'USD'})
+            for i in range(5)
+        ]
+        lines.append('{not json')
+        source.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        repository = InMemoryDiscountRepository()
+
+        # Act
+        report = asyncio.run(make_cli(repository).run(str(source)))
+
+        # Assert
+        assert report.accepted == 5
+        assert report.rejected == 1
+        assert report.batches == 3
+        assert len(repository.discounts) == 5
+
+    def test_unsupported_format(self, tmp_path):
+        """Testa que extensões desconhecidas são recusadas."""
+        with pytest.raises(ValueError):
+            asyncio.run(
+                make_cli(InMemoryDiscountRepository()).run(
+                    str(tmp_path / 'feed.xml')
+                )
+            )
+
+    def test_import_persists_to_sqlite(self, tmp_path):
+        """Testa que o backend sqlite mantém os descontos importados."""
+        # Arrange
+        source = tmp_path / 'feed.csv'
+        source.write_text('code,amount\nTEN,10\nFIVE,5\n', encoding='utf-8')
+        database = str(tmp_path / 'discounts.db')
+        argv = ['import', str(source), '--backend', 'sqlite']
+
+        # Act
+        asyncio.run(main([*argv, '--database', database]))
+
+        # Assert
+        async def read():
+            repository = await build_sqlite_repository(database)
+            return await repository.get_by_code('TEN'), await repository.list()
+
+        ten, stored = asyncio.run(read())
+        assert ten.value == Money(10)
+        assert len(stored) == 2
+
+    def test_export_reads_sqlite_backend(self, tmp_path):
+        """Testa exportar o que uma importação gravou no SQLite."""
+        # Arrange
+        source = tmp_path / 'feed.csv'
+        source.write_text('code,amount\nTEN,10\nFIVE,5\n', encoding='utf-8')
+        target = tmp_path / 'discounts.jsonl'
+        backend = ['--backend', 'sqlite', '--database', str(tmp_path / 'd.db')]
+        asyncio.run(main(['import', str(source), *backend]))
+
+        # Act
+        asyncio.run(main(['export', str(target), *backend]))
+
+        # Assert
+        exported = [
+            json.loads(line) for line in target.read_text().splitlines()
+        ]
+        assert sorted(row['code'] for row in exported) == ['FIVE', 'TEN']
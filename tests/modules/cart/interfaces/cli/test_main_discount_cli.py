@@ -0,0 +1,34 @@
+import asyncio
+
+import pytest
+
+from ecommerce.main_discount_cli import main
+
+
+class TestMainDiscountCLI:
+    def test_simulate_refuses_to_replace_existing_database(self, tmp_path):
+        """Testa que o backend sqlite só apaga um arquivo com --overwrite."""
+        # Arrange
+        database = tmp_path / 'discounts.db'
+        database.write_bytes(b'dados')
+        argv = [
+            'simulate',
+            '--backend',
+            'sqlite',
+            '--database',
+            str(database),
+            '--requests',
+            '20',
+            '--concurrency',
+            '2',
+        ]
+
+        # Act
+        with pytest.raises(SystemExit):
+            asyncio.run(main(argv))
+        kept = database.read_bytes()
+        asyncio.run(main([*argv, '--overwrite']))
+
+        # Assert
+        assert kept == b'dados'
+        assert database.read_bytes() != b'dados'
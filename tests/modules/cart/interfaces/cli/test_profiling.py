@@ -0,0 +1,120 @@
+import asyncio
+import pstats
+import sys
+import time
+from contextlib import nullcontext
+from decimal import Decimal
+
+import pytest
+
+from ecommerce.main_discount_cli import main
+from ecommerce.modules.cart.domain.value_objects.money import Money
+from ecommerce.modules.cart.interfaces.cli.profiling import (
+    layer_of,
+    profile_session,
+)
+
+
+def busy_pricing(seconds):
+    deadline = time.perf_counter() + seconds
+    total = Money.zero()
+    while time.perf_counter() < deadline:
+        for _ in range(100):
+            total += Money(Decimal('1.99')) * 3
+    return total
+
+
+def read_collapsed(path):
+    lines = path.read_text(encoding='utf-8').splitlines()
+    stacks = {}
+    for line in lines:
+        stack, weight = line.rsplit(' ', 1)
+        stacks[stack] = int(weight)
+    return stacks
+
+
+class TestProfiling:
+    def test_disabled_profile_installs_nothing(self):
+        """Testa que sem modo nenhum perfilador é instalado."""
+        # Act
+        session = profile_session(None)
+
+        # Assert
+        assert isinstance(session, nullcontext)
+        with session:
+            assert sys.getprofile() is None
+
+    def test_unknown_mode_is_rejected(self):
+        """Testa que um modo desconhecido é recusado."""
+        with pytest.raises(ValueError):
+            profile_session('tracing')
+
+    @pytest.mark.parametrize('mode', ['cprofile', 'sampling'])
+    def test_writes_outputs(self, tmp_path, mode, capsys):
+        """Testa os arquivos gravados e o resumo por camada."""
+        # Arrange
+        prefix = tmp_path / 'profile'
+
+        # Act
+        with profile_session(mode, str(prefix), interval=0.001):
+            busy_pricing(0.2)
+
+        # Assert
+        stats = pstats.Stats(str(prefix) + '.pstats')
+        assert any(key[2] == 'busy_pricing' for key in stats.stats)
+
+        stacks = read_collapsed(tmp_path / 'profile.collapsed')
+        assert stacks
+        assert any('busy_pricing' in stack for stack in stacks)
+        assert any('money.py' in stack for stack in stacks)
+
+        summary = (tmp_path / 'profile.summary.txt').read_text('utf-8')
+        assert f'Perfil ({mode})' in summary
+        assert 'domain' in summary
+        assert summary in capsys.readouterr().err
+
+    def test_layers(self):
+        """Testa a classificação dos arquivos por camada."""
+        assert (
+            layer_of('/src/ecommerce/modules/cart/domain/entities/cart.py')
+            == 'domain'
+        )
+        assert (
+            layer_of(
+                '/src/ecommerce/modules/cart/infrastructure/db/repositories/'
+                'sql_discount_repository.py'
+            )
+            == 'repositories'
+        )
+        assert (
+            layer_of(
+                '/src/ecommerce/modules/cart/infrastructure/cache/'
+                'discount_cache.py'
+            )
+            == 'infrastructure'
+        )
+        assert layer_of('/usr/lib/python3.13/json/decoder.py') == 'other'
+
+    def test_cli_profile_option(self, tmp_path):
+        """Testa a opção global --profile em um comando da CLI."""
+        # Arrange
+        prefix = tmp_path / 'cli'
+
+        # Act
+        asyncio.run(
+            main(
+                [
+                    '--profile',
+                    'cprofile',
+                    '--profile-output',
+                    str(prefix),
+                    'export',
+                    str(tmp_path / 'discounts.jsonl'),
+                ]
+            )
+        )
+
+        # Assert
+        stats = pstats.Stats(str(prefix) + '.pstats')
+        assert any(key[2] == 'run' for key in stats.stats)
+        assert (tmp_path / 'cli.collapsed').exists()
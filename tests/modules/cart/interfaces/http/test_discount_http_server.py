@@ -0,0 +1,246 @@
+import asyncio
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from ecommerce.modules.cart.domain.entities import Discount, DiscountType
+from ecommerce.modules.cart.domain.services.discount_service import (
+    DiscountService,
+)
+from ecommerce.modules.cart.domain.services.discount_snapshot import (
+    DiscountCatalogSnapshot,
+)
+from ecommerce.modules.cart.domain.services.guarded_discount_service import (  # noqa: E501
+    GuardedDiscountService,
+)
+from ecommerce.modules.cart.infrastructure.db.repositories.memory_discount_repository import (  # noqa: E501
+    InMemoryDiscountRepository,
+)
+from ecommerce.modules.cart.interfaces.http.discount_http_load import (
+    HTTPLoadProfile,
+    encode_request,
+    read_response,
+    run_http_load,
+)
+from ecommerce.modules.cart.interfaces.http.discount_http_server import (
+    DiscountHTTPServer,
+    HTTPRequest,
+)
+
+
+async def start_server(*discounts):
+    service = DiscountService(InMemoryDiscountRepository())
+    await service.save_discounts(list(discounts))
+    server = DiscountHTTPServer(service, port=0)
+    await server.start()
+    return server
+
+
+def make_discount(code, max_usage_count=None):
+    return Discount(
+        type=DiscountType.PERCENTAGE,
+        value=Decimal(10),
+        code=code,
+        valid_from=datetime.now() - timedelta(days=1),
+        max_usage_count=max_usage_count,
+    )
+
+
+class TestDiscountHTTPServer:
+    def test_pipelined_requests_on_one_connection(self):
+        """Respostas de requisições em pipeline chegam na ordem."""
+
+        async def scenario():
+            # Arrange
+            discount = make_discount('PIPE', max_usage_count=1)
+            server = await start_server(discount)
+            reader, writer = await asyncio.open_connection(
+                server.host, server.port
+            )
+            apply_path = f'/discounts/{discount.id}/apply'
+
+            # Act
+            writer.write(
+                encode_request(
+                    '/coupons/validate',
+                    {'code': 'PIPE', 'order_value': '100.00'},
+                )
+                + encode_request(
+                    '/coupons/validate',
+                    {'code': 'NENHUM', 'order_value': '100.00'},
+                )
+                + encode_request(apply_path, {'cart_total': '100.00'})
+                + encode_request(apply_path, {'cart_total': '100.00'})
+            )
+            await writer.drain()
+            responses = [await read_response(reader) for _ in range(4)]
+            writer.close()
+            await writer.wait_closed()
+            await server.close()
+            return discount, server, responses
+
+        discount, server, responses = asyncio.run(scenario())
+
+        # Assert
+        statuses = [status for status, _ in responses]
+        bodies = [json.loads(body) for _, body in responses]
+        assert statuses == [200, 200, 200, 409]
+        assert bodies[0] == {
+            'valid': True,
+            'discount_id': str(discount.id),
+            'total': '90.00',
+            'currency': 'BRL',
+        }
+        assert bodies[1] == {'valid': False}
+        assert bodies[2] == {'total': '90.00', 'currency': 'BRL'}
+        assert server.stats.connections == 1
+        assert server.stats.requests == 4
+
+    def test_error_responses(self):
+        """Testa rotas, métodos e corpos inválidos."""
+
+        async def request(server, raw):
+            reader, writer = await asyncio.open_connection(
+                server.host, server.port
+            )
+            writer.write(raw)
+            await writer.drain()
+            response = await read_response(reader)
+            writer.close()
+            await writer.wait_closed()
+            return response[0]
+
+        async def scenario():
+            server = await start_server()
+            statuses = [
+                await request(
+                    server, encode_request('/desconhecida', {'code': 'X'})
+                ),
+                await request(
+                    server, b'GET /coupons/validate HTTP/1.1\r\n\r\n'
+                ),
+                await request(
+                    server,
+                    encode_request('/coupons/validate', {'code': 'X'}),
+                ),
+                await request(
+                    server,
+                    encode_request('/discounts/abc/apply', {}),
+                ),
+                await request(
+                    server,
+                    encode_request(
+                        '/discounts/00000000-0000-0000-0000-000000000000'
+                        '/apply',
+                        {'cart_total': '10'},
+                    ),
+                ),
+                await request(server, b'INVALIDA\r\n\r\n'),
+            ]
+            await server.close()
+            return statuses
+
+        assert asyncio.run(scenario()) == [404, 405, 400, 400, 404, 400]
+
+    def test_degraded_validation_and_metrics(self):
+        """Validação pela cópia em memória, resgate recusado e métricas."""
+
+        class FailingRepository(InMemoryDiscountRepository):
+            failing = False
+
+            async def get_by_code(self, code):
+                if self.failing:
+                    raise ConnectionError('sem conexão')
+                return await super().get_by_code(code)
+
+            async def get_by_id(self, discount_id):
+                if self.failing:
+                    raise ConnectionError('sem conexão')
+                return await super().get_by_id(discount_id)
+
+        def post(path, document):
+            return HTTPRequest(
+                'POST', path, {}, json.dumps(document).encode(), True
+            )
+
+        async def scenario():
+            # Arrange
+            discount = make_discount('STALE')
+            repository = FailingRepository()
+            service = GuardedDiscountService(
+                repository, DiscountCatalogSnapshot()
+            )
+            await service.save_discounts([discount])
+            await service.refresh_snapshot()
+            server = DiscountHTTPServer(service)
+            repository.failing = True
+
+            # Act
+            validation = await server._respond(
+                post('/coupons/validate', {'code': 'STALE', 'order_value': 50})
+            )
+            redemption = await server._respond(
+                post(f'/discounts/{discount.id}/apply', {'cart_total': 50})
+            )
+            metrics = await server._respond(
+                HTTPRequest('GET', '/metrics', {}, b'', True)
+            )
+            return validation, redemption, metrics
+
+        validation, redemption, metrics = asyncio.run(scenario())
+
+        # Assert
+        assert validation[0] == 200
+        assert validation[1]['valid'] and validation[1]['stale']
+        assert 'as_of' in validation[1]
+        assert redemption[0] == 503
+        assert metrics[1]['service']['fallbacks'] == 1
+        assert metrics[1]['service']['failures'] == 2
+
+    def test_connection_close_is_honoured(self):
+        """O servidor encerra a conexão quando o cliente pede."""
+
+        async def scenario():
+            server = await start_server()
+            reader, writer = await asyncio.open_connection(
+                server.host, server.port
+            )
+            writer.write(
+                b'GET /health HTTP/1.1\r\nConnection: close\r\n\r\n'
+            )
+            await writer.drain()
+            status, body = await read_response(reader)
+            closed = await reader.read() == b''
+            writer.close()
+            await server.close()
+            return status, body, closed
+
+        status, body, closed = asyncio.run(scenario())
+
+        assert status == 200
+        assert json.loads(body) == {'status': 'ok'}
+        assert closed
+
+    def test_load_report(self):
+        """Testa o relatório de um teste de carga pequeno."""
+
+        async def scenario():
+            discounts = [make_discount(f'HTTP-{index}') for index in range(20)]
+            server = await start_server(*discounts)
+            report = await run_http_load(
+                server.host,
+                server.port,
+                [discount.code for discount in discounts],
+                [str(discount.id) for discount in discounts],
+                HTTPLoadProfile(connections=4, requests=400, pipeline_depth=8),
+            )
+            await server.close()
+            return server, report
+
+        server, report = asyncio.run(scenario())
+
+        assert report.requests == 400
+        assert report.statuses == {'200': 400}
+        assert report.requests_per_second > 0
+        assert set(report.latency_ms) == {'p50', 'p95', 'p99', 'p999'}
+        assert server.stats.connections == 4